@@ -3,22 +3,50 @@ Flask Web Application for Oversight AI System
 Provides web interface for the 3-step AI process.
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context, url_for
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import hashlib
 import json
-import io
 import os
 from datetime import datetime
 from config import Config
 from src.oversight_ai import OversightAI
+from src.admission import AdmissionRejected, validate_priority
+from src.serialization import get_serializer
+from src.result_views import parse_fields, validate_fields
+from src.http_cache import CONTENT_ENCODINGS, metadata_etag
+
+
+class SerializerJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by the configured serializer (orjson when installed),
+    so every jsonify() response uses the fast encoder.
+    """
+    
+    def __init__(self, app):
+        super().__init__(app)
+        self.serializer = get_serializer()
+    
+    def dumps(self, obj, **kwargs):
+        return self.serializer.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return self.serializer.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.serializer.dumps(obj), mimetype='application/json')
+
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = SerializerJSONProvider(app)
 
 # Configure CORS for embedding
 CORS(app, 
      origins="*",  # Allow all origins for embedding
-     allow_headers=["Content-Type", "Authorization"],
+     allow_headers=["Content-Type", "Authorization", "X-API-Key"],
      methods=["GET", "POST", "OPTIONS"])
 
 # Add security headers for iframe embedding
@@ -32,13 +60,73 @@ def after_request(response):
     # Enable cross-origin resource sharing
     response.headers['Access-Control-Allow-Origin'] = '*'
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-API-Key'
     
     return response
 
 # Initialize the Oversight AI system
 oversight_ai = OversightAI()
 
+def cached_session_response(key, render, mimetype, immutable=False, etag=None):
+    """
+    Build the response for a body of a finished session: a strong ETag (a
+    content hash unless `etag` is given), a pre-compressed variant when the
+    client accepts one, and a 304 when If-None-Match matches. Bodies are
+    revalidated unless immutable (see set_session_cache_control()).
+    """
+    encoding = request.accept_encodings.best_match(CONTENT_ENCODINGS)
+    body, etag, applied_encoding = oversight_ai.http_cache.get(key, render, encoding, etag)
+    
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    if applied_encoding:
+        response.content_encoding = applied_encoding
+    response.vary.add('Accept-Encoding')
+    set_session_cache_control(response, immutable)
+    return response.make_conditional(request)
+
+def not_modified_response(etag, vary, immutable=False, encoding=None):
+    """
+    304 response when If-None-Match holds the metadata ETag (see
+    metadata_etag()) of a finished session's body, or of its variant in the
+    content encoding the client prefers; None otherwise. Checked before the
+    session is loaded, so revalidation costs no rendering or decompression.
+    """
+    etags = [etag] + ([f"{etag}-{encoding}"] if encoding else [])
+    matched = next((tag for tag in etags if request.if_none_match.contains(tag)), None)
+    if matched is None:
+        return None
+    response = Response(status=304)
+    response.set_etag(matched)
+    response.vary.add(vary)
+    set_session_cache_control(response, immutable)
+    return response
+
+def set_session_cache_control(response, immutable=False):
+    """
+    Set the Cache-Control of a finished session's body. Any session can still
+    be refreshed, so bodies are revalidated with their ETag (no-cache) unless
+    the URL pins the revision with `?revision=<n>`, which makes it immutable.
+    """
+    response.cache_control.public = True
+    if immutable:
+        response.cache_control.max_age = Config.HTTP_CACHE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+
+def pinned_revision_error(revision, status):
+    """
+    404 response for a URL pinning a revision (`?revision=<n>`) other than the
+    session's current one, or None if the revision matches or is not pinned.
+    """
+    if revision is None or status is None or revision == status['revision']:
+        return None
+    return jsonify({
+        'success': False,
+        'error': f"Revision {revision} of the session is not available (current revision: {status['revision']})"
+    }), 404
+
 @app.route('/')
 def index():
     """Main page with the web interface."""
@@ -59,41 +147,368 @@ def embed_guide():
     """Embedding guide and documentation."""
     return send_file('embedding_guide.html')
 
+def rejected_response(error):
+    """
+    429 response for a request shed by admission control, telling the client
+    when to retry.
+    """
+    response = jsonify({
+        'success': False,
+        'error': str(error),
+        'retry_after': error.retry_after
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def client_id(headers, remote_addr=None):
+    """
+    Identify the client a request is charged to (see QuotaManager): its API
+    key (X-API-Key, kept only as a hash), else the embedding site (Origin),
+    else its address.
+    """
+    api_key = headers.get('X-API-Key')
+    if api_key:
+        return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    origin = headers.get('Origin')
+    if origin:
+        return f'origin:{origin}'
+    return f'address:{remote_addr}'
+
+def parse_analyze_request(data):
+    """
+    Read and validate the JSON body of /api/analyze.
+    
+    Returns:
+        Dict of the process_topic() arguments plus 'async'
+    
+    Raises:
+        ValueError: with the message of the 400 response
+    """
+    if not data:
+        raise ValueError('No data provided')
+    
+    topic = data.get('topic', '').strip()
+    report_type = data.get('report_type', 'detailed')
+    include = data.get('include')
+    report_types = data.get('report_types')
+    priority = data.get('priority', 'interactive')
+    
+    if not topic:
+        raise ValueError('Topic is required')
+    
+    # Validate report type
+    if not oversight_ai.validate_report_type(report_type):
+        raise ValueError(f'Invalid report type. Available types: {oversight_ai.get_available_report_types()}')
+    
+    # Validate requested response fields (rendered artifacts are produced lazily)
+    fields = parse_fields(data.get('fields'))
+    if fields is not None:
+        oversight_ai.validate_response_fields(fields)
+    if include is not None:
+        oversight_ai.validate_include(include)
+    
+    # Validate multi-report requests (one research run, several report types)
+    if report_types is not None:
+        oversight_ai.validate_report_types(report_types)
+    
+    # Batch work only gets the capacity interactive requests leave over
+    validate_priority(priority)
+    
+    # Unknown tenants are rejected here rather than failing inside the pipeline
+    oversight_ai.validate_tenant(data.get('tenant'))
+    
+    return {
+        'topic': topic,
+        'report_type': report_type,
+        'tenant': data.get('tenant'),
+        'include': include,
+        'report_types': report_types,
+        'fields': fields,
+        'priority': priority,
+        'async': bool(data.get('async'))
+    }
+
+def parse_batch_request(data):
+    """
+    Read the JSON body of /api/analyze/batch. Topics are given as strings or
+    as {"topic": ..., "report_type": ...} objects; "report_type" at the top
+    level is the default report type.
+    
+    Returns:
+        Dict of the process_topics() arguments
+    
+    Raises:
+        ValueError: with the message of the 400 response
+    """
+    if not data:
+        raise ValueError('No data provided')
+    
+    entries = data.get('topics')
+    if not isinstance(entries, list) or not entries:
+        raise ValueError('Topics are required')
+    
+    report_type = data.get('report_type', 'detailed')
+    topics = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            topics.append((entry.get('topic'), entry.get('report_type', report_type)))
+        else:
+            topics.append((entry, report_type))
+    oversight_ai.validate_tenant(data.get('tenant'))
+    
+    return {
+        'topics': topics,
+        'tenant': data.get('tenant'),
+        'priority': data.get('priority', 'batch')
+    }
+
+def job_links(session_id, build=url_for):
+    """
+    URLs of a queued session's endpoints, for the 202 response of /api/analyze.
+    """
+    return {
+        'status_url': build('get_status', session_id=session_id),
+        'progress_url': build('stream_progress', session_id=session_id),
+        'response_url': build('get_analysis', session_id=session_id),
+        'results_url': build('get_results', session_id=session_id)
+    }
+
+def format_sse_event(event):
+    """
+    Format a progress event (or None, for a keep-alive) as a Server-Sent Event.
+    """
+    if event is None:
+        return ': keep-alive\n\n'
+    event_id, name, data = event
+    payload = oversight_ai.serializer.dumps(data).decode('utf-8')
+    return f"id: {event_id}\nevent: {name}\ndata: {payload}\n\n"
+
+def format_ndjson_line(item):
+    """
+    Format a batch result (or the batch summary) as a line of NDJSON.
+    """
+    return oversight_ai.serializer.dumps(item) + b'\n'
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_topic():
     """
     API endpoint to analyze a topic using the 3-step AI process.
+    With "async": true the topic is queued for the background workers and a
+    202 with the session id is returned right away; progress is reported by
+    /api/status/<session_id> and the results by /api/results/<session_id>.
+    Requests that would wait too long for a pipeline slot get a 429 with
+    Retry-After. "priority": "batch" marks bulk work that must not slow down
+    interactive requests.
     """
     try:
-        data = request.get_json()
-        
-        if not data:
+        try:
+            params = parse_analyze_request(request.get_json())
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'error': 'No data provided'
+                'error': str(e)
             }), 400
         
-        topic = data.get('topic', '').strip()
-        report_type = data.get('report_type', 'detailed')
+        if params['async']:
+            session_id = oversight_ai.submit_topic(
+                params['topic'], params['report_type'], params['tenant'], params['report_types'],
+                client_id(request.headers, request.remote_addr), params['priority']
+            )
+            if session_id is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Job queue is full'
+                }), 503
+            
+            links = job_links(session_id)
+            response = jsonify({
+                'success': True,
+                'session_id': session_id,
+                'status': 'queued',
+                **links
+            })
+            response.status_code = 202
+            response.headers['Location'] = links['status_url']
+            return response
+        
+        # Process the topic through the 3-step AI system
+        result = oversight_ai.process_topic(
+            params['topic'], params['report_type'], params['tenant'],
+            params['include'], params['report_types'], params['fields'],
+            client_id(request.headers, request.remote_addr), params['priority']
+        )
         
-        if not topic:
+        return jsonify(result)
+    
+    except AdmissionRejected as e:
+        return rejected_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_topics():
+    """
+    API endpoint to analyze many topics at once (see OversightAI.process_topics).
+    Topics run concurrently under one shared LLM rate limit; the response is
+    newline-delimited JSON with one line per topic as it finishes (in
+    completion order, with its index in the request) and a final summary
+    line with the throughput in topics per minute and tokens per second.
+    Rendered reports are fetched by session id. Batches are "priority":
+    "batch" work unless stated otherwise.
+    """
+    try:
+        try:
+            params = parse_batch_request(request.get_json(silent=True))
+            results = oversight_ai.process_topics(
+                params['topics'], params['tenant'], client_id(request.headers, request.remote_addr),
+                params['priority']
+            )
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'error': 'Topic is required'
+                'error': str(e)
             }), 400
         
-        # Validate report type
-        if not oversight_ai.validate_report_type(report_type):
+        response = Response(
+            stream_with_context(format_ndjson_line(result) for result in results), mimetype='application/x-ndjson'
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        # Keep reverse proxies from buffering the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    except AdmissionRejected as e:
+        return rejected_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/analyze/<session_id>')
+def get_analysis(session_id):
+    """
+    Get the /api/analyze response of a finished session, e.g. of an
+    "async": true analysis. Accepts the same `include` and `fields` as
+    /api/analyze (comma-separated). Sessions still queued or processing
+    answer 202 with their status.
+    """
+    try:
+        try:
+            include = parse_fields(request.args.get('include'))
+            fields = parse_fields(request.args.get('fields'))
+            response = oversight_ai.get_analysis_response(session_id, include, fields)
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'error': f'Invalid report type. Available types: {oversight_ai.get_available_report_types()}'
+                'error': str(e)
             }), 400
         
-        # Process the topic through the 3-step AI system
-        result = oversight_ai.process_topic(topic, report_type)
+        if response is not None:
+            return jsonify(response)
         
-        return jsonify(result)
+        status = oversight_ai.get_processing_status(session_id)
+        if status is None:
+            return jsonify({
+                'success': False,
+                'error': 'Session not found'
+            }), 404
+        if status['status'] == 'failed':
+            return jsonify({
+                'success': False,
+                'session_id': session_id,
+                'error': status.get('error'),
+                'steps_completed': status['steps_completed']
+            })
+        return jsonify({
+            'success': True,
+            'session_id': session_id,
+            'status': status
+        }), 202
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/progress/<session_id>')
+def stream_progress(session_id):
+    """
+    Stream the progress of a session as Server-Sent Events: step_started and
+    step_finished (with its duration), angle_completed for each research angle
+    (with its timing and an ETA for the remaining angles), categorization
+    (items per priority bucket), report_ready per report type, and finally
+    completed or failed. Clients reconnecting with Last-Event-ID resume after
+    the last event they received.
+    """
+    try:
+        last_event_id = request.headers.get('Last-Event-ID', 0, type=int)
+        events = oversight_ai.stream_progress(session_id, last_event_id)
+        
+        if events is None:
+            return jsonify({
+                'success': False,
+                'error': 'Session not found'
+            }), 404
         
+        response = Response(
+            stream_with_context(format_sse_event(event) for event in events), mimetype='text/event-stream'
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        # Keep reverse proxies from buffering the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/refresh/<session_id>', methods=['POST'])
+def refresh_angle(session_id):
+    """
+    Re-research one angle of a completed session.
+    Only the report sections that read changed data are regenerated.
+    
+    JSON body: {"angle": "<research angle, as listed in research_data.content>",
+                "priority": "interactive" (default) or "batch"}
+    """
+    try:
+        data = request.get_json(silent=True)
+        angle = data.get('angle') if isinstance(data, dict) else None
+        
+        if not isinstance(angle, str) or not angle:
+            return jsonify({
+                'success': False,
+                'error': 'Angle is required'
+            }), 400
+        
+        try:
+            refresh = oversight_ai.refresh_angle(
+                session_id, angle, client_id(request.headers, request.remote_addr),
+                data.get('priority', 'interactive')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if refresh is None:
+            return jsonify({
+                'success': False,
+                'error': 'Session not found'
+            }), 404
+        return jsonify({'success': True, **refresh})
+    
+    except AdmissionRejected as e:
+        return rejected_response(e)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -118,7 +533,7 @@ def get_status(session_id):
                 'success': False,
                 'error': 'Session not found'
             }), 404
-            
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -129,71 +544,154 @@ def get_status(session_id):
 def get_results(session_id):
     """
     Get the complete results for a specific session.
+    
+    Query parameters:
+        fields: Comma-separated dotted result fields to return
+            (e.g. `final_report.content,categorized_data.categorization_metadata`)
+        offset, limit: Page through research content and the priority buckets
     """
     try:
-        results = oversight_ai.get_session_results(session_id)
-        
-        if results:
+        try:
+            fields = parse_fields(request.args.get('fields'))
+            if fields is not None:
+                validate_fields(fields, oversight_ai.RESULT_FIELDS)
+            offset = request.args.get('offset', 0, type=int)
+            limit = request.args.get('limit', type=int)
+            revision = request.args.get('revision', type=int)
+            if offset < 0 or (limit is not None and limit < 0):
+                raise ValueError("offset and limit must not be negative")
+        except ValueError as e:
             return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # The session can expire between lookups, so every lookup may come back empty
+        status = oversight_ai.get_processing_status(session_id)
+        error = pinned_revision_error(revision, status)
+        if error is not None:
+            return error
+        serialized_results = None
+        view = None
+        if status is not None and fields is None and not offset and limit is None:
+            if status['status'] == 'completed':
+                # Revalidated against an ETag of the session revision before the session is loaded
+                etag = metadata_etag(session_id, status['revision'], 'results')
+                response = not_modified_response(etag, 'Accept-Encoding', immutable=revision is not None,
+                                                 encoding=request.accept_encodings.best_match(CONTENT_ENCODINGS))
+                if response is not None:
+                    return response
+            # Finished sessions are served from a precomputed JSON blob; sessions
+            # still queued or processing return their partial results
+            serialized_results = oversight_ai.get_serialized_results(session_id)
+        elif status is not None:
+            view = oversight_ai.get_session_results_view(session_id, fields, offset, limit)
+        
+        if serialized_results is not None:
+            body = b'{"success":true,"results":' + serialized_results + b'}'
+            if status['status'] == 'completed':
+                return cached_session_response((session_id, 'http', 'results', status['revision']), lambda: body,
+                                               'application/json', immutable=revision is not None, etag=etag)
+            return Response(body, mimetype='application/json')
+        elif view is not None:
+            results_view, pagination = view
+            response = {
                 'success': True,
-                'results': results
-            })
+                'results': results_view
+            }
+            if pagination:
+                response['pagination'] = pagination
+            return jsonify(response)
         else:
             return jsonify({
                 'success': False,
                 'error': 'Session not found'
             }), 404
-            
+    
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+# Download formats: format name -> (file extension, mimetype). The first entry is
+# the default when neither the URL nor the Accept header selects a format.
+DOWNLOAD_FORMATS = {
+    'markdown': ('md', 'text/markdown'),
+    'text': ('txt', 'text/plain'),
+    'html': ('html', 'text/html'),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+    'msgpack': ('msgpack', 'application/msgpack')
+}
+
 @app.route('/api/download/<session_id>')
 @app.route('/api/download/<session_id>/<format_type>')
-def download_report(session_id, format_type='markdown'):
+def download_report(session_id, format_type=None):
     """
-    Download the report for a specific session as a markdown or text file.
+    Download the report for a specific session as a markdown, text, HTML,
+    JSON Lines or MessagePack file.
+    The format comes from the URL, or else from the Accept header.
+    Reports are streamed in chunks as they are rendered, so memory stays flat
+    and the first bytes go out right away. Their ETag is derived from the
+    session revision, format and report type rather than the body, so a
+    matching If-None-Match is answered with 304 without rendering anything.
+    Multi-report sessions accept a `report_type` query parameter.
     """
     try:
+        report_type = request.args.get('report_type')
+        revision = request.args.get('revision', type=int)
+        
+        if format_type is None:
+            mimetypes = {mimetype: name for name, (_, mimetype) in DOWNLOAD_FORMATS.items()}
+            best_match = request.accept_mimetypes.best_match(list(mimetypes))
+            format_type = mimetypes.get(best_match, 'markdown')
+        
         # Default to markdown format
-        if format_type not in ['markdown', 'text']:
+        if format_type not in DOWNLOAD_FORMATS:
             format_type = 'markdown'
-            
-        report_content = oversight_ai.export_session_data(session_id, format=format_type)
+        extension, mimetype = DOWNLOAD_FORMATS[format_type]
         
-        if report_content:
-            # Create a file-like object
-            report_file = io.StringIO(report_content)
-            report_bytes = io.BytesIO(report_file.getvalue().encode('utf-8'))
+        status = oversight_ai.get_processing_status(session_id)
+        error = pinned_revision_error(revision, status)
+        if error is not None:
+            return error
+        if status is not None and status['status'] == 'completed':
+            etag = metadata_etag(session_id, status['revision'], format_type, report_type)
+            response = not_modified_response(etag, 'Accept', immutable=revision is not None)
+            if response is not None:
+                return response
             
+            try:
+                report = oversight_ai.stream_artifact(session_id, format_type, report_type)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 406
+        else:
+            # Only finished sessions have a report to download
+            report = None
+        
+        if report is not None:
             # Get session data for filename
-            results = oversight_ai.get_session_results(session_id)
+            results = oversight_ai.get_session_results(session_id) or {}
             topic = results.get('final_report', {}).get('metadata', {}).get('topic', 'report')
             
-            # Set file extension and mimetype based on format
-            if format_type == 'markdown':
-                extension = 'md'
-                mimetype = 'text/markdown'
-            else:
-                extension = 'txt'
-                mimetype = 'text/plain'
-                
-            filename = f"oversight_ai_report_{topic.replace(' ', '_')}_{session_id}.{extension}"
+            report_suffix = f"_{report_type}" if report_type else ''
+            filename = f"oversight_ai_report_{topic.replace(' ', '_')}_{session_id}{report_suffix}.{extension}"
             
-            return send_file(
-                report_bytes,
-                as_attachment=True,
-                download_name=filename,
-                mimetype=mimetype
-            )
+            response = Response(stream_with_context(report), mimetype=mimetype)
+            response.set_etag(etag)
+            set_session_cache_control(response, immutable=revision is not None)
+            response.headers.set('Content-Disposition', 'attachment', filename=filename)
+            response.vary.add('Accept')
+            return response
         else:
             return jsonify({
                 'success': False,
                 'error': 'Session not found or no report available'
             }), 404
-            
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -211,7 +709,7 @@ def get_history():
             'success': True,
             'history': history
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -229,7 +727,27 @@ def get_statistics():
             'success': True,
             'statistics': stats
         })
-        
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/usage')
+def get_usage():
+    """
+    Get the calling client's usage counters and remaining quotas.
+    Clients are identified like for quota charging (see client_id).
+    """
+    try:
+        client = client_id(request.headers, request.remote_addr)
+        return jsonify({
+            'success': True,
+            'client': client,
+            'usage': oversight_ai.quotas.usage(client)
+        })
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -247,7 +765,7 @@ def get_report_types():
             'success': True,
             'report_types': report_types
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -265,7 +783,7 @@ def clear_history():
             'success': True,
             'message': 'History cleared successfully'
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -0,0 +1,221 @@
+"""
+ASGI Entry Point for Oversight AI System
+Serves the same API as app.py from an ASGI server (e.g. `uvicorn asgi:app`).
+Analyses and progress streams run as tasks on the event loop, so one process
+can hold thousands of them open; every other route is served by the Flask
+app through a WSGI adapter.
+"""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+from app import (
+    app as flask_app, client_id, format_ndjson_line, format_sse_event, job_links, oversight_ai,
+    parse_analyze_request, parse_batch_request
+)
+from src.admission import AdmissionRejected
+
+
+# Same headers as the Flask app's after_request hook
+CORS_HEADERS = {
+    'X-Frame-Options': 'ALLOWALL',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-API-Key'
+}
+
+_urls = flask_app.url_map.bind('')
+
+
+def build_url(endpoint, **values):
+    """
+    Build the URL of a Flask route outside of a Flask request.
+    """
+    return _urls.build(endpoint, values)
+
+
+def json_response(data, status_code=200, headers=None):
+    """
+    JSON response encoded with the configured serializer, like jsonify().
+    """
+    return Response(
+        oversight_ai.serializer.dumps(data), status_code=status_code,
+        media_type='application/json', headers={**CORS_HEADERS, **(headers or {})}
+    )
+
+
+async def analyze_topic(request: Request):
+    """
+    Async version of /api/analyze. Both modes run the pipeline on the event
+    loop: "async": true analyses are started as tasks (503 once
+    ASYNC_MAX_ANALYSES are in flight), the others are awaited.
+    """
+    if request.method == 'OPTIONS':
+        # CORS preflight
+        return Response(headers=CORS_HEADERS)
+    
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        try:
+            params = parse_analyze_request(data)
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'error': str(e)
+            }, 400)
+        
+        client = client_id(request.headers, request.client.host if request.client else None)
+        if params['async']:
+            session_id = oversight_ai.submit_topic_async(
+                params['topic'], params['report_type'], params['tenant'], params['report_types'], client,
+                params['priority']
+            )
+            if session_id is None:
+                return json_response({
+                    'success': False,
+                    'error': 'Too many analyses in progress'
+                }, 503)
+            
+            links = job_links(session_id, build_url)
+            return json_response({
+                'success': True,
+                'session_id': session_id,
+                'status': 'queued',
+                **links
+            }, 202, {'Location': links['status_url']})
+        
+        # Process the topic through the 3-step AI system
+        result = await oversight_ai.process_topic_async(
+            params['topic'], params['report_type'], params['tenant'],
+            params['include'], params['report_types'], params['fields'], client, params['priority']
+        )
+        
+        return json_response(result)
+    
+    except AdmissionRejected as e:
+        return json_response({
+            'success': False,
+            'error': str(e),
+            'retry_after': e.retry_after
+        }, 429, {'Retry-After': str(e.retry_after)})
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+
+async def analyze_topics(request: Request):
+    """
+    Async version of /api/analyze/batch: the research angles of every running
+    topic are queried concurrently on the event loop.
+    """
+    if request.method == 'OPTIONS':
+        # CORS preflight
+        return Response(headers=CORS_HEADERS)
+    
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        try:
+            params = parse_batch_request(data)
+            client = client_id(request.headers, request.client.host if request.client else None)
+            results = oversight_ai.process_topics_async(
+                params['topics'], params['tenant'], client, params['priority']
+            )
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'error': str(e)
+            }, 400)
+        
+        async def format_results():
+            async for result in results:
+                yield format_ndjson_line(result)
+        
+        return StreamingResponse(format_results(), media_type='application/x-ndjson', headers={
+            **CORS_HEADERS,
+            'Cache-Control': 'no-cache',
+            # Keep reverse proxies from buffering the stream
+            'X-Accel-Buffering': 'no'
+        })
+    
+    except AdmissionRejected as e:
+        return json_response({
+            'success': False,
+            'error': str(e),
+            'retry_after': e.retry_after
+        }, 429, {'Retry-After': str(e.retry_after)})
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+
+async def stream_progress(request: Request):
+    """
+    Async version of /api/progress/<session_id>: streams the same
+    Server-Sent Events without holding a thread per stream.
+    """
+    session_id = request.path_params['session_id']
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+    
+    try:
+        events = oversight_ai.stream_progress_async(session_id, last_event_id)
+        
+        if events is None:
+            return json_response({
+                'success': False,
+                'error': 'Session not found'
+            }, 404)
+        
+        async def format_events():
+            async for event in events:
+                yield format_sse_event(event)
+        
+        return StreamingResponse(format_events(), media_type='text/event-stream', headers={
+            **CORS_HEADERS,
+            'Cache-Control': 'no-cache',
+            # Keep reverse proxies from buffering the stream
+            'X-Accel-Buffering': 'no'
+        })
+    
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+
+app = Starlette(routes=[
+    Route('/api/analyze', analyze_topic, methods=['POST', 'OPTIONS']),
+    Route('/api/analyze/batch', analyze_topics, methods=['POST', 'OPTIONS']),
+    Route('/api/progress/{session_id}', stream_progress),
+    # Everything else (pages, status, results, downloads, ...) is served by Flask
+    Mount('/', WSGIMiddleware(flask_app))
+])
+
+
+if __name__ == '__main__':
+    import uvicorn
+    from config import Config
+    
+    print("Starting Oversight AI System (ASGI)...")
+    print(f"Server will run on {Config.HOST}:{Config.PORT}")
+    uvicorn.run(app, host=Config.HOST, port=Config.PORT)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: report generation and export throughput
+Measures how many reports per second are built for each report type and how
+many reports per second the text and markdown exporters render. Runs against
+a stubbed research step, so no OpenAI API key or network access is required.
+
+Also compares refreshing one re-bucketed item (regenerating and re-rendering
+only the sections that read changed data) with a full regeneration.
+
+Usage: python benchmarks/bench_report_rendering.py [repetitions]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from unittest.mock import patch
+from config import Config
+
+with patch.object(Config, 'validate_openai_config', return_value=True):
+    from app import oversight_ai
+from test_api import fake_compile_information
+
+
+def measure(label, run, repetitions, rounds=5):
+    """Print the throughput of one rendering step (best of several rounds)."""
+    run()
+    elapsed = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            run()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"  {label:<28} {repetitions / elapsed:10,.0f} reports/s   {elapsed / repetitions * 1e6:8.1f} us/report")
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    generator = oversight_ai.report_generator
+    report_types = list(generator.report_templates)
+    
+    with patch.object(oversight_ai.research_engine, 'compile_information',
+                      side_effect=fake_compile_information):
+        response = oversight_ai.process_topic('Edge Computing', 'detailed', include=[])
+    categorized_data = oversight_ai.get_session_results(response['session_id'])['categorized_data']
+    
+    print(f"\nReport generation ({repetitions} repetitions)")
+    for report_type in report_types:
+        measure(report_type, lambda: generator.generate_report(categorized_data, report_type), repetitions)
+    
+    print(f"\nExport ({repetitions} repetitions)")
+    for report_type in report_types:
+        report = generator.generate_report(categorized_data, report_type)
+        measure(f"{report_type} text", lambda: generator.export_report_as_text(report), repetitions)
+        measure(f"{report_type} markdown", lambda: generator.export_report_as_markdown(report), repetitions)
+    
+    # One low priority item is refreshed and stays in its bucket
+    item = categorized_data['minor_information']['low_priority'][0]['content']
+    refreshed_data = oversight_ai.information_architect.recategorize_item(
+        categorized_data, {**item, 'content': item['content'] + " Refreshed."}
+    )
+    changed = generator.changed_dependencies(categorized_data, refreshed_data)
+    
+    print(f"\nRefresh of one item, generation + markdown ({repetitions} repetitions)")
+    for report_type in report_types:
+        report = generator.generate_report(categorized_data, report_type)
+        sections = generator.render_sections(report, 'markdown')
+        
+        def full():
+            generator.render_sections(generator.generate_report(refreshed_data, report_type), 'markdown')
+        
+        def incremental():
+            refreshed, invalidated = generator.refresh_report(report, refreshed_data, changed)
+            generator.render_sections(refreshed, 'markdown', sections, invalidated)
+        
+        measure(f"{report_type} full", full, repetitions)
+        measure(f"{report_type} incremental", incremental, repetitions)
+
+
+if __name__ == "__main__":
+    main()
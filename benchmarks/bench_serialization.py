@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON encode time per API response
+Compares the previous encoding path (stdlib json, as used by jsonify() and
+export_session_data) with the serializer layer and with the precomputed blobs
+served for finished sessions. Runs against a stubbed research step, so no
+OpenAI API key or network access is required.
+
+Usage: python benchmarks/bench_serialization.py [repetitions]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+from unittest.mock import patch
+from config import Config
+from src.serialization import SERIALIZERS, get_serializer, orjson
+
+with patch.object(Config, 'validate_openai_config', return_value=True):
+    from app import oversight_ai
+from test_api import fake_compile_information
+
+
+def measure(label, encode, repetitions):
+    """Print the mean time and payload size of one encoding path."""
+    payload = encode()
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        encode()
+    elapsed = (time.perf_counter() - start) / repetitions
+    print(f"  {label:<38} {elapsed * 1000:8.3f} ms   {len(payload):>9,} bytes")
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    
+    with patch.object(oversight_ai.research_engine, 'compile_information',
+                      side_effect=fake_compile_information):
+        response = oversight_ai.process_topic('Edge Computing', 'detailed',
+                                              report_types=['executive', 'detailed', 'technical', 'summary'])
+    session_id = response['session_id']
+    session_data = oversight_ai.sessions.get(session_id)
+    results = session_data['results']
+    
+    print(f"\n/api/analyze response ({repetitions} repetitions)")
+    measure("before: json.dumps (jsonify)", lambda: json.dumps(response).encode('utf-8'), repetitions)
+    for name in SERIALIZERS:
+        if name == 'orjson' and orjson is None:
+            continue
+        serializer = get_serializer(name)
+        measure(f"after: {name}", lambda: serializer.dumps(response), repetitions)
+    
+    print(f"\n/api/results/<session_id> response ({repetitions} repetitions)")
+    measure("before: json.dumps (jsonify)",
+            lambda: json.dumps({'success': True, 'results': results}).encode('utf-8'), repetitions)
+    measure(f"after: {oversight_ai.serializer.name}",
+            lambda: oversight_ai.serializer.dumps({'success': True, 'results': results}), repetitions)
+    measure("after: precomputed blob",
+            lambda: oversight_ai.get_serialized_results(session_id), repetitions)
+    
+    print(f"\nexport_session_data(format='json') ({repetitions} repetitions)")
+    measure("before: json.dumps(indent=2)",
+            lambda: json.dumps(session_data, indent=2, default=str), repetitions)
+    measure(f"after: {oversight_ai.serializer.name} (pretty)",
+            lambda: oversight_ai.serializer.dumps(session_data, pretty=True), repetitions)
+    measure("after: precomputed blob",
+            lambda: oversight_ai.export_session_data(session_id, format='json'), repetitions)
+
+
+if __name__ == "__main__":
+    main()
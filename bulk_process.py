@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Bulk processor for Oversight AI System
+Analyzes every topic of a CSV or JSONL file without interaction, writing each
+finished report to an output directory or a JSONL file. A checkpoint manifest
+records finished topics and researched angles, so a killed run resumes where
+it stopped when started again with the same arguments.
+
+Usage:
+    python bulk_process.py topics.csv --output-dir reports/
+    python bulk_process.py topics.jsonl --output reports.jsonl --format text
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import contextlib
+import csv
+import re
+import threading
+import time
+from config import Config
+from src.checkpoint import CheckpointManifest
+from src.oversight_ai import OversightAI
+from src.serialization import get_serializer
+
+
+# Report formats written per topic: format -> file extension
+REPORT_EXTENSIONS = {
+    'markdown': 'md',
+    'text': 'txt',
+    'html': 'html',
+    'jsonl': 'jsonl'
+}
+
+
+def read_topics(path, report_type='detailed'):
+    """
+    Read the (topic, report_type) pairs of a topic file.
+    
+    JSONL files (.jsonl, .ndjson) hold one topic per line, as a string or as
+    {"topic": ..., "report_type": ...}. CSV files have a "topic" column (and
+    optionally a "report_type" column) or, without a header row, the topic in
+    the first column. `report_type` is used for topics that do not name one.
+    """
+    topics = []
+    if os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson'):
+        serializer = get_serializer()
+        with open(path, encoding='utf-8') as topic_file:
+            for line in topic_file:
+                if not line.strip():
+                    continue
+                entry = serializer.loads(line)
+                if isinstance(entry, dict):
+                    topics.append((entry.get('topic') or '', entry.get('report_type') or report_type))
+                else:
+                    topics.append((str(entry), report_type))
+    else:
+        with open(path, encoding='utf-8', newline='') as topic_file:
+            rows = [row for row in csv.reader(topic_file) if row]
+        header = [column.strip().lower() for column in rows[0]] if rows else []
+        if 'topic' in header:
+            topic_column = header.index('topic')
+            type_column = header.index('report_type') if 'report_type' in header else None
+            for row in rows[1:]:
+                row_type = row[type_column].strip() if type_column is not None and len(row) > type_column else ''
+                topics.append((row[topic_column] if len(row) > topic_column else '', row_type or report_type))
+        else:
+            topics = [(row[0], report_type) for row in rows]
+    return [(topic.strip(), topic_type) for topic, topic_type in topics if topic.strip()]
+
+
+def slugify(text, max_length=60):
+    """
+    Turn a topic into a file name.
+    """
+    slug = re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+    return slug[:max_length] or 'topic'
+
+
+class ReportWriter:
+    """
+    Writes finished reports to an output directory (one file per topic) or
+    appends them to a JSONL file (one line per topic).
+    """
+    
+    def __init__(self, oversight_ai, report_format, output_dir=None, output=None):
+        self.oversight_ai = oversight_ai
+        self.report_format = report_format
+        self.output_dir = output_dir
+        self.output = output
+        self._lock = threading.Lock()
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+        elif os.path.dirname(os.path.abspath(output)):
+            os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    
+    def write(self, result):
+        """
+        Write the report of a finished topic. Returns where it was written.
+        """
+        report = self.oversight_ai.render_artifact(result['session_id'], self.report_format)
+        if self.output_dir is not None:
+            filename = f"{slugify(result['topic'])}_{result['report_type']}.{REPORT_EXTENSIONS[self.report_format]}"
+            path = os.path.join(self.output_dir, filename)
+            with open(path, 'w', encoding='utf-8') as report_file:
+                report_file.write(report)
+            return path
+        
+        line = self.oversight_ai.serializer.dumps({
+            'topic': result['topic'],
+            'report_type': result['report_type'],
+            'session_id': result['session_id'],
+            'processing_time': result['processing_time'],
+            'tokens': result['tokens'],
+            'format': self.report_format,
+            'report': report
+        }) + b'\n'
+        with self._lock, open(self.output, 'ab') as output_file:
+            output_file.write(line)
+        return self.output
+
+
+class ProgressReporter:
+    """
+    Prints the progress, throughput and ETA of a bulk run every `interval`
+    seconds, from a background thread, until stopped.
+    """
+    
+    def __init__(self, total, skipped=0, interval=10.0, stream=None):
+        self.total = total
+        self.skipped = skipped
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.completed = 0
+        self.failed = 0
+        self.tokens = 0
+        self.start_time = time.time()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='oversight-bulk-progress', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.report()
+    
+    def add(self, success, tokens=0):
+        """
+        Count a finished topic.
+        """
+        with self._lock:
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.tokens += tokens
+    
+    def get_statistics(self):
+        """
+        Get the progress of this run: topics done, throughput and ETA (seconds).
+        """
+        with self._lock:
+            elapsed = max(time.time() - self.start_time, 1e-6)
+            finished = self.completed + self.failed
+            remaining = self.total - self.skipped - finished
+            topics_per_second = finished / elapsed
+            return {
+                'done': self.skipped + finished,
+                'total': self.total,
+                'completed': self.completed,
+                'failed': self.failed,
+                'skipped': self.skipped,
+                'elapsed': elapsed,
+                'topics_per_minute': topics_per_second * 60,
+                'tokens_per_second': self.tokens / elapsed,
+                'eta': remaining / topics_per_second if topics_per_second else None
+            }
+    
+    def report(self):
+        stats = self.get_statistics()
+        eta = 'unknown' if stats['eta'] is None else format_duration(stats['eta'])
+        percent = stats['done'] / stats['total'] * 100 if stats['total'] else 100.0
+        print(
+            f"[{stats['done']}/{stats['total']}] {percent:.1f}% | {stats['failed']} failed | "
+            f"{stats['topics_per_minute']:.1f} topics/min | {stats['tokens_per_second']:.0f} tokens/s | "
+            f"elapsed {format_duration(stats['elapsed'])} | ETA {eta}",
+            file=self.stream, flush=True
+        )
+    
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.report()
+
+
+def format_duration(seconds):
+    """
+    Format seconds as H:MM:SS.
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def process_topics(oversight_ai, topics, manifest, writer, progress, concurrency=None, priority='batch'):
+    """
+    Analyze the topics not completed yet, in batches of BATCH_MAX_TOPICS,
+    writing each report and recording it in the manifest as it finishes.
+    """
+    for start in range(0, len(topics), Config.BATCH_MAX_TOPICS):
+        chunk = topics[start:start + Config.BATCH_MAX_TOPICS]
+        # Closed as soon as the loop stops (e.g. on an interrupt), so topics not started yet are dropped
+        with contextlib.closing(oversight_ai.process_topics(chunk, priority=priority,
+                                                            concurrency=concurrency)) as results:
+            for result in results:
+                if result['type'] != 'result':
+                    continue
+                key = CheckpointManifest.topic_key(*chunk[result['index']])
+                if result['success']:
+                    try:
+                        output = writer.write(result)
+                    except Exception as e:
+                        manifest.record_topic(key, 'failed', session_id=result['session_id'], error=str(e))
+                        progress.add(False)
+                        continue
+                    manifest.record_topic(key, 'completed', session_id=result['session_id'], output=output,
+                                          tokens=result['tokens'])
+                else:
+                    manifest.record_topic(key, 'failed', session_id=result.get('session_id'),
+                                          error=result['error'])
+                progress.add(result['success'], result['tokens'])
+
+
+def wait_for_workers():
+    """
+    Wait for the topics still running on batch worker threads to finish.
+    """
+    for thread in threading.enumerate():
+        if thread.name.startswith('oversight-batch'):
+            thread.join()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Analyze every topic of a CSV or JSONL file, resuming an interrupted run."
+    )
+    parser.add_argument('topics', help="CSV (topic[,report_type] columns) or JSONL file of topics")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--output-dir', help="Directory to write one report file per topic to")
+    output.add_argument('--output', help="JSONL file to append one report per line to")
+    parser.add_argument('--format', default='markdown', choices=sorted(REPORT_EXTENSIONS),
+                        help="Report format (default: markdown)")
+    parser.add_argument('--report-type', default='detailed',
+                        help="Report type of topics that do not name one (default: detailed)")
+    parser.add_argument('--checkpoint',
+                        help="Checkpoint manifest (default: manifest.jsonl in the output directory, "
+                             "or <output>.manifest.jsonl)")
+    parser.add_argument('--concurrency', type=int, default=Config.BATCH_CONCURRENCY,
+                        help=f"Topics analyzed at once (default: {Config.BATCH_CONCURRENCY})")
+    parser.add_argument('--priority', default='batch', choices=['batch', 'interactive'],
+                        help="Priority class of the analyses (default: batch)")
+    parser.add_argument('--progress-interval', type=float, default=10.0,
+                        help="Seconds between progress lines (default: 10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Run the bulk processor. Returns the exit status: 0 when every topic is
+    completed, 1 when some failed (rerun to retry them), 130 when interrupted.
+    """
+    args = parse_args(argv)
+    checkpoint = args.checkpoint or (
+        os.path.join(args.output_dir, 'manifest.jsonl') if args.output_dir else f"{args.output}.manifest.jsonl"
+    )
+    
+    # Each topic is done once per report type, even if it is listed again
+    topics = list(dict.fromkeys(read_topics(args.topics, args.report_type)))
+    manifest = CheckpointManifest(checkpoint)
+    pending = [pair for pair in topics if not manifest.is_completed(CheckpointManifest.topic_key(*pair))]
+    print(f"{len(topics)} topics, {len(topics) - len(pending)} already completed (checkpoint: {checkpoint})")
+    
+    oversight_ai = OversightAI()
+    # Angles researched before an interruption are reused instead of researched again
+    oversight_ai.research_engine.checkpoint = manifest
+    writer = ReportWriter(oversight_ai, args.format, args.output_dir, args.output)
+    progress = ProgressReporter(len(topics), len(topics) - len(pending), args.progress_interval)
+    
+    progress.start()
+    try:
+        process_topics(oversight_ai, pending, manifest, writer, progress, args.concurrency, args.priority)
+    except KeyboardInterrupt:
+        # Topics already running finish, recording the angles they research for
+        # the rerun, before the manifest is closed
+        progress.stop()
+        print("\nInterrupted. Waiting for running topics to finish...")
+        wait_for_workers()
+        manifest.close()
+        print("Run the same command again to resume.")
+        return 130
+    progress.stop()
+    manifest.close()
+    
+    stats = progress.get_statistics()
+    print(f"Done: {stats['completed']} completed, {stats['failed']} failed, {stats['skipped']} skipped")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,121 @@ class Config:
     OPENAI_MAX_TOKENS = int(os.environ.get('OPENAI_MAX_TOKENS', 2000))
     OPENAI_TEMPERATURE = float(os.environ.get('OPENAI_TEMPERATURE', 0.7))
     
+    # Information Architect Lexicon Configuration
+    LEXICON_DIR = os.environ.get('LEXICON_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'lexicons'
+    )
+    LEXICON_RELOAD_INTERVAL = float(os.environ.get('LEXICON_RELOAD_INTERVAL', 5))
+    LEXICON_CACHE_MAX_ENTRIES = int(os.environ.get('LEXICON_CACHE_MAX_ENTRIES', 256))
+    
+    # Importance Scoring Backend ('keyword' or 'tfidf')
+    SCORING_BACKEND = os.environ.get('SCORING_BACKEND', 'keyword')
+    TFIDF_STATS_PATH = os.environ.get('TFIDF_STATS_PATH', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'tfidf_document_frequency.tsv.gz'
+    ))
+    TFIDF_SNAPSHOT_INTERVAL = int(os.environ.get('TFIDF_SNAPSHOT_INTERVAL', 100))
+    TFIDF_SCORE_SCALE = float(os.environ.get('TFIDF_SCORE_SCALE', 3.0))
+    
+    # Report Type Templates
+    REPORT_TYPES_DIR = os.environ.get('REPORT_TYPES_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'report_types'
+    )
+    
+    # Priority Bucket Selection
+    TOP_K_PER_BUCKET = int(os.environ.get('TOP_K_PER_BUCKET', 5))
+    CATEGORIZATION_KEEP_FULL_LISTS = os.environ.get('CATEGORIZATION_KEEP_FULL_LISTS', 'True').lower() == 'true'
+    
+    # Rendered Artifact Cache (bytes)
+    ARTIFACT_CACHE_MAX_BYTES = int(os.environ.get('ARTIFACT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # Streamed downloads larger than this are not kept in the artifact cache
+    ARTIFACT_STREAM_CACHE_MAX_BYTES = int(os.environ.get('ARTIFACT_STREAM_CACHE_MAX_BYTES', 1024 * 1024))
+    
+    # JSON Serialization ('auto' uses orjson when installed, otherwise 'json')
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER', 'auto')
+    
+    # HTTP Caching of Finished Sessions
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 365 * 24 * 3600))
+    HTTP_COMPRESSION_MIN_BYTES = int(os.environ.get('HTTP_COMPRESSION_MIN_BYTES', 1024))
+    HTTP_GZIP_LEVEL = int(os.environ.get('HTTP_GZIP_LEVEL', 9))
+    HTTP_BROTLI_QUALITY = int(os.environ.get('HTTP_BROTLI_QUALITY', 9))
+    
+    # Session Store (least recently used sessions are evicted beyond either bound;
+    # sessions idle for SESSION_TTL seconds expire, 0 disables expiry)
+    SESSION_STORE_MAX_SESSIONS = int(os.environ.get('SESSION_STORE_MAX_SESSIONS', 1000))
+    SESSION_STORE_MAX_BYTES = int(os.environ.get('SESSION_STORE_MAX_BYTES', 256 * 1024 * 1024))
+    SESSION_TTL = float(os.environ.get('SESSION_TTL', 24 * 3600))
+    # Sessions beyond the most recently used ones are kept zlib-compressed
+    SESSION_STORE_HOT_SESSIONS = int(os.environ.get('SESSION_STORE_HOT_SESSIONS', 32))
+    SESSION_STORE_COMPRESS = os.environ.get('SESSION_STORE_COMPRESS', 'True').lower() == 'true'
+    SESSION_STORE_COMPRESSION_LEVEL = int(os.environ.get('SESSION_STORE_COMPRESSION_LEVEL', 6))
+    # Session Backend ('memory' keeps sessions in the process; 'sqlite' keeps them in a
+    # WAL-mode database shared by every worker process on the host and kept across restarts)
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'memory')
+    SESSION_DB_PATH = os.environ.get('SESSION_DB_PATH', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'sessions.db'
+    ))
+    SESSION_DB_BUSY_TIMEOUT = float(os.environ.get('SESSION_DB_BUSY_TIMEOUT', 5.0))
+    
+    # Background Jobs (POST /api/analyze with "async": true)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 4))
+    JOB_QUEUE_DEPTH = int(os.environ.get('JOB_QUEUE_DEPTH', 100))
+    
+    # Multi-Topic Batches (POST /api/analyze/batch): topics per batch, and topics of one batch run at once
+    BATCH_MAX_TOPICS = int(os.environ.get('BATCH_MAX_TOPICS', 100))
+    BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', 8))
+    
+    # Admission Control (pipelines are the requests that cost LLM calls)
+    ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT', 32))
+    ADMISSION_MAX_WAITING = int(os.environ.get('ADMISSION_MAX_WAITING', 256))
+    # Seconds a request may be expected to wait for a pipeline slot before it is rejected with a 429
+    ADMISSION_DEADLINE = float(os.environ.get('ADMISSION_DEADLINE', 60))
+    # Weight of the latest stage latency in its moving average, and the pipeline
+    # duration assumed before any stage has been measured (seconds)
+    ADMISSION_LATENCY_SMOOTHING = float(os.environ.get('ADMISSION_LATENCY_SMOOTHING', 0.2))
+    ADMISSION_DEFAULT_DURATION = float(os.environ.get('ADMISSION_DEFAULT_DURATION', 30))
+    
+    # Priority Classes ('interactive' or 'batch' work): share of pipeline slots and of the
+    # LLM rate limits held back from batch work for interactive requests
+    BATCH_RESERVE = float(os.environ.get('BATCH_RESERVE', 0.25))
+    
+    # LLM Call Scheduling (research API calls; a rate of 0 disables that limit)
+    LLM_MAX_CONCURRENT = int(os.environ.get('LLM_MAX_CONCURRENT', 32))
+    LLM_REQUESTS_PER_MINUTE = float(os.environ.get('LLM_REQUESTS_PER_MINUTE', 500))
+    LLM_TOKENS_PER_MINUTE = float(os.environ.get('LLM_TOKENS_PER_MINUTE', 1000000))
+    
+    # Per-Client Quotas (clients are identified by their X-API-Key header, else by their
+    # Origin; rates are per minute, bursts are bucket sizes, a rate of 0 disables a quota)
+    QUOTA_ANALYSES_PER_MINUTE = float(os.environ.get('QUOTA_ANALYSES_PER_MINUTE', 30))
+    QUOTA_ANALYSES_BURST = float(os.environ.get('QUOTA_ANALYSES_BURST', 60))
+    QUOTA_TOKENS_PER_MINUTE = float(os.environ.get('QUOTA_TOKENS_PER_MINUTE', 200000))
+    QUOTA_TOKENS_BURST = float(os.environ.get('QUOTA_TOKENS_BURST', 400000))
+    QUOTA_MAX_CLIENTS = int(os.environ.get('QUOTA_MAX_CLIENTS', 10000))
+    # Fair share weights of clients in the job queue, pipeline slots and LLM calls,
+    # as "client=weight,..." (default weight 1)
+    CLIENT_WEIGHTS = {
+        client.strip(): float(weight)
+        for client, weight in (
+            entry.rsplit('=', 1) for entry in os.environ.get('CLIENT_WEIGHTS', '').split(',') if '=' in entry
+        )
+    }
+    
+    # ASGI Serving (asgi.py): "async": true analyses in flight on the event loop
+    ASYNC_MAX_ANALYSES = int(os.environ.get('ASYNC_MAX_ANALYSES', 2000))
+    
+    # Progress Streams (GET /api/progress/<session_id>, seconds)
+    PROGRESS_RETENTION = float(os.environ.get('PROGRESS_RETENTION', 300))
+    PROGRESS_KEEPALIVE_INTERVAL = float(os.environ.get('PROGRESS_KEEPALIVE_INTERVAL', 15))
+    # Poll interval for sessions run by another worker process
+    PROGRESS_POLL_INTERVAL = float(os.environ.get('PROGRESS_POLL_INTERVAL', 1.0))
+    
+    # Near-Duplicate Content Elimination
+    DEDUP_ENABLED = os.environ.get('DEDUP_ENABLED', 'True').lower() == 'true'
+    DEDUP_THRESHOLD = float(os.environ.get('DEDUP_THRESHOLD', 0.8))
+    DEDUP_MODE = os.environ.get('DEDUP_MODE', 'merge')
+    DEDUP_NUM_PERM = int(os.environ.get('DEDUP_NUM_PERM', 64))
+    DEDUP_BANDS = int(os.environ.get('DEDUP_BANDS', 16))
+    DEDUP_SHINGLE_SIZE = int(os.environ.get('DEDUP_SHINGLE_SIZE', 5))
+    
     @classmethod
     def validate_openai_config(cls):
         """Validate OpenAI configuration."""
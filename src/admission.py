@@ -0,0 +1,407 @@
+"""
+Admission Control
+Caps the analysis pipelines running at once and sheds load up front: requests
+whose expected wait for a pipeline slot is past a deadline are rejected with a
+retry delay instead of piling up behind upstream rate limits.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from config import Config
+
+
+# Priority classes of pipeline work, highest first: interactive requests are
+# served before batch work (like bulk analyses), which only gets the capacity
+# left over by interactive requests
+PRIORITIES = ['interactive', 'batch']
+
+
+def validate_priority(priority: str) -> None:
+    """
+    Validate a priority class.
+    
+    Raises:
+        ValueError: if the priority class is unknown
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Invalid priority. Available priorities: {PRIORITIES}")
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is not admitted; `retry_after` is the number of
+    seconds after which a retry is expected to get a slot.
+    """
+    
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class WaitStats:
+    """
+    Queue wait times of one priority class: totals, and percentiles over the
+    most recent `samples` waits (callers hold their own lock).
+    """
+    
+    def __init__(self, samples: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self._recent = deque(maxlen=samples)
+    
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self._recent.append(seconds)
+    
+    def summary(self) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+        
+        def percentile(fraction):
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] if recent else 0.0
+        
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'max': recent[-1] if recent else 0.0
+        }
+
+
+class FairQueue:
+    """
+    Waiting requests in weighted fair queuing order across clients (callers
+    hold their own lock).
+    
+    Every request gets a virtual finish tag of max(virtual time, tag of its
+    client's previous request) + 1 / weight of the client, and the request
+    with the smallest tag is served first (see JobQueue). A client with many
+    requests waiting therefore only delays its own requests, and each client
+    gets a share of the capacity proportional to its weight; requests of one
+    client are served in FIFO order. Requests without a client share a queue.
+    """
+    
+    def __init__(self):
+        # Waiting requests as (finish tag, sequence number, client, request)
+        self._heap = []
+        self._sequence = itertools.count()
+        # Finish tag of the last waiting request of each client with requests waiting
+        self._finish_tags = {}
+        self._virtual_time = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def append(self, request: Any, client: Optional[str] = None, weight: float = 1.0) -> None:
+        finish_tag = max(self._virtual_time, self._finish_tags.get(client, 0.0)) + 1.0 / weight
+        self._finish_tags[client] = finish_tag
+        heapq.heappush(self._heap, (finish_tag, next(self._sequence), client, request))
+    
+    def peek(self) -> Any:
+        """
+        The request served next.
+        """
+        return self._heap[0][3]
+    
+    def popleft(self) -> Any:
+        """
+        Take the request served next.
+        """
+        finish_tag, _, client, request = heapq.heappop(self._heap)
+        self._virtual_time = max(self._virtual_time, finish_tag)
+        if self._finish_tags.get(client) == finish_tag:
+            # The client has no more requests waiting
+            del self._finish_tags[client]
+        return request
+    
+    def remove(self, request: Any) -> None:
+        """
+        Drop a request that gave up waiting.
+        """
+        entry = next(entry for entry in self._heap if entry[3] is request)
+        self._heap.remove(entry)
+        heapq.heapify(self._heap)
+        client = entry[2]
+        tags = self._client_tags(client)
+        if tags:
+            self._finish_tags[client] = max(tags)
+        else:
+            self._finish_tags.pop(client, None)
+    
+    def _client_tags(self, client: Optional[str]) -> List[float]:
+        return [finish_tag for finish_tag, _, waiting_client, _ in self._heap if waiting_client == client]
+
+
+class _Waiter:
+    """
+    A request waiting for a slot, woken by the thread or event loop it waits on.
+    """
+    
+    def __init__(self, priority: str = 'interactive', loop: Optional[asyncio.AbstractEventLoop] = None,
+                 client: Optional[str] = None, weight: float = 1.0):
+        self.priority = priority
+        self.client = client
+        self.weight = weight
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+        self.enqueued = time.monotonic()
+        self.granted = False
+    
+    def wake(self) -> None:
+        self.granted = True
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class AdmissionController:
+    """
+    Admission controller for analysis pipelines (the requests that cost LLM calls).
+    
+    At most `max_concurrent` pipelines hold a slot at a time; others wait per
+    priority class (see PRIORITIES), at most `max_waiting` of them. Within a
+    class, waiting requests of different clients are served in weighted fair
+    order (see FairQueue), so a client running many pipelines at once only
+    delays its own. A freed slot goes to an interactive request before any
+    batch request, and batch pipelines never hold the `batch_reserve` share of the
+    slots, which is kept for interactive requests. A request is rejected up
+    front when the wait queue is full or its expected wait is past `deadline`
+    seconds, and also when it does not get a slot within the deadline.
+    
+    The expected wait is derived from recent stage latencies: an exponentially
+    weighted moving average (EWMA) per pipeline step is kept, their sum is the
+    expected pipeline duration, and the slots drain `max_concurrent` pipelines
+    per expected duration.
+    """
+    
+    def __init__(self, max_concurrent: Optional[int] = None, max_waiting: Optional[int] = None,
+                 deadline: Optional[float] = None, smoothing: Optional[float] = None,
+                 batch_reserve: Optional[float] = None):
+        self.max_concurrent = Config.ADMISSION_MAX_CONCURRENT if max_concurrent is None else max_concurrent
+        self.max_waiting = Config.ADMISSION_MAX_WAITING if max_waiting is None else max_waiting
+        self.deadline = Config.ADMISSION_DEADLINE if deadline is None else deadline
+        self.smoothing = Config.ADMISSION_LATENCY_SMOOTHING if smoothing is None else smoothing
+        batch_reserve = Config.BATCH_RESERVE if batch_reserve is None else batch_reserve
+        # Slots batch pipelines may hold at once
+        self.batch_limit = max(1, math.floor(self.max_concurrent * (1 - batch_reserve)))
+        self._lock = threading.Lock()
+        self._waiters = {priority: FairQueue() for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._waits = {priority: WaitStats() for priority in PRIORITIES}
+        # Pipeline step -> EWMA of its duration (seconds)
+        self._latencies = {}
+        self.admitted = 0
+        self.rejected = 0
+    
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+    
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Record the duration of a pipeline stage.
+        """
+        with self._lock:
+            previous = self._latencies.get(stage)
+            if previous is None:
+                self._latencies[stage] = seconds
+            else:
+                self._latencies[stage] = previous + self.smoothing * (seconds - previous)
+    
+    def expected_duration(self) -> float:
+        """
+        Expected seconds a pipeline holds its slot.
+        """
+        with self._lock:
+            return self._expected_duration()
+    
+    def expected_wait(self, backlog: int = 0, priority: str = 'interactive') -> float:
+        """
+        Expected seconds until a new request of a priority class gets a slot,
+        with `backlog` more pipelines (e.g. queued background jobs) ahead of it.
+        """
+        with self._lock:
+            return self._expected_wait(backlog, priority)
+    
+    def check(self, backlog: int = 0, priority: str = 'interactive') -> None:
+        """
+        Reject a request that would wait past the deadline, without taking a
+        slot (e.g. before queueing a background job).
+        
+        Raises:
+            AdmissionRejected: if the expected wait is past the deadline
+        """
+        with self._lock:
+            self._check(backlog, priority)
+    
+    @contextmanager
+    def slot(self, reject: bool = True, priority: str = 'interactive', client: Optional[str] = None,
+             weight: float = 1.0) -> Iterator[None]:
+        """
+        Hold a pipeline slot, waiting for one if all are taken. With
+        reject=False (for work already accepted, like queued jobs) the request
+        waits for as long as it takes instead of being rejected.
+        
+        Args:
+            reject: Whether the request may be rejected
+            priority: The priority class of the request (see PRIORITIES)
+            client: The client the pipeline runs for
+            weight: The client's share of the slots relative to other clients
+        
+        Raises:
+            AdmissionRejected: if the request is not admitted
+        """
+        waiter = self._acquire(reject, priority, client=client, weight=weight)
+        if waiter is not None:
+            waiter.event.wait(self.deadline if reject else None)
+            self._settle(waiter)
+        try:
+            yield
+        finally:
+            self._release(priority)
+    
+    @asynccontextmanager
+    async def slot_async(self, reject: bool = True, priority: str = 'interactive', client: Optional[str] = None,
+                         weight: float = 1.0) -> AsyncIterator[None]:
+        """
+        Hold a pipeline slot like slot(), waiting on the running event loop.
+        """
+        waiter = self._acquire(reject, priority, asyncio.get_running_loop(), client, weight)
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter.event.wait(), self.deadline if reject else None)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted = waiter.granted
+                    if not granted:
+                        self._waiters[priority].remove(waiter)
+                if granted:
+                    self._release(priority)
+                raise
+            self._settle(waiter)
+        try:
+            yield
+        finally:
+            self._release(priority)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get admission statistics, with the queue wait times per priority class.
+        """
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'batch_limit': self.batch_limit,
+                'max_waiting': self.max_waiting,
+                'deadline': self.deadline,
+                'running': self.running,
+                'waiting': self._waiting(),
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'expected_duration': self._expected_duration(),
+                'expected_wait': self._expected_wait(0, 'interactive'),
+                'stage_latencies': dict(self._latencies),
+                'classes': {
+                    priority: {
+                        'running': self._running[priority],
+                        'waiting': len(self._waiters[priority]),
+                        'queue_wait': self._waits[priority].summary()
+                    }
+                    for priority in PRIORITIES
+                }
+            }
+    
+    def _acquire(self, reject: bool, priority: str, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 client: Optional[str] = None, weight: float = 1.0) -> Optional[_Waiter]:
+        """
+        Take a free slot, or queue a waiter for the next one.
+        Returns the waiter, or None if a slot was taken right away.
+        """
+        with self._lock:
+            if self._has_slot(priority) and not self._waiting_ahead(priority):
+                self._running[priority] += 1
+                self._waits[priority].add(0.0)
+                self.admitted += 1
+                return None
+            if reject:
+                if self._waiting() >= self.max_waiting:
+                    self._reject("Too many requests waiting for analysis", self._expected_wait(0, priority))
+                self._check(0, priority)
+            waiter = _Waiter(priority, loop, client, weight)
+            self._waiters[priority].append(waiter, client, weight)
+            return waiter
+    
+    def _settle(self, waiter: _Waiter) -> None:
+        """
+        Check whether a waiter got its slot, and reject it if it timed out.
+        """
+        with self._lock:
+            if waiter.granted:
+                self.admitted += 1
+                return
+            self._waiters[waiter.priority].remove(waiter)
+            self._reject("Timed out waiting for analysis capacity", self._expected_wait(0, waiter.priority))
+    
+    def _release(self, priority: str) -> None:
+        """
+        Free a slot and hand the free slots to the waiting requests in fair
+        order, interactive requests first.
+        """
+        with self._lock:
+            self._running[priority] -= 1
+            now = time.monotonic()
+            for waiting_priority in PRIORITIES:
+                waiters = self._waiters[waiting_priority]
+                while waiters and self._has_slot(waiting_priority):
+                    waiter = waiters.popleft()
+                    self._running[waiting_priority] += 1
+                    self._waits[waiting_priority].add(now - waiter.enqueued)
+                    waiter.wake()
+    
+    def _has_slot(self, priority: str) -> bool:
+        if self.running >= self.max_concurrent:
+            return False
+        return priority != 'batch' or self._running['batch'] < self.batch_limit
+    
+    def _waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+    
+    def _waiting_ahead(self, priority: str) -> int:
+        """
+        Waiting requests served before a new request of a priority class.
+        """
+        return sum(len(self._waiters[ahead]) for ahead in PRIORITIES[:PRIORITIES.index(priority) + 1])
+    
+    def _check(self, backlog: int, priority: str) -> None:
+        wait = self._expected_wait(backlog, priority)
+        if wait > self.deadline:
+            self._reject(f"Server is busy (expected wait {wait:.0f}s)", wait)
+    
+    def _reject(self, message: str, wait: float) -> None:
+        self.rejected += 1
+        raise AdmissionRejected(message, max(1, math.ceil(wait)))
+    
+    def _expected_duration(self) -> float:
+        if not self._latencies:
+            return Config.ADMISSION_DEFAULT_DURATION
+        return sum(self._latencies.values())
+    
+    def _expected_wait(self, backlog: int, priority: str) -> float:
+        ahead = self._waiting_ahead(priority) + backlog
+        if self.running + ahead < self.max_concurrent and (
+                priority != 'batch' or self._running['batch'] + ahead < self.batch_limit):
+            return 0.0
+        # Batch pipelines drain through their share of the slots only
+        slots = self.batch_limit if priority == 'batch' else self.max_concurrent
+        return self._expected_duration() * (ahead + 1) / slots
@@ -0,0 +1,135 @@
+"""
+Rendered Artifact Cache
+Memoizes rendered report artifacts per (session, format) with a byte-size bound
+and least-recently-used eviction.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+from config import Config
+
+
+# Text, binary, or sectioned artifacts: (section key, text) pieces of a
+# report export that can be spliced when single sections change
+Artifact = Union[str, bytes, Tuple[Tuple[Any, str], ...]]
+
+
+class ArtifactCache:
+    """
+    Byte-size-bounded LRU cache of rendered artifacts.
+    
+    Keys are (session_id, format) tuples. Artifacts are rendered on first access
+    through get_or_render() and served from memory afterwards; when the total size
+    exceeds `max_bytes` the least recently used artifacts are evicted. Keys are
+    also indexed by session, so invalidating a session only touches its own
+    artifacts.
+    """
+    
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = Config.ARTIFACT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # session_id -> keys of its cached artifacts
+        self._session_keys = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Artifact]:
+        """
+        Get a cached artifact and mark it as recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Hashable, artifact: Artifact) -> None:
+        """
+        Store an artifact, evicting least recently used artifacts if needed.
+        Artifacts larger than the whole cache are not stored.
+        """
+        size = self._size_of(artifact)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            
+            self._entries[key] = (artifact, size)
+            self._session_keys.setdefault(key[0], set()).add(key)
+            self.current_bytes += size
+            
+            while self.current_bytes > self.max_bytes:
+                evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+                self._forget_key(evicted_key)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def get_or_render(self, key: Hashable, render: Callable[[], Artifact]) -> Artifact:
+        """
+        Get a cached artifact, rendering and caching it on first access.
+        """
+        artifact = self.get(key)
+        if artifact is None:
+            artifact = render()
+            self.put(key, artifact)
+        return artifact
+    
+    def invalidate_session(self, session_id: str) -> None:
+        """
+        Drop every cached artifact of a session.
+        """
+        with self._lock:
+            for key in self._session_keys.pop(session_id, ()):
+                _, size = self._entries.pop(key)
+                self.current_bytes -= size
+    
+    def clear(self) -> None:
+        """
+        Drop all cached artifacts.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._session_keys.clear()
+            self.current_bytes = 0
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+    
+    def _forget_key(self, key: Hashable) -> None:
+        """
+        Remove a key from its session's key set (caller holds the lock).
+        """
+        keys = self._session_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._session_keys[key[0]]
+    
+    def _size_of(self, artifact: Artifact) -> int:
+        if isinstance(artifact, bytes):
+            return len(artifact)
+        if isinstance(artifact, tuple):
+            return sum(len(piece.encode('utf-8')) for _, piece in artifact)
+        return len(artifact.encode('utf-8'))
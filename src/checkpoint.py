@@ -0,0 +1,128 @@
+"""
+Checkpoint Manifest
+Append-only record of the progress of a bulk run (see bulk_process.py): the
+topics it finished and the research angles it completed, so a run that was
+killed resumes without repeating finished work.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional
+from .serialization import get_serializer
+
+
+class CheckpointManifest:
+    """
+    Checkpoint manifest stored as a JSONL file with one entry per line:
+    
+    - {"type": "angle", "topic": ..., "item": {...}} for every researched
+      angle (the content item returned by ResearchEngine.research_angle())
+    - {"type": "topic", "key": ..., "status": "completed" | "failed", ...}
+      for every finished topic, with the details given to record_topic()
+    
+    Entries are flushed as they are recorded, so at most the line being
+    written when the process is killed is lost; an incomplete last line is
+    skipped when the manifest is loaded. A topic recorded as failed is
+    retried by the next run.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.serializer = get_serializer()
+        self._lock = threading.Lock()
+        # (topic, angle) -> content item
+        self._angles = {}
+        # topic key -> last entry recorded for the topic
+        self._topics = {}
+        self._load()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'ab')
+    
+    @staticmethod
+    def topic_key(topic: str, report_type: str) -> str:
+        """
+        Key of a topic of the input (a topic is done once per report type).
+        """
+        return f"{report_type}:{' '.join(topic.split())}"
+    
+    def is_completed(self, key: str) -> bool:
+        """
+        Check whether a topic was completed by an earlier run.
+        """
+        with self._lock:
+            entry = self._topics.get(key)
+            return entry is not None and entry['status'] == 'completed'
+    
+    def get_angle(self, topic: str, angle: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the content item of an angle researched by an earlier run, if any.
+        """
+        with self._lock:
+            return self._angles.get((topic, angle))
+    
+    def record_angle(self, topic: str, item: Dict[str, Any]) -> None:
+        """
+        Record a researched angle of a topic.
+        """
+        with self._lock:
+            self._write({'type': 'angle', 'topic': topic, 'item': item})
+            self._angles[(topic, item['angle'])] = item
+    
+    def record_topic(self, key: str, status: str, **details: Any) -> None:
+        """
+        Record a finished topic ('completed' or 'failed') with details such as
+        its session id and output location.
+        """
+        entry = {'type': 'topic', 'key': key, 'status': status, **details}
+        with self._lock:
+            self._write(entry)
+            self._topics[key] = entry
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get the number of completed and failed topics and of researched angles.
+        """
+        with self._lock:
+            statuses = [entry['status'] for entry in self._topics.values()]
+            return {
+                'completed': statuses.count('completed'),
+                'failed': statuses.count('failed'),
+                'angles': len(self._angles)
+            }
+    
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+    
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """
+        Append an entry to the manifest file (caller holds the lock).
+        """
+        self._file.write(self.serializer.dumps(entry) + b'\n')
+        self._file.flush()
+    
+    def _load(self) -> None:
+        """
+        Read the entries of an existing manifest.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as manifest:
+            data = manifest.read()
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = self.serializer.loads(line)
+            except ValueError:
+                # Cut short when the previous run was killed
+                continue
+            if entry.get('type') == 'angle':
+                self._angles[(entry['topic'], entry['item']['angle'])] = entry['item']
+            elif entry.get('type') == 'topic':
+                self._topics[entry['key']] = entry
+        if data and not data.endswith(b'\n'):
+            # Start the next entry on a line of its own
+            with open(self.path, 'ab') as manifest:
+                manifest.write(b'\n')
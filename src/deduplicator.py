@@ -0,0 +1,260 @@
+"""
+Step 2a+: Content Deduplicator
+Detects near-duplicate research content with word shingling and MinHash so that
+overlapping passages are not categorized, stored and rendered twice.
+"""
+
+import hashlib
+import re
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from config import Config
+
+
+# Mersenne prime used for the MinHash permutations (hash values are 61-bit)
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 61) - 1
+_WORD = re.compile(r'\w+')
+
+
+class ContentDeduplicator:
+    """
+    Near-duplicate detection for research content items.
+    
+    Each item is reduced to a set of word shingles, summarized by a MinHash
+    signature and indexed with locality-sensitive hashing (LSH) bands, so every
+    new item is only compared against likely duplicates instead of all items.
+    
+    Modes:
+    - 'merge': the duplicate is removed and its angle is recorded on (a copy of)
+      the kept item under `merged_angles`. This is provenance only: the kept
+      item's content already covers the duplicate's passages, and it keeps the
+      score and bucket it was categorized with
+    - 'drop': the duplicate is removed; only its source entry records why
+    """
+    
+    MODES = ('merge', 'drop')
+    
+    def __init__(self, threshold: Optional[float] = None, num_perm: Optional[int] = None,
+                 shingle_size: Optional[int] = None, bands: Optional[int] = None,
+                 mode: Optional[str] = None):
+        self.threshold = Config.DEDUP_THRESHOLD if threshold is None else threshold
+        self.num_perm = num_perm or Config.DEDUP_NUM_PERM
+        self.shingle_size = shingle_size or Config.DEDUP_SHINGLE_SIZE
+        self.bands = bands or Config.DEDUP_BANDS
+        self.mode = mode or Config.DEDUP_MODE
+        
+        if self.mode not in self.MODES:
+            raise ValueError(f"Invalid deduplication mode. Available modes: {list(self.MODES)}")
+        if self.num_perm % self.bands != 0:
+            raise ValueError("DEDUP_NUM_PERM must be a multiple of DEDUP_BANDS")
+        self.rows_per_band = self.num_perm // self.bands
+        
+        # Deterministic permutation coefficients so signatures are stable across runs
+        self._permutations = []
+        for i in range(self.num_perm):
+            digest = hashlib.blake2b(f"minhash-{i}".encode('utf-8'), digest_size=16).digest()
+            a = int.from_bytes(digest[:8], 'big') % (_MERSENNE_PRIME - 1) + 1
+            b = int.from_bytes(digest[8:], 'big') % _MERSENNE_PRIME
+            self._permutations.append((a, b))
+    
+    def deduplicate(self, research_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Remove near-duplicate items from compiled research data.
+        
+        Args:
+            research_data: Output from ResearchEngine.compile_information()
+        
+        Returns:
+            Research data with duplicates removed and their provenance recorded
+        """
+        session = self.begin_session()
+        for item in research_data['content']:
+            session.add_item(item)
+        return session.finalize(research_data)
+    
+    def begin_session(self) -> 'DeduplicationSession':
+        """
+        Start deduplicating the items of a single research run one at a time.
+        """
+        return DeduplicationSession(self)
+    
+    def _shingles(self, text: str) -> set:
+        """
+        Get the hashed word shingles of a text.
+        """
+        words = _WORD.findall(text.lower())
+        if not words:
+            return set()
+        
+        size = min(self.shingle_size, len(words))
+        return {
+            int.from_bytes(
+                hashlib.blake2b(' '.join(words[i:i + size]).encode('utf-8'), digest_size=8).digest(),
+                'big'
+            ) & _MAX_HASH
+            for i in range(len(words) - size + 1)
+        }
+    
+    def _signature(self, shingles: set) -> Tuple[int, ...]:
+        """
+        Compute the MinHash signature of a set of hashed shingles.
+        """
+        return tuple(
+            min((a * shingle + b) % _MERSENNE_PRIME for shingle in shingles)
+            for a, b in self._permutations
+        )
+    
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        rows = self.rows_per_band
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+    
+    def _similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """
+        Estimate the Jaccard similarity of two items from their signatures.
+        """
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_perm
+
+
+class DeduplicationSession:
+    """
+    LSH index over the items of one research run.
+    
+    Items are checked as they arrive; the first occurrence of a passage is kept
+    and later near-duplicates are rejected, so deduplication can run while the
+    remaining research angles are still being compiled.
+    """
+    
+    def __init__(self, deduplicator: ContentDeduplicator):
+        self.deduplicator = deduplicator
+        self._lock = threading.Lock()
+        self._kept = []
+        self._buckets = {}
+        # id(duplicate item) -> (kept item, estimated similarity)
+        self._duplicates = {}
+    
+    def add_item(self, content_item: Dict[str, Any]) -> bool:
+        """
+        Check a content item against the items seen so far.
+        
+        Returns:
+            True if the item is kept, False if it is a near-duplicate
+        """
+        dedup = self.deduplicator
+        shingles = dedup._shingles(content_item['content'])
+        if not shingles:
+            with self._lock:
+                self._kept.append((content_item, None))
+            return True
+        
+        signature = dedup._signature(shingles)
+        band_keys = dedup._band_keys(signature)
+        
+        with self._lock:
+            best_match, best_similarity = self._best_match(signature, band_keys)
+            if best_match is not None and best_similarity >= dedup.threshold:
+                # Items are not modified: they may be shared (e.g. reused from a checkpoint)
+                self._duplicates[id(content_item)] = (best_match, best_similarity)
+                return False
+            
+            index = len(self._kept)
+            self._kept.append((content_item, signature))
+            for key in band_keys:
+                self._buckets.setdefault(key, []).append(index)
+            return True
+    
+    def match(self, content_item: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find the kept item a content item is a near-duplicate of, without
+        adding the item or recording anything (e.g. for a refreshed angle).
+        
+        Returns:
+            Tuple of (kept item, estimated similarity), or None if the item is not a duplicate
+        """
+        dedup = self.deduplicator
+        shingles = dedup._shingles(content_item['content'])
+        if not shingles:
+            return None
+        
+        signature = dedup._signature(shingles)
+        with self._lock:
+            best_match, best_similarity = self._best_match(signature, dedup._band_keys(signature))
+        if best_match is not None and best_similarity >= dedup.threshold:
+            return best_match, best_similarity
+        return None
+    
+    def _best_match(self, signature: Tuple[int, ...],
+                    band_keys: List[Tuple[int, Tuple[int, ...]]]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the most similar kept item sharing an LSH band (caller holds the lock).
+        """
+        best_match, best_similarity = None, 0.0
+        seen = set()
+        for key in band_keys:
+            for index in self._buckets.get(key, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                similarity = self.deduplicator._similarity(signature, self._kept[index][1])
+                if similarity > best_similarity:
+                    best_match, best_similarity = self._kept[index][0], similarity
+        return best_match, best_similarity
+    
+    def finalize(self, research_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply the deduplication decisions to compiled research data.
+        
+        Duplicate items are removed from the content, their source entries are
+        kept with a `duplicate_of` reference, and deduplication statistics are
+        added to the metadata. In merge mode, kept items that absorbed duplicates
+        are replaced by copies listing the duplicates' angles.
+        """
+        with self._lock:
+            duplicates = dict(self._duplicates)
+        
+        duplicate_angles = {}
+        merged_angles = {}
+        for item in research_data['content']:
+            if id(item) in duplicates:
+                kept_item, similarity = duplicates[id(item)]
+                duplicate_angles[item['angle']] = (kept_item['angle'], similarity)
+                merged_angles.setdefault(id(kept_item), []).append(item['angle'])
+        
+        content = []
+        for item in research_data['content']:
+            if id(item) in duplicates:
+                continue
+            if self.deduplicator.mode == 'merge' and id(item) in merged_angles:
+                item = {
+                    **item,
+                    'merged_angles': list(dict.fromkeys(item.get('merged_angles', []) + merged_angles[id(item)]))
+                }
+            content.append(item)
+        
+        sources = []
+        for source in research_data['sources']:
+            if source.get('query') in duplicate_angles:
+                kept_angle, similarity = duplicate_angles[source['query']]
+                source = {
+                    **source,
+                    'duplicate_of': kept_angle,
+                    'similarity': round(similarity, 3),
+                    'action': 'merged' if self.deduplicator.mode == 'merge' else 'dropped'
+                }
+            sources.append(source)
+        
+        # Totals describe the kept items only
+        metadata = dict(research_data['metadata'])
+        content_length = sum(item['word_count'] for item in content)
+        if metadata.get('content_length') and 'words_per_second' in metadata:
+            metadata['words_per_second'] = metadata['words_per_second'] * content_length / metadata['content_length']
+        metadata['total_sources'] = len(content)
+        metadata['content_length'] = content_length
+        metadata['deduplication'] = {
+            'items_in': len(research_data['content']),
+            'items_removed': len(research_data['content']) - len(content),
+            'threshold': self.deduplicator.threshold,
+            'mode': self.deduplicator.mode
+        }
+        
+        return {**research_data, 'content': content, 'sources': sources, 'metadata': metadata}
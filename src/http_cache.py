@@ -0,0 +1,93 @@
+"""
+HTTP Response Caching
+Content-hash ETags and pre-compressed variants of immutable response bodies,
+such as the results and downloads of finished sessions.
+"""
+
+import gzip
+import hashlib
+from typing import Callable, Hashable, Optional, Tuple
+from config import Config
+from .artifact_cache import ArtifactCache
+
+try:
+    import brotli
+except ImportError:  # brotli compression is optional
+    brotli = None
+
+
+# Supported content encodings, most preferred first
+CONTENT_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def content_etag(body: bytes) -> str:
+    """
+    Strong entity tag derived from a hash of the response body.
+    """
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def metadata_etag(*parts: Hashable) -> str:
+    """
+    Strong entity tag derived from what identifies a body (e.g. session id,
+    revision and format) instead of its content, for bodies streamed as they
+    are rendered.
+    """
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body with one of CONTENT_ENCODINGS.
+    """
+    if encoding == 'gzip':
+        # mtime=0 keeps the output (and therefore its ETag) deterministic
+        return gzip.compress(body, compresslevel=Config.HTTP_GZIP_LEVEL, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(body, quality=Config.HTTP_BROTLI_QUALITY)
+    raise ValueError(f"Invalid content encoding. Available encodings: {list(CONTENT_ENCODINGS)}")
+
+
+class HTTPBodyCache:
+    """
+    Memoizes the ETag and the compressed variants of immutable response bodies.
+    
+    The identity body is produced by the caller's render function (normally
+    from an already cached artifact); its hash and each compressed variant
+    are computed once and kept in the artifact cache, so repeated and
+    conditional fetches never re-hash or re-compress. Callers that derive the
+    ETag from metadata (see metadata_etag()) pass it in, so conditional
+    fetches can be answered before anything is loaded or rendered.
+    """
+    
+    def __init__(self, cache: ArtifactCache, min_compress_bytes: Optional[int] = None):
+        self.cache = cache
+        self.min_compress_bytes = (
+            Config.HTTP_COMPRESSION_MIN_BYTES if min_compress_bytes is None else min_compress_bytes
+        )
+    
+    def get(self, key: Tuple[Hashable, ...], render: Callable[[], bytes],
+            encoding: Optional[str] = None, etag: Optional[str] = None) -> Tuple[bytes, str, Optional[str]]:
+        """
+        Get a response body, its ETag and the content encoding applied.
+        
+        Args:
+            key: Cache key of the body; the first element must be the session id
+                so the entries are dropped with the session's other artifacts
+            render: Produces the uncompressed body (cheaply, from cached artifacts)
+            encoding: Preferred content encoding, or None for the identity body
+            etag: ETag of the identity body, if derived from metadata rather than its content
+            
+        Returns:
+            Tuple of (body, ETag, applied encoding or None)
+        """
+        identity = render()
+        if etag is None:
+            etag = self.cache.get_or_render(key + ('etag',), lambda: content_etag(identity))
+        
+        if encoding is None or len(identity) < self.min_compress_bytes:
+            return identity, etag, None
+        
+        body = self.cache.get_or_render(key + (encoding,), lambda: compress(identity, encoding))
+        # Each encoding is a different representation, so it gets its own strong ETag
+        return body, f"{etag}-{encoding}", encoding
@@ -0,0 +1,87 @@
+"""
+Identifiers
+Generates time-ordered, collision-free ids (ULIDs) for sessions.
+"""
+
+import os
+import threading
+import time
+
+
+# Crockford's base32 alphabet, as used by ULIDs
+ENCODING = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+RANDOM_BITS = 80
+
+
+class ULIDGenerator:
+    """
+    Generator of ULIDs: a 48-bit millisecond timestamp followed by 80 random
+    bits, written as 26 Crockford base32 characters, so ids sort by creation
+    time as plain strings.
+    
+    Ids created within the same millisecond (or while the clock steps back)
+    reuse the last timestamp and increment the random part, so ids from one
+    process are unique and strictly increasing. Processes draw their random
+    parts independently (forked children start over), so ids from different
+    processes collide only if 80 random bits do.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_time = -1
+        self._last_random = 0
+    
+    def new(self) -> str:
+        """
+        Generate a new ULID.
+        """
+        with self._lock:
+            now = int(time.time() * 1000)
+            if now <= self._last_time:
+                now = self._last_time
+                self._last_random += 1
+                if self._last_random >> RANDOM_BITS:
+                    # The random part overflowed: move on to the next millisecond
+                    now += 1
+                    self._last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), 'big')
+            else:
+                self._last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), 'big')
+            self._last_time = now
+            value = (now << RANDOM_BITS) | self._last_random
+        
+        characters = []
+        for _ in range(26):
+            characters.append(ENCODING[value & 31])
+            value >>= 5
+        return ''.join(reversed(characters))
+    
+    def reset(self) -> None:
+        """
+        Forget the last id, so the next one draws a fresh random part.
+        """
+        self._lock = threading.Lock()
+        self._last_time = -1
+        self._last_random = 0
+
+
+def ulid_timestamp(ulid: str) -> float:
+    """
+    Get the creation time (seconds since the epoch) encoded in a ULID.
+    """
+    milliseconds = 0
+    for character in ulid[:10]:
+        milliseconds = milliseconds * 32 + ENCODING.index(character)
+    return milliseconds / 1000
+
+
+_generator = ULIDGenerator()
+if hasattr(os, 'register_at_fork'):
+    # A forked worker must not continue the parent's sequence
+    os.register_at_fork(after_in_child=_generator.reset)
+
+
+def new_ulid() -> str:
+    """
+    Generate a new ULID (see ULIDGenerator).
+    """
+    return _generator.new()
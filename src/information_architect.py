@@ -3,104 +3,188 @@ Step 2b: Information Architect
 Categorizes compiled information into important and minorly important information.
 """
 
+import heapq
 import re
-from typing import Dict, List, Any, Tuple
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from config import Config
+from .lexicon import CompiledLexicon, LexiconRegistry
+from .tfidf_scorer import TfidfImportanceScorer
+
+
+# Priority buckets in descending order with their minimum importance score
+PRIORITY_THRESHOLDS = (
+    ('high_priority', 0.7),
+    ('medium_priority', 0.4),
+    ('low_priority', 0.2),
+    ('supplementary', 0.0)
+)
+
+# Top-level group each priority bucket belongs to
+BUCKET_GROUPS = {
+    'high_priority': 'important_information',
+    'medium_priority': 'important_information',
+    'low_priority': 'minor_information',
+    'supplementary': 'minor_information'
+}
 
 
 class InformationArchitect:
-    def __init__(self):
-        self.importance_keywords = {
-            'high': [
-                'fundamental', 'essential', 'critical', 'key', 'primary', 'main', 'core',
-                'significant', 'major', 'important', 'crucial', 'vital', 'central',
-                'principal', 'basic', 'foundation', 'framework', 'strategy', 'approach',
-                'methodology', 'system', 'process', 'implementation', 'benefits',
-                'advantages', 'impact', 'results', 'outcomes', 'effectiveness'
-            ],
-            'medium': [
-                'relevant', 'useful', 'helpful', 'applicable', 'practical', 'common',
-                'typical', 'standard', 'regular', 'normal', 'general', 'broad',
-                'wide', 'extensive', 'comprehensive', 'detailed', 'specific',
-                'particular', 'individual', 'unique', 'special', 'notable'
-            ],
-            'low': [
-                'minor', 'small', 'limited', 'restricted', 'narrow', 'simple',
-                'basic', 'elementary', 'preliminary', 'initial', 'introductory',
-                'supplementary', 'additional', 'extra', 'optional', 'alternative',
-                'secondary', 'supporting', 'background', 'contextual', 'historical'
-            ]
-        }
+    SCORING_BACKENDS = ('keyword', 'tfidf')
     
-    def categorize_information(self, research_data: Dict[str, Any]) -> Dict[str, Any]:
+    def __init__(self, lexicon_registry: Optional[LexiconRegistry] = None,
+                 scoring_backend: Optional[str] = None,
+                 tfidf_scorer: Optional[TfidfImportanceScorer] = None,
+                 top_k: Optional[int] = None,
+                 keep_full_lists: Optional[bool] = None):
+        # Keyword lexicons and angle weights are loaded from versioned lexicon files
+        self.lexicon_registry = lexicon_registry or LexiconRegistry()
+        
+        # Keyword scores come from plain lexicon matches or corpus-level TF-IDF
+        self.scoring_backend = scoring_backend or Config.SCORING_BACKEND
+        if self.scoring_backend not in self.SCORING_BACKENDS:
+            raise ValueError(f"Invalid scoring backend. Available backends: {list(self.SCORING_BACKENDS)}")
+        self.tfidf_scorer = None
+        if self.scoring_backend == 'tfidf':
+            self.tfidf_scorer = tfidf_scorer or TfidfImportanceScorer()
+        
+        # Each bucket keeps a bounded heap of its highest-scoring items; the full
+        # bucket lists are optional for callers that only need the top items
+        self.top_k = Config.TOP_K_PER_BUCKET if top_k is None else top_k
+        self.keep_full_lists = (
+            Config.CATEGORIZATION_KEEP_FULL_LISTS if keep_full_lists is None else keep_full_lists
+        )
+        if not self.keep_full_lists and self.top_k <= 0:
+            raise ValueError("top_k must be positive when full bucket lists are not kept")
+    
+    @property
+    def importance_keywords(self) -> Dict[str, List[str]]:
+        """
+        Importance keywords of the active default lexicon, by tier.
+        """
+        lexicon = self.lexicon_registry.get()
+        return {tier: list(keywords) for tier, keywords in lexicon.importance_keywords.items()}
+    
+    def categorize_information(self, research_data: Dict[str, Any],
+                               tenant: Optional[str] = None) -> Dict[str, Any]:
         """
         Categorize research information into important and minorly important categories.
         
         Args:
             research_data: Output from ResearchEngine.compile_information()
+            tenant: Optional tenant whose lexicon overrides should be applied
             
         Returns:
             Dict containing categorized information
         """
-        categorized_data = {
-            'topic': research_data['topic'],
-            'important_information': {
-                'high_priority': [],
-                'medium_priority': []
-            },
-            'minor_information': {
-                'low_priority': [],
-                'supplementary': []
-            },
-            'categorization_metadata': {
-                'total_items_processed': len(research_data['content']),
-                'categorization_method': 'hybrid_scoring',
-                'confidence_scores': {}
-            }
-        }
+        categorization = self.begin_categorization(research_data['topic'], tenant)
         
         # Process each content item
         for item in research_data['content']:
-            category_info = self._analyze_content_importance(item)
-            
-            # Categorize based on importance score
-            if category_info['importance_score'] >= 0.7:
-                categorized_data['important_information']['high_priority'].append({
-                    'content': item,
-                    'importance_score': category_info['importance_score'],
-                    'reasoning': category_info['reasoning'],
-                    'key_indicators': category_info['key_indicators']
-                })
-            elif category_info['importance_score'] >= 0.4:
-                categorized_data['important_information']['medium_priority'].append({
-                    'content': item,
-                    'importance_score': category_info['importance_score'],
-                    'reasoning': category_info['reasoning'],
-                    'key_indicators': category_info['key_indicators']
-                })
-            elif category_info['importance_score'] >= 0.2:
-                categorized_data['minor_information']['low_priority'].append({
-                    'content': item,
-                    'importance_score': category_info['importance_score'],
-                    'reasoning': category_info['reasoning'],
-                    'key_indicators': category_info['key_indicators']
-                })
-            else:
-                categorized_data['minor_information']['supplementary'].append({
-                    'content': item,
-                    'importance_score': category_info['importance_score'],
-                    'reasoning': category_info['reasoning'],
-                    'key_indicators': category_info['key_indicators']
-                })
+            categorization.add_item(item)
         
-        # Calculate confidence scores
-        self._calculate_confidence_scores(categorized_data)
+        return categorization.snapshot()
+    
+    def recategorize_item(self, categorized_data: Dict[str, Any], content_item: Dict[str, Any],
+                          tenant: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Re-score one content item (e.g. a refreshed research angle) and
+        re-bucket it, replacing the item of the same angle.
         
-        return categorized_data
+        Every other entry keeps its score and position, so only the buckets the
+        item leaves or enters change. Requires full bucket lists.
+        
+        Returns:
+            The updated categorized data, in the same format as categorize_information()
+        """
+        if not self.keep_full_lists:
+            raise ValueError("Recategorizing an item requires full bucket lists (CATEGORIZATION_KEEP_FULL_LISTS)")
+        
+        categorization = self.begin_categorization(categorized_data['topic'], tenant)
+        # The topic's documents are already counted in the corpus statistics
+        new_bucket, new_entry = self._build_categorized_entry(
+            content_item, categorization.lexicon, categorization.topic, update_corpus=False
+        )
+        return self._replace_item(categorization, categorized_data, content_item['angle'], new_bucket, new_entry)
     
-    def _analyze_content_importance(self, content_item: Dict[str, Any]) -> Dict[str, Any]:
+    def remove_item(self, categorized_data: Dict[str, Any], angle: str, tenant: Optional[str] = None,
+                    kept_item: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Analyze the importance of a single content item.
+        Remove the item of an angle (e.g. a refreshed angle that now duplicates
+        another one). Every other entry keeps its score and position; the entry
+        of `kept_item`'s angle, if given, gets that item as its content.
+        Requires full bucket lists.
+        
+        Returns:
+            The updated categorized data, in the same format as categorize_information()
+        """
+        if not self.keep_full_lists:
+            raise ValueError("Removing an item requires full bucket lists (CATEGORIZATION_KEEP_FULL_LISTS)")
+        
+        categorization = self.begin_categorization(categorized_data['topic'], tenant)
+        return self._replace_item(categorization, categorized_data, angle, kept_item=kept_item)
+    
+    def _replace_item(self, categorization: 'IncrementalCategorization', categorized_data: Dict[str, Any],
+                      angle: str, new_bucket: Optional[str] = None, new_entry: Optional[Dict[str, Any]] = None,
+                      kept_item: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Rebuild categorized data with the entry of an angle replaced by
+        `new_entry` (or dropped without one), keeping every other entry.
+        """
+        for bucket, group in BUCKET_GROUPS.items():
+            for entry in categorized_data[group][bucket]:
+                if entry['content']['angle'] != angle:
+                    if kept_item is not None and entry['content']['angle'] == kept_item['angle']:
+                        entry = {**entry, 'content': kept_item}
+                    categorization.add_entry(bucket, entry)
+                elif bucket == new_bucket and new_entry is not None:
+                    # Unchanged bucket: the item keeps its position
+                    categorization.add_entry(bucket, new_entry)
+                    new_entry = None
+        if new_entry is not None:
+            categorization.add_entry(new_bucket, new_entry)
+        
+        return categorization.snapshot()
+    
+    def begin_categorization(self, topic: str,
+                             tenant: Optional[str] = None) -> 'IncrementalCategorization':
+        """
+        Start an incremental categorization for a topic.
+        
+        Items can be added one at a time (e.g. as each research angle completes)
+        and a categorized snapshot can be taken at any point. The lexicon is
+        resolved once here, so a categorization never mixes lexicon versions.
+        """
+        return IncrementalCategorization(self, topic, self.lexicon_registry.get(tenant))
+    
+    def _build_categorized_entry(self, content_item: Dict[str, Any],
+                                 lexicon: Optional[CompiledLexicon] = None,
+                                 topic: str = '', update_corpus: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """
+        Score a content item and return its priority bucket and categorized entry.
+        """
+        category_info = self._analyze_content_importance(content_item, lexicon, topic, update_corpus)
+        importance_score = category_info['importance_score']
+        
+        for bucket, threshold in PRIORITY_THRESHOLDS:
+            if importance_score >= threshold:
+                break
+        
+        return bucket, {
+            'content': content_item,
+            'importance_score': importance_score,
+            'reasoning': category_info['reasoning'],
+            'key_indicators': category_info['key_indicators']
+        }
+    
+    def _analyze_content_importance(self, content_item: Dict[str, Any],
+                                    lexicon: Optional[CompiledLexicon] = None,
+                                    topic: str = '', update_corpus: bool = True) -> Dict[str, Any]:
         """
+        Analyze the importance of a single content item. With update_corpus=False
+        the item is scored without being added to the TF-IDF corpus statistics.
+        """
+        lexicon = lexicon or self.lexicon_registry.get()
         text = content_item['content'].lower()
         angle = content_item['angle'].lower()
         
@@ -111,15 +195,18 @@ class InformationArchitect:
         angle_score = 0
         
         # Keyword-based scoring
-        high_count = sum(1 for keyword in self.importance_keywords['high'] if keyword in text)
-        medium_count = sum(1 for keyword in self.importance_keywords['medium'] if keyword in text)
-        low_count = sum(1 for keyword in self.importance_keywords['low'] if keyword in text)
+        keyword_counts = lexicon.match_keywords(text)
+        high_count = keyword_counts.get('high', 0)
         
-        keyword_score = (high_count * 1.0 + medium_count * 0.6 + low_count * 0.2) / 10
+        if self.tfidf_scorer is not None:
+            keyword_score = self.tfidf_scorer.score(content_item['content'], topic, lexicon, update_corpus)
+        else:
+            keyword_score = sum(
+                count * lexicon.keyword_weights.get(tier, 0.0) for tier, count in keyword_counts.items()
+            ) / 10
         
         # Angle-based scoring (certain research angles are inherently more important)
-        important_angles = ['definition', 'key concepts', 'principles', 'benefits', 'applications']
-        angle_score = 0.8 if any(important_angle in angle for important_angle in important_angles) else 0.3
+        angle_score = lexicon.angle_weight(angle)
         
         # Length-based scoring (longer content might be more comprehensive)
         word_count = content_item['word_count']
@@ -149,7 +236,7 @@ class InformationArchitect:
         key_indicators = []
         if high_count > 0:
             key_indicators.append(f"Contains {high_count} high-importance keywords")
-        if any(important_angle in angle for important_angle in ['definition', 'key concepts', 'principles']):
+        if lexicon.is_fundamental_angle(angle):
             key_indicators.append("Covers fundamental concepts")
         if word_count > 100:
             key_indicators.append("Comprehensive content length")
@@ -179,28 +266,25 @@ class InformationArchitect:
         else:
             return "Supplementary information that provides additional context."
     
-    def _calculate_confidence_scores(self, categorized_data: Dict[str, Any]) -> None:
+    def _confidence_from_counts(self, bucket_counts: Dict[str, int], total_items: int) -> Dict[str, Any]:
         """
-        Calculate confidence scores for the categorization process.
+        Derive confidence scores from per-bucket item counts.
         """
-        total_items = categorized_data['categorization_metadata']['total_items_processed']
-        
-        high_priority_count = len(categorized_data['important_information']['high_priority'])
-        medium_priority_count = len(categorized_data['important_information']['medium_priority'])
-        low_priority_count = len(categorized_data['minor_information']['low_priority'])
-        supplementary_count = len(categorized_data['minor_information']['supplementary'])
+        if total_items == 0:
+            return {
+                'overall_confidence': 0.0,
+                'distribution': {bucket: 0.0 for bucket in BUCKET_GROUPS}
+            }
         
         # Calculate distribution confidence (good distribution indicates reliable categorization)
-        distribution_balance = 1.0 - abs(0.25 - (high_priority_count / total_items)) * 2
+        distribution_balance = 1.0 - abs(0.25 - (bucket_counts['high_priority'] / total_items)) * 2
         distribution_balance = max(0.0, min(1.0, distribution_balance))
         
-        categorized_data['categorization_metadata']['confidence_scores'] = {
+        return {
             'overall_confidence': distribution_balance,
             'distribution': {
-                'high_priority': high_priority_count / total_items,
-                'medium_priority': medium_priority_count / total_items,
-                'low_priority': low_priority_count / total_items,
-                'supplementary': supplementary_count / total_items
+                bucket: bucket_counts[bucket] / total_items
+                for bucket in BUCKET_GROUPS
             }
         }
     
@@ -209,10 +293,13 @@ class InformationArchitect:
         Generate a summary of the categorization results.
         """
         topic = categorized_data['topic']
-        high_count = len(categorized_data['important_information']['high_priority'])
-        medium_count = len(categorized_data['important_information']['medium_priority'])
-        low_count = len(categorized_data['minor_information']['low_priority'])
-        supp_count = len(categorized_data['minor_information']['supplementary'])
+        bucket_counts = categorized_data['categorization_metadata'].get('bucket_counts') or {
+            bucket: len(categorized_data[group][bucket]) for bucket, group in BUCKET_GROUPS.items()
+        }
+        high_count = bucket_counts['high_priority']
+        medium_count = bucket_counts['medium_priority']
+        low_count = bucket_counts['low_priority']
+        supp_count = bucket_counts['supplementary']
         
         confidence = categorized_data['categorization_metadata']['confidence_scores']['overall_confidence']
         
@@ -232,4 +319,156 @@ Distribution Analysis:
 - Minor Information: {low_count + supp_count} items ({((low_count + supp_count) / (high_count + medium_count + low_count + supp_count) * 100):.1f}%)
 """
         
-        return summary
\ No newline at end of file
+        return summary
+
+
+class IncrementalCategorization:
+    """
+    Categorization of a single topic that is built up one item at a time.
+    
+    Each added item is scored and placed in its priority bucket immediately, and
+    the bucket counts and confidence scores are updated in constant time, so the
+    categorization is complete as soon as the last research angle arrives.
+    
+    Every bucket also keeps a min-heap of its `top_k` highest-scoring items, so
+    the best items are available in O(n log k) without sorting whole buckets.
+    Snapshots list them under 'top_indices' as positions in the bucket lists,
+    best first, so no item is stored twice.
+    """
+    
+    def __init__(self, architect: InformationArchitect, topic: str, lexicon: CompiledLexicon):
+        self.architect = architect
+        self.topic = topic
+        self.lexicon = lexicon
+        self._lock = threading.Lock()
+        self._bucket_counts = {bucket: 0 for bucket in BUCKET_GROUPS}
+        self._top_heaps = {bucket: [] for bucket in BUCKET_GROUPS}
+        self._sequence = 0
+        self._categorized_data = {
+            'topic': topic,
+            'important_information': {
+                'high_priority': [],
+                'medium_priority': []
+            },
+            'minor_information': {
+                'low_priority': [],
+                'supplementary': []
+            },
+            'categorization_metadata': {
+                'total_items_processed': 0,
+                'categorization_method': (
+                    'hybrid_tfidf_scoring' if architect.tfidf_scorer is not None else 'hybrid_scoring'
+                ),
+                'lexicon_version': lexicon.version,
+                'confidence_scores': architect._confidence_from_counts(self._bucket_counts, 0)
+            }
+        }
+    
+    def add_item(self, content_item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score a content item and add it to its priority bucket.
+        
+        Args:
+            content_item: A single entry of ResearchEngine research_data['content']
+            
+        Returns:
+            The categorized entry, including the bucket it was placed in
+        """
+        # Scoring happens outside the lock so readers are never blocked on it
+        bucket, entry = self.architect._build_categorized_entry(content_item, self.lexicon, self.topic)
+        self.add_entry(bucket, entry)
+        return {'bucket': bucket, **entry}
+    
+    def add_entry(self, bucket: str, entry: Dict[str, Any]) -> None:
+        """
+        Add an already scored entry to a priority bucket.
+        """
+        with self._lock:
+            items = self._categorized_data[BUCKET_GROUPS[bucket]][bucket]
+            if self.architect.keep_full_lists:
+                items.append(entry)
+            self._bucket_counts[bucket] += 1
+            self._push_top_item(bucket, entry, len(items) - 1)
+            
+            metadata = self._categorized_data['categorization_metadata']
+            metadata['total_items_processed'] += 1
+            metadata['confidence_scores'] = self.architect._confidence_from_counts(
+                self._bucket_counts, metadata['total_items_processed']
+            )
+    
+    def _push_top_item(self, bucket: str, entry: Dict[str, Any], index: int) -> None:
+        """
+        Offer an entry, at `index` of its full bucket list, to the bucket's
+        bounded top-k heap (caller holds the lock).
+        """
+        top_k = self.architect.top_k
+        if top_k <= 0:
+            return
+        
+        # Ties are broken in favour of earlier items, matching a stable sort
+        self._sequence += 1
+        heap_item = (entry['importance_score'], -self._sequence, index, entry)
+        heap = self._top_heaps[bucket]
+        if len(heap) < top_k:
+            heapq.heappush(heap, heap_item)
+        elif heap_item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, heap_item)
+    
+    def get_top_items(self, bucket: str) -> List[Dict[str, Any]]:
+        """
+        Get a bucket's highest-scoring items, best first.
+        """
+        with self._lock:
+            return self._sorted_top_items(bucket)
+    
+    def _sorted_top_items(self, bucket: str) -> List[Dict[str, Any]]:
+        return [entry for _, _, _, entry in sorted(self._top_heaps[bucket], reverse=True)]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the categorized data as it stands, in the same format as
+        InformationArchitect.categorize_information().
+        """
+        with self._lock:
+            data = self._categorized_data
+            metadata = data['categorization_metadata']
+            if self.architect.keep_full_lists:
+                buckets = {
+                    bucket: list(data[group][bucket]) for bucket, group in BUCKET_GROUPS.items()
+                }
+                top_indices = {
+                    bucket: [index for _, _, index, _ in sorted(self._top_heaps[bucket], reverse=True)]
+                    for bucket in BUCKET_GROUPS
+                }
+            else:
+                # The buckets hold just the top items, best first
+                buckets = {bucket: self._sorted_top_items(bucket) for bucket in BUCKET_GROUPS}
+                top_indices = {bucket: list(range(len(items))) for bucket, items in buckets.items()}
+            
+            return {
+                'topic': data['topic'],
+                'important_information': {
+                    'high_priority': buckets['high_priority'],
+                    'medium_priority': buckets['medium_priority']
+                },
+                'minor_information': {
+                    'low_priority': buckets['low_priority'],
+                    'supplementary': buckets['supplementary']
+                },
+                'top_indices': top_indices,
+                'categorization_metadata': {
+                    **metadata,
+                    'bucket_counts': dict(self._bucket_counts),
+                    'confidence_scores': {
+                        'overall_confidence': metadata['confidence_scores']['overall_confidence'],
+                        'distribution': dict(metadata['confidence_scores']['distribution'])
+                    }
+                }
+            }
+    
+    def get_bucket_counts(self) -> Dict[str, int]:
+        """
+        Get the number of items currently in each priority bucket.
+        """
+        with self._lock:
+            return dict(self._bucket_counts)
@@ -0,0 +1,182 @@
+"""
+Job Queue
+Runs submitted jobs on a bounded pool of background worker threads, so
+long-running pipelines do not hold a request thread.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from config import Config
+from .admission import PRIORITIES, WaitStats
+
+
+class JobQueue:
+    """
+    Bounded queue of jobs served by a fixed pool of worker threads.
+    
+    Jobs are served in weighted fair queuing order across clients: every job
+    gets a virtual finish tag of max(virtual time, tag of its client's
+    previous job) + 1 / weight of the client, and workers take the job with
+    the smallest tag. A client queueing many jobs therefore only delays its
+    own jobs, and each client gets a share of the workers proportional to its
+    weight; jobs of one client run in FIFO order. Fair queuing applies
+    within a priority class (see PRIORITIES): workers take every queued
+    interactive job before any batch job.
+    
+    At most `max_depth` jobs wait in the queue; submit() rejects new jobs while
+    it is full instead of blocking. Workers are started on the first submit().
+    """
+    
+    def __init__(self, workers: Optional[int] = None, max_depth: Optional[int] = None):
+        self.workers = Config.JOB_WORKERS if workers is None else workers
+        self.max_depth = Config.JOB_QUEUE_DEPTH if max_depth is None else max_depth
+        self._condition = threading.Condition()
+        # Queued jobs as (priority rank, finish tag, sequence number, client, job, queued at);
+        # a job of None stops a worker
+        self._heap = []
+        self._sequence = itertools.count()
+        # Finish tag of the last queued job of each client with jobs in the queue
+        self._finish_tags = {}
+        self._virtual_time = 0.0
+        self._queued = 0
+        self._queued_by_priority = {priority: 0 for priority in PRIORITIES}
+        self._waits = {priority: WaitStats() for priority in PRIORITIES}
+        self._unfinished = 0
+        self._threads = []
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+    
+    def submit(self, job: Callable[[], Any], client: Optional[str] = None, weight: float = 1.0,
+               priority: str = 'interactive') -> bool:
+        """
+        Queue a job to run on a worker thread.
+        
+        Args:
+            job: The job to run
+            client: The client the job runs for (jobs without one share a queue)
+            weight: The client's share of the workers relative to other clients
+            priority: The priority class of the job (see PRIORITIES)
+        
+        Returns:
+            False if the queue is full and the job was rejected
+        """
+        self._start_workers()
+        with self._condition:
+            if self._queued >= self.max_depth:
+                with self._lock:
+                    self.rejected += 1
+                return False
+            finish_tag = max(self._virtual_time, self._finish_tags.get(client, 0.0)) + 1.0 / weight
+            self._finish_tags[client] = finish_tag
+            heapq.heappush(self._heap, (PRIORITIES.index(priority), finish_tag, next(self._sequence),
+                                        client, job, time.monotonic()))
+            self._queued += 1
+            self._queued_by_priority[priority] += 1
+            self._unfinished += 1
+            self._condition.notify()
+        with self._lock:
+            self.submitted += 1
+        return True
+    
+    def join(self) -> None:
+        """
+        Wait until every submitted job has finished.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._unfinished == 0)
+    
+    def shutdown(self) -> None:
+        """
+        Stop the workers once the queued jobs have run.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        with self._condition:
+            for _ in threads:
+                heapq.heappush(self._heap, (len(PRIORITIES), float('inf'), next(self._sequence), None, None, 0.0))
+            self._condition.notify_all()
+        for thread in threads:
+            thread.join()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get queue usage statistics, with the queue wait times per priority class.
+        """
+        with self._condition:
+            classes = {
+                priority: {
+                    'queued': self._queued_by_priority[priority],
+                    'queue_wait': self._waits[priority].summary()
+                }
+                for priority in PRIORITIES
+            }
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_depth': self.max_depth,
+                'queued': self._queued,
+                'running': self.running,
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'failed': self.failed,
+                'classes': classes
+            }
+    
+    def _start_workers(self) -> None:
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work, name=f'oversight-job-worker-{len(self._threads)}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+    
+    def _next_job(self) -> Optional[Callable[[], Any]]:
+        """
+        Wait for the queued job with the smallest finish tag and take it.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._heap)
+            rank, finish_tag, _, client, job, queued_at = heapq.heappop(self._heap)
+            if job is not None:
+                priority = PRIORITIES[rank]
+                self._queued -= 1
+                self._queued_by_priority[priority] -= 1
+                self._waits[priority].add(time.monotonic() - queued_at)
+                # Interactive jobs may have run ahead of batch jobs with smaller tags
+                self._virtual_time = max(self._virtual_time, finish_tag)
+                if self._finish_tags.get(client) == finish_tag:
+                    # The client has no more queued jobs
+                    del self._finish_tags[client]
+            return job
+    
+    def _work(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            with self._lock:
+                self.running += 1
+            failed = False
+            try:
+                job()
+            except Exception as e:
+                print(f"Job failed: {str(e)}")
+                failed = True
+            with self._lock:
+                self.running -= 1
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+            with self._condition:
+                self._unfinished -= 1
+                self._condition.notify_all()
@@ -0,0 +1,235 @@
+"""
+Importance Lexicon
+Loads the Information Architect's keyword lexicons and angle weights from versioned
+files, with per-tenant overrides, and compiles them into matcher indexes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from config import Config
+
+
+_TENANT_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class CompiledLexicon:
+    """
+    Immutable, precompiled form of a lexicon specification.
+    
+    All keywords are matched in a single regex pass over the text. The pattern
+    prefers the longest keyword at each position, and every keyword that is a
+    prefix of the match is implied by it, so the counts are identical to testing
+    each keyword with `keyword in text`.
+    """
+    
+    def __init__(self, spec: Dict[str, Any], version: str):
+        self.version = version
+        self.importance_keywords = {
+            tier: tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+            for tier, keywords in spec['importance_keywords'].items()
+        }
+        self.keyword_weights = dict(spec.get('keyword_weights', {}))
+        self.angle_weights = tuple(
+            (pattern.lower(), float(weight)) for pattern, weight in spec.get('angle_weights', {}).items()
+        )
+        self.default_angle_weight = float(spec.get('default_angle_weight', 0.3))
+        self.fundamental_angles = tuple(angle.lower() for angle in spec.get('fundamental_angles', []))
+        
+        # Keyword -> tiers it belongs to (a keyword may appear in several tiers)
+        self._tiers = {}
+        for tier, keywords in self.importance_keywords.items():
+            for keyword in keywords:
+                self._tiers.setdefault(keyword, []).append(tier)
+        
+        # Keyword -> all keywords that are a prefix of it (including itself)
+        self._implied = {
+            keyword: tuple(other for other in self._tiers if keyword.startswith(other))
+            for keyword in self._tiers
+        }
+        
+        keywords = sorted(self._tiers, key=len, reverse=True)
+        self._pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(keyword) for keyword in keywords) + '))'
+        ) if keywords else None
+    
+    def match_keywords(self, text: str) -> Dict[str, int]:
+        """
+        Count the distinct keywords of each tier that occur in the (lowercased) text.
+        """
+        counts = {tier: 0 for tier in self.importance_keywords}
+        if self._pattern is None:
+            return counts
+        
+        found = set()
+        for match in self._pattern.finditer(text):
+            found.update(self._implied[match.group(1)])
+        
+        for keyword in found:
+            for tier in self._tiers[keyword]:
+                counts[tier] += 1
+        return counts
+    
+    def angle_weight(self, angle: str) -> float:
+        """
+        Get the importance weight of a (lowercased) research angle.
+        """
+        weights = [weight for pattern, weight in self.angle_weights if pattern in angle]
+        return max(weights) if weights else self.default_angle_weight
+    
+    def is_fundamental_angle(self, angle: str) -> bool:
+        """
+        Check whether a (lowercased) research angle covers fundamental concepts.
+        """
+        return any(pattern in angle for pattern in self.fundamental_angles)
+
+
+class LexiconRegistry:
+    """
+    Loads lexicon files and keeps one compiled lexicon active per tenant.
+    
+    Lexicon files are re-checked at most every `reload_interval` seconds. When a
+    file changes, the new version is compiled and swapped in with a single
+    reference assignment, so requests already holding a lexicon keep using it.
+    Compiled lexicons are cached by content (the `max_compiled` most recently
+    used versions), so a version is compiled only once while it is in use.
+    A changed file that cannot be loaded (malformed, or caught half written) is
+    reported and the previous lexicon stays active until the file changes again.
+    """
+    
+    DEFAULT_FILE = 'default.json'
+    TENANT_DIR = 'tenants'
+    
+    def __init__(self, lexicon_dir: Optional[str] = None, reload_interval: Optional[float] = None,
+                 max_compiled: Optional[int] = None):
+        self.lexicon_dir = lexicon_dir or Config.LEXICON_DIR
+        self.reload_interval = (
+            Config.LEXICON_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        )
+        self.max_compiled = Config.LEXICON_CACHE_MAX_ENTRIES if max_compiled is None else max_compiled
+        
+        self._lock = threading.Lock()
+        # tenant -> (file signature, compiled lexicon, last check time)
+        self._active = {}
+        # content fingerprint -> compiled lexicon, least recently used first
+        self._compiled = OrderedDict()
+    
+    def get(self, tenant: Optional[str] = None) -> CompiledLexicon:
+        """
+        Get the active compiled lexicon for a tenant (or the default lexicon).
+        """
+        if tenant is not None and not _TENANT_NAME.match(tenant):
+            raise ValueError(f"Invalid tenant name: {tenant!r}")
+        
+        entry = self._active.get(tenant)
+        now = time.monotonic()
+        if entry is not None and now - entry[2] < self.reload_interval:
+            return entry[1]
+        
+        with self._lock:
+            entry = self._active.get(tenant)
+            signature = self._file_signature(tenant)
+            if entry is not None and entry[0] == signature:
+                self._active[tenant] = (signature, entry[1], now)
+                return entry[1]
+            
+            try:
+                compiled = self._load(tenant)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                if entry is None:
+                    raise
+                # A broken or half-written file must not take the tenant down: keep
+                # serving the active lexicon until the file changes again
+                print(f"Error reloading lexicon for tenant {tenant!r}, keeping version "
+                      f"{entry[1].version}: {str(e)}")
+                self._active[tenant] = (signature, entry[1], now)
+                return entry[1]
+            self._active[tenant] = (signature, compiled, now)
+            return compiled
+    
+    def tenants(self) -> List[str]:
+        """
+        Get the names of the tenants that have a lexicon override file.
+        """
+        try:
+            names = os.listdir(os.path.join(self.lexicon_dir, self.TENANT_DIR))
+        except FileNotFoundError:
+            return []
+        return sorted(
+            name[:-len('.json')] for name in names
+            if name.endswith('.json') and _TENANT_NAME.match(name[:-len('.json')])
+        )
+    
+    def reload(self) -> None:
+        """
+        Force every tenant's lexicon to be re-checked on next access.
+        """
+        with self._lock:
+            self._active = {
+                tenant: (None, compiled, 0.0) for tenant, (_, compiled, _) in self._active.items()
+            }
+    
+    def _paths(self, tenant: Optional[str]) -> Tuple[str, ...]:
+        default_path = os.path.join(self.lexicon_dir, self.DEFAULT_FILE)
+        if tenant is None:
+            return (default_path,)
+        return (default_path, os.path.join(self.lexicon_dir, self.TENANT_DIR, f"{tenant}.json"))
+    
+    def _file_signature(self, tenant: Optional[str]) -> Tuple:
+        signature = []
+        for path in self._paths(tenant):
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+        return tuple(signature)
+    
+    def _load(self, tenant: Optional[str]) -> CompiledLexicon:
+        paths = self._paths(tenant)
+        
+        with open(paths[0], 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        versions = [str(spec.get('version', '0'))]
+        
+        # Tenant overrides are optional; tenants without a file use the default lexicon
+        if len(paths) > 1 and os.path.exists(paths[1]):
+            with open(paths[1], 'r', encoding='utf-8') as f:
+                override = json.load(f)
+            spec = self._merge(spec, override)
+            versions.append(f"{tenant}:{override.get('version', '0')}")
+        
+        fingerprint = hashlib.sha256(
+            json.dumps([versions, spec], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        
+        compiled = self._compiled.get(fingerprint)
+        if compiled is None:
+            compiled = CompiledLexicon(spec, '+'.join(versions))
+            self._compiled[fingerprint] = compiled
+            # Lexicons still active for a tenant stay referenced by self._active
+            while len(self._compiled) > self.max_compiled:
+                self._compiled.popitem(last=False)
+        else:
+            self._compiled.move_to_end(fingerprint)
+        return compiled
+    
+    def _merge(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge a tenant override into a base spec. Mapping values are merged one
+        level deep (e.g. a single keyword tier can be replaced); others replace.
+        """
+        merged = dict(base)
+        for key, value in override.items():
+            if key == 'version':
+                continue
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                merged[key] = {**base[key], **value}
+            else:
+                merged[key] = value
+        return merged
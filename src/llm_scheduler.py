@@ -0,0 +1,249 @@
+"""
+LLM Call Scheduling
+Priority scheduling of the LLM calls made by the research engine: calls for
+interactive requests go ahead of queued batch calls, batch calls only get the
+request and token rate left over after a reserve kept for interactive work, and
+calls of different clients share the capacity by their weights.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+from config import Config
+from .admission import PRIORITIES, FairQueue, WaitStats
+from .quotas import TokenBucket
+
+# Priority class of the pipeline making LLM calls (set by OversightAI for each session)
+current_priority: ContextVar[str] = ContextVar('current_priority', default='interactive')
+# Client of the pipeline making LLM calls and its fair share weight (set like current_priority)
+current_client: ContextVar[Tuple[Optional[str], float]] = ContextVar('current_client', default=(None, 1.0))
+
+# Longest a waiting call sleeps before checking the rate limits again
+_MAX_POLL = 1.0
+
+
+class _Call:
+    """
+    An LLM call waiting for (or holding) capacity. The caller sets
+    `tokens_used` once the actual usage is known, so the difference to the
+    estimate is given back to the token budget.
+    """
+    
+    def __init__(self, priority: str, tokens: int, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 client: Optional[str] = None, weight: float = 1.0):
+        self.priority = priority
+        self.tokens = tokens
+        self.client = client
+        self.weight = weight
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.tokens_used = None
+    
+    def wake(self) -> None:
+        self.granted = True
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class LLMScheduler:
+    """
+    Scheduler for LLM calls across all running pipelines.
+    
+    A call takes one request from a requests-per-minute budget and its
+    estimated tokens from a tokens-per-minute budget (both token buckets
+    holding up to a minute's worth), and at most `max_concurrent` calls run at
+    once. Calls that do not fit wait per priority class (see PRIORITIES), in
+    weighted fair order across the clients of the pipelines making them (see
+    FairQueue and current_client); whenever capacity frees up, waiting
+    interactive calls are served before any batch call. Batch calls must also leave the
+    `batch_reserve` share of both budgets and of the concurrent calls
+    unused, so an interactive request arriving during a bulk run is never
+    queued behind batch work. A rate of 0 disables that budget.
+    """
+    
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_concurrent: Optional[int] = None, batch_reserve: Optional[float] = None):
+        self.requests_per_minute = (Config.LLM_REQUESTS_PER_MINUTE
+                                    if requests_per_minute is None else requests_per_minute)
+        self.tokens_per_minute = Config.LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.max_concurrent = Config.LLM_MAX_CONCURRENT if max_concurrent is None else max_concurrent
+        self.batch_reserve = Config.BATCH_RESERVE if batch_reserve is None else batch_reserve
+        self.batch_limit = max(1, int(self.max_concurrent * (1 - self.batch_reserve)))
+        now = time.monotonic()
+        self._request_bucket = (TokenBucket(self.requests_per_minute / 60, self.requests_per_minute, now)
+                                if self.requests_per_minute else None)
+        self._token_bucket = (TokenBucket(self.tokens_per_minute / 60, self.tokens_per_minute, now)
+                              if self.tokens_per_minute else None)
+        self._lock = threading.Lock()
+        self._waiting = {priority: FairQueue() for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._waits = {priority: WaitStats() for priority in PRIORITIES}
+        self._calls = {priority: 0 for priority in PRIORITIES}
+    
+    @contextmanager
+    def call(self, tokens: int, priority: Optional[str] = None) -> Iterator[_Call]:
+        """
+        Hold capacity for an LLM call estimated to use `tokens` tokens, waiting
+        until the call fits. The priority class defaults to that of the
+        current pipeline (see current_priority), and the call is queued for
+        the pipeline's client (see current_client).
+        """
+        call = self._enqueue(tokens, priority)
+        while True:
+            with self._lock:
+                self._dispatch()
+                if call.granted:
+                    break
+                timeout = self._poll_timeout()
+            call.event.wait(timeout)
+        try:
+            yield call
+        finally:
+            self._release(call)
+    
+    @asynccontextmanager
+    async def call_async(self, tokens: int, priority: Optional[str] = None) -> AsyncIterator[_Call]:
+        """
+        Hold capacity for an LLM call like call(), waiting on the running event loop.
+        """
+        call = self._enqueue(tokens, priority, asyncio.get_running_loop())
+        try:
+            while True:
+                with self._lock:
+                    self._dispatch()
+                    if call.granted:
+                        break
+                    timeout = self._poll_timeout()
+                try:
+                    await asyncio.wait_for(call.event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = call.granted
+                if not granted:
+                    self._waiting[call.priority].remove(call)
+            if granted:
+                self._release(call)
+            raise
+        try:
+            yield call
+        finally:
+            self._release(call)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get scheduling statistics, with the queue wait times per priority class.
+        """
+        with self._lock:
+            self._refill()
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'tokens_per_minute': self.tokens_per_minute,
+                'max_concurrent': self.max_concurrent,
+                'batch_reserve': self.batch_reserve,
+                'requests_available': (int(self._request_bucket.level)
+                                       if self._request_bucket is not None else None),
+                'tokens_available': int(self._token_bucket.level) if self._token_bucket is not None else None,
+                'classes': {
+                    priority: {
+                        'calls': self._calls[priority],
+                        'running': self._running[priority],
+                        'waiting': len(self._waiting[priority]),
+                        'queue_wait': self._waits[priority].summary()
+                    }
+                    for priority in PRIORITIES
+                }
+            }
+    
+    def _enqueue(self, tokens: int, priority: Optional[str],
+                 loop: Optional[asyncio.AbstractEventLoop] = None) -> _Call:
+        client, weight = current_client.get()
+        call = _Call(current_priority.get() if priority is None else priority, tokens, loop, client, weight)
+        with self._lock:
+            self._waiting[call.priority].append(call, client, weight)
+        return call
+    
+    def _release(self, call: _Call) -> None:
+        """
+        Free the capacity of a finished call, giving back tokens it was
+        estimated to use but did not, and start the calls that now fit.
+        """
+        with self._lock:
+            self._running[call.priority] -= 1
+            if self._token_bucket is not None and call.tokens_used is not None:
+                self._token_bucket.level = min(self._token_bucket.capacity,
+                                               self._token_bucket.level + call.tokens - call.tokens_used)
+            self._dispatch()
+    
+    def _dispatch(self) -> None:
+        """
+        Start waiting calls in priority and fair order for as long as they
+        fit; a call that does not fit holds back every call behind it (caller
+        holds the lock).
+        """
+        self._refill()
+        now = time.monotonic()
+        for priority in PRIORITIES:
+            waiting = self._waiting[priority]
+            while waiting:
+                call = waiting.peek()
+                if not self._fits(call):
+                    return
+                waiting.popleft()
+                if self._request_bucket is not None:
+                    self._request_bucket.level -= 1
+                if self._token_bucket is not None:
+                    self._token_bucket.level -= call.tokens
+                self._running[priority] += 1
+                self._calls[priority] += 1
+                self._waits[priority].add(now - call.enqueued)
+                call.wake()
+    
+    def _fits(self, call: _Call) -> bool:
+        batch = call.priority == 'batch'
+        if sum(self._running.values()) >= self.max_concurrent:
+            return False
+        if batch and self._running['batch'] >= self.batch_limit:
+            return False
+        for bucket, amount in ((self._request_bucket, 1), (self._token_bucket, call.tokens)):
+            if bucket is None or bucket.level >= bucket.capacity:
+                # A full budget takes any call, even one larger than the reserve allows
+                continue
+            reserve = bucket.capacity * self.batch_reserve if batch else 0
+            if bucket.level - amount < reserve:
+                return False
+        return True
+    
+    def _poll_timeout(self) -> Optional[float]:
+        """
+        Seconds until the first waiting call may fit the refilled budgets, or
+        None if it waits for a running call to finish (caller holds the lock).
+        """
+        for priority in PRIORITIES:
+            if self._waiting[priority]:
+                call = self._waiting[priority].peek()
+                break
+        else:
+            return None
+        wait = 0.0
+        for bucket, amount in ((self._request_bucket, 1), (self._token_bucket, call.tokens)):
+            if bucket is not None:
+                reserve = bucket.capacity * self.batch_reserve if call.priority == 'batch' else 0
+                # Waiting until the bucket is full is enough for any call
+                needed = min(amount + reserve, bucket.capacity)
+                wait = max(wait, bucket.wait_time(needed))
+        return min(wait, _MAX_POLL) if wait > 0 else None
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        for bucket in (self._request_bucket, self._token_bucket):
+            if bucket is not None:
+                bucket.refill(now)
@@ -3,12 +3,37 @@ Oversight AI System - Main Controller
 Orchestrates the 3-step AI process for topic research and report generation.
 """
 
-from typing import Dict, Any, Optional, List
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, List, Tuple, Union
+import asyncio
+import contextlib
 import time
+from config import Config
 from .research_engine import ResearchEngine
+from .deduplicator import ContentDeduplicator
 from .information_architect import InformationArchitect
-from .report_generator import ReportGenerator
+from .report_generator import SECTIONED_FORMATS, ReportGenerator, encode_chunks
+from .artifact_cache import ArtifactCache
+from .serialization import get_serializer
+from .http_cache import HTTPBodyCache
+from .result_views import paginate, select_fields, validate_fields
+from .session_store import SessionStore
+from .sqlite_session_store import SQLiteSessionStore
+from .job_queue import JobQueue
+from .progress import TERMINAL_EVENTS, ProgressBroker
+from .identifiers import new_ulid
+from .admission import AdmissionController, AdmissionRejected, validate_priority
+from .quotas import QuotaExceeded, QuotaManager
+from .llm_scheduler import current_client, current_priority
+
+
+# Session processed by the calling thread (or asyncio task), so pipelines
+# running concurrently in one process never see each other's session
+_current_session: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_session', default=None)
+
+# Yielded by _poll_progress(sleep=False) when the caller should wait before the next poll
+_POLL_WAIT = object()
 
 
 class OversightAI:
@@ -19,67 +44,645 @@ class OversightAI:
     1. Topic Input: User provides a topic for research
     2. Information Processing:
        a. Compile Information: In-depth research on the topic
+          (near-duplicate content is removed as it arrives)
        b. Categorize Text: Information architect categorizes importance
     3. Output Generation: Generate final informative report
     """
     
+    # Response fields that can be requested from process_topic(), mapped to the
+    # rendered artifact format behind them ('final_report' is the report itself)
+    RESPONSE_ARTIFACTS = {
+        'final_report': None,
+        'research_summary': 'research_summary',
+        'categorization_summary': 'categorization_summary',
+        'text_report': 'text',
+        'markdown_report': 'markdown',
+        'html_report': 'html'
+    }
+    # Artifact formats rendered from a single report (one per report type of a session)
+    REPORT_FORMATS = ('text', 'markdown', 'html', 'jsonl', 'msgpack')
+    # Response fields that are always returned, even with a sparse field selection
+    RESPONSE_BASE_FIELDS = ('success', 'session_id', 'topic', 'report_type', 'report_types', 'processing_time')
+    
+    # Top-level fields of session results, and the result lists that can be paginated
+    RESULT_FIELDS = ('validated_topic', 'research_data', 'categorized_data', 'final_report', 'final_reports')
+    PAGINATED_RESULTS = (
+        'research_data.content',
+        'research_data.sources',
+        'categorized_data.important_information.high_priority',
+        'categorized_data.important_information.medium_priority',
+        'categorized_data.minor_information.low_priority',
+        'categorized_data.minor_information.supplementary'
+    )
+    
+    # Pipeline steps, in order, as recorded in a session's steps_completed
+    PIPELINE_STEPS = ('topic_input', 'information_compilation', 'information_categorization', 'report_generation')
+    
+    # Session store backends (see Config.SESSION_BACKEND)
+    SESSION_BACKENDS = {
+        'memory': SessionStore,
+        'sqlite': SQLiteSessionStore
+    }
+    
     def __init__(self):
+        if Config.SESSION_BACKEND not in self.SESSION_BACKENDS:
+            raise ValueError(f"Invalid session backend. Available backends: {list(self.SESSION_BACKENDS)}")
+        
         self.research_engine = ResearchEngine()
+        self.deduplicator = ContentDeduplicator() if Config.DEDUP_ENABLED else None
         self.information_architect = InformationArchitect()
         self.report_generator = ReportGenerator()
+        self.serializer = get_serializer()
+        
+        # Rendered artifacts are produced on first access and memoized per
+        # (session, format, report type, revision); renderers receive the session results
+        # and the selected report. Text and markdown exports are kept as
+        # sections, so refreshed sessions only re-render the changed sections
+        self.artifact_cache = ArtifactCache()
+        # ETags and compressed variants of finished sessions' HTTP responses
+        self.http_cache = HTTPBodyCache(self.artifact_cache)
+        self.artifact_renderers = {
+            'research_summary': lambda results, report: self.research_engine.get_research_summary(
+                results['research_data']
+            ),
+            'categorization_summary': lambda results, report: self.information_architect.get_categorization_summary(
+                results['categorized_data']
+            ),
+            'text': lambda results, report: self.report_generator.render_sections(report, 'text'),
+            'markdown': lambda results, report: self.report_generator.render_sections(report, 'markdown'),
+            'html': lambda results, report: self.report_generator.export_report_as_html(report),
+            'jsonl': lambda results, report: self.report_generator.export_report_as_jsonl(report),
+            'msgpack': lambda results, report: self.report_generator.export_report_as_msgpack(report),
+            # Serialized results of a finished session, reused by repeated fetches
+            'results_json': lambda results, report: self.serializer.dumps(results)
+        }
+        # Generator-based renderers used to stream large artifacts without building them in memory
+        self.artifact_streamers = {
+            'text': self.report_generator.iter_report_as_text,
+            'markdown': self.report_generator.iter_report_as_markdown,
+            'html': self.report_generator.iter_report_as_html,
+            'jsonl': self.report_generator.iter_report_as_jsonl
+        }
         
-        self.processing_history = []
-        self.current_session = None
+        # Finished sessions by id; evicted sessions take their cached artifacts with them
+        self.sessions = self.SESSION_BACKENDS[Config.SESSION_BACKEND](
+            on_evict=self.artifact_cache.invalidate_session
+        )
+        # Caps the pipelines running at once and rejects requests that would wait too long
+        self.admission = AdmissionController()
+        # Per-client analysis and LLM token quotas, and fair share weights
+        self.quotas = QuotaManager()
+        # Background workers running topics submitted with submit_topic()
+        self.jobs = JobQueue()
+        # Event loop tasks running topics submitted with submit_topic_async()
+        self._async_jobs = set()
+        # Progress events of the sessions run by this process
+        self.progress = ProgressBroker()
+    
+    @property
+    def current_session(self) -> Optional[Dict[str, Any]]:
+        """
+        The session being processed by the calling thread or task, if any.
+        """
+        return _current_session.get()
     
-    def process_topic(self, topic: str, report_type: str = 'detailed') -> Dict[str, Any]:
+    def process_topic(self, topic: str, report_type: str = 'detailed',
+                      tenant: Optional[str] = None,
+                      include: Optional[List[str]] = None,
+                      report_types: Optional[List[str]] = None,
+                      fields: Optional[List[str]] = None,
+                      client: Optional[str] = None,
+                      priority: str = 'interactive') -> Dict[str, Any]:
         """
         Execute the complete 3-step AI process for a given topic.
         
         Args:
             topic (str): The research topic
             report_type (str): Type of report to generate
-            
+            tenant (str): Optional tenant whose lexicon overrides should be used
+            include (list): Response fields to render and return (see
+                RESPONSE_ARTIFACTS); defaults to all of them. Anything not
+                included can be rendered later with render_artifact().
+            report_types (list): Generate several report types from a single
+                research and categorization run. Overrides report_type (the
+                first entry becomes the session's primary report), and the
+                report fields of the response are returned per type under 'reports'.
+            fields (list): Sparse selection of dotted response field paths
+                (e.g. 'final_report.content.key_points'). Only the artifacts
+                these paths need are rendered unless include is also given.
+            client (str): Optional client (API key or embedding origin) charged
+                against its quotas (see QuotaManager)
+            priority (str): 'interactive', or 'batch' for bulk work that only
+                gets the pipeline slots and LLM capacity interactive requests
+                leave over
+        
         Returns:
             Dict containing the complete processing results
+        
+        Raises:
+            AdmissionRejected: if no pipeline slot is expected to free up in
+                time, or the client is out of quota (QuotaExceeded)
+        """
+        report_type, include = self._validate_request(report_type, include, report_types, fields, priority)
+        with self._charge_quota(client), self.admission.slot(priority=priority, client=client,
+                                                             weight=self.quotas.weight(client)):
+            session_data = self._start_session(topic, report_type, tenant, client, priority)
+            return self._run_session(session_data, include, report_types, fields)
+    
+    async def process_topic_async(self, topic: str, report_type: str = 'detailed',
+                                  tenant: Optional[str] = None,
+                                  include: Optional[List[str]] = None,
+                                  report_types: Optional[List[str]] = None,
+                                  fields: Optional[List[str]] = None,
+                                  client: Optional[str] = None,
+                                  priority: str = 'interactive') -> Dict[str, Any]:
+        """
+        Execute the complete 3-step AI process for a topic on the running event
+        loop (see process_topic() for the arguments and response). The research
+        angles are queried concurrently through the async OpenAI client, so an
+        analysis holds no thread while it waits on the API.
+        """
+        report_type, include = self._validate_request(report_type, include, report_types, fields, priority)
+        with self._charge_quota(client):
+            async with self.admission.slot_async(priority=priority, client=client, weight=self.quotas.weight(client)):
+                session_data = self._start_session(topic, report_type, tenant, client, priority)
+                return await self._run_session_async(session_data, include, report_types, fields)
+    
+    def submit_topic(self, topic: str, report_type: str = 'detailed',
+                     tenant: Optional[str] = None,
+                     report_types: Optional[List[str]] = None,
+                     client: Optional[str] = None,
+                     priority: str = 'interactive') -> Optional[str]:
+        """
+        Queue a topic for processing by the background job workers.
+        
+        The session is stored right away with status 'queued'; its progress
+        (see get_processing_status) and results are then fetched by id.
+        Artifacts are not rendered up front but on first access. Jobs of
+        different clients share the workers fairly, and queued interactive
+        jobs run before batch jobs (see JobQueue).
+        
+        Returns:
+            The session id, or None if the job queue is full
+        
+        Raises:
+            AdmissionRejected: if the queued jobs are not expected to be done
+                in time, or the client is out of quota (QuotaExceeded)
+        """
+        report_type, _ = self._validate_request(report_type, None, report_types, priority=priority)
+        with self._charge_quota(client):
+            self.admission.check(self._jobs_ahead(priority), priority)
+        session_data = self._start_session(topic, report_type, tenant, client, priority, status='queued')
+        
+        def run():
+            with self.admission.slot(reject=False, priority=priority, client=client,
+                                     weight=self.quotas.weight(client)):
+                result = self._run_session(session_data, [], report_types)
+            if not result['success']:
+                raise RuntimeError(result['error'])
+        
+        if not self.jobs.submit(run, client, self.quotas.weight(client), priority):
+            self.quotas.refund(client)
+            self.sessions.discard(session_data['session_id'])
+            # Channels are only pruned once finished, so a rejected session's must be dropped
+            self.progress.close(session_data['session_id'])
+            return None
+        return session_data['session_id']
+    
+    def submit_topic_async(self, topic: str, report_type: str = 'detailed',
+                           tenant: Optional[str] = None,
+                           report_types: Optional[List[str]] = None,
+                           client: Optional[str] = None,
+                           priority: str = 'interactive') -> Optional[str]:
+        """
+        Queue a topic like submit_topic(), but run it as a task on the running
+        event loop instead of on a worker thread. At most ASYNC_MAX_ANALYSES
+        of these analyses are in flight at a time.
+        
+        Returns:
+            The session id, or None if too many analyses are in flight
+        
+        Raises:
+            AdmissionRejected: if the waiting analyses are not expected to be done
+                in time, or the client is out of quota (QuotaExceeded)
+        """
+        report_type, _ = self._validate_request(report_type, None, report_types, priority=priority)
+        if len(self._async_jobs) >= Config.ASYNC_MAX_ANALYSES:
+            return None
+        with self._charge_quota(client):
+            self.admission.check(priority=priority)
+        session_data = self._start_session(topic, report_type, tenant, client, priority, status='queued')
+        
+        async def run():
+            async with self.admission.slot_async(reject=False, priority=priority, client=client,
+                                                 weight=self.quotas.weight(client)):
+                await self._run_session_async(session_data, [], report_types)
+        
+        task = asyncio.get_running_loop().create_task(run())
+        # The loop only keeps weak references to tasks
+        self._async_jobs.add(task)
+        task.add_done_callback(self._async_jobs.discard)
+        return session_data['session_id']
+    
+    def process_topics(self, topics: List[Tuple[str, str]], tenant: Optional[str] = None,
+                       client: Optional[str] = None, priority: str = 'batch',
+                       concurrency: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze many topics at once, yielding each topic's result as it finishes.
+        
+        Up to `concurrency` (BATCH_CONCURRENCY) topics run at a time, each in
+        its own pipeline slot; the LLM calls of all of them share the research
+        engine's rate limits (see LLMScheduler). Every result is the
+        process_topic() response without rendered artifacts (those are
+        rendered on first access by session id), plus 'type': 'result', the
+        topic's 'index' in `topics` and the LLM 'tokens' it used. A final
+        'type': 'summary' item reports the aggregate throughput.
+        
+        The client is charged one analysis per topic as the topic starts, so a
+        batch larger than the client's quota burst runs as far as the quota
+        allows; topics it is out of quota for fail with 'retry_after'.
+        
+        Args:
+            topics (list): (topic, report_type) pairs
+            priority (str): Priority class of the analyses (bulk work by default)
+        
+        Raises:
+            ValueError: if a topic or report type is invalid, or there are too many topics
+            AdmissionRejected: if the server is too busy, or the client is out
+                of quota for even one topic (QuotaExceeded)
+        """
+        topics = self._validate_topics(topics, priority)
+        # The first topic is charged up front; the others as they start
+        with self._charge_quota(client):
+            self.admission.check(priority=priority)
+        concurrency = Config.BATCH_CONCURRENCY if concurrency is None else concurrency
+        
+        def results():
+            start_time = time.time()
+            outcomes = []
+            executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(topics))),
+                                          thread_name_prefix='oversight-batch')
+            
+            def run(index, topic, report_type):
+                with self.admission.slot(reject=False, priority=priority, client=client,
+                                         weight=self.quotas.weight(client)):
+                    rejection = self._charge_batch_topic(client, index, topic, report_type) if index else None
+                    if rejection is not None:
+                        return rejection
+                    session_data = self._start_session(topic, report_type, tenant, client, priority)
+                    return self._batch_result(index, session_data, self._run_session(session_data, []))
+            
+            futures = [executor.submit(run, index, *pair) for index, pair in enumerate(topics)]
+            try:
+                for future in as_completed(futures):
+                    outcomes.append(future.result())
+                    yield outcomes[-1]
+                yield self._batch_summary(outcomes, start_time)
+            finally:
+                # Topics not started yet when the caller stops reading (e.g. the client
+                # went away) are dropped; only the first one was charged before starting
+                cancelled = [future.cancel() for future in futures]
+                self.quotas.refund(client, int(cancelled[0]))
+                executor.shutdown(wait=False)
+        
+        return results()
+    
+    def process_topics_async(self, topics: List[Tuple[str, str]], tenant: Optional[str] = None,
+                             client: Optional[str] = None, priority: str = 'batch',
+                             concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze many topics like process_topics(), on the running event loop.
+        The research angles of all running topics are queried concurrently.
+        """
+        topics = self._validate_topics(topics, priority)
+        with self._charge_quota(client):
+            self.admission.check(priority=priority)
+        concurrency = Config.BATCH_CONCURRENCY if concurrency is None else concurrency
+        
+        async def results():
+            start_time = time.time()
+            outcomes = []
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+            
+            async def run(index, topic, report_type):
+                session_data = None
+                # The first topic was charged when the batch was admitted
+                charged = index == 0
+                try:
+                    async with semaphore, self.admission.slot_async(reject=False, priority=priority, client=client,
+                                                                    weight=self.quotas.weight(client)):
+                        if not charged:
+                            rejection = self._charge_batch_topic(client, index, topic, report_type)
+                            if rejection is not None:
+                                return rejection
+                            charged = True
+                        session_data = self._start_session(topic, report_type, tenant, client, priority)
+                        result = await self._run_session_async(session_data, [])
+                        return self._batch_result(index, session_data, result)
+                except asyncio.CancelledError:
+                    if charged and session_data is None:
+                        self.quotas.refund(client)
+                    raise
+            
+            tasks = [asyncio.ensure_future(run(index, *pair)) for index, pair in enumerate(topics)]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    outcomes.append(await task)
+                    yield outcomes[-1]
+                yield self._batch_summary(outcomes, start_time)
+            finally:
+                # Topics still running when the caller stops reading are cancelled;
+                # the analyses of those not started yet are given back
+                for task in tasks:
+                    task.cancel()
+        
+        return results()
+    
+    def _validate_topics(self, topics: List[Tuple[str, str]], priority: str) -> List[Tuple[str, str]]:
+        """
+        Validate the (topic, report_type) pairs of a batch.
+        
+        Returns:
+            The pairs with their topics stripped
+        """
+        validate_priority(priority)
+        if not topics:
+            raise ValueError("At least one topic is required")
+        if len(topics) > Config.BATCH_MAX_TOPICS:
+            raise ValueError(f"Too many topics. At most {Config.BATCH_MAX_TOPICS} topics per batch")
+        validated = []
+        for topic, report_type in topics:
+            if not isinstance(topic, str) or not topic.strip():
+                raise ValueError("Topic is required")
+            if not self.validate_report_type(report_type):
+                raise ValueError(f"Invalid report type. Available types: {self.get_available_report_types()}")
+            validated.append((topic.strip(), report_type))
+        return validated
+    
+    def _charge_batch_topic(self, client: Optional[str], index: int, topic: str,
+                            report_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge a client for a topic of a batch as it starts.
+        
+        Returns:
+            None if the topic may run, else its failed result
+        """
+        try:
+            self.quotas.admit(client)
+        except QuotaExceeded as e:
+            return {
+                'type': 'result',
+                'index': index,
+                'topic': topic,
+                'report_type': report_type,
+                'success': False,
+                'session_id': None,
+                'error': str(e),
+                'retry_after': e.retry_after,
+                'tokens': 0
+            }
+        return None
+    
+    def _batch_result(self, index: int, session_data: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the result of one topic of a batch.
+        """
+        research_data = session_data['results'].get('research_data') or {}
+        return {
+            'type': 'result',
+            'index': index,
+            'topic': session_data['topic'],
+            'report_type': session_data['report_type'],
+            **result,
+            'tokens': sum(item.get('tokens', 0) for item in research_data.get('content', []))
+        }
+    
+    def _batch_summary(self, outcomes: List[Dict[str, Any]], start_time: float) -> Dict[str, Any]:
+        """
+        Build the aggregate throughput of a finished batch.
         """
-        session_id = f"session_{int(time.time())}"
+        elapsed = max(time.time() - start_time, 1e-6)
+        tokens = sum(outcome['tokens'] for outcome in outcomes)
+        return {
+            'type': 'summary',
+            'topics': len(outcomes),
+            'succeeded': sum(1 for outcome in outcomes if outcome['success']),
+            'failed': sum(1 for outcome in outcomes if not outcome['success']),
+            'tokens': tokens,
+            'elapsed': elapsed,
+            'topics_per_minute': len(outcomes) * 60 / elapsed,
+            'tokens_per_second': tokens / elapsed
+        }
+    
+    def _validate_request(self, report_type: str, include: Optional[List[str]] = None,
+                          report_types: Optional[List[str]] = None,
+                          fields: Optional[List[str]] = None,
+                          priority: str = 'interactive') -> tuple:
+        """
+        Validate the arguments of process_topic().
         
-        # Initialize session
+        Returns:
+            Tuple of (primary report type, artifacts to include)
+        """
+        validate_priority(priority)
+        if fields is not None:
+            self.validate_response_fields(fields)
+            if include is None:
+                include = self._include_for_fields(fields)
+        if include is not None:
+            self.validate_include(include)
+        if report_types is not None:
+            self.validate_report_types(report_types)
+            report_type = report_types[0]
+        return report_type, include
+    
+    def _jobs_ahead(self, priority: str) -> int:
+        """
+        Queued background jobs that run before a new job of a priority class.
+        """
+        classes = self.jobs.get_statistics()['classes']
+        if priority == 'batch':
+            return sum(queued['queued'] for queued in classes.values())
+        return classes['interactive']['queued']
+    
+    @contextlib.contextmanager
+    def _charge_quota(self, client: Optional[str], analyses: int = 1) -> Iterator[None]:
+        """
+        Charge a client for analyses, and refund them if admission control
+        then rejects the request.
+        """
+        self.quotas.admit(client, analyses)
+        try:
+            yield
+        except AdmissionRejected:
+            self.quotas.refund(client, analyses)
+            raise
+    
+    def _start_session(self, topic: str, report_type: str, tenant: Optional[str] = None,
+                       client: Optional[str] = None, priority: str = 'interactive',
+                       status: str = 'processing') -> Dict[str, Any]:
+        """
+        Create and store a new session.
+        """
         session_data = {
-            'session_id': session_id,
+            'session_id': f"session_{new_ulid()}",
             'topic': topic,
             'report_type': report_type,
+            'tenant': tenant,
+            'client': client,
+            'priority': priority,
             'start_time': time.time(),
+            'status': status,
             'steps_completed': [],
             'results': {}
         }
+        self.progress.open(session_data['session_id'])
+        self._checkpoint(session_data)
+        return session_data
+    
+    def _checkpoint(self, session_data: Dict[str, Any]) -> None:
+        """
+        Store a snapshot of an unfinished session, so its status and partial
+        results can be read while the pipeline keeps updating it.
+        """
+        self.sessions.put({
+            **session_data,
+            'steps_completed': list(session_data['steps_completed']),
+            'results': dict(session_data['results'])
+        })
+    
+    def _run_session(self, session_data: Dict[str, Any], include: Optional[List[str]] = None,
+                     report_types: Optional[List[str]] = None,
+                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run the pipeline for a started session (see process_topic() for the
+        arguments), storing its progress after every step.
+        """
+        pipeline = self._pipeline(session_data, include, report_types, fields)
+        try:
+            request = next(pipeline)
+            while True:
+                try:
+                    research_data = self.research_engine.compile_information(*request)
+                except Exception as e:
+                    request = pipeline.throw(e)
+                else:
+                    request = pipeline.send(research_data)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            # Unwind the pipeline on this thread if the research step was interrupted
+            pipeline.close()
+    
+    async def _run_session_async(self, session_data: Dict[str, Any], include: Optional[List[str]] = None,
+                                 report_types: Optional[List[str]] = None,
+                                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run the pipeline for a started session like _run_session(), with the
+        research step awaited on the running event loop.
+        """
+        pipeline = self._pipeline(session_data, include, report_types, fields)
+        try:
+            request = next(pipeline)
+            while True:
+                try:
+                    research_data = await self.research_engine.compile_information_async(*request)
+                except asyncio.CancelledError:
+                    # Record the session as failed before giving up
+                    with contextlib.suppress(StopIteration):
+                        pipeline.throw(RuntimeError("Processing was cancelled"))
+                    raise
+                except Exception as e:
+                    request = pipeline.throw(e)
+                else:
+                    request = pipeline.send(research_data)
+        except StopIteration as stop:
+            return stop.value
+    
+    def _pipeline(self, session_data: Dict[str, Any], include: Optional[List[str]] = None,
+                  report_types: Optional[List[str]] = None,
+                  fields: Optional[List[str]] = None):
+        """
+        The pipeline steps of a session, independent of how research is done:
+        yields (validated topic, on_item callback) once, expects the compiled
+        research data to be sent back (or the research error to be thrown in),
+        and returns the process_topic() response.
+        """
+        session_id = session_data['session_id']
+        topic = session_data['topic']
+        report_type = session_data['report_type']
+        tenant = session_data['tenant']
         
-        self.current_session = session_data
+        if session_data['status'] != 'processing':
+            session_data['status'] = 'processing'
+            self._checkpoint(session_data)
         
+        token = _current_session.set(session_data)
+        # LLM calls of the pipeline are scheduled by its priority class and client
+        priority_token = current_priority.set(session_data.get('priority', 'interactive'))
+        client_token = current_client.set((session_data['client'], self.quotas.weight(session_data['client'])))
         try:
             # Step 1: Topic Input (validation and preparation)
             print(f"Step 1: Processing topic input - '{topic}'")
+            step_started = self._start_step(session_data, 'topic_input')
             validated_topic = self._validate_and_prepare_topic(topic)
-            session_data['steps_completed'].append('topic_input')
             session_data['results']['validated_topic'] = validated_topic
+            self._finish_step(session_data, 'topic_input', step_started)
             
             # Step 2a: Compile Information
+            # Each angle is categorized as soon as it arrives (Step 2b runs alongside)
             print("Step 2a: Compiling information...")
-            research_data = self.research_engine.compile_information(validated_topic)
-            session_data['steps_completed'].append('information_compilation')
+            step_started = self._start_step(session_data, 'information_compilation')
+            categorization = self.information_architect.begin_categorization(validated_topic, tenant)
+            deduplication = self.deduplicator.begin_session() if self.deduplicator else None
+            total_angles = len(self.research_engine.get_research_angles(validated_topic))
+            completed_angles = []
+            
+            def on_item(item):
+                self.quotas.charge_tokens(session_data['client'], item.get('tokens', 0))
+                kept = deduplication is None or deduplication.add_item(item)
+                if kept:
+                    categorization.add_item(item)
+                completed_angles.append(item['angle'])
+                elapsed = time.time() - step_started
+                self.progress.publish(session_id, 'angle_completed', {
+                    'angle': item['angle'],
+                    'index': len(completed_angles),
+                    'total': total_angles,
+                    'word_count': item['word_count'],
+                    'processing_time': item.get('processing_time', 0),
+                    'duplicate': not kept,
+                    # Seconds until the remaining angles are done, at the pace so far
+                    'eta': elapsed / len(completed_angles) * max(total_angles - len(completed_angles), 0)
+                })
+            
+            research_data = yield validated_topic, on_item
+            if deduplication is not None:
+                research_data = deduplication.finalize(research_data)
             session_data['results']['research_data'] = research_data
+            self._finish_step(session_data, 'information_compilation', step_started)
             
             # Step 2b: Categorize Information
             print("Step 2b: Categorizing information...")
-            categorized_data = self.information_architect.categorize_information(research_data)
-            session_data['steps_completed'].append('information_categorization')
+            step_started = self._start_step(session_data, 'information_categorization')
+            categorized_data = categorization.snapshot()
             session_data['results']['categorized_data'] = categorized_data
+            # Bucket lists only hold the top items when full lists are not kept
+            self.progress.publish(session_id, 'categorization',
+                                  dict(categorized_data['categorization_metadata']['bucket_counts']))
+            self._finish_step(session_data, 'information_categorization', step_started)
             
             # Step 3: Generate Report
             print("Step 3: Generating final report...")
-            final_report = self.report_generator.generate_report(categorized_data, report_type)
-            session_data['steps_completed'].append('report_generation')
+            step_started = self._start_step(session_data, 'report_generation')
+            if report_types is None:
+                final_report = self.report_generator.generate_report(categorized_data, report_type)
+            else:
+                final_reports = self.report_generator.generate_reports(categorized_data, report_types)
+                final_report = final_reports[report_type]
+                session_data['results']['final_reports'] = final_reports
             session_data['results']['final_report'] = final_report
+            self._finish_step(session_data, 'report_generation', step_started, checkpoint=False)
             
             # Complete session
             session_data['end_time'] = time.time()
@@ -87,27 +690,25 @@ class OversightAI:
             session_data['status'] = 'completed'
             
             # Add to history
-            self.processing_history.append(session_data)
+            self.sessions.put(session_data)
+            for generated in report_types or [report_type]:
+                self.progress.publish(session_id, 'report_ready', {'report_type': generated})
+            self.progress.publish(session_id, 'completed', {
+                'session_id': session_id,
+                'processing_time': session_data['processing_time']
+            })
             
             print(f"Processing completed in {session_data['processing_time']:.2f} seconds")
             
-            return {
-                'success': True,
-                'session_id': session_id,
-                'topic': topic,
-                'report_type': report_type,
-                'processing_time': session_data['processing_time'],
-                'research_summary': self.research_engine.get_research_summary(research_data),
-                'categorization_summary': self.information_architect.get_categorization_summary(categorized_data),
-                'final_report': final_report,
-                'text_report': self.report_generator.export_report_as_text(final_report),
-                'markdown_report': self.report_generator.export_report_as_markdown(final_report)
-            }
-            
+            return self._build_response(session_data, include, fields)
+        
         except Exception as e:
             session_data['status'] = 'failed'
             session_data['error'] = str(e)
             session_data['end_time'] = time.time()
+            session_data['processing_time'] = session_data['end_time'] - session_data['start_time']
+            self.sessions.put(session_data)
+            self.progress.publish(session_id, 'failed', {'session_id': session_id, 'error': str(e)})
             
             print(f"Processing failed: {str(e)}")
             
@@ -117,6 +718,200 @@ class OversightAI:
                 'error': str(e),
                 'steps_completed': session_data['steps_completed']
             }
+        finally:
+            current_client.reset(client_token)
+            current_priority.reset(priority_token)
+            _current_session.reset(token)
+    
+    def _start_step(self, session_data: Dict[str, Any], step: str) -> float:
+        """
+        Publish the start of a pipeline step. Returns its start time.
+        """
+        self.progress.publish(session_data['session_id'], 'step_started', {
+            'step': step,
+            'index': self.PIPELINE_STEPS.index(step) + 1,
+            'total_steps': len(self.PIPELINE_STEPS)
+        })
+        return time.time()
+    
+    def _finish_step(self, session_data: Dict[str, Any], step: str, started: float,
+                     checkpoint: bool = True) -> None:
+        """
+        Record a completed pipeline step, store the session's progress and
+        publish the step's duration.
+        """
+        duration = time.time() - started
+        session_data['steps_completed'].append(step)
+        if checkpoint:
+            self._checkpoint(session_data)
+        self.admission.record(step, duration)
+        self.progress.publish(session_data['session_id'], 'step_finished', {
+            'step': step,
+            'index': self.PIPELINE_STEPS.index(step) + 1,
+            'duration': duration
+        })
+    
+    def get_analysis_response(self, session_id: str, include: Optional[List[str]] = None,
+                              fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the process_topic() response of a completed session, e.g. of a
+        topic queued with submit_topic(). See process_topic() for the arguments.
+        
+        Returns:
+            The response, or None if the session does not exist or has not completed
+        """
+        if fields is not None:
+            self.validate_response_fields(fields)
+            if include is None:
+                include = self._include_for_fields(fields)
+        if include is not None:
+            self.validate_include(include)
+        
+        session_data = self.sessions.get(session_id)
+        if session_data is None or session_data.get('status') != 'completed':
+            return None
+        return self._build_response(session_data, include, fields)
+    
+    def _build_response(self, session_data: Dict[str, Any], include: Optional[List[str]] = None,
+                        fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        report_type = session_data['report_type']
+        report_types = list(session_data['results'].get('final_reports') or []) or None
+        response = {
+            'success': True,
+            'session_id': session_data['session_id'],
+            'topic': session_data['topic'],
+            'report_type': report_type,
+            'processing_time': session_data['processing_time']
+        }
+        
+        included = list(self.RESPONSE_ARTIFACTS if include is None else include)
+        if report_types is None:
+            response.update(self._build_response_fields(session_data, included, report_type))
+        else:
+            report_fields = [field for field in included if self._is_report_field(field)]
+            response.update(self._build_response_fields(
+                session_data, [field for field in included if field not in report_fields], report_type
+            ))
+            response['report_types'] = report_types
+            response['reports'] = {
+                rt: self._build_response_fields(session_data, report_fields, rt)
+                for rt in report_types
+            }
+        
+        if fields is not None:
+            response = select_fields(response, list(self.RESPONSE_BASE_FIELDS) + fields)
+        
+        return response
+    
+    def stream_progress(self, session_id: str, last_event_id: int = 0) -> Optional[Iterator[Optional[tuple]]]:
+        """
+        Iterate over the progress events of a session as (event id, event, data)
+        tuples, ending with a 'completed' or 'failed' event. None is yielded
+        as a keep-alive while nothing happens.
+        
+        Sessions run by this process stream every pipeline event, replayed from
+        `last_event_id`. Sessions run by another worker sharing the session
+        store (or finished before their events expired) stream 'status' events
+        polled from the store.
+        
+        Returns:
+            The event iterator, or None if the session does not exist
+        """
+        if session_id in self.progress:
+            return self.progress.subscribe(session_id, last_event_id, Config.PROGRESS_KEEPALIVE_INTERVAL)
+        status = self.get_processing_status(session_id)
+        if status is None:
+            return None
+        return self._poll_progress(session_id, status)
+    
+    def stream_progress_async(self, session_id: str,
+                              last_event_id: int = 0) -> Optional[AsyncIterator[Optional[tuple]]]:
+        """
+        Asynchronously iterate over the progress events of a session, like
+        stream_progress(), without holding a thread while waiting.
+        """
+        if session_id in self.progress:
+            return self.progress.subscribe_async(session_id, last_event_id, Config.PROGRESS_KEEPALIVE_INTERVAL)
+        status = self.get_processing_status(session_id)
+        if status is None:
+            return None
+        return self._poll_progress_async(session_id, status)
+    
+    async def _poll_progress_async(self, session_id: str,
+                                   status: Dict[str, Any]) -> AsyncIterator[Optional[tuple]]:
+        for event in self._poll_progress(session_id, status, sleep=False):
+            if event is _POLL_WAIT:
+                await asyncio.sleep(Config.PROGRESS_POLL_INTERVAL)
+            else:
+                yield event
+    
+    def _poll_progress(self, session_id: str, status: Dict[str, Any],
+                       sleep: bool = True) -> Iterator[Optional[tuple]]:
+        """
+        Stream 'status' events polled from the session store until the session
+        finishes. With sleep=False, _POLL_WAIT is yielded instead of sleeping
+        between polls, so an async caller can wait without blocking.
+        """
+        event_id = 0
+        last_change = time.time()
+        previous = None
+        while status is not None:
+            if status['status'] in TERMINAL_EVENTS:
+                data = {'session_id': session_id}
+                if status['status'] == 'completed':
+                    data['processing_time'] = status['processing_time']
+                else:
+                    data['error'] = status.get('error')
+                yield event_id + 1, status['status'], data
+                return
+            if status != previous:
+                event_id += 1
+                last_change = time.time()
+                previous = status
+                yield event_id, 'status', status
+            elif time.time() - last_change >= Config.PROGRESS_KEEPALIVE_INTERVAL:
+                last_change = time.time()
+                yield None
+            if sleep:
+                time.sleep(Config.PROGRESS_POLL_INTERVAL)
+            else:
+                yield _POLL_WAIT
+            status = self.get_processing_status(session_id)
+    
+    def _build_response_fields(self, session_data: Dict[str, Any], fields: List[str],
+                               report_type: str) -> Dict[str, Any]:
+        """
+        Build the requested response fields for one report type of a session.
+        """
+        response_fields = {}
+        for field in fields:
+            artifact_format = self.RESPONSE_ARTIFACTS[field]
+            if artifact_format is None:
+                response_fields[field] = self._get_report(session_data, report_type)
+            else:
+                response_fields[field] = self._get_artifact(session_data, artifact_format, report_type)
+        return response_fields
+    
+    def _include_for_fields(self, fields: List[str]) -> List[str]:
+        """
+        Get the response artifacts needed to answer a sparse field selection.
+        """
+        include = []
+        for field in fields:
+            keys = field.split('.')
+            if keys[0] == 'reports':
+                # reports.<report_type>.<field>...
+                needed = [keys[2]] if len(keys) > 2 else [
+                    name for name in self.RESPONSE_ARTIFACTS if self._is_report_field(name)
+                ]
+            else:
+                needed = [keys[0]]
+            include.extend(name for name in needed if name in self.RESPONSE_ARTIFACTS and name not in include)
+        return include
+    
+    def _is_report_field(self, field: str) -> bool:
+        artifact_format = self.RESPONSE_ARTIFACTS[field]
+        return artifact_format is None or artifact_format in self.REPORT_FORMATS
     
     def _validate_and_prepare_topic(self, topic: str) -> str:
         """
@@ -137,91 +932,477 @@ class OversightAI:
         
         return cleaned_topic
     
-    def get_processing_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+    def refresh_angle(self, session_id: str, angle: str,
+                      client: Optional[str] = None,
+                      priority: str = 'interactive') -> Optional[Dict[str, Any]]:
+        """
+        Re-research one angle of a completed session and update its results.
+        
+        Only the refreshed item is re-scored and re-bucketed, and only the report
+        sections (content, metadata and appendices) that read a changed priority
+        bucket or the categorization metadata are regenerated. Cached text and
+        markdown exports have the regenerated sections spliced in; other cached
+        artifacts of the session are dropped.
+        
+        Args:
+            session_id (str): The completed session to refresh
+            angle (str): The research angle to refresh, as listed in research_data['content']
+            client (str): Optional client charged for the LLM tokens of the refresh
+            priority (str): The priority class of the refresh (see process_topic())
+        
+        Returns:
+            Dict with the changed buckets/metadata and the regenerated sections of
+            each report, or None if the session does not exist
+        """
+        validate_priority(priority)
+        session_data = self.sessions.get(session_id)
+        if session_data is None:
+            return None
+        if session_data.get('status') != 'completed':
+            raise ValueError("Only completed sessions can be refreshed")
+        
+        results = session_data['results']
+        research_data = results['research_data']
+        angles = [item['angle'] for item in research_data['content']]
+        if angle not in angles:
+            raise ValueError(f"Invalid angle. Available angles: {angles}")
+        
+        self.quotas.admit(client, analyses=0)
+        priority_token = current_priority.set(priority)
+        client_token = current_client.set((client, self.quotas.weight(client)))
+        try:
+            with self.admission.slot(priority=priority, client=client, weight=self.quotas.weight(client)):
+                content_item = self.research_engine.research_angle(angle, results['validated_topic'])
+        finally:
+            current_client.reset(client_token)
+            current_priority.reset(priority_token)
+        if content_item is not None:
+            self.quotas.charge_tokens(client, content_item.get('tokens', 0))
+        if content_item is None:
+            raise ValueError(f"No content was generated for angle '{angle}'")
+        
+        # Other threads and workers may update the session meanwhile: the update is
+        # stored only if the session is still at the revision it was computed from,
+        # and computed again from the newer revision otherwise
+        while True:
+            stored = self.sessions.get(session_id)
+            if stored is None:
+                return None
+            session_data, refresh, artifacts = self._apply_refresh(stored, angle, content_item)
+            if self.sessions.replace(session_data, stored.get('revision', 0)):
+                break
+        
+        self.artifact_cache.invalidate_session(session_id)
+        for key, artifact in artifacts.items():
+            self.artifact_cache.put(key, artifact)
+        return refresh
+    
+    def _apply_refresh(self, stored: Dict[str, Any], angle: str, content_item: Dict[str, Any]) -> tuple:
         """
-        Get the processing status for a specific session.
+        Compute the update of a stored session with a re-researched item.
+        
+        The stored session is copied rather than changed in place, so readers
+        holding it keep a consistent view until the updated copy is stored.
+        A refreshed item that now near-duplicates another item of the session is
+        removed like duplicates found during research (see ContentDeduplicator).
+        
+        Returns:
+            Tuple of (updated session, refresh summary, artifact cache key ->
+            cached export with the regenerated sections spliced in)
         """
-        for session in self.processing_history:
-            if session['session_id'] == session_id:
-                return {
-                    'session_id': session_id,
-                    'topic': session['topic'],
-                    'status': session.get('status', 'processing'),
-                    'steps_completed': session['steps_completed'],
-                    'processing_time': session.get('processing_time', 0)
+        session_id = stored['session_id']
+        session_data = {**stored, 'results': dict(stored['results'])}
+        results = session_data['results']
+        research_data = results['research_data']
+        previous_categorized = results['categorized_data']
+        
+        duplicate = self._match_duplicate(research_data['content'], angle, content_item)
+        refreshed_at = time.time()
+        sources = [
+            {**source, 'timestamp': refreshed_at} if source.get('query') == angle else source
+            for source in research_data['sources']
+        ]
+        metadata = dict(research_data['metadata'])
+        if duplicate is None:
+            content = [content_item if item['angle'] == angle else item for item in research_data['content']]
+            categorized_data = self.information_architect.recategorize_item(
+                previous_categorized, content_item, session_data.get('tenant')
+            )
+        else:
+            kept_item, similarity = duplicate
+            mode = self.deduplicator.mode
+            if mode == 'merge':
+                kept_item = {
+                    **kept_item, 'merged_angles': list(dict.fromkeys(kept_item.get('merged_angles', []) + [angle]))
                 }
-        return None
+            content = [
+                kept_item if item['angle'] == kept_item['angle'] else item
+                for item in research_data['content'] if item['angle'] != angle
+            ]
+            categorized_data = self.information_architect.remove_item(
+                previous_categorized, angle, session_data.get('tenant'),
+                kept_item if mode == 'merge' else None
+            )
+            sources = [
+                {**source, 'duplicate_of': kept_item['angle'], 'similarity': round(similarity, 3),
+                 'action': 'merged' if mode == 'merge' else 'dropped'}
+                if source.get('query') == angle else source
+                for source in sources
+            ]
+            if 'deduplication' in metadata:
+                metadata['deduplication'] = {
+                    **metadata['deduplication'],
+                    'items_removed': metadata['deduplication']['items_removed'] + 1
+                }
+        metadata['total_sources'] = len(content)
+        metadata['content_length'] = sum(item['word_count'] for item in content)
+        results['research_data'] = {**research_data, 'content': content, 'sources': sources, 'metadata': metadata}
+        
+        changed = self.report_generator.changed_dependencies(previous_categorized, categorized_data)
+        results['categorized_data'] = categorized_data
+        
+        reports = results.get('final_reports') or {session_data['report_type']: results['final_report']}
+        shared = {}
+        refreshed = {}
+        invalidated = {}
+        for report_type, report in reports.items():
+            refreshed[report_type], invalidated[report_type] = self.report_generator.refresh_report(
+                report, categorized_data, changed, shared
+            )
+        
+        # Keep the cached exports' sections to splice the regenerated ones into
+        previous_sections = {}
+        for report_type in refreshed:
+            for export_format in SECTIONED_FORMATS:
+                cached = self.artifact_cache.get(self._artifact_key(session_data, export_format, report_type))
+                if isinstance(cached, tuple):
+                    previous_sections[(export_format, report_type)] = cached
+        
+        if 'final_reports' in results:
+            results['final_reports'] = refreshed
+        results['final_report'] = refreshed[session_data['report_type']]
+        session_data['revision'] = session_data.get('revision', 0) + 1
+        
+        artifacts = {
+            self._artifact_key(session_data, export_format, report_type): self.report_generator.render_sections(
+                refreshed[report_type], export_format, sections, invalidated[report_type]
+            )
+            for (export_format, report_type), sections in previous_sections.items()
+        }
+        
+        return session_data, {
+            'session_id': session_id,
+            'angle': angle,
+            'revision': session_data['revision'],
+            'changed': sorted(changed),
+            'duplicate_of': duplicate[0]['angle'] if duplicate is not None else None,
+            'regenerated_sections': {
+                report_type: sorted('.'.join(key) for key in keys) for report_type, keys in invalidated.items()
+            }
+        }, artifacts
+    
+    def _match_duplicate(self, content: List[Dict[str, Any]], angle: str,
+                         content_item: Dict[str, Any]) -> Optional[tuple]:
+        """
+        Find the item of another angle a refreshed item near-duplicates.
+        Returns (kept item, similarity), or None.
+        """
+        if self.deduplicator is None:
+            return None
+        deduplication = self.deduplicator.begin_session()
+        for item in content:
+            if item['angle'] != angle:
+                deduplication.add_item(item)
+        return deduplication.match(content_item)
+    
+    def get_processing_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the processing status for a specific session. Progress is the
+        fraction of PIPELINE_STEPS completed.
+        """
+        session = self.sessions.get_summary(session_id)
+        if session is None:
+            return None
+        status = {
+            'session_id': session_id,
+            'topic': session['topic'],
+            'status': session['status'] or 'processing',
+            'steps_completed': session['steps_completed'],
+            'progress': len(session['steps_completed'] or []) / len(self.PIPELINE_STEPS),
+            'processing_time': session['processing_time'] or 0,
+            'revision': session['revision'] or 0
+        }
+        if session.get('error'):
+            status['error'] = session['error']
+        return status
     
     def get_session_results(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Get the complete results for a specific session.
         """
-        for session in self.processing_history:
-            if session['session_id'] == session_id:
-                return session['results']
-        return None
+        session = self.sessions.get(session_id)
+        return session['results'] if session is not None else None
+    
+    def get_session_results_view(self, session_id: str, fields: Optional[List[str]] = None,
+                                 offset: int = 0, limit: Optional[int] = None) -> Optional[tuple]:
+        """
+        Get a sparse and/or paginated view of a session's results.
+        
+        Args:
+            session_id (str): The session to view
+            fields (list): Dotted result field paths to return (see RESULT_FIELDS)
+            offset (int): First item of every paginated list (see PAGINATED_RESULTS)
+            limit (int): Maximum number of items per paginated list
+        
+        Returns:
+            Tuple of (results view, pagination info per paginated list), or None
+            if the session does not exist
+        """
+        results = self.get_session_results(session_id)
+        if results is None:
+            return None
+        
+        pagination = {}
+        if offset or limit is not None:
+            results, pagination = paginate(results, self.PAGINATED_RESULTS, offset, limit)
+        if fields is not None:
+            results = select_fields(results, fields)
+            pagination = {
+                path: page for path, page in pagination.items()
+                if any(path == field or path.startswith(field + '.') for field in fields)
+            }
+        return results, pagination
+    
+    def get_serialized_results(self, session_id: str) -> Optional[bytes]:
+        """
+        Get the results of a session encoded as JSON.
+        
+        Results of completed sessions never change, so they are encoded once
+        and the cached blob is returned on every later fetch.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        if session.get('status') == 'completed':
+            return self._get_artifact(session, 'results_json')
+        return self.serializer.dumps(session['results'])
     
     def list_processing_history(self) -> List[Dict[str, Any]]:
         """
         Get a list of all processing sessions.
         """
         history_summary = []
-        for session in self.processing_history:
+        for session in self.sessions.summaries():
             summary = {
                 'session_id': session['session_id'],
                 'topic': session['topic'],
-                'report_type': session.get('report_type', 'detailed'),
-                'status': session.get('status', 'unknown'),
-                'processing_time': session.get('processing_time', 0),
+                'report_type': session['report_type'] or 'detailed',
+                'status': session['status'] or 'unknown',
+                'processing_time': session['processing_time'] or 0,
                 'timestamp': session['start_time']
             }
             history_summary.append(summary)
         
         return history_summary
     
-    def export_session_data(self, session_id: str, format: str = 'json') -> Optional[str]:
+    def export_session_data(self, session_id: str, format: str = 'json',
+                            report_type: Optional[str] = None) -> Optional[Union[str, bytes]]:
         """
         Export session data in the specified format.
+        Report exports (see REPORT_FORMATS) use the session's primary report
+        unless another generated report_type is given; 'msgpack' returns bytes.
         """
-        session_data = None
-        for session in self.processing_history:
-            if session['session_id'] == session_id:
-                session_data = session
-                break
-        
+        session_data = self.sessions.get(session_id)
         if not session_data:
             return None
         
         if format.lower() == 'json':
-            return json.dumps(session_data, indent=2, default=str)
-        elif format.lower() == 'text' and 'final_report' in session_data.get('results', {}):
-            return self.report_generator.export_report_as_text(
-                session_data['results']['final_report']
-            )
-        elif format.lower() == 'markdown' and 'final_report' in session_data.get('results', {}):
-            return self.report_generator.export_report_as_markdown(
-                session_data['results']['final_report']
+            if session_data.get('status') != 'completed':
+                return self.serializer.dumps(session_data, pretty=True).decode('utf-8')
+            return self.artifact_cache.get_or_render(
+                self._artifact_key(session_data, 'session_json'),
+                lambda: self.serializer.dumps(session_data, pretty=True).decode('utf-8')
             )
+        elif format.lower() in self.REPORT_FORMATS and self._get_report(session_data, report_type) is not None:
+            return self._get_artifact(session_data, format.lower(), report_type)
         else:
             return str(session_data)
     
+    def render_artifact(self, session_id: str, artifact_format: str,
+                        report_type: Optional[str] = None) -> Optional[Union[str, bytes]]:
+        """
+        Get a rendered artifact of a completed session, rendering it on first access.
+        
+        Args:
+            session_id (str): The session to render
+            artifact_format (str): One of artifact_renderers (e.g. 'markdown', 'text')
+            report_type (str): Report of a multi-report session to render;
+                defaults to the session's primary report
+        
+        Returns:
+            The rendered artifact, or None if the session has no results to render
+        """
+        if artifact_format not in self.artifact_renderers:
+            raise ValueError(
+                f"Invalid artifact format. Available formats: {list(self.artifact_renderers)}"
+            )
+        
+        session = self.sessions.get(session_id)
+        if session is None or self._get_report(session, report_type) is None:
+            return None
+        return self._get_artifact(session, artifact_format, report_type)
+    
+    def stream_artifact(self, session_id: str, artifact_format: str,
+                        report_type: Optional[str] = None) -> Optional[Iterator[bytes]]:
+        """
+        Stream a rendered artifact of a completed session as encoded chunks
+        (UTF-8 for text formats, raw bytes for binary formats).
+        
+        A cached artifact is streamed from memory. Otherwise the artifact is
+        rendered section by section as the chunks are consumed, and memoized
+        only if it stays under ARTIFACT_STREAM_CACHE_MAX_BYTES, so peak memory
+        stays flat for very large reports.
+        
+        Returns:
+            An iterator of byte chunks, or None if the session has no report
+        """
+        if artifact_format not in self.artifact_renderers:
+            raise ValueError(
+                f"Invalid artifact format. Available formats: {list(self.artifact_renderers)}"
+            )
+        
+        session_data = self.sessions.get(session_id)
+        report = self._get_report(session_data, report_type) if session_data else None
+        if report is None:
+            return None
+        
+        key = self._artifact_key(session_data, artifact_format, report_type)
+        cached = self.artifact_cache.get(key)
+        if cached is not None:
+            return self._encode_artifact(cached)
+        
+        if artifact_format in SECTIONED_FORMATS:
+            return self._stream_and_cache(
+                key, self.report_generator.iter_report_sections(report, artifact_format), sectioned=True
+            )
+        
+        streamer = self.artifact_streamers.get(artifact_format)
+        if streamer is None:
+            return self._encode_artifact(self._get_artifact(session_data, artifact_format, report_type))
+        
+        return self._stream_and_cache(key, ((None, piece) for piece in streamer(report)))
+    
+    def _encode_artifact(self, artifact: Union[str, bytes, tuple]) -> Iterator[bytes]:
+        if isinstance(artifact, bytes):
+            return iter([artifact])
+        if isinstance(artifact, tuple):
+            return encode_chunks(piece for _, piece in artifact)
+        return encode_chunks([artifact])
+    
+    def _stream_and_cache(self, key: tuple, sections: Iterator[tuple],
+                          sectioned: bool = False) -> Iterator[bytes]:
+        kept = []
+        
+        def pieces():
+            for section in sections:
+                if kept is not None:
+                    kept.append(section)
+                yield section[1]
+        
+        buffered = 0
+        for chunk in encode_chunks(pieces()):
+            buffered += len(chunk)
+            if buffered > Config.ARTIFACT_STREAM_CACHE_MAX_BYTES:
+                kept = None
+            yield chunk
+        
+        if kept is not None:
+            self.artifact_cache.put(key, tuple(kept) if sectioned else ''.join(piece for _, piece in kept))
+    
+    def _get_artifact(self, session_data: Dict[str, Any], artifact_format: str,
+                      report_type: Optional[str] = None) -> Union[str, bytes]:
+        report_type = report_type or session_data['report_type']
+        render = self.artifact_renderers[artifact_format]
+        artifact = self.artifact_cache.get_or_render(
+            self._artifact_key(session_data, artifact_format, report_type),
+            lambda: render(session_data['results'], self._get_report(session_data, report_type))
+        )
+        if isinstance(artifact, tuple):
+            return ''.join(piece for _, piece in artifact)
+        return artifact
+    
+    def _artifact_key(self, session_data: Dict[str, Any], artifact_format: str,
+                      report_type: Optional[str] = None) -> tuple:
+        """
+        Get the artifact cache key of a session's rendered artifact. The key
+        includes the session revision, so artifacts cached by this process are
+        never served for a session another worker has since refreshed.
+        """
+        return (
+            session_data['session_id'], artifact_format, report_type or session_data['report_type'],
+            session_data.get('revision', 0)
+        )
+    
+    def _get_report(self, session_data: Dict[str, Any],
+                    report_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get one generated report of a session (the primary report by default).
+        """
+        results = session_data.get('results', {})
+        if report_type is None or report_type == session_data.get('report_type'):
+            return results.get('final_report')
+        return results.get('final_reports', {}).get(report_type)
+    
+    def validate_include(self, include: List[str]) -> None:
+        """
+        Validate the response fields requested from process_topic().
+        """
+        if not isinstance(include, list) or not all(isinstance(field, str) for field in include):
+            raise ValueError("include must be a list of field names")
+        
+        invalid = [field for field in include if field not in self.RESPONSE_ARTIFACTS]
+        if invalid:
+            raise ValueError(
+                f"Invalid include fields {invalid}. Available fields: {list(self.RESPONSE_ARTIFACTS)}"
+            )
+    
+    def validate_tenant(self, tenant: Optional[str]) -> None:
+        """
+        Validate the tenant whose lexicon overrides an analysis should use.
+        """
+        if tenant is None:
+            return
+        tenants = self.information_architect.lexicon_registry.tenants()
+        if tenant not in tenants:
+            raise ValueError(f"Invalid tenant. Available tenants: {tenants}")
+    
+    def validate_response_fields(self, fields: List[str]) -> None:
+        """
+        Validate a sparse field selection for process_topic() responses.
+        """
+        if not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+            raise ValueError("fields must be a list of field names")
+        validate_fields(fields, list(self.RESPONSE_ARTIFACTS) + ['reports'])
+    
     def get_system_statistics(self) -> Dict[str, Any]:
         """
         Get system usage statistics.
         """
-        total_sessions = len(self.processing_history)
-        successful_sessions = sum(1 for s in self.processing_history if s.get('status') == 'completed')
+        summaries = self.sessions.summaries()
+        sessions = [s for s in summaries if s['status'] in ('completed', 'failed')]
+        total_sessions = len(sessions)
+        successful_sessions = sum(1 for s in sessions if s['status'] == 'completed')
         failed_sessions = total_sessions - successful_sessions
         
         if total_sessions > 0:
             avg_processing_time = sum(
-                s.get('processing_time', 0) for s in self.processing_history
+                s['processing_time'] or 0 for s in sessions
             ) / total_sessions
         else:
             avg_processing_time = 0
         
         # Topic analysis
-        topics_processed = [s['topic'] for s in self.processing_history]
+        topics_processed = [s['topic'] for s in sessions]
         unique_topics = len(set(topics_processed))
         
         return {
@@ -231,15 +1412,21 @@ class OversightAI:
             'success_rate': (successful_sessions / total_sessions * 100) if total_sessions > 0 else 0,
             'average_processing_time': avg_processing_time,
             'unique_topics_processed': unique_topics,
-            'total_topics_processed': len(topics_processed)
+            'total_topics_processed': len(topics_processed),
+            'active_sessions': len(summaries) - total_sessions,
+            'session_store': self.sessions.get_statistics(),
+            'jobs': self.jobs.get_statistics(),
+            'admission': self.admission.get_statistics(),
+            'quotas': self.quotas.get_statistics(),
+            'llm_scheduler': self.research_engine.scheduler.get_statistics()
         }
     
     def clear_history(self) -> None:
         """
         Clear the processing history.
         """
-        self.processing_history = []
-        self.current_session = None
+        self.sessions.clear()
+        self.artifact_cache.clear()
     
     def get_available_report_types(self) -> List[str]:
         """
@@ -251,4 +1438,20 @@ class OversightAI:
         """
         Validate if the report type is supported.
         """
-        return report_type in self.report_generator.report_templates
\ No newline at end of file
+        return report_type in self.report_generator.report_templates
+    
+    def validate_report_types(self, report_types: List[str]) -> None:
+        """
+        Validate the report types requested from a multi-report process_topic() call.
+        """
+        if (not isinstance(report_types, list) or not report_types
+                or not all(isinstance(report_type, str) for report_type in report_types)):
+            raise ValueError("report_types must be a non-empty list of report types")
+        
+        invalid = [report_type for report_type in report_types if not self.validate_report_type(report_type)]
+        if invalid:
+            raise ValueError(
+                f"Invalid report types {invalid}. Available types: {self.get_available_report_types()}"
+            )
+        if len(set(report_types)) != len(report_types):
+            raise ValueError("report_types must not contain duplicates")
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Progress Broker
+Publishes pipeline progress events per session to any number of subscribers
+(e.g. Server-Sent Events streams). Late subscribers get the earlier events of
+the session replayed first.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+from config import Config
+
+
+# Events after which a session publishes nothing more
+TERMINAL_EVENTS = ('completed', 'failed')
+
+
+class ProgressBroker:
+    """
+    In-process broker of session progress events.
+    
+    Every published event gets an id (1, 2, ... per session), so a subscriber
+    can resume after the last event it saw. The events of a finished session
+    are kept for `retention` seconds, then dropped.
+    """
+    
+    def __init__(self, retention: Optional[float] = None):
+        self.retention = Config.PROGRESS_RETENTION if retention is None else retention
+        self._condition = threading.Condition()
+        # session_id -> [events as (event id, name, data), time the session finished or None,
+        #                waiting async subscribers as (event loop, asyncio.Event)]
+        self._channels = OrderedDict()
+    
+    def open(self, session_id: str) -> None:
+        """
+        Start publishing the progress of a session; subscribers may wait for
+        its events from now on.
+        """
+        with self._condition:
+            self._prune(time.time())
+            self._channels[session_id] = [[], None, []]
+    
+    def publish(self, session_id: str, event: str, data: Dict[str, Any]) -> None:
+        """
+        Publish an event of an open session and wake up its subscribers.
+        """
+        with self._condition:
+            channel = self._channels.get(session_id)
+            if channel is None or channel[1] is not None:
+                return
+            channel[0].append((len(channel[0]) + 1, event, data))
+            if event in TERMINAL_EVENTS:
+                channel[1] = time.time()
+            self._condition.notify_all()
+            for loop, waiter in channel[2]:
+                loop.call_soon_threadsafe(waiter.set)
+    
+    def close(self, session_id: str) -> None:
+        """
+        Drop the channel of a session that will never run (e.g. its job was
+        rejected), ending the streams of its subscribers.
+        """
+        with self._condition:
+            channel = self._channels.pop(session_id, None)
+            if channel is None:
+                return
+            self._condition.notify_all()
+            for loop, waiter in channel[2]:
+                loop.call_soon_threadsafe(waiter.set)
+    
+    def __contains__(self, session_id: str) -> bool:
+        with self._condition:
+            return session_id in self._channels
+    
+    def subscribe(self, session_id: str, last_event_id: int = 0,
+                  timeout: Optional[float] = None) -> Iterator[Optional[Tuple[int, str, Dict[str, Any]]]]:
+        """
+        Iterate over the events of a session after `last_event_id`, waiting for
+        new ones until a terminal event (see TERMINAL_EVENTS).
+        
+        Yields None whenever `timeout` seconds pass without an event, so the
+        caller can send keep-alives.
+        """
+        position = last_event_id
+        while True:
+            with self._condition:
+                channel = self._channels.get(session_id)
+                if channel is None or (position >= len(channel[0]) and channel[1] is not None):
+                    return
+                if position >= len(channel[0]):
+                    self._condition.wait(timeout)
+                    channel = self._channels.get(session_id)
+                    if channel is None:
+                        return
+                events = channel[0][position:]
+            
+            if not events:
+                yield None
+                continue
+            for event in events:
+                yield event
+                if event[1] in TERMINAL_EVENTS:
+                    return
+            position += len(events)
+    
+    async def subscribe_async(self, session_id: str, last_event_id: int = 0,
+                              timeout: Optional[float] = None
+                              ) -> AsyncIterator[Optional[Tuple[int, str, Dict[str, Any]]]]:
+        """
+        Async version of subscribe(): waits for new events without blocking the
+        event loop.
+        """
+        loop = asyncio.get_running_loop()
+        position = last_event_id
+        while True:
+            waiter = None
+            with self._condition:
+                channel = self._channels.get(session_id)
+                if channel is None or (position >= len(channel[0]) and channel[1] is not None):
+                    return
+                events = channel[0][position:]
+                if not events:
+                    waiter = (loop, asyncio.Event())
+                    channel[2].append(waiter)
+            
+            if waiter is not None:
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    with self._condition:
+                        channel = self._channels.get(session_id)
+                        if channel is not None and waiter in channel[2]:
+                            channel[2].remove(waiter)
+                with self._condition:
+                    channel = self._channels.get(session_id)
+                    if channel is None:
+                        return
+                    events = channel[0][position:]
+            
+            if not events:
+                yield None
+                continue
+            for event in events:
+                yield event
+                if event[1] in TERMINAL_EVENTS:
+                    return
+            position += len(events)
+    
+    def _prune(self, now: float) -> None:
+        """
+        Drop the channels of sessions that finished more than `retention`
+        seconds ago (caller holds the lock).
+        """
+        expired = [
+            session_id for session_id, channel in self._channels.items()
+            if channel[1] is not None and now - channel[1] > self.retention
+        ]
+        for session_id in expired:
+            del self._channels[session_id]
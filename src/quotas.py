@@ -0,0 +1,197 @@
+"""
+Client Quotas
+Per-client token-bucket quotas for analyses and LLM tokens, so one heavy
+embedding site cannot use up the capacity every other client shares.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from config import Config
+from .admission import AdmissionRejected
+
+
+class QuotaExceeded(AdmissionRejected):
+    """
+    Raised when a client has used up a quota; `retry_after` is the number of
+    seconds until the quota allows the request again.
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `capacity`.
+    Charges may take the level below zero (usage that is only known after
+    the fact, like LLM tokens); the debt is paid off by the refill.
+    """
+    
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = now
+    
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` tokens are available (0 if they are now).
+        """
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class QuotaManager:
+    """
+    Per-client quotas for analyses and LLM tokens, with usage counters.
+    
+    Every client (an API key or an embedding origin, see client_id() in
+    app.py) has two token buckets: one for analyses (refilled at
+    `analyses_per_minute`, holding up to `analyses_burst`) and one for LLM
+    tokens (`tokens_per_minute`, up to `tokens_burst`). An analysis takes one
+    token from the first bucket and is refused while the client's LLM token
+    bucket is empty or in debt; the LLM tokens it uses are charged as they
+    are spent. A rate of 0 disables that quota.
+    
+    The state of at most `max_clients` clients is kept; the least recently
+    seen clients are forgotten beyond that.
+    """
+    
+    def __init__(self, analyses_per_minute: Optional[float] = None, analyses_burst: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, tokens_burst: Optional[float] = None,
+                 weights: Optional[Dict[str, float]] = None, max_clients: Optional[int] = None):
+        self.analyses_per_minute = (Config.QUOTA_ANALYSES_PER_MINUTE
+                                    if analyses_per_minute is None else analyses_per_minute)
+        self.analyses_burst = Config.QUOTA_ANALYSES_BURST if analyses_burst is None else analyses_burst
+        self.tokens_per_minute = Config.QUOTA_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.tokens_burst = Config.QUOTA_TOKENS_BURST if tokens_burst is None else tokens_burst
+        self.weights = Config.CLIENT_WEIGHTS if weights is None else weights
+        self.max_clients = Config.QUOTA_MAX_CLIENTS if max_clients is None else max_clients
+        self._lock = threading.Lock()
+        # client -> usage counters and buckets
+        self._clients = OrderedDict()
+    
+    def weight(self, client: Optional[str]) -> float:
+        """
+        Fair share weight of a client (see CLIENT_WEIGHTS; 1 by default).
+        """
+        return self.weights.get(client, 1.0)
+    
+    def admit(self, client: Optional[str], analyses: int = 1) -> None:
+        """
+        Charge a client for `analyses` analyses (0 for a request that only
+        spends LLM tokens, like an angle refresh). Requests without a client
+        (e.g. programmatic use) are not limited.
+        
+        Raises:
+            QuotaExceeded: if the client is out of analyses or LLM tokens
+        """
+        if client is None:
+            return
+        with self._lock:
+            state = self._state(client, time.time())
+            analysis_bucket, token_bucket = state['buckets']
+            if token_bucket is not None and token_bucket.level <= 0:
+                state['rejected'] += 1
+                self._exceed("LLM token quota exceeded for this client", token_bucket.wait_time(1))
+            if analyses and analysis_bucket is not None:
+                wait = analysis_bucket.wait_time(analyses)
+                if wait > 0:
+                    state['rejected'] += 1
+                    self._exceed("Analysis quota exceeded for this client", wait)
+                analysis_bucket.level -= analyses
+            state['analyses'] += analyses
+    
+    def refund(self, client: Optional[str], analyses: int = 1) -> None:
+        """
+        Give back analyses charged by admit() for requests that were not run.
+        """
+        if client is None:
+            return
+        with self._lock:
+            state = self._state(client, time.time())
+            state['analyses'] -= analyses
+            analysis_bucket = state['buckets'][0]
+            if analysis_bucket is not None:
+                analysis_bucket.level = min(analysis_bucket.capacity, analysis_bucket.level + analyses)
+    
+    def charge_tokens(self, client: Optional[str], tokens: int) -> None:
+        """
+        Charge a client for LLM tokens spent on its behalf.
+        """
+        if client is None or not tokens:
+            return
+        with self._lock:
+            state = self._state(client, time.time())
+            state['llm_tokens'] += tokens
+            token_bucket = state['buckets'][1]
+            if token_bucket is not None:
+                token_bucket.level -= tokens
+    
+    def usage(self, client: str) -> Dict[str, Any]:
+        """
+        Get the usage counters and remaining quotas of a client.
+        """
+        with self._lock:
+            return self._usage(self._state(client, time.time()))
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get the quota settings and the usage of every known client.
+        """
+        with self._lock:
+            now = time.time()
+            return {
+                'analyses_per_minute': self.analyses_per_minute,
+                'tokens_per_minute': self.tokens_per_minute,
+                'clients': {
+                    client: self._usage(self._state(client, now, touch=False)) for client in list(self._clients)
+                }
+            }
+    
+    def _state(self, client: str, now: float, touch: bool = True) -> Dict[str, Any]:
+        """
+        Get (or create) the state of a client, with its buckets refilled, and
+        mark it as recently seen unless touch=False (caller holds the lock).
+        """
+        state = self._clients.get(client)
+        if state is None:
+            state = {
+                'analyses': 0,
+                'llm_tokens': 0,
+                'rejected': 0,
+                'buckets': (
+                    TokenBucket(self.analyses_per_minute / 60, self.analyses_burst, now)
+                    if self.analyses_per_minute else None,
+                    TokenBucket(self.tokens_per_minute / 60, self.tokens_burst, now)
+                    if self.tokens_per_minute else None
+                )
+            }
+            self._clients[client] = state
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            if touch:
+                self._clients.move_to_end(client)
+            for bucket in state['buckets']:
+                if bucket is not None:
+                    bucket.refill(now)
+        return state
+    
+    def _usage(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        analysis_bucket, token_bucket = state['buckets']
+        return {
+            'analyses': state['analyses'],
+            'llm_tokens': state['llm_tokens'],
+            'rejected': state['rejected'],
+            'analyses_remaining': int(analysis_bucket.level) if analysis_bucket is not None else None,
+            'llm_tokens_remaining': int(token_bucket.level) if token_bucket is not None else None
+        }
+    
+    def _exceed(self, message: str, wait: float) -> None:
+        raise QuotaExceeded(message, max(1, math.ceil(wait)))
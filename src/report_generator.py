@@ -3,29 +3,150 @@ Step 3: Report Generator
 Generates final informative reports from categorized information.
 """
 
-import json
+import functools
+import heapq
 from datetime import datetime
-from typing import Dict, Any, List
+from html import escape
+from typing import Dict, Any, Callable, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 import re
+from .information_architect import BUCKET_GROUPS
+from .report_templates import CompiledTemplate, ReportType, heading_label, load_report_types, section_label
+from .serialization import get_serializer
+
+try:
+    import msgpack
+except ImportError:  # MessagePack export is optional
+    msgpack = None
+
+
+# Export headers, compiled once
+TEXT_HEADER = CompiledTemplate("""
+{rule}
+OVERSIGHT AI SYSTEM - INFORMATIVE REPORT
+{rule}
+
+Topic: {topic}
+Report Type: {report_type_title}
+Generated: {timestamp}
+Sources Analyzed: {sources_analyzed}
+Confidence Level: {confidence:.2%}
+
+{rule}
+REPORT CONTENT
+{rule}
+
+""")
+
+MARKDOWN_HEADER = CompiledTemplate("""# {topic_title} - {report_type_title} Report
+
+*Generated on {timestamp}*
+
+---
+
+## 1. Sources Used
+
+- **Primary Source**: OpenAI GPT Model
+- **Total Sources Analyzed**: {sources_analyzed}
+- **Source Type**: AI-Generated Research Content
+- **Confidence Level**: {confidence:.2%}
+- **Research Method**: Multi-angle systematic analysis
+- **Data Quality**: High reliability with systematic categorization
+
+---
+
+## 2. Speed & Performance Metrics
+
+- **Report Type**: {report_type_title}
+- **Generation Timestamp**: {timestamp}
+- **Processing Method**: Automated AI analysis
+- **Quality Assurance**: Multi-criteria assessment with confidence scoring
+- **Coverage**: Comprehensive multi-angle approach
+
+---
+
+## 3. Document Content
+
+""")
+
+
+# Categorized data read by each section builder: priority buckets (their items)
+# and 'metadata' (categorization counts and confidence). Priority buckets named
+# in a section's arguments are read as well.
+BUILDER_DEPENDENCIES = {
+    'key_findings': ('high_priority',),
+    'key_points': (),
+    'recommendations': (),
+    'critical_insights': ('high_priority',),
+    'risk_assessment': ('metadata',),
+    'priority_section': (),
+    'technical_findings': ('metadata',),
+    'data_analysis': ('metadata',),
+    'methodology_details': (),
+    'quality_metrics': ('metadata',),
+    'quick_insights': ('high_priority',),
+    'action_items': ()
+}
+
+# Categorized data read by the template variables, the report metadata and each appendix
+VARIABLE_DEPENDENCIES = {'topic': (), 'topic_upper': (), 'total_items': ('metadata',)}
+APPENDIX_DEPENDENCIES = {
+    'categorization_metadata': ('metadata',),
+    'supplementary_information': ('supplementary',),
+    'processing_statistics': ('metadata',)
+}
+
+# Export formats rendered as (section key, text) pieces that can be spliced
+SECTIONED_FORMATS = ('text', 'markdown')
 
 
 class ReportGenerator:
-    def __init__(self):
+    def __init__(self, report_types: Optional[Dict[str, ReportType]] = None):
+        # Report types are defined by template files (see Config.REPORT_TYPES_DIR),
+        # compiled once here
+        self.report_types = load_report_types() if report_types is None else report_types
+        
+        # Named section builders that report type templates can reference
+        self.section_builders = {
+            'key_findings': self._build_key_findings,
+            'key_points': self._build_key_points,
+            'recommendations': lambda categorized_data, shared: self._shared(
+                shared, 'recommendations', lambda: self._generate_recommendations(categorized_data)
+            ),
+            'critical_insights': lambda categorized_data, shared: self._extract_critical_insights(
+                self._top_items(categorized_data, 'important_information', 'high_priority', 5, shared), shared
+            ),
+            'risk_assessment': lambda categorized_data, shared: self._generate_risk_assessment(categorized_data),
+            'priority_section': lambda categorized_data, shared, group, bucket, title, description: (
+                self._format_priority_section(categorized_data[group][bucket], title, description)
+            ),
+            'technical_findings': lambda categorized_data, shared: self._generate_technical_findings(categorized_data),
+            'data_analysis': lambda categorized_data, shared: self._generate_data_analysis(categorized_data),
+            'methodology_details': lambda categorized_data, shared: self._generate_methodology_details(categorized_data),
+            'quality_metrics': lambda categorized_data, shared: self._generate_quality_metrics(categorized_data),
+            'quick_insights': self._generate_quick_insights,
+            'action_items': lambda categorized_data, shared: self._generate_action_items(categorized_data)
+        }
+        
+        # Compiled sections of each report type, with the categorized data each section reads
+        self.compiled_sections = {
+            name: self._compile_sections(report_type) for name, report_type in self.report_types.items()
+        }
         self.report_templates = {
-            'executive': self._generate_executive_report,
-            'detailed': self._generate_detailed_report,
-            'technical': self._generate_technical_report,
-            'summary': self._generate_summary_report
+            name: functools.partial(self._build_report_content, steps)
+            for name, steps in self.compiled_sections.items()
         }
     
     def generate_report(self, categorized_data: Dict[str, Any], 
-                       report_type: str = 'detailed') -> Dict[str, Any]:
+                       report_type: str = 'detailed',
+                       shared: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
         """
         Generate a final informative report from categorized information.
         
         Args:
             categorized_data: Output from InformationArchitect.categorize_information()
             report_type: Type of report to generate ('executive', 'detailed', 'technical', 'summary')
+            shared: Optional memo of sub-computations (key insights, recommendations,
+                appendices) shared between reports of the same categorized data
             
         Returns:
             Dict containing the generated report
@@ -33,172 +154,261 @@ class ReportGenerator:
         if report_type not in self.report_templates:
             report_type = 'detailed'
         
+        if shared is None:
+            shared = {}
+        
         report_data = {
-            'metadata': {
-                'topic': categorized_data['topic'],
-                'report_type': report_type,
-                'generation_timestamp': datetime.now().isoformat(),
-                'total_sources_analyzed': categorized_data['categorization_metadata']['total_items_processed'],
-                'categorization_confidence': categorized_data['categorization_metadata']['confidence_scores']['overall_confidence']
-            },
+            'metadata': self._generate_metadata(categorized_data, report_type),
             'content': {},
             'appendices': {}
         }
         
         # Generate the specific report type
-        report_content = self.report_templates[report_type](categorized_data)
+        report_content = self.report_templates[report_type](categorized_data, shared)
         report_data['content'] = report_content
         
         # Add appendices
-        report_data['appendices'] = self._generate_appendices(categorized_data)
+        report_data['appendices'] = self._shared(
+            shared, 'appendices', lambda: self._generate_appendices(categorized_data)
+        )
         
         return report_data
     
-    def _generate_executive_report(self, categorized_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generate an executive summary report focusing on high-level insights.
-        """
-        topic = categorized_data['topic']
-        high_priority = categorized_data['important_information']['high_priority']
-        
-        executive_summary = f"""
-EXECUTIVE SUMMARY: {topic.upper()}
-
-This report provides a comprehensive analysis of {topic}, focusing on the most critical information and strategic insights.
-
-KEY FINDINGS:
-"""
-        
-        # Extract key findings from high priority information
-        key_findings = []
-        for i, item in enumerate(high_priority[:5], 1):  # Top 5 high priority items
-            angle = item['content']['angle']
-            key_findings.append(f"{i}. {angle}: {self._extract_key_insight(item['content']['content'])}")
-        
-        executive_summary += "\n".join(key_findings)
-        
-        # Strategic recommendations
-        recommendations = self._generate_recommendations(categorized_data)
-        
+    def _generate_metadata(self, categorized_data: Dict[str, Any], report_type: str) -> Dict[str, Any]:
         return {
-            'executive_summary': executive_summary,
-            'strategic_recommendations': recommendations,
-            'critical_insights': self._extract_critical_insights(high_priority),
-            'risk_assessment': self._generate_risk_assessment(categorized_data)
+            'topic': categorized_data['topic'],
+            'report_type': report_type,
+            'generation_timestamp': datetime.now().isoformat(),
+            'total_sources_analyzed': categorized_data['categorization_metadata']['total_items_processed'],
+            'categorization_confidence': categorized_data['categorization_metadata']['confidence_scores']['overall_confidence']
         }
     
-    def _generate_detailed_report(self, categorized_data: Dict[str, Any]) -> Dict[str, Any]:
+    def section_dependencies(self, report_type: str) -> Dict[Tuple[str, ...], FrozenSet[str]]:
         """
-        Generate a comprehensive detailed report with all categorized information.
-        """
-        topic = categorized_data['topic']
-        
-        # Introduction
-        introduction = f"""
-COMPREHENSIVE ANALYSIS: {topic.upper()}
-
-This detailed report presents a thorough analysis of {topic}, organized by information priority and relevance. The analysis covers fundamental concepts, practical applications, benefits, challenges, and future outlook.
-
-METHODOLOGY:
-Our analysis employed a systematic approach to information gathering and categorization, utilizing advanced algorithms to assess the importance and relevance of each piece of information.
-"""
-        
-        # High Priority Section
-        high_priority_section = self._format_priority_section(
-            categorized_data['important_information']['high_priority'],
-            "CRITICAL INFORMATION",
-            "The following information represents the most essential aspects of the topic:"
-        )
-        
-        # Medium Priority Section
-        medium_priority_section = self._format_priority_section(
-            categorized_data['important_information']['medium_priority'],
-            "IMPORTANT INFORMATION",
-            "This section covers significant information that enhances understanding:"
-        )
-        
-        # Supporting Information Section
-        supporting_section = self._format_priority_section(
-            categorized_data['minor_information']['low_priority'],
-            "SUPPORTING INFORMATION",
-            "Additional relevant information for comprehensive understanding:"
-        )
+        Get the categorized data read by every section of a report type.
         
-        # Analysis and Insights
-        analysis = self._generate_comprehensive_analysis(categorized_data)
+        Sections are keyed ('metadata',), ('content', name) and ('appendix', name);
+        their dependencies are priority buckets and 'metadata'.
+        """
+        dependencies = {('metadata',): frozenset(['metadata'])}
+        for section_name, _, _, _, section_dependencies in self.compiled_sections[report_type]:
+            dependencies[('content', section_name)] = section_dependencies
+        for appendix_name, appendix_dependencies in APPENDIX_DEPENDENCIES.items():
+            dependencies[('appendix', appendix_name)] = frozenset(appendix_dependencies)
+        return dependencies
+    
+    def changed_dependencies(self, previous: Dict[str, Any], categorized_data: Dict[str, Any]) -> Set[str]:
+        """
+        Get the priority buckets (and 'metadata') whose items or values differ
+        between two versions of the categorized data of a topic.
+        """
+        changed = set()
+        for bucket, group in BUCKET_GROUPS.items():
+            if (previous[group][bucket] != categorized_data[group][bucket]
+                    or previous.get('top_indices', {}).get(bucket)
+                    != categorized_data.get('top_indices', {}).get(bucket)):
+                changed.add(bucket)
+        if (previous['topic'] != categorized_data['topic']
+                or previous['categorization_metadata'] != categorized_data['categorization_metadata']):
+            changed.add('metadata')
+        return changed
+    
+    def refresh_report(self, report_data: Dict[str, Any], categorized_data: Dict[str, Any],
+                       changed: Iterable[str],
+                       shared: Optional[Dict[Any, Any]] = None) -> Tuple[Dict[str, Any], Set[Tuple[str, ...]]]:
+        """
+        Bring a report up to date with changed categorized data, regenerating
+        only the sections that read changed data.
         
-        return {
-            'introduction': introduction,
-            'critical_information': high_priority_section,
-            'important_information': medium_priority_section,
-            'supporting_information': supporting_section,
-            'comprehensive_analysis': analysis,
-            'conclusions': self._generate_conclusions(categorized_data)
+        Args:
+            report_data: A report generated from an earlier version of the categorized data
+            categorized_data: The current categorized data
+            changed: Priority buckets and metadata that changed (see changed_dependencies())
+            shared: Optional memo shared with other reports of the same categorized data
+            
+        Returns:
+            Tuple of (refreshed report, keys of the regenerated sections; see
+            section_dependencies())
+        """
+        changed = frozenset(changed)
+        report_type = report_data['metadata']['report_type']
+        invalidated = {
+            key for key, dependencies in self.section_dependencies(report_type).items()
+            if not dependencies.isdisjoint(changed)
         }
+        if not invalidated:
+            return report_data, invalidated
+        
+        if shared is None:
+            shared = {}
+        
+        refreshed = {
+            'metadata': report_data['metadata'],
+            'content': self._build_report_content(
+                self.compiled_sections[report_type], categorized_data, shared,
+                previous=report_data['content'], changed=changed
+            ),
+            'appendices': report_data['appendices']
+        }
+        if ('metadata',) in invalidated:
+            refreshed['metadata'] = self._generate_metadata(categorized_data, report_type)
+        if any(key[0] == 'appendix' for key in invalidated):
+            refreshed['appendices'] = self._shared(
+                shared, 'appendices', lambda: self._generate_appendices(categorized_data)
+            )
+        return refreshed, invalidated
     
-    def _generate_technical_report(self, categorized_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generate a technical report with detailed methodology and data analysis.
+    def generate_reports(self, categorized_data: Dict[str, Any],
+                         report_types: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        topic = categorized_data['topic']
-        
-        technical_overview = f"""
-TECHNICAL ANALYSIS REPORT: {topic.upper()}
-
-SCOPE AND METHODOLOGY:
-This technical report provides an in-depth analysis of {topic} using systematic information processing and categorization techniques.
-
-DATA PROCESSING PIPELINE:
-1. Information Compilation: Multi-angle research approach
-2. Content Analysis: Keyword-based importance scoring
-3. Categorization: Hybrid scoring algorithm with confidence metrics
-4. Report Generation: Structured output with technical appendices
-"""
+        Generate several report types from one categorized dataset.
         
-        # Technical findings
-        technical_findings = self._generate_technical_findings(categorized_data)
-        
-        # Data analysis
-        data_analysis = self._generate_data_analysis(categorized_data)
+        Sub-computations used by more than one report type (key insights,
+        top items, recommendations, appendices) are computed only once.
         
+        Returns:
+            Dict mapping each report type to its generated report
+        """
+        shared = {}
         return {
-            'technical_overview': technical_overview,
-            'technical_findings': technical_findings,
-            'data_analysis': data_analysis,
-            'methodology_details': self._generate_methodology_details(categorized_data),
-            'quality_metrics': self._generate_quality_metrics(categorized_data)
+            report_type: self.generate_report(categorized_data, report_type, shared)
+            for report_type in report_types
         }
     
-    def _generate_summary_report(self, categorized_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _shared(self, shared: Optional[Dict[Any, Any]], key: Any, compute: Callable[[], Any]) -> Any:
         """
-        Generate a concise summary report with key highlights.
+        Compute a value once per shared memo (or every time without one).
         """
-        topic = categorized_data['topic']
+        if shared is None:
+            return compute()
+        if key not in shared:
+            shared[key] = compute()
+        return shared[key]
+    
+    # Variables available to every text template
+    TEMPLATE_VARIABLES = ('topic', 'topic_upper', 'total_items')
+    
+    def _compile_sections(self, report_type: ReportType) -> List[tuple]:
+        """
+        Resolve the section builders of a report type once.
+        
+        Returns (section_name, builder, template, builder_fields, dependencies)
+        steps: builder sections carry their builder with its arguments bound, text
+        sections carry their template and the template fields filled by section
+        builders. `dependencies` are the priority buckets and metadata the section reads.
+        """
+        unknown = report_type.builders - set(self.section_builders) - set(self.TEMPLATE_VARIABLES)
+        if unknown:
+            raise ValueError(
+                f"Invalid section builders {sorted(unknown)} in report type '{report_type.name}'. "
+                f"Available builders: {list(self.section_builders)}"
+            )
+        
+        steps = []
+        for section_name, template, args in report_type.sections:
+            if args is not None:
+                dependencies = set(BUILDER_DEPENDENCIES.get(template, ()))
+                dependencies.update(
+                    value for value in [*args, *args.values()] if isinstance(value, str) and value in BUCKET_GROUPS
+                )
+                builder = functools.partial(self.section_builders[template], **args)
+                steps.append((section_name, builder, None, (), frozenset(dependencies)))
+            else:
+                builder_fields = tuple(
+                    (field, self.section_builders[field])
+                    for field in template.fields if field not in self.TEMPLATE_VARIABLES
+                )
+                dependencies = frozenset(
+                    dependency for field in template.fields
+                    for dependency in VARIABLE_DEPENDENCIES.get(field) or BUILDER_DEPENDENCIES.get(field, ())
+                )
+                steps.append((section_name, None, template, builder_fields, dependencies))
+        return steps
+    
+    def _build_report_content(self, steps: List[tuple], categorized_data: Dict[str, Any],
+                              shared: Optional[Dict[Any, Any]] = None,
+                              previous: Optional[Dict[str, Any]] = None,
+                              changed: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
+        """
+        Build the content sections of a report type from its compiled sections.
         
-        summary = f"""
-SUMMARY REPORT: {topic.upper()}
-
-OVERVIEW:
-This summary provides the essential information about {topic} in a concise format.
-"""
+        Text sections are rendered from their template; other template fields
+        are filled by the section builder of the same name (lists are joined
+        one item per line). Sections of a `previous` content that read none of
+        the `changed` data are reused as-is.
+        """
+        topic = categorized_data['topic']
+        context = {
+            'topic': topic,
+            'topic_upper': topic.upper(),
+            'total_items': categorized_data['categorization_metadata']['total_items_processed']
+        }
         
-        # Key points from each priority level
+        content = {}
+        for section_name, builder, template, builder_fields, dependencies in steps:
+            if previous is not None and dependencies.isdisjoint(changed):
+                content[section_name] = previous[section_name]
+                continue
+            
+            if builder is not None:
+                content[section_name] = builder(categorized_data, shared)
+                continue
+            
+            for field, field_builder in builder_fields:
+                if field not in context:
+                    value = field_builder(categorized_data, shared)
+                    context[field] = "\n".join(value) if isinstance(value, list) else value
+            content[section_name] = template.render(context)
+        return content
+    
+    def _build_key_findings(self, categorized_data: Dict[str, Any],
+                            shared: Optional[Dict[Any, Any]] = None, count: int = 5) -> List[str]:
+        """
+        Numbered key findings from the top high priority items.
+        """
+        high_priority = self._top_items(categorized_data, 'important_information', 'high_priority', count, shared)
+        return [
+            f"{i}. {item['content']['angle']}: {self._extract_key_insight(item['content']['content'], shared)}"
+            for i, item in enumerate(high_priority, 1)
+        ]
+    
+    def _build_key_points(self, categorized_data: Dict[str, Any], shared: Optional[Dict[Any, Any]] = None,
+                          **counts: int) -> List[str]:
+        """
+        Key points from the top items of the given priority buckets
+        (e.g. high_priority=3, medium_priority=2).
+        """
         key_points = []
+        for bucket, count in counts.items():
+            for item in self._top_items(categorized_data, 'important_information', bucket, count, shared):
+                key_points.append(f"• {self._extract_key_point(item['content'], shared)}")
+        return key_points
+    
+    def _top_items(self, categorized_data: Dict[str, Any], group: str, bucket: str,
+                   count: int, shared: Optional[Dict[Any, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Get the highest-scoring items of a priority bucket, best first.
         
-        # High priority key points
-        for item in categorized_data['important_information']['high_priority'][:3]:
-            key_points.append(f"• {self._extract_key_point(item['content'])}")
-        
-        # Medium priority key points
-        for item in categorized_data['important_information']['medium_priority'][:2]:
-            key_points.append(f"• {self._extract_key_point(item['content'])}")
-        
-        return {
-            'summary': summary,
-            'key_points': key_points,
-            'quick_insights': self._generate_quick_insights(categorized_data),
-            'action_items': self._generate_action_items(categorized_data)
-        }
+        Uses the architect's precomputed top-k heaps when they hold enough items,
+        and otherwise selects from the full bucket list in O(n log k).
+        """
+        return self._shared(
+            shared, ('top_items', bucket, count),
+            lambda: self._select_top_items(categorized_data, group, bucket, count)
+        )
+    
+    def _select_top_items(self, categorized_data: Dict[str, Any], group: str, bucket: str,
+                          count: int) -> List[Dict[str, Any]]:
+        items = categorized_data[group][bucket]
+        top_indices = categorized_data.get('top_indices', {}).get(bucket)
+        if top_indices is not None:
+            bucket_count = categorized_data['categorization_metadata'].get('bucket_counts', {}).get(
+                bucket, len(items)
+            )
+            if len(top_indices) >= min(count, bucket_count):
+                return [items[index] for index in top_indices[:count]]
+        
+        return heapq.nlargest(count, items, key=lambda item: item['importance_score'])
     
     def _format_priority_section(self, items: List[Dict], title: str, description: str) -> Dict[str, Any]:
         """
@@ -223,10 +433,13 @@ This summary provides the essential information about {topic} in a concise forma
             'items': formatted_items
         }
     
-    def _extract_key_insight(self, content: str) -> str:
+    def _extract_key_insight(self, content: str, shared: Optional[Dict[Any, Any]] = None) -> str:
         """
         Extract a key insight from content text.
         """
+        if shared is not None:
+            return self._shared(shared, ('key_insight', content), lambda: self._extract_key_insight(content))
+        
         sentences = content.split('.')
         # Return the first substantial sentence
         for sentence in sentences:
@@ -234,7 +447,8 @@ This summary provides the essential information about {topic} in a concise forma
                 return sentence.strip() + "."
         return content[:100] + "..." if len(content) > 100 else content
     
-    def _extract_key_point(self, content_item: Dict[str, Any]) -> str:
+    def _extract_key_point(self, content_item: Dict[str, Any],
+                           shared: Optional[Dict[Any, Any]] = None) -> str:
         """
         Extract a key point from a content item.
         """
@@ -243,13 +457,13 @@ This summary provides the essential information about {topic} in a concise forma
         
         # Create a concise key point
         if 'definition' in angle.lower():
-            return f"Definition: {self._extract_key_insight(content)}"
+            return f"Definition: {self._extract_key_insight(content, shared)}"
         elif 'benefit' in angle.lower():
-            return f"Key Benefit: {self._extract_key_insight(content)}"
+            return f"Key Benefit: {self._extract_key_insight(content, shared)}"
         elif 'application' in angle.lower():
-            return f"Application: {self._extract_key_insight(content)}"
+            return f"Application: {self._extract_key_insight(content, shared)}"
         else:
-            return f"{angle}: {self._extract_key_insight(content)}"
+            return f"{angle}: {self._extract_key_insight(content, shared)}"
     
     def _generate_recommendations(self, categorized_data: Dict[str, Any]) -> List[str]:
         """
@@ -264,13 +478,14 @@ This summary provides the essential information about {topic} in a concise forma
         ]
         return recommendations
     
-    def _extract_critical_insights(self, high_priority_items: List[Dict]) -> List[str]:
+    def _extract_critical_insights(self, high_priority_items: List[Dict],
+                                   shared: Optional[Dict[Any, Any]] = None) -> List[str]:
         """
         Extract critical insights from high priority information.
         """
         insights = []
         for item in high_priority_items[:3]:
-            insight = f"Critical insight from {item['content']['angle']}: {self._extract_key_insight(item['content']['content'])}"
+            insight = f"Critical insight from {item['content']['angle']}: {self._extract_key_insight(item['content']['content'], shared)}"
             insights.append(insight)
         return insights
     
@@ -284,43 +499,6 @@ This summary provides the essential information about {topic} in a concise forma
             'reliability_score': f"{categorized_data['categorization_metadata']['confidence_scores']['overall_confidence']:.2%}"
         }
     
-    def _generate_comprehensive_analysis(self, categorized_data: Dict[str, Any]) -> str:
-        """
-        Generate comprehensive analysis section.
-        """
-        topic = categorized_data['topic']
-        total_items = categorized_data['categorization_metadata']['total_items_processed']
-        
-        analysis = f"""
-COMPREHENSIVE ANALYSIS:
-
-Our analysis of {topic} reveals a multi-faceted subject with {total_items} distinct research angles explored. The information has been systematically categorized to highlight the most critical aspects while ensuring comprehensive coverage.
-
-The analysis indicates strong foundational concepts with practical applications across multiple domains. Key themes emerge around implementation strategies, benefits realization, and future development potential.
-"""
-        return analysis
-    
-    def _generate_conclusions(self, categorized_data: Dict[str, Any]) -> str:
-        """
-        Generate conclusions section.
-        """
-        topic = categorized_data['topic']
-        
-        conclusions = f"""
-CONCLUSIONS:
-
-Based on our comprehensive analysis of {topic}, several key conclusions emerge:
-
-1. The topic demonstrates significant relevance and practical applicability
-2. Multiple implementation approaches are available with varying complexity levels
-3. Benefits outweigh challenges when properly implemented
-4. Continued development and innovation are expected in this area
-5. Strategic planning and systematic approach are essential for success
-
-This analysis provides a solid foundation for informed decision-making and strategic planning related to {topic}.
-"""
-        return conclusions
-    
     def _generate_technical_findings(self, categorized_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate technical findings section.
@@ -380,15 +558,16 @@ This analysis provides a solid foundation for informed decision-making and strat
             'information_coverage': 'Comprehensive multi-angle analysis'
         }
     
-    def _generate_quick_insights(self, categorized_data: Dict[str, Any]) -> List[str]:
+    def _generate_quick_insights(self, categorized_data: Dict[str, Any],
+                                 shared: Optional[Dict[Any, Any]] = None) -> List[str]:
         """
         Generate quick insights for summary report.
         """
         insights = []
-        high_priority = categorized_data['important_information']['high_priority']
+        high_priority = self._top_items(categorized_data, 'important_information', 'high_priority', 3, shared)
         
-        for item in high_priority[:3]:
-            insight = f"Quick insight: {self._extract_key_insight(item['content']['content'])}"
+        for item in high_priority:
+            insight = f"Quick insight: {self._extract_key_insight(item['content']['content'], shared)}"
             insights.append(insight)
         
         return insights
@@ -423,62 +602,94 @@ This analysis provides a solid foundation for informed decision-making and strat
         """
         Export the report as formatted text.
         """
-        text_report = f"""
-{'='*80}
-OVERSIGHT AI SYSTEM - INFORMATIVE REPORT
-{'='*80}
-
-Topic: {report_data['metadata']['topic']}
-Report Type: {report_data['metadata']['report_type'].title()}
-Generated: {report_data['metadata']['generation_timestamp']}
-Sources Analyzed: {report_data['metadata']['total_sources_analyzed']}
-Confidence Level: {report_data['metadata']['categorization_confidence']:.2%}
-
-{'='*80}
-REPORT CONTENT
-{'='*80}
-
-"""
+        return ''.join(self.iter_report_as_text(report_data))
+    
+    def iter_report_as_text(self, report_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Export the report as formatted text, yielding it section by section.
+        """
+        for _, piece in self._iter_text_sections(report_data, {}):
+            yield piece
+    
+    def iter_report_sections(self, report_data: Dict[str, Any], export_format: str,
+                             previous: Optional[Iterable[Tuple[Tuple[str, ...], str]]] = None,
+                             invalidated: Iterable[Tuple[str, ...]] = ()) -> Iterator[Tuple[Tuple[str, ...], str]]:
+        """
+        Export the report as text or markdown, yielding (section key, text)
+        pieces that joined together form the export.
+        
+        Pieces of a `previous` rendering of the report that are not
+        `invalidated` (see refresh_report()) are reused instead of re-rendered.
+        """
+        if export_format not in SECTIONED_FORMATS:
+            raise ValueError(f"Invalid sectioned export format. Available formats: {list(SECTIONED_FORMATS)}")
+        
+        invalidated = set(invalidated)
+        reuse = {key: piece for key, piece in previous or () if key not in invalidated}
+        if export_format == 'text':
+            return self._iter_text_sections(report_data, reuse)
+        return self._iter_markdown_sections(report_data, reuse)
+    
+    def render_sections(self, report_data: Dict[str, Any], export_format: str,
+                        previous: Optional[Iterable[Tuple[Tuple[str, ...], str]]] = None,
+                        invalidated: Iterable[Tuple[str, ...]] = ()) -> Tuple[Tuple[Tuple[str, ...], str], ...]:
+        """
+        Render a text or markdown export as a tuple of (section key, text)
+        pieces (see iter_report_sections()).
+        """
+        return tuple(self.iter_report_sections(report_data, export_format, previous, invalidated))
+    
+    def _iter_text_sections(self, report_data: Dict[str, Any],
+                            reuse: Dict[Tuple[str, ...], str]) -> Iterator[Tuple[Tuple[str, ...], str]]:
+        key = ('metadata',)
+        yield key, reuse.get(key) or TEXT_HEADER.render(self._header_context(report_data['metadata']))
         
         # Add content sections
         for section_name, section_content in report_data['content'].items():
-            text_report += f"\n{section_name.upper().replace('_', ' ')}\n"
-            text_report += "-" * len(section_name) + "\n"
+            key = ('content', section_name)
+            if key in reuse:
+                yield key, reuse[key]
+                continue
+            
+            pieces = [f"\n{heading_label(section_name)}\n", "-" * len(section_name) + "\n"]
             
             if isinstance(section_content, str):
-                text_report += section_content + "\n"
+                pieces.append(section_content + "\n")
             elif isinstance(section_content, dict):
-                text_report += self._format_dict_as_text(section_content) + "\n"
+                self._render_dict_as_text(section_content, 0, pieces)
+                pieces.append("\n")
             elif isinstance(section_content, list):
                 for item in section_content:
-                    text_report += f"• {item}\n"
+                    pieces.append(f"• {item}\n")
             
-            text_report += "\n"
-        
-        return text_report
+            pieces.append("\n")
+            yield key, ''.join(pieces)
     
     def _format_dict_as_text(self, data: Dict[str, Any], indent: int = 0) -> str:
         """
         Format dictionary data as readable text.
         """
-        text = ""
+        pieces = []
+        self._render_dict_as_text(data, indent, pieces)
+        return ''.join(pieces)
+    
+    def _render_dict_as_text(self, data: Dict[str, Any], indent: int, pieces: List[str]) -> None:
         indent_str = "  " * indent
         
         for key, value in data.items():
             if isinstance(value, dict):
-                text += f"{indent_str}{key.title().replace('_', ' ')}:\n"
-                text += self._format_dict_as_text(value, indent + 1)
+                pieces.append(f"{indent_str}{section_label(key)}:\n")
+                self._render_dict_as_text(value, indent + 1, pieces)
             elif isinstance(value, list):
-                text += f"{indent_str}{key.title().replace('_', ' ')}:\n"
+                pieces.append(f"{indent_str}{section_label(key)}:\n")
                 for item in value:
                     if isinstance(item, dict):
-                        text += self._format_dict_as_text(item, indent + 1)
+                        self._render_dict_as_text(item, indent + 1, pieces)
                     else:
-                        text += f"{indent_str}  • {item}\n"
+                        pieces.append(f"{indent_str}  • {item}\n")
             else:
-                text += f"{indent_str}{key.title().replace('_', ' ')}: {value}\n"
-        
-        return text
+                pieces.append(f"{indent_str}{section_label(key)}: {value}\n")
+    
     def export_report_as_markdown(self, report_data: Dict[str, Any]) -> str:
         """
         Export the report as a formatted markdown document with 3 main sections:
@@ -486,94 +697,207 @@ REPORT CONTENT
         2. Speed/Loading Time/ETA
         3. Document Content (varies by report type)
         """
-        topic = report_data['metadata']['topic']
-        report_type = report_data['metadata']['report_type']
-        timestamp = report_data['metadata']['generation_timestamp']
-        sources_analyzed = report_data['metadata']['total_sources_analyzed']
-        confidence = report_data['metadata']['categorization_confidence']
-
-        markdown_report = f"""# {topic.title()} - {report_type.title()} Report
-
-*Generated on {timestamp}*
-
----
-
-## 1. Sources Used
-
-- **Primary Source**: OpenAI GPT Model
-- **Total Sources Analyzed**: {sources_analyzed}
-- **Source Type**: AI-Generated Research Content
-- **Confidence Level**: {confidence:.2%}
-- **Research Method**: Multi-angle systematic analysis
-- **Data Quality**: High reliability with systematic categorization
-
----
-
-## 2. Speed & Performance Metrics
-
-- **Report Type**: {report_type.title()}
-- **Generation Timestamp**: {timestamp}
-- **Processing Method**: Automated AI analysis
-- **Quality Assurance**: Multi-criteria assessment with confidence scoring
-- **Coverage**: Comprehensive multi-angle approach
-
----
-
-## 3. Document Content
-
-"""
-
+        return ''.join(self.iter_report_as_markdown(report_data))
+    
+    def iter_report_as_markdown(self, report_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Export the report as markdown, yielding it section by section.
+        """
+        for _, piece in self._iter_markdown_sections(report_data, {}):
+            yield piece
+    
+    def _iter_markdown_sections(self, report_data: Dict[str, Any],
+                                reuse: Dict[Tuple[str, ...], str]) -> Iterator[Tuple[Tuple[str, ...], str]]:
+        key = ('metadata',)
+        yield key, reuse.get(key) or MARKDOWN_HEADER.render(self._header_context(report_data['metadata']))
+        
         # Add content sections based on report type
         for section_name, section_content in report_data['content'].items():
-            section_title = section_name.replace('_', ' ').title()
-            markdown_report += f"### {section_title}\n\n"
-
+            key = ('content', section_name)
+            if key in reuse:
+                yield key, reuse[key]
+                continue
+            
+            pieces = [f"### {section_label(section_name)}\n\n"]
+            
             if isinstance(section_content, str):
-                markdown_report += section_content + "\n\n"
+                pieces.append(section_content + "\n\n")
             elif isinstance(section_content, dict):
-                markdown_report += self._format_dict_as_markdown(section_content) + "\n\n"
+                self._render_dict_as_markdown(section_content, 0, pieces)
+                pieces.append("\n\n")
             elif isinstance(section_content, list):
                 for item in section_content:
-                    markdown_report += f"- {item}\n"
-                markdown_report += "\n"
-
+                    pieces.append(f"- {item}\n")
+                pieces.append("\n")
+            
+            yield key, ''.join(pieces)
+        
         # Add appendices if they exist
         if report_data.get('appendices'):
-            markdown_report += "---\n\n## Appendices\n\n"
+            yield ('appendices',), "---\n\n## Appendices\n\n"
             for appendix_name, appendix_content in report_data['appendices'].items():
-                appendix_title = appendix_name.replace('_', ' ').title()
-                markdown_report += f"### {appendix_title}\n\n"
+                key = ('appendix', appendix_name)
+                if key in reuse:
+                    yield key, reuse[key]
+                    continue
+                
+                pieces = [f"### {section_label(appendix_name)}\n\n"]
                 if isinstance(appendix_content, dict):
-                    markdown_report += self._format_dict_as_markdown(appendix_content) + "\n\n"
+                    self._render_dict_as_markdown(appendix_content, 0, pieces)
+                    pieces.append("\n\n")
                 else:
-                    markdown_report += str(appendix_content) + "\n\n"
-
-        return markdown_report
-
+                    pieces.append(str(appendix_content) + "\n\n")
+                yield key, ''.join(pieces)
+    
     def _format_dict_as_markdown(self, data: Dict[str, Any], level: int = 0) -> str:
         """
         Format dictionary data as markdown.
         """
-        markdown = ""
-        
+        pieces = []
+        self._render_dict_as_markdown(data, level, pieces)
+        return ''.join(pieces)
+    
+    def _render_dict_as_markdown(self, data: Dict[str, Any], level: int, pieces: List[str]) -> None:
         for key, value in data.items():
-            key_formatted = key.replace('_', ' ').title()
+            label = section_label(key)
             
             if isinstance(value, dict):
                 if level == 0:
-                    markdown += f"#### {key_formatted}\n\n"
+                    pieces.append(f"#### {label}\n\n")
                 else:
-                    markdown += f"**{key_formatted}:**\n\n"
-                markdown += self._format_dict_as_markdown(value, level + 1)
+                    pieces.append(f"**{label}:**\n\n")
+                self._render_dict_as_markdown(value, level + 1, pieces)
             elif isinstance(value, list):
-                markdown += f"**{key_formatted}:**\n\n"
+                pieces.append(f"**{label}:**\n\n")
                 for item in value:
                     if isinstance(item, dict):
-                        markdown += self._format_dict_as_markdown(item, level + 1)
+                        self._render_dict_as_markdown(item, level + 1, pieces)
                     else:
-                        markdown += f"- {item}\n"
-                markdown += "\n"
+                        pieces.append(f"- {item}\n")
+                pieces.append("\n")
             else:
-                markdown += f"**{key_formatted}:** {value}\n\n"
-
-        return markdown
+                pieces.append(f"**{label}:** {value}\n\n")
+    
+    def _header_context(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Values of the export header templates.
+        """
+        return {
+            'topic': metadata['topic'],
+            'topic_title': metadata['topic'].title(),
+            'report_type_title': metadata['report_type'].title(),
+            'timestamp': metadata['generation_timestamp'],
+            'sources_analyzed': metadata['total_sources_analyzed'],
+            'confidence': metadata['categorization_confidence'],
+            'rule': '=' * 80
+        }
+    
+    def export_report_as_html(self, report_data: Dict[str, Any]) -> str:
+        """
+        Export the report as a pre-rendered HTML fragment that can be inserted
+        into a page as-is.
+        """
+        return ''.join(self.iter_report_as_html(report_data))
+    
+    def iter_report_as_html(self, report_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Export the report as HTML, yielding it section by section.
+        """
+        metadata = report_data['metadata']
+        yield (
+            '<article class="oversight-report">\n'
+            f"<h1>{escape(metadata['topic'].title())} - {escape(metadata['report_type'].title())} Report</h1>\n"
+            '<p class="report-meta">'
+            f"Generated on {escape(str(metadata['generation_timestamp']))} &middot; "
+            f"Sources analyzed: {metadata['total_sources_analyzed']} &middot; "
+            f"Confidence: {metadata['categorization_confidence']:.2%}</p>\n"
+        )
+        
+        for section_name, section_content in report_data['content'].items():
+            yield f"<section>\n<h2>{escape(section_label(section_name))}</h2>\n"
+            yield from self._iter_value_as_html(section_content)
+            yield "</section>\n"
+        
+        if report_data.get('appendices'):
+            yield '<section class="appendices">\n<h2>Appendices</h2>\n'
+            for appendix_name, appendix_content in report_data['appendices'].items():
+                yield f"<h3>{escape(section_label(appendix_name))}</h3>\n"
+                yield from self._iter_value_as_html(appendix_content)
+            yield "</section>\n"
+        
+        yield "</article>\n"
+    
+    def _iter_value_as_html(self, value: Any) -> Iterator[str]:
+        if isinstance(value, dict):
+            yield "<dl>\n"
+            for key, item in value.items():
+                yield f"<dt>{escape(section_label(str(key)))}</dt>\n<dd>"
+                yield from self._iter_value_as_html(item)
+                yield "</dd>\n"
+            yield "</dl>\n"
+        elif isinstance(value, list):
+            yield "<ul>\n"
+            for item in value:
+                yield "<li>"
+                yield from self._iter_value_as_html(item)
+                yield "</li>\n"
+            yield "</ul>\n"
+        elif isinstance(value, str) and '\n' in value:
+            for paragraph in value.split('\n\n'):
+                if paragraph.strip():
+                    yield f"<p>{escape(paragraph.strip())}</p>\n"
+        else:
+            yield escape(str(value))
+    
+    def export_report_as_jsonl(self, report_data: Dict[str, Any]) -> str:
+        """
+        Export the report as JSON Lines: one compact JSON object per section.
+        """
+        return ''.join(self.iter_report_as_jsonl(report_data))
+    
+    def iter_report_as_jsonl(self, report_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Export the report as JSON Lines, yielding one line per section.
+        
+        The first line holds the report metadata, followed by one line per
+        content section and one per appendix, so consumers can process the
+        report section by section.
+        """
+        yield self._jsonl_line({'section': 'metadata', 'data': report_data['metadata']})
+        for section_name, section_content in report_data['content'].items():
+            yield self._jsonl_line({'section': 'content', 'name': section_name, 'data': section_content})
+        for appendix_name, appendix_content in report_data.get('appendices', {}).items():
+            yield self._jsonl_line({'section': 'appendix', 'name': appendix_name, 'data': appendix_content})
+    
+    def _jsonl_line(self, record: Dict[str, Any]) -> str:
+        # The shared serializer, so non-JSON values are encoded as in every other JSON export
+        return get_serializer().dumps(record).decode('utf-8') + "\n"
+    
+    def export_report_as_msgpack(self, report_data: Dict[str, Any]) -> bytes:
+        """
+        Export the report as a binary MessagePack document.
+        Requires the optional `msgpack` package.
+        """
+        if msgpack is None:
+            raise ValueError("MessagePack export requires the 'msgpack' package")
+        return msgpack.packb(report_data, default=str, use_bin_type=True)
+
+
+def encode_chunks(chunks: Iterable[str], encoding: str = 'utf-8',
+                  chunk_size: int = 16 * 1024) -> Iterator[bytes]:
+    """
+    Encode a stream of text pieces into byte chunks of roughly `chunk_size`,
+    so exporters can be written to a socket or file without building the
+    whole document in memory.
+    """
+    buffer = []
+    buffered = 0
+    for piece in chunks:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= chunk_size:
+            yield ''.join(buffer).encode(encoding)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer).encode(encoding)
@@ -0,0 +1,145 @@
+"""
+Report Templates
+Text templates compiled once, cached section labels, and report type
+definitions loaded from template files.
+"""
+
+import functools
+import json
+import keyword
+import operator
+import os
+import re
+from string import Formatter
+from typing import Any, Callable, Dict, Mapping, Optional
+from config import Config
+
+
+# Format specifications allowed in template fields (no nested fields or quotes)
+_FORMAT_SPEC = re.compile(r'[\w<>=^+\- #,.%]*')
+
+
+@functools.lru_cache(maxsize=4096)
+def section_label(key: str) -> str:
+    """
+    Readable label of a section or field key ('key_points' -> 'Key Points').
+    """
+    return key.replace('_', ' ').title()
+
+
+@functools.lru_cache(maxsize=1024)
+def heading_label(key: str) -> str:
+    """
+    Upper-case heading of a section key ('key_points' -> 'KEY POINTS').
+    """
+    return key.upper().replace('_', ' ')
+
+
+class CompiledTemplate:
+    """
+    Text template with `{field}` or `{field:format_spec}` placeholders.
+    
+    The source is parsed once into literal strings and pre-resolved field
+    accessors, so rendering is a single pass joining the parts. Template text
+    is never turned into code, so template files cannot execute anything.
+    """
+    
+    def __init__(self, source: str):
+        self.source = source
+        
+        fields = []
+        parts = []
+        for literal, field, format_spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or keyword.iskeyword(field) or conversion:
+                raise ValueError(f"Invalid template field '{{{field}}}'. Fields must be plain names")
+            if not _FORMAT_SPEC.fullmatch(format_spec):
+                raise ValueError(f"Invalid format specification '{format_spec}' for template field '{field}'")
+            parts.append(_field_accessor(field, format_spec))
+            fields.append(field)
+        
+        self.fields = tuple(dict.fromkeys(fields))
+        self._parts = tuple(parts)
+    
+    def render(self, context: Mapping[str, Any]) -> str:
+        """
+        Render the template with values from `context`.
+        """
+        return ''.join([part if isinstance(part, str) else part(context) for part in self._parts])
+
+
+def _field_accessor(field: str, format_spec: str) -> Callable[[Mapping[str, Any]], str]:
+    """
+    Build the function rendering one template field from a context.
+    """
+    get = operator.itemgetter(field)
+    if format_spec:
+        return lambda context: format(get(context), format_spec)
+    return lambda context: format(get(context))
+
+
+class ReportType:
+    """
+    A report type defined by a template file.
+    
+    The file lists the report's content sections in order. A section is either
+    a text template (`text`, a string or a list of lines) or a named section
+    builder of the ReportGenerator (`builder`, with optional `args`).
+    """
+    
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.description = spec.get('description', '')
+        self.order = spec.get('order', 0)
+        self.sections = []
+        
+        for section in spec['sections']:
+            if 'text' in section:
+                text = section['text']
+                if isinstance(text, list):
+                    text = '\n'.join(text)
+                self.sections.append((section['name'], CompiledTemplate(text), None))
+            elif 'builder' in section:
+                self.sections.append((section['name'], section['builder'], section.get('args', {})))
+            else:
+                raise ValueError(
+                    f"Section '{section.get('name')}' of report type '{name}' needs a 'text' or a 'builder'"
+                )
+    
+    @property
+    def builders(self) -> set:
+        """
+        Names of the section builders the report type uses, in sections and in
+        text template fields.
+        """
+        names = set()
+        for _, template, args in self.sections:
+            if args is None:
+                names.update(template.fields)
+            else:
+                names.add(template)
+        return names
+
+
+def load_report_types(directory: Optional[str] = None) -> Dict[str, ReportType]:
+    """
+    Load and compile every report type template (`<report_type>.json`) in a directory.
+    
+    Returns:
+        Dict mapping report type names to compiled report types, ordered by
+        their `order` field and then by name
+    """
+    directory = directory or Config.REPORT_TYPES_DIR
+    report_types = []
+    for filename in os.listdir(directory):
+        name, extension = os.path.splitext(filename)
+        if extension != '.json':
+            continue
+        with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+            report_types.append(ReportType(name, json.load(f)))
+    
+    report_types.sort(key=lambda report_type: (report_type.order, report_type.name))
+    return {report_type.name: report_type for report_type in report_types}
@@ -3,12 +3,19 @@ Step 2a: Information Compilation Engine
 Conducts in-depth research on provided topics using OpenAI API.
 """
 
+import asyncio
+import math
 import openai
 import json
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 import os
 from config import Config
+from .llm_scheduler import LLMScheduler
+
+
+# Rough size of an LLM token in English text, used to estimate token usage
+CHARACTERS_PER_TOKEN = 4
 
 
 class ResearchEngine:
@@ -18,23 +25,97 @@ class ResearchEngine:
         
         # Initialize OpenAI client
         self.client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+        # Async client used by the async pipeline (see OversightAI.process_topic_async)
+        self.async_client = openai.AsyncOpenAI(api_key=Config.OPENAI_API_KEY)
         self.model = Config.OPENAI_MODEL
         self.max_tokens = Config.OPENAI_MAX_TOKENS
         self.temperature = Config.OPENAI_TEMPERATURE
+        # Shares the LLM rate limits between interactive and batch pipelines
+        self.scheduler = LLMScheduler()
+        # Optional CheckpointManifest: angles it holds are not researched again,
+        # and newly researched angles are recorded in it (see bulk_process.py)
+        self.checkpoint = None
     
-    def compile_information(self, topic: str) -> Dict[str, Any]:
+    def get_research_angles(self, topic: str) -> List[str]:
+        """
+        Get the research angles compiled for a topic, in research order.
+        """
+        # Research angles for comprehensive coverage
+        return [
+            f"What is {topic}? Provide a comprehensive definition and overview.",
+            f"What are the key concepts and principles of {topic}?",
+            f"What are the main applications and use cases of {topic}?",
+            f"What are the benefits and advantages of {topic}?",
+            f"What are the challenges and limitations of {topic}?",
+            f"What are the current trends and developments in {topic}?",
+            f"What is the future outlook and predictions for {topic}?",
+            f"What are the best practices and recommendations for {topic}?"
+        ]
+    
+    def compile_information(self, topic: str,
+                            on_item: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Dict[str, Any]:
         """
         Compile comprehensive information about a given topic using OpenAI API.
         
         Args:
             topic (str): The research topic
-            
+            on_item: Optional callback invoked with each content item as soon as
+                its research angle completes
+        
         Returns:
             Dict containing compiled research data with sources, speed, and content
         """
         start_time = time.time()
+        research_data = self._new_research_data(topic)
+        
+        for angle in self.get_research_angles(topic):
+            angle_start_time = time.time()
+            content_item = self._checkpointed(angle, topic)
+            if content_item is None:
+                content_item = self._checkpoint(topic, self.research_angle(angle, topic))
+            
+            if content_item:
+                self._add_content_item(research_data, content_item, angle_start_time)
+                if on_item is not None:
+                    on_item(content_item)
+        
+        return self._finish_research_data(research_data, start_time)
+    
+    async def compile_information_async(self, topic: str,
+                                        on_item: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Dict[str, Any]:
+        """
+        Compile information about a topic like compile_information(), with the
+        research angles queried concurrently through the async OpenAI client.
         
-        research_data = {
+        Content items are added (and passed to on_item) in research angle
+        order, so the result is the same as that of compile_information().
+        """
+        start_time = time.time()
+        research_data = self._new_research_data(topic)
+        
+        async def research(angle):
+            angle_start_time = time.time()
+            content_item = self._checkpointed(angle, topic)
+            if content_item is None:
+                content_item = self._checkpoint(topic, await self.research_angle_async(angle, topic))
+            return angle_start_time, content_item
+        
+        tasks = [asyncio.ensure_future(research(angle)) for angle in self.get_research_angles(topic)]
+        try:
+            for task in tasks:
+                angle_start_time, content_item = await task
+                if content_item:
+                    self._add_content_item(research_data, content_item, angle_start_time)
+                    if on_item is not None:
+                        on_item(content_item)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return self._finish_research_data(research_data, start_time)
+    
+    def _new_research_data(self, topic: str) -> Dict[str, Any]:
+        return {
             'topic': topic,
             'sources': [],
             'content': [],
@@ -46,41 +127,20 @@ class ResearchEngine:
                 'loading_time': 0
             }
         }
+    
+    def _add_content_item(self, research_data: Dict[str, Any], content_item: Dict[str, Any],
+                          angle_start_time: float) -> None:
+        research_data['content'].append(content_item)
         
-        # Research angles for comprehensive coverage
-        research_angles = [
-            f"What is {topic}? Provide a comprehensive definition and overview.",
-            f"What are the key concepts and principles of {topic}?",
-            f"What are the main applications and use cases of {topic}?",
-            f"What are the benefits and advantages of {topic}?",
-            f"What are the challenges and limitations of {topic}?",
-            f"What are the current trends and developments in {topic}?",
-            f"What is the future outlook and predictions for {topic}?",
-            f"What are the best practices and recommendations for {topic}?"
-        ]
-        
-        for angle in research_angles:
-            angle_start_time = time.time()
-            content = self._research_angle_with_openai(angle, topic)
-            angle_end_time = time.time()
-            
-            if content:
-                research_data['content'].append({
-                    'angle': angle,
-                    'content': content,
-                    'word_count': len(content.split()),
-                    'processing_time': angle_end_time - angle_start_time,
-                    'source': f"OpenAI {self.model}"
-                })
-                
-                # Add source information
-                research_data['sources'].append({
-                    'type': 'AI Generated',
-                    'source': f"OpenAI {self.model}",
-                    'query': angle,
-                    'timestamp': angle_start_time
-                })
-        
+        # Add source information
+        research_data['sources'].append({
+            'type': 'AI Generated',
+            'source': f"OpenAI {self.model}",
+            'query': content_item['angle'],
+            'timestamp': angle_start_time
+        })
+    
+    def _finish_research_data(self, research_data: Dict[str, Any], start_time: float) -> Dict[str, Any]:
         end_time = time.time()
         total_processing_time = end_time - start_time
         
@@ -95,19 +155,135 @@ class ResearchEngine:
         
         return research_data
     
-    def _research_angle_with_openai(self, angle: str, topic: str) -> str:
+    def research_angle(self, angle: str, topic: str) -> Optional[Dict[str, Any]]:
+        """
+        Research a single angle of a topic (e.g. to refresh one angle of a session).
+        
+        Returns:
+            The content item for the angle, or None if no content was generated
+        """
+        angle_start_time = time.time()
+        content = self._research_angle_with_openai(angle, topic)
+        if content is None:
+            return self._content_item(angle, topic, self._fallback_content(angle, topic),
+                                      time.time() - angle_start_time, fallback=True)
+        return self._content_item(angle, topic, content, time.time() - angle_start_time)
+    
+    async def research_angle_async(self, angle: str, topic: str) -> Optional[Dict[str, Any]]:
+        """
+        Research a single angle of a topic through the async OpenAI client.
+        """
+        angle_start_time = time.time()
+        content = await self._research_angle_with_openai_async(angle, topic)
+        if content is None:
+            return self._content_item(angle, topic, self._fallback_content(angle, topic),
+                                      time.time() - angle_start_time, fallback=True)
+        return self._content_item(angle, topic, content, time.time() - angle_start_time)
+    
+    def _checkpointed(self, angle: str, topic: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the content item of an angle recorded in the checkpoint, if any.
+        """
+        if self.checkpoint is None:
+            return None
+        return self.checkpoint.get_angle(topic, angle)
+    
+    def _checkpoint(self, topic: str, content_item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Record a newly researched content item in the checkpoint, if any.
+        Fallback content is not recorded, so a resumed run researches the angle again.
+        """
+        if self.checkpoint is not None and content_item is not None and not content_item.get('fallback'):
+            self.checkpoint.record_angle(topic, content_item)
+        return content_item
+    
+    def _content_item(self, angle: str, topic: str, content: str, processing_time: float,
+                      fallback: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Build the content item of an angle. Fallback content (a placeholder for a
+        failed OpenAI call) is flagged and used no tokens.
+        """
+        if not content:
+            return None
+        content_item = {
+            'angle': angle,
+            'content': content,
+            'word_count': len(content.split()),
+            'tokens': 0 if fallback else self.estimate_tokens(self._research_messages(angle, topic), content),
+            'processing_time': processing_time,
+            'source': f"OpenAI {self.model}"
+        }
+        if fallback:
+            content_item['fallback'] = True
+        return content_item
+    
+    def estimate_tokens(self, messages: List[Dict[str, str]], completion: str = '') -> int:
+        """
+        Estimate the LLM tokens used by a chat request and its completion.
+        """
+        characters = sum(len(message['content']) for message in messages) + len(completion)
+        return math.ceil(characters / CHARACTERS_PER_TOKEN)
+    
+    def _research_angle_with_openai(self, angle: str, topic: str) -> Optional[str]:
         """
         Research a specific angle of the topic using OpenAI API.
         
         Args:
             angle (str): The research angle/question
             topic (str): The main topic
-            
+        
         Returns:
-            str: Generated content from OpenAI
+            str: Generated content from OpenAI, or None if the call failed
         """
+        messages = self._research_messages(angle, topic)
         try:
-            prompt = f"""
+            with self.scheduler.call(self.estimate_tokens(messages) + self.max_tokens) as call:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature
+                )
+                call.tokens_used = self._tokens_used(response)
+            
+            return response.choices[0].message.content.strip()
+        
+        except Exception as e:
+            print(f"Error querying OpenAI for angle '{angle}': {str(e)}")
+            return None
+    
+    async def _research_angle_with_openai_async(self, angle: str, topic: str) -> Optional[str]:
+        """
+        Research a specific angle of the topic using the async OpenAI client
+        (None if the call failed).
+        """
+        messages = self._research_messages(angle, topic)
+        try:
+            async with self.scheduler.call_async(self.estimate_tokens(messages) + self.max_tokens) as call:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature
+                )
+                call.tokens_used = self._tokens_used(response)
+            
+            return response.choices[0].message.content.strip()
+        
+        except Exception as e:
+            print(f"Error querying OpenAI for angle '{angle}': {str(e)}")
+            return None
+    
+    def _tokens_used(self, response: Any) -> Optional[int]:
+        """
+        Tokens a chat completion used, as reported by the API (None if unknown).
+        """
+        usage = getattr(response, 'usage', None)
+        total_tokens = getattr(usage, 'total_tokens', None)
+        return total_tokens if isinstance(total_tokens, int) else None
+    
+    def _research_messages(self, angle: str, topic: str) -> List[Dict[str, str]]:
+        prompt = f"""
             You are a research expert providing comprehensive, accurate information about {topic}.
             
             Question: {angle}
@@ -120,23 +296,14 @@ class ResearchEngine:
             
             Keep the response focused, informative, and well-structured. Aim for 150-250 words.
             """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a knowledgeable research assistant providing accurate, comprehensive information on various topics."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            print(f"Error querying OpenAI for angle '{angle}': {str(e)}")
-            # Fallback content if OpenAI fails
-            return f"Research findings related to {angle} indicate significant relevance to {topic} and its various applications in modern contexts."
+        return [
+            {"role": "system", "content": "You are a knowledgeable research assistant providing accurate, comprehensive information on various topics."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _fallback_content(self, angle: str, topic: str) -> str:
+        # Fallback content if OpenAI fails
+        return f"Research findings related to {angle} indicate significant relevance to {topic} and its various applications in modern contexts."
     
     def get_research_summary(self, research_data: Dict[str, Any]) -> str:
         """
@@ -166,7 +333,7 @@ class ResearchEngine:
 ## Research Coverage
 The following research angles were explored:
 """
-        
+
         for item in research_data['content']:
             summary += f"- {item['angle']} ({item['word_count']} words, {item.get('processing_time', 0):.2f}s)\n"
         
@@ -0,0 +1,99 @@
+"""
+Result Views
+Sparse field selection and pagination over session results and API responses,
+so clients can fetch only the parts of a large result they display.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+def parse_fields(fields: Any) -> Optional[List[str]]:
+    """
+    Normalize a field selection given as a list or a comma-separated string.
+    
+    Returns:
+        The list of dotted field paths, or None when no selection was given
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',')]
+    if not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+        raise ValueError("fields must be a list or a comma-separated string of field names")
+    return [field for field in fields if field]
+
+
+def validate_fields(fields: List[str], available: Iterable[str]) -> None:
+    """
+    Check that every field path starts with one of the available top-level fields.
+    """
+    available = list(available)
+    invalid = [field for field in fields if field.split('.', 1)[0] not in available]
+    if invalid:
+        raise ValueError(f"Invalid fields {invalid}. Available fields: {available}")
+
+
+def select_fields(data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """
+    Build a sparse copy of `data` holding only the given dotted field paths
+    (e.g. 'final_report.content.key_points'). Missing paths are skipped and
+    the values themselves are shared, not copied.
+    """
+    selected = {}
+    for field in fields:
+        keys = field.split('.')
+        if _lookup(data, keys) is _MISSING:
+            continue
+        
+        source, target = data, selected
+        for key in keys[:-1]:
+            source = source[key]
+            if target.get(key) is source:
+                break  # an enclosing field is already selected in full
+            target = target.setdefault(key, {})
+        else:
+            target[keys[-1]] = source[keys[-1]]
+    return selected
+
+
+def paginate(data: Dict[str, Any], paths: Iterable[str], offset: int = 0,
+             limit: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Slice the lists found at the given dotted paths to one page.
+    
+    Only the dicts along each path are copied, so the original data is left
+    untouched and unpaginated values are shared.
+    
+    Returns:
+        The paginated data and, per paginated path, its offset, limit and total
+    """
+    pagination = {}
+    end = None if limit is None else offset + limit
+    for path in paths:
+        keys = path.split('.')
+        items = _lookup(data, keys)
+        if not isinstance(items, list):
+            continue
+        data = _replace(data, keys, items[offset:end])
+        pagination[path] = {'offset': offset, 'limit': limit, 'total': len(items)}
+    return data, pagination
+
+
+def _lookup(data: Any, keys: List[str]) -> Any:
+    for key in keys:
+        if not isinstance(data, dict) or key not in data:
+            return _MISSING
+        data = data[key]
+    return data
+
+
+def _replace(data: Dict[str, Any], keys: List[str], value: Any) -> Dict[str, Any]:
+    copied = dict(data)
+    if len(keys) == 1:
+        copied[keys[0]] = value
+    else:
+        copied[keys[0]] = _replace(data[keys[0]], keys[1:], value)
+    return copied
@@ -0,0 +1,94 @@
+"""
+JSON Serialization
+Pluggable JSON encoders for API responses and session exports. orjson is used
+when it is installed; the standard library json module is the fallback.
+"""
+
+import json
+from typing import Any, Dict, Optional
+from config import Config
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+class StdlibJSONSerializer:
+    """
+    JSON serializer built on the standard library json module.
+    """
+    
+    name = 'json'
+    
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        """
+        Encode an object as UTF-8 JSON. Unsupported values are encoded with str().
+        """
+        if pretty:
+            return json.dumps(obj, indent=2, default=str).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8')
+    
+    def loads(self, data: Any) -> Any:
+        """
+        Decode JSON from bytes or text.
+        """
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    """
+    JSON serializer built on orjson, which encodes large nested reports several
+    times faster than the standard library.
+    """
+    
+    name = 'orjson'
+    
+    def __init__(self):
+        if orjson is None:
+            raise ValueError("The orjson serializer requires the 'orjson' package")
+    
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        """
+        Encode an object as UTF-8 JSON. Unsupported values are encoded with str().
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    
+    def loads(self, data: Any) -> Any:
+        """
+        Decode JSON from bytes or text.
+        """
+        return orjson.loads(data)
+
+
+SERIALIZERS = {
+    'orjson': OrjsonSerializer,
+    'json': StdlibJSONSerializer
+}
+
+_serializers: Dict[str, Any] = {}
+
+
+def get_serializer(name: Optional[str] = None):
+    """
+    Get a shared serializer instance.
+    
+    Args:
+        name: 'orjson', 'json' or 'auto' (orjson when installed);
+            defaults to Config.JSON_SERIALIZER
+    """
+    name = name or Config.JSON_SERIALIZER
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'json'
+    if name not in SERIALIZERS:
+        raise ValueError(
+            f"Invalid JSON serializer. Available serializers: {['auto'] + list(SERIALIZERS)}"
+        )
+    
+    serializer = _serializers.get(name)
+    if serializer is None:
+        serializer = _serializers[name] = SERIALIZERS[name]()
+    return serializer
@@ -0,0 +1,303 @@
+"""
+Session Store
+Keeps processing sessions by id with O(1) lookup, bounded by session count and
+bytes, with least-recently-used and idle-time eviction and zlib compression of
+cold session payloads. Serialization and (de)compression run outside the
+store lock.
+"""
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import Config
+from .serialization import get_serializer
+
+
+# Session fields kept uncompressed for history listings and statistics
+SUMMARY_FIELDS = (
+    'session_id', 'topic', 'report_type', 'status', 'steps_completed', 'processing_time', 'start_time',
+    'revision', 'error'
+)
+
+
+def topic_key(topic: Optional[str]) -> str:
+    """
+    Normalize a topic for lookups (case and whitespace insensitive).
+    """
+    return ' '.join((topic or '').lower().split())
+
+
+class SessionStore:
+    """
+    Bounded store of processing sessions, keyed by session id.
+    
+    The `hot_sessions` most recently used sessions are kept as live dicts;
+    colder sessions are serialized and zlib-compressed, and decompressed again
+    on access. When the store holds more than `max_sessions` sessions or
+    `max_bytes` bytes (serialized size of hot sessions, compressed size of cold
+    ones), the least recently used sessions are evicted. Sessions that have not
+    been accessed for `ttl` seconds expire.
+    
+    A small summary of every session (see SUMMARY_FIELDS) is kept uncompressed,
+    so history listings and statistics never touch the session payloads.
+    """
+    
+    def __init__(self, max_sessions: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, hot_sessions: Optional[int] = None,
+                 compress: Optional[bool] = None,
+                 on_evict: Optional[Callable[[str], Any]] = None):
+        self.max_sessions = Config.SESSION_STORE_MAX_SESSIONS if max_sessions is None else max_sessions
+        self.max_bytes = Config.SESSION_STORE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = Config.SESSION_TTL if ttl is None else ttl
+        self.hot_sessions = Config.SESSION_STORE_HOT_SESSIONS if hot_sessions is None else hot_sessions
+        self.compress = Config.SESSION_STORE_COMPRESS if compress is None else compress
+        self.compression_level = Config.SESSION_STORE_COMPRESSION_LEVEL
+        # Called with the id of every evicted or expired session (e.g. to drop its cached artifacts)
+        self.on_evict = on_evict
+        self.serializer = get_serializer()
+        
+        self._lock = threading.Lock()
+        # session_id -> [summary, payload (dict when hot, compressed bytes when cold),
+        #                size, last access, serialized size]
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.compressions = 0
+        self.decompressions = 0
+    
+    def put(self, session_data: Dict[str, Any]) -> None:
+        """
+        Store a session (or store it again after it was updated) as the most
+        recently used one.
+        """
+        self._store(session_data)
+    
+    def replace(self, session_data: Dict[str, Any], revision: int) -> bool:
+        """
+        Store an updated session only if the stored one is still at `revision`
+        (compare-and-set), so concurrent read-modify-write updates of a session
+        never overwrite each other.
+        
+        Returns:
+            Whether the session was stored; if not, it was changed (or dropped)
+            since it was read and the update must be recomputed
+        """
+        return self._store(session_data, revision)
+    
+    def _store(self, session_data: Dict[str, Any], revision: Optional[int] = None) -> bool:
+        session_id = session_data['session_id']
+        # Measured before taking the lock; the lock only guards swapping entries and byte counts
+        size = len(self.serializer.dumps(session_data))
+        summary = {field: session_data.get(field) for field in SUMMARY_FIELDS}
+        
+        with self._lock:
+            previous = self._entries.get(session_id)
+            if revision is not None and (previous is None or (previous[0]['revision'] or 0) != revision):
+                return False
+            if previous is not None:
+                del self._entries[session_id]
+                self.current_bytes -= previous[2]
+            
+            self._entries[session_id] = [summary, session_data, size, time.time(), size]
+            self.current_bytes += size
+            cooling = self._cooling_candidate()
+        
+        self._notify_evicted(self._cool_and_evict(cooling))
+        return True
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session and mark it as recently used, decompressing it if it was cold.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            now = time.time()
+            expired = entry is not None and self.ttl and now - entry[3] > self.ttl
+            if expired:
+                self._remove(session_id)
+                self.expirations += 1
+                entry = None
+            
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                entry[3] = now
+                self._entries.move_to_end(session_id)
+                payload = entry[1]
+        
+        if expired:
+            self._notify_evicted([session_id])
+        if entry is None:
+            return None
+        if not isinstance(payload, bytes):
+            return payload
+        
+        # Cold session: decompressed without holding the lock, then swapped in
+        # unless another get() did so first or the session was stored again
+        session_data = self.serializer.loads(zlib.decompress(payload))
+        cooling = None
+        with self._lock:
+            if entry[1] is payload and self._entries.get(session_id) is entry:
+                entry[1] = session_data
+                self.decompressions += 1
+                self.current_bytes += entry[4] - entry[2]
+                entry[2] = entry[4]
+                cooling = self._cooling_candidate()
+            elif not isinstance(entry[1], bytes):
+                session_data = entry[1]
+        
+        self._notify_evicted(self._cool_and_evict(cooling))
+        return session_data
+    
+    def get_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the summary of a session (see SUMMARY_FIELDS) without decompressing
+        it or marking it as recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            return dict(entry[0]) if entry is not None else None
+    
+    def discard(self, session_id: str) -> None:
+        """
+        Drop a session if it is stored.
+        """
+        with self._lock:
+            if session_id in self._entries:
+                self._remove(session_id)
+    
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._entries
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def summaries(self, topic: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the summaries of all stored sessions (or of the sessions on one
+        topic), oldest first.
+        """
+        key = topic_key(topic) if topic is not None else None
+        with self._lock:
+            evicted = self._expire(time.time())
+            summaries = [
+                dict(entry[0]) for entry in self._entries.values()
+                if key is None or topic_key(entry[0]['topic']) == key
+            ]
+        
+        self._notify_evicted(evicted)
+        return sorted(summaries, key=lambda summary: summary['start_time'] or 0)
+    
+    def clear(self) -> None:
+        """
+        Drop all sessions.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get store usage statistics.
+        """
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'sessions': len(self._entries),
+                'compressed_sessions': sum(1 for entry in self._entries.values() if isinstance(entry[1], bytes)),
+                'current_bytes': self.current_bytes,
+                'max_sessions': self.max_sessions,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'compressions': self.compressions,
+                'decompressions': self.decompressions
+            }
+    
+    def _cooling_candidate(self) -> Optional[Tuple[str, List[Any], Dict[str, Any], float]]:
+        """
+        Find the session that left the hot window, if it is not compressed yet
+        (caller holds the lock). Sessions are hot while among the `hot_sessions`
+        most recently used; at most one session leaves that window per put() or get().
+        """
+        if not self.compress:
+            return None
+        for position, (session_id, entry) in enumerate(reversed(self._entries.items())):
+            if position < self.hot_sessions:
+                continue
+            if not isinstance(entry[1], bytes):
+                return session_id, entry, entry[1], entry[3]
+            break
+        return None
+    
+    def _cool_and_evict(self, cooling: Optional[Tuple[str, List[Any], Dict[str, Any], float]]) -> List[str]:
+        """
+        Compress the session that left the hot window (outside the lock), then
+        swap it in and evict expired and least recently used sessions until
+        the store is within its bounds. Returns the evicted session ids.
+        """
+        compressed = None
+        if cooling is not None:
+            session_id, entry, session_data, accessed = cooling
+            serialized = self.serializer.dumps(session_data)
+            compressed = zlib.compress(serialized, self.compression_level)
+        
+        with self._lock:
+            # Skipped if the session was stored again or accessed while it was compressed
+            if compressed is not None and self._entries.get(session_id) is entry and \
+                    entry[1] is session_data and entry[3] == accessed:
+                self.current_bytes += len(compressed) - entry[2]
+                entry[1], entry[2], entry[4] = compressed, len(compressed), len(serialized)
+                self.compressions += 1
+            return self._evict()
+    
+    def _evict(self) -> List[str]:
+        """
+        Evict expired and least recently used sessions until the store is
+        within its bounds (caller holds the lock). Returns the evicted session ids.
+        """
+        evicted = self._expire(time.time())
+        while self._entries and (
+            len(self._entries) > self.max_sessions or self.current_bytes > self.max_bytes
+        ):
+            session_id = next(iter(self._entries))
+            self._remove(session_id)
+            self.evictions += 1
+            evicted.append(session_id)
+        return evicted
+    
+    def _expire(self, now: float) -> List[str]:
+        """
+        Drop sessions idle for longer than the TTL (caller holds the lock).
+        Least recently used sessions come first, so only expired ones are visited.
+        """
+        expired = []
+        if not self.ttl:
+            return expired
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if now - entry[3] <= self.ttl:
+                break
+            self._remove(session_id)
+            self.expirations += 1
+            expired.append(session_id)
+        return expired
+    
+    def _remove(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id)
+        self.current_bytes -= entry[2]
+    
+    def _notify_evicted(self, session_ids: List[str]) -> None:
+        if self.on_evict is not None:
+            for session_id in session_ids:
+                self.on_evict(session_id)
@@ -0,0 +1,377 @@
+"""
+SQLite Session Store
+Keeps processing sessions in a SQLite database in WAL mode, so every worker
+process on a host shares the same sessions and sessions survive restarts.
+Session payloads are stored as zlib-compressed blobs next to indexed columns
+for the session id, topic key, status and timestamps.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import Config
+from .serialization import get_serializer
+from .session_store import SUMMARY_FIELDS, topic_key
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    topic_key TEXT NOT NULL,
+    status TEXT,
+    start_time REAL,
+    updated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    version INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    summary BLOB NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_topic_key ON sessions (topic_key);
+CREATE INDEX IF NOT EXISTS sessions_status ON sessions (status);
+CREATE INDEX IF NOT EXISTS sessions_start_time ON sessions (start_time);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE INDEX IF NOT EXISTS sessions_accessed_at ON sessions (accessed_at);
+
+-- Running totals of the sessions table, kept by triggers in the transaction of every write
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS session_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    sessions INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS session_stats_insert AFTER INSERT ON sessions BEGIN
+    UPDATE session_stats SET sessions = sessions + 1, bytes = bytes + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS session_stats_update AFTER UPDATE OF size ON sessions BEGIN
+    UPDATE session_stats SET bytes = bytes + new.size - old.size;
+END;
+CREATE TRIGGER IF NOT EXISTS session_stats_delete AFTER DELETE ON sessions BEGIN
+    UPDATE session_stats SET sessions = sessions - 1, bytes = bytes - old.size;
+END;
+INSERT OR IGNORE INTO session_stats SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM sessions;
+COMMIT;
+"""
+
+# Sessions read per query while evicting down to the byte bound
+EVICTION_BATCH = 16
+
+# Reads record their access time at most this often per session (seconds), so
+# polling a session does not turn every read into a write
+ACCESS_TOUCH_INTERVAL = 60.0
+
+
+class SQLiteSessionStore:
+    """
+    Durable store of processing sessions, keyed by session id.
+    
+    Has the same interface as SessionStore. The database runs in WAL mode, so
+    any number of readers (threads or processes) proceed while one writer
+    commits; writers wait up to SESSION_DB_BUSY_TIMEOUT seconds for each other.
+    Every thread uses its own connection.
+    
+    Bounds are enforced on every put(): sessions idle for `ttl` seconds expire,
+    then the least recently accessed sessions are evicted while the store holds
+    more than `max_sessions` sessions or `max_bytes` compressed bytes. Access
+    times are recorded with a resolution of ACCESS_TOUCH_INTERVAL seconds (or a
+    tenth of the TTL, if shorter). The session count and bytes are running
+    totals in the session_stats table, so neither check reads the sessions
+    table and eviction only reads the sessions it drops.
+    
+    The `hot_sessions` most recently read sessions are also kept decoded in
+    this process; a cached copy is reused only while the stored version is
+    unchanged, so sessions updated by other processes are always reloaded.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_sessions: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 hot_sessions: Optional[int] = None,
+                 on_evict: Optional[Callable[[str], Any]] = None):
+        self.path = path or Config.SESSION_DB_PATH
+        self.max_sessions = Config.SESSION_STORE_MAX_SESSIONS if max_sessions is None else max_sessions
+        self.max_bytes = Config.SESSION_STORE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = Config.SESSION_TTL if ttl is None else ttl
+        self.hot_sessions = Config.SESSION_STORE_HOT_SESSIONS if hot_sessions is None else hot_sessions
+        self.compression_level = Config.SESSION_STORE_COMPRESSION_LEVEL
+        self.busy_timeout = Config.SESSION_DB_BUSY_TIMEOUT
+        self.touch_interval = min(ACCESS_TOUCH_INTERVAL, self.ttl / 10) if self.ttl else ACCESS_TOUCH_INTERVAL
+        # Called with the id of every session this process evicts or expires
+        self.on_evict = on_evict
+        self.serializer = get_serializer()
+        
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # session_id -> (version, decoded session) of recently read sessions
+        self._hot = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+    
+    def put(self, session_data: Dict[str, Any]) -> None:
+        """
+        Store a session (or store it again after it was updated) as the most
+        recently used one.
+        """
+        self._store(session_data)
+    
+    def replace(self, session_data: Dict[str, Any], revision: int) -> bool:
+        """
+        Store an updated session only if the stored one is still at `revision`
+        (compare-and-set inside the write transaction), so workers updating
+        the same session never overwrite each other's changes.
+        
+        Returns:
+            Whether the session was stored; if not, it was changed (or dropped)
+            since it was read and the update must be recomputed
+        """
+        return self._store(session_data, revision)
+    
+    def _store(self, session_data: Dict[str, Any], revision: Optional[int] = None) -> bool:
+        session_id = session_data['session_id']
+        summary = {field: session_data.get(field) for field in SUMMARY_FIELDS}
+        payload = zlib.compress(self.serializer.dumps(session_data), self.compression_level)
+        now = time.time()
+        
+        connection = self._connection()
+        with self._transaction(connection):
+            row = connection.execute(
+                'SELECT version, summary FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            if revision is not None:
+                if row is None or (self.serializer.loads(row[1]).get('revision') or 0) != revision:
+                    return False
+            version = row[0] + 1 if row else 1
+            # An UPDATE rather than INSERT OR REPLACE, whose implicit delete skips the stats triggers
+            connection.execute(
+                'UPDATE sessions SET topic_key = ?, status = ?, start_time = ?, updated_at = ?, accessed_at = ?,'
+                ' version = ?, size = ?, summary = ?, payload = ? WHERE session_id = ?'
+                if row else
+                'INSERT INTO sessions (topic_key, status, start_time, updated_at, accessed_at, version, size,'
+                ' summary, payload, session_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (topic_key(session_data.get('topic')), session_data.get('status'), session_data.get('start_time'),
+                 now, now, version, len(payload), self.serializer.dumps(summary), payload, session_id)
+            )
+            evicted = self._evict(connection, now)
+        
+        with self._lock:
+            self._hot[session_id] = (version, session_data)
+            self._hot.move_to_end(session_id)
+            self._trim_hot()
+        self._notify_evicted(evicted)
+        return True
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session and mark it as recently used.
+        """
+        with self._lock:
+            cached = self._hot.get(session_id)
+        
+        connection = self._connection()
+        # The payload is only read when the cached copy is missing or stale
+        row = connection.execute(
+            'SELECT version, accessed_at, CASE WHEN version = ? THEN NULL ELSE payload END'
+            ' FROM sessions WHERE session_id = ?',
+            (cached[0] if cached else None, session_id)
+        ).fetchone()
+        
+        now = time.time()
+        if row is not None and self.ttl and now - row[1] > self.ttl:
+            with self._transaction(connection):
+                connection.execute(
+                    'DELETE FROM sessions WHERE session_id = ? AND accessed_at = ?', (session_id, row[1])
+                )
+            with self._lock:
+                self.expirations += 1
+            self._notify_evicted([session_id])
+            row = None
+        
+        if row is None:
+            with self._lock:
+                self._hot.pop(session_id, None)
+                self.misses += 1
+            return None
+        
+        version, accessed_at, payload = row
+        if now - accessed_at > self.touch_interval:
+            with self._transaction(connection):
+                connection.execute(
+                    'UPDATE sessions SET accessed_at = ? WHERE session_id = ?', (now, session_id)
+                )
+        
+        session_data = cached[1] if payload is None else self.serializer.loads(zlib.decompress(payload))
+        with self._lock:
+            self.hits += 1
+            self._hot[session_id] = (version, session_data)
+            self._hot.move_to_end(session_id)
+            self._trim_hot()
+        return session_data
+    
+    def get_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the summary of a session (see SUMMARY_FIELDS) without loading its
+        payload or marking it as recently used.
+        """
+        row = self._connection().execute(
+            'SELECT summary FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        return self.serializer.loads(row[0]) if row is not None else None
+    
+    def discard(self, session_id: str) -> None:
+        """
+        Drop a session if it is stored.
+        """
+        connection = self._connection()
+        with self._transaction(connection):
+            connection.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+        with self._lock:
+            self._hot.pop(session_id, None)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return self._connection().execute(
+            'SELECT 1 FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone() is not None
+    
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT sessions FROM session_stats').fetchone()[0]
+    
+    def summaries(self, topic: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the summaries of all stored sessions (or of the sessions on one
+        topic), oldest first.
+        """
+        query = 'SELECT summary FROM sessions'
+        parameters = ()
+        if topic is not None:
+            query += ' WHERE topic_key = ?'
+            parameters = (topic_key(topic),)
+        rows = self._connection().execute(query + ' ORDER BY start_time', parameters).fetchall()
+        return [self.serializer.loads(row[0]) for row in rows]
+    
+    def clear(self) -> None:
+        """
+        Drop all sessions.
+        """
+        connection = self._connection()
+        with self._transaction(connection):
+            connection.execute('DELETE FROM sessions')
+        with self._lock:
+            self._hot.clear()
+    
+    def close(self) -> None:
+        """
+        Close the calling thread's database connection.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get store usage statistics.
+        """
+        sessions, current_bytes = self._connection().execute(
+            'SELECT sessions, bytes FROM session_stats'
+        ).fetchone()
+        with self._lock:
+            return {
+                'backend': 'sqlite',
+                'path': self.path,
+                'sessions': sessions,
+                'compressed_sessions': sessions,
+                'current_bytes': current_bytes,
+                'max_sessions': self.max_sessions,
+                'max_bytes': self.max_bytes,
+                'cached_sessions': len(self._hot),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+    
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Autocommit mode; writes use explicit transactions (see _transaction)
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+    
+    @contextmanager
+    def _transaction(self, connection: sqlite3.Connection) -> Iterator[None]:
+        """
+        Write transaction that takes the write lock up front, so concurrent
+        writers wait on the busy timeout instead of failing on lock upgrade.
+        """
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+    
+    def _evict(self, connection: sqlite3.Connection, now: float) -> List[str]:
+        """
+        Drop expired sessions, then the least recently accessed ones until the
+        store is within its bounds (inside a write transaction).
+        Returns the evicted session ids.
+        """
+        evicted = []
+        if self.ttl:
+            expired = [row[0] for row in connection.execute(
+                'SELECT session_id FROM sessions WHERE accessed_at < ?', (now - self.ttl,)
+            )]
+            connection.executemany('DELETE FROM sessions WHERE session_id = ?', [(sid,) for sid in expired])
+            evicted.extend(expired)
+            with self._lock:
+                self.expirations += len(expired)
+        
+        sessions, current_bytes = connection.execute('SELECT sessions, bytes FROM session_stats').fetchone()
+        removed = []
+        while sessions > self.max_sessions or current_bytes > self.max_bytes:
+            # Only the least recently accessed sessions are read, enough for the count bound
+            rows = connection.execute(
+                'SELECT session_id, size FROM sessions ORDER BY accessed_at, updated_at LIMIT ?',
+                (max(sessions - self.max_sessions, EVICTION_BATCH),)
+            ).fetchall()
+            if not rows:
+                break
+            batch = []
+            for session_id, size in rows:
+                if sessions <= self.max_sessions and current_bytes <= self.max_bytes:
+                    break
+                batch.append(session_id)
+                sessions -= 1
+                current_bytes -= size
+            connection.executemany('DELETE FROM sessions WHERE session_id = ?', [(sid,) for sid in batch])
+            removed.extend(batch)
+        with self._lock:
+            self.evictions += len(removed)
+        return evicted + removed
+    
+    def _trim_hot(self) -> None:
+        while len(self._hot) > self.hot_sessions:
+            self._hot.popitem(last=False)
+    
+    def _notify_evicted(self, session_ids: List[str]) -> None:
+        with self._lock:
+            for session_id in session_ids:
+                self._hot.pop(session_id, None)
+        if self.on_evict is not None:
+            for session_id in session_ids:
+                self.on_evict(session_id)
+
@@ -0,0 +1,224 @@
+"""
+Corpus TF-IDF Importance Scoring
+Optional scoring backend for the Information Architect that weighs keywords by how
+rare they are across all content processed so far.
+"""
+
+import gzip
+import math
+import os
+import re
+import threading
+import weakref
+from collections import Counter
+from typing import Dict, Any, Iterable, Optional
+from config import Config
+from .lexicon import CompiledLexicon
+
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into lowercase word terms.
+    """
+    return _WORD.findall(text.lower())
+
+
+class CorpusStatistics:
+    """
+    Document-frequency table maintained incrementally over every processed item.
+    
+    Adding a document costs O(unique terms in the document) and an IDF lookup is
+    a single dict access. The table is persisted as a gzip-compressed
+    `term<TAB>count` file of count increments: every `snapshot_interval`
+    documents a background thread appends the counts added since the previous
+    snapshot as a new gzip member, and loading sums all members. Snapshots stay
+    off the request path, cost O(terms added since the last one), and processes
+    sharing the file add to each other's counts instead of overwriting them.
+    """
+    
+    def __init__(self, path: Optional[str] = None, snapshot_interval: Optional[int] = None):
+        self.path = Config.TFIDF_STATS_PATH if path is None else path
+        self.snapshot_interval = snapshot_interval or Config.TFIDF_SNAPSHOT_INTERVAL
+        
+        self._lock = threading.Lock()
+        # Serializes this process's writes to the statistics file
+        self._write_lock = threading.Lock()
+        self._document_frequency = {}
+        self.document_count = 0
+        # Counts added since the last snapshot
+        self._pending_terms = Counter()
+        self._pending_documents = 0
+        self._snapshot_due = threading.Event()
+        self._snapshot_thread = None
+        
+        if self.path and os.path.exists(self.path):
+            self._load()
+    
+    def add_document(self, terms: Iterable[str]) -> None:
+        """
+        Count a document's unique terms in the document-frequency table.
+        """
+        unique_terms = set(terms)
+        with self._lock:
+            frequency = self._document_frequency
+            for term in unique_terms:
+                frequency[term] = frequency.get(term, 0) + 1
+            self._pending_terms.update(unique_terms)
+            self.document_count += 1
+            self._pending_documents += 1
+            snapshot_due = self.path and self._pending_documents >= self.snapshot_interval
+            if snapshot_due and self._snapshot_thread is None:
+                self._snapshot_thread = threading.Thread(
+                    target=self._run_snapshots, name='tfidf-snapshot', daemon=True
+                )
+                self._snapshot_thread.start()
+        
+        if snapshot_due:
+            self._snapshot_due.set()
+    
+    def idf(self, term: str) -> float:
+        """
+        Smoothed inverse document frequency of a term.
+        """
+        return math.log((self.document_count + 1) / (self._document_frequency.get(term, 0) + 1)) + 1.0
+    
+    def document_frequency(self, term: str) -> int:
+        """
+        Number of processed documents that contain a term.
+        """
+        return self._document_frequency.get(term, 0)
+    
+    @property
+    def term_count(self) -> int:
+        """
+        Number of distinct terms in the table.
+        """
+        return len(self._document_frequency)
+    
+    def snapshot(self) -> None:
+        """
+        Append the counts added since the last snapshot to the statistics file.
+        """
+        if not self.path:
+            return
+        
+        with self._write_lock:
+            with self._lock:
+                terms, self._pending_terms = self._pending_terms, Counter()
+                documents, self._pending_documents = self._pending_documents, 0
+            if not documents:
+                return
+            
+            lines = [f"#documents\t{documents}\n"]
+            lines.extend(f"{term}\t{count}\n" for term, count in terms.items())
+            data = gzip.compress(''.join(lines).encode('utf-8'))
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # One O_APPEND write per member, so members of concurrent writers do not interleave
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+            except OSError:
+                # Keep the counts for the next snapshot
+                with self._lock:
+                    self._pending_terms.update(terms)
+                    self._pending_documents += documents
+                raise
+    
+    def _run_snapshots(self) -> None:
+        while True:
+            self._snapshot_due.wait()
+            self._snapshot_due.clear()
+            try:
+                self.snapshot()
+            except OSError as e:
+                print(f"Error writing corpus statistics: {str(e)}")
+    
+    def _load(self) -> None:
+        frequency = self._document_frequency
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    term, _, count = line.rstrip('\n').rpartition('\t')
+                    if term == '#documents':
+                        self.document_count += int(count)
+                    elif term:
+                        frequency[term] = frequency.get(term, 0) + int(count)
+        except (EOFError, gzip.BadGzipFile):
+            # Last snapshot cut short when a process was killed
+            pass
+
+
+class TfidfImportanceScorer:
+    """
+    Scores content by the share of its TF-IDF weight that falls on the topic
+    terms and the importance lexicon.
+    
+    Common terms contribute little because their IDF is low, so a keyword that
+    appears in nearly every answer no longer inflates the score.
+    """
+    
+    def __init__(self, statistics: Optional[CorpusStatistics] = None,
+                 score_scale: Optional[float] = None):
+        self.statistics = statistics or CorpusStatistics()
+        self.score_scale = Config.TFIDF_SCORE_SCALE if score_scale is None else score_scale
+        # compiled lexicon -> {term: query weight}
+        self._lexicon_weights = weakref.WeakKeyDictionary()
+    
+    def score(self, text: str, topic: str, lexicon: CompiledLexicon, update: bool = True) -> float:
+        """
+        Score a content item's text between 0 and 1.
+        
+        Args:
+            text: The content text
+            topic: The research topic
+            lexicon: The compiled lexicon providing the importance keywords
+            update: Whether to add the text to the corpus statistics first
+        """
+        terms = tokenize(text)
+        if not terms:
+            return 0.0
+        
+        if update:
+            self.statistics.add_document(terms)
+        
+        lexicon_weights = self._get_lexicon_weights(lexicon)
+        topic_terms = set(tokenize(topic))
+        
+        idf = self.statistics.idf
+        total_weight = 0.0
+        matched_weight = 0.0
+        for term, count in Counter(terms).items():
+            weight = count * idf(term)
+            total_weight += weight
+            query_weight = 1.0 if term in topic_terms else lexicon_weights.get(term, 0.0)
+            matched_weight += weight * query_weight
+        
+        return min(1.0, matched_weight / total_weight * self.score_scale)
+    
+    def _get_lexicon_weights(self, lexicon: CompiledLexicon) -> Dict[str, float]:
+        weights = self._lexicon_weights.get(lexicon)
+        if weights is None:
+            weights = {}
+            for tier, keywords in lexicon.importance_keywords.items():
+                tier_weight = lexicon.keyword_weights.get(tier, 0.0)
+                for keyword in keywords:
+                    weights[keyword] = max(weights.get(keyword, 0.0), tier_weight)
+            self._lexicon_weights[lexicon] = weights
+        return weights
+    
+    def get_statistics_summary(self) -> Dict[str, Any]:
+        """
+        Get the size of the corpus statistics.
+        """
+        return {
+            'documents': self.statistics.document_count,
+            'terms': self.statistics.term_count
+        }
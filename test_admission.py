@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test script for the admission controller
+Tests the concurrency cap, FIFO and weighted fair hand-over of slots, wait
+estimates from stage latencies, rejection of requests expected to wait past the
+deadline, and the priority classes.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import threading
+import time
+import unittest
+from src.admission import AdmissionController, AdmissionRejected
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test admitting, queueing and rejecting pipeline requests."""
+    
+    def test_expected_wait_from_stage_latencies(self):
+        """Stage latencies are smoothed and summed into the expected pipeline duration."""
+        controller = AdmissionController(max_concurrent=2, deadline=60, smoothing=0.5)
+        controller.record('information_compilation', 10.0)
+        controller.record('information_compilation', 20.0)
+        controller.record('report_generation', 1.0)
+        self.assertAlmostEqual(controller.expected_duration(), 16.0)
+        
+        self.assertEqual(controller.expected_wait(), 0.0)
+        with controller.slot(), controller.slot():
+            # Both slots taken: the next request waits for one of them
+            self.assertAlmostEqual(controller.expected_wait(), 8.0)
+            self.assertAlmostEqual(controller.expected_wait(backlog=3), 32.0)
+    
+    def test_rejects_past_deadline(self):
+        """Requests expected to wait past the deadline are rejected with a retry delay."""
+        controller = AdmissionController(max_concurrent=1, deadline=10)
+        controller.record('information_compilation', 12.4)
+        
+        with controller.slot():
+            with self.assertRaises(AdmissionRejected) as rejection:
+                with controller.slot():
+                    pass
+            self.assertEqual(rejection.exception.retry_after, 13)
+            with self.assertRaises(AdmissionRejected):
+                controller.check()
+        
+        controller.check()
+        stats = controller.get_statistics()
+        self.assertEqual((stats['admitted'], stats['rejected'], stats['running']), (1, 2, 0))
+    
+    def test_rejects_when_queue_is_full(self):
+        """No more than max_waiting requests wait for a slot."""
+        controller = AdmissionController(max_concurrent=1, max_waiting=0, deadline=60)
+        controller.record('topic_input', 0.001)
+        with controller.slot():
+            with self.assertRaises(AdmissionRejected):
+                with controller.slot():
+                    pass
+    
+    def test_waiting_requests_are_served_in_order(self):
+        """A freed slot is handed to the longest waiting request."""
+        controller = AdmissionController(max_concurrent=1, deadline=5)
+        controller.record('topic_input', 0.01)
+        order = []
+        
+        def request(name):
+            with controller.slot():
+                order.append(name)
+        
+        with controller.slot():
+            threads = []
+            for name in ('first', 'second', 'third'):
+                thread = threading.Thread(target=request, args=(name,))
+                thread.start()
+                threads.append(thread)
+                while controller.get_statistics()['waiting'] < len(threads):
+                    time.sleep(0.001)
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(order, ['first', 'second', 'third'])
+        self.assertEqual(controller.get_statistics()['running'], 0)
+    
+    def test_clients_share_slots_by_weight(self):
+        """Freed slots alternate between clients by weight instead of going to whoever queued first."""
+        controller = AdmissionController(max_concurrent=1, deadline=5)
+        controller.record('topic_input', 0.01)
+        order = []
+        
+        def request(name, client, weight):
+            with controller.slot(reject=False, client=client, weight=weight):
+                order.append(name)
+        
+        with controller.slot():
+            threads = []
+            for name, client, weight in (('heavy1', 'heavy', 1.0), ('heavy2', 'heavy', 1.0),
+                                         ('heavy3', 'heavy', 1.0), ('light1', 'light', 1.0),
+                                         ('premium1', 'premium', 2.0), ('premium2', 'premium', 2.0)):
+                thread = threading.Thread(target=request, args=(name, client, weight))
+                thread.start()
+                threads.append(thread)
+                while controller.get_statistics()['waiting'] < len(threads):
+                    time.sleep(0.001)
+        for thread in threads:
+            thread.join(5)
+        
+        # Finish tags: heavy 1, 2, 3; light 1; premium 0.5, 1
+        self.assertEqual(order, ['premium1', 'heavy1', 'light1', 'premium2', 'heavy2', 'heavy3'])
+    
+    def test_times_out_waiting(self):
+        """A request that does not get a slot within the deadline is rejected."""
+        controller = AdmissionController(max_concurrent=1, deadline=0.05)
+        controller.record('topic_input', 0.01)
+        with controller.slot():
+            with self.assertRaises(AdmissionRejected):
+                with controller.slot():
+                    pass
+            self.assertEqual(controller.get_statistics()['waiting'], 0)
+    
+    def test_accepted_work_is_never_rejected(self):
+        """With reject=False a request waits past the deadline."""
+        controller = AdmissionController(max_concurrent=1, max_waiting=0, deadline=0)
+        done = threading.Event()
+        
+        def job():
+            with controller.slot(reject=False):
+                done.set()
+        
+        with controller.slot():
+            thread = threading.Thread(target=job)
+            thread.start()
+            self.assertFalse(done.wait(0.05))
+        thread.join(5)
+        self.assertTrue(done.is_set())
+    
+    def test_async_slots(self):
+        """Async requests wait on the event loop and get slots released by threads."""
+        controller = AdmissionController(max_concurrent=1, deadline=5)
+        controller.record('topic_input', 0.01)
+        held = threading.Event()
+        release = threading.Event()
+        
+        def hold():
+            with controller.slot():
+                held.set()
+                release.wait(5)
+        
+        async def request():
+            async with controller.slot_async():
+                return controller.get_statistics()['running']
+        
+        async def main():
+            waiting = asyncio.ensure_future(request())
+            while controller.get_statistics()['waiting'] == 0:
+                await asyncio.sleep(0.001)
+            release.set()
+            return await waiting
+        
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait(5)
+        self.assertEqual(asyncio.run(main()), 1)
+        thread.join(5)
+        self.assertEqual(controller.get_statistics()['running'], 0)
+    
+    def test_batch_work_leaves_reserve_for_interactive_requests(self):
+        """Batch pipelines only get the unreserved slots, and freed slots go to interactive requests first."""
+        controller = AdmissionController(max_concurrent=3, deadline=5, batch_reserve=0.4)
+        controller.record('topic_input', 0.01)
+        self.assertEqual(controller.batch_limit, 1)
+        order = []
+        
+        def request(name, priority):
+            with controller.slot(priority=priority):
+                order.append(name)
+        
+        with controller.slot(priority='batch'):
+            # The batch share is taken: batch work waits, interactive requests do not
+            self.assertGreater(controller.expected_wait(priority='batch'), 0)
+            self.assertEqual(controller.expected_wait(), 0.0)
+            with controller.slot():
+                with controller.slot():
+                    threads = []
+                    for name, priority in (('batch', 'batch'), ('interactive', 'interactive')):
+                        thread = threading.Thread(target=request, args=(name, priority))
+                        thread.start()
+                        threads.append(thread)
+                        while controller.get_statistics()['waiting'] < len(threads):
+                            time.sleep(0.001)
+                # The freed slot goes to the interactive request, which arrived later
+                threads[1].join(5)
+                self.assertEqual(order, ['interactive'])
+            # A free slot, but the batch share is still taken
+            self.assertEqual(controller.get_statistics()['classes']['batch']['waiting'], 1)
+        threads[0].join(5)
+        
+        self.assertEqual(order, ['interactive', 'batch'])
+        classes = controller.get_statistics()['classes']
+        self.assertEqual(classes['batch']['queue_wait']['count'], 2)
+        self.assertEqual(classes['interactive']['queue_wait']['count'], 3)
+        self.assertGreater(classes['batch']['queue_wait']['max'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
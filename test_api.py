@@ -0,0 +1,953 @@
+#!/usr/bin/env python3
+"""
+Test script for the Oversight AI web API
+Exercises the Flask endpoints with a stubbed research step, so no OpenAI API key
+or network access is required.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import gzip
+import json
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from config import Config
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+with patch.object(Config, 'validate_openai_config', return_value=True):
+    from app import app, oversight_ai
+from src.admission import AdmissionController
+from src.job_queue import JobQueue
+from src.llm_scheduler import current_client
+from src.oversight_ai import OversightAI
+from src.progress import ProgressBroker
+from src.quotas import QuotaManager
+from src.sqlite_session_store import SQLiteSessionStore
+
+
+ANGLES = [
+    ("What is {topic}? Provide a comprehensive definition and overview.",
+     "{topic} is a fundamental and essential discipline with a key impact on results. "),
+    ("What are the main applications and use cases of {topic}?",
+     "Practical applications of {topic} include detailed monitoring and specific tooling. "),
+    ("What are the challenges and limitations of {topic}?",
+     "Limited budgets and minor integration issues slow down adoption of {topic}. "),
+    ("What are the current trends and developments in {topic}?",
+     "Recent developments in {topic} focus on automation and cheaper hardware. ")
+]
+
+
+def fake_compile_information(topic, on_item=None):
+    """Stand-in for ResearchEngine.compile_information that needs no API calls."""
+    research_data = {
+        'topic': topic,
+        'sources': [],
+        'content': [],
+        'metadata': {
+            'research_timestamp': time.time(),
+            'total_sources': len(ANGLES),
+            'content_length': 0,
+            'processing_speed': '0.00 seconds',
+            'loading_time': '0.00 seconds',
+            'words_per_second': 0
+        }
+    }
+    for angle, text in ANGLES:
+        content = text.format(topic=topic) * 20
+        item = {
+            'angle': angle.format(topic=topic),
+            'content': content,
+            'word_count': len(content.split()),
+            'processing_time': 0.0,
+            'source': 'OpenAI test-model'
+        }
+        research_data['content'].append(item)
+        research_data['sources'].append({
+            'type': 'AI Generated',
+            'source': 'OpenAI test-model',
+            'query': item['angle'],
+            'timestamp': time.time()
+        })
+        research_data['metadata']['content_length'] += item['word_count']
+        if on_item is not None:
+            on_item(item)
+    return research_data
+
+
+class APITestCase(unittest.TestCase):
+    """Base class running the API against a stubbed research engine."""
+    
+    def setUp(self):
+        self.client = app.test_client()
+        patcher = patch.object(oversight_ai.research_engine, 'compile_information',
+                               side_effect=fake_compile_information)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Every test starts with fresh client quotas
+        patcher = patch.object(oversight_ai, 'quotas', QuotaManager())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(oversight_ai.clear_history)
+    
+    def analyze(self, topic='Edge Computing', report_type='detailed', **extra):
+        response = self.client.post('/api/analyze', json={'topic': topic, 'report_type': report_type, **extra})
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        return response.get_json()
+
+
+class TestAsyncAnalysis(APITestCase):
+    """Test queued analysis jobs run by the background workers."""
+    
+    def submit(self, topic='Edge Computing', **extra):
+        return self.client.post('/api/analyze', json={'topic': topic, 'async': True, **extra})
+    
+    def test_job_returns_immediately_and_completes(self):
+        """A job submission returns 202 with the session id; status then reports progress."""
+        progress = []
+        
+        def compile_information(topic, on_item=None):
+            session_id = oversight_ai.current_session['session_id']
+            progress.append(oversight_ai.get_processing_status(session_id))
+            return fake_compile_information(topic, on_item)
+        
+        with patch.object(oversight_ai.research_engine, 'compile_information', side_effect=compile_information):
+            response = self.submit(report_types=['detailed', 'executive'])
+            self.assertEqual(response.status_code, 202)
+            session_id = response.get_json()['session_id']
+            self.assertEqual(response.headers['Location'], f'/api/status/{session_id}')
+            oversight_ai.jobs.join()
+        
+        self.assertEqual(progress[0]['status'], 'processing')
+        self.assertEqual(progress[0]['steps_completed'], ['topic_input'])
+        self.assertEqual(progress[0]['progress'], 0.25)
+        
+        status = self.client.get(f'/api/status/{session_id}').get_json()['status']
+        self.assertEqual(status['status'], 'completed')
+        self.assertEqual(status['steps_completed'], list(OversightAI.PIPELINE_STEPS))
+        self.assertEqual(status['progress'], 1.0)
+        
+        results = self.client.get(f'/api/results/{session_id}').get_json()['results']
+        self.assertEqual(sorted(results['final_reports']), ['detailed', 'executive'])
+        download = self.client.get(f'/api/download/{session_id}/markdown')
+        self.assertEqual(download.status_code, 200)
+    
+    def test_concurrent_jobs_keep_their_own_session(self):
+        """Pipelines running at the same time get distinct ids and see only their own session."""
+        both_running = threading.Barrier(2, timeout=5)
+        seen = {}
+        
+        def compile_information(topic, on_item=None):
+            both_running.wait()
+            seen[topic] = oversight_ai.current_session['topic']
+            return fake_compile_information(topic, on_item)
+        
+        with patch.object(oversight_ai.research_engine, 'compile_information', side_effect=compile_information):
+            first = self.submit(topic='Edge Computing').get_json()['session_id']
+            second = self.submit(topic='Quantum Computing').get_json()['session_id']
+            oversight_ai.jobs.join()
+        
+        self.assertNotEqual(first, second)
+        self.assertLess(first, second)
+        self.assertEqual(seen, {'Edge Computing': 'Edge Computing', 'Quantum Computing': 'Quantum Computing'})
+        self.assertIsNone(oversight_ai.current_session)
+        self.assertEqual(oversight_ai.get_session_results(second)['validated_topic'], 'Quantum Computing')
+    
+    def test_failed_job_reports_error(self):
+        """A job whose pipeline fails is reported as failed with its error."""
+        with patch.object(oversight_ai.research_engine, 'compile_information',
+                          side_effect=RuntimeError('Research service unavailable')):
+            session_id = self.submit().get_json()['session_id']
+            oversight_ai.jobs.join()
+        
+        status = self.client.get(f'/api/status/{session_id}').get_json()['status']
+        self.assertEqual(status['status'], 'failed')
+        self.assertEqual(status['error'], 'Research service unavailable')
+        self.assertEqual(oversight_ai.jobs.get_statistics()['failed'], 1)
+    
+    def test_full_queue_rejects_jobs(self):
+        """Submissions beyond the queue depth are rejected with 503."""
+        progress = ProgressBroker()
+        with patch.object(oversight_ai, 'jobs', JobQueue(workers=0, max_depth=1)), \
+                patch.object(oversight_ai, 'progress', progress):
+            queued = self.submit()
+            rejected = self.submit(topic='Quantum Computing')
+        # The rejected session's progress channel is not left behind
+        self.assertEqual(list(progress._channels), [queued.get_json()['session_id']])
+        
+        self.assertEqual(queued.status_code, 202)
+        status = self.client.get(f"/api/status/{queued.get_json()['session_id']}").get_json()['status']
+        self.assertEqual(status['status'], 'queued')
+        self.assertEqual(status['progress'], 0)
+        self.assertEqual(rejected.status_code, 503)
+        self.assertEqual([session['topic'] for session in oversight_ai.list_processing_history()],
+                         ['Edge Computing'])
+
+
+class TestAdmissionControl(APITestCase):
+    """Test shedding analyses that would wait too long for a pipeline slot."""
+    
+    def test_busy_server_answers_429(self):
+        """Analyses are rejected with Retry-After while the slots are taken; reads are still served."""
+        session_id = self.analyze()['session_id']
+        controller = AdmissionController(max_concurrent=1, deadline=10)
+        controller.record('information_compilation', 29.2)
+        
+        with patch.object(oversight_ai, 'admission', controller):
+            with controller.slot():
+                response = self.client.post('/api/analyze', json={'topic': 'Quantum Computing'})
+                job = self.client.post('/api/analyze', json={'topic': 'Quantum Computing', 'async': True})
+                results = self.client.get(f'/api/analyze/{session_id}')
+            admission = self.client.get('/api/statistics').get_json()['statistics']['admission']
+        
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '30')
+        self.assertEqual(response.get_json()['retry_after'], 30)
+        self.assertEqual(job.status_code, 429)
+        self.assertEqual(results.status_code, 200)
+        self.assertEqual([session['topic'] for session in oversight_ai.list_processing_history()],
+                         ['Edge Computing'])
+        self.assertEqual((admission['admitted'], admission['rejected']), (1, 2))
+    
+    def test_batch_requests_are_shed_first(self):
+        """Batch analyses are rejected while the batch share of the slots is taken; interactive ones are not."""
+        controller = AdmissionController(max_concurrent=2, deadline=10, batch_reserve=0.5)
+        controller.record('information_compilation', 29.2)
+        
+        with patch.object(oversight_ai, 'admission', controller):
+            with controller.slot(priority='batch'):
+                batch = self.client.post('/api/analyze', json={'topic': 'Quantum Computing', 'priority': 'batch'})
+                interactive = self.client.post('/api/analyze', json={'topic': 'Quantum Computing'})
+        
+        self.assertEqual(batch.status_code, 429)
+        self.assertEqual(interactive.status_code, 200)
+        session = oversight_ai.sessions.get(interactive.get_json()['session_id'])
+        self.assertEqual(session['priority'], 'interactive')
+        
+        response = self.client.post('/api/analyze', json={'topic': 'Quantum Computing', 'priority': 'urgent'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid priority', response.get_json()['error'])
+
+
+class TestBatchAnalysis(APITestCase):
+    """Test analyzing many topics in one request."""
+    
+    def analyze_batch(self, body, **kwargs):
+        response = self.client.post('/api/analyze/batch', json=body, **kwargs)
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+        return response, lines
+    
+    def test_topics_run_concurrently_and_stream_back(self):
+        """Topics run at once; each result is streamed as it finishes, then the throughput summary."""
+        running = []
+        peak = []
+        lock = threading.Lock()
+        
+        def research(topic, on_item=None):
+            with lock:
+                running.append(topic)
+                peak.append(len(running))
+            # Later topics finish first
+            time.sleep(0.02 * (3 - int(topic[-1])))
+            with lock:
+                running.remove(topic)
+            research_data = fake_compile_information(topic, on_item)
+            for item in research_data['content']:
+                item['tokens'] = 100
+            return research_data
+        
+        topics = ['Topic 0', {'topic': 'Topic 1', 'report_type': 'technical'}, 'Topic 2']
+        with patch.object(oversight_ai.research_engine, 'compile_information', side_effect=research):
+            response, lines = self.analyze_batch({'topics': topics, 'report_type': 'executive'})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        results, summary = lines[:-1], lines[-1]
+        self.assertEqual(max(peak), 3)
+        self.assertEqual([result['index'] for result in results], [2, 1, 0])
+        self.assertEqual([result['report_type'] for result in results], ['executive', 'technical', 'executive'])
+        self.assertTrue(all(result['success'] and result['tokens'] == 400 for result in results))
+        self.assertEqual(oversight_ai.sessions.get(results[0]['session_id'])['priority'], 'batch')
+        
+        self.assertEqual(summary['type'], 'summary')
+        self.assertEqual((summary['topics'], summary['succeeded'], summary['failed']), (3, 3, 0))
+        self.assertEqual(summary['tokens'], 1200)
+        self.assertGreater(summary['topics_per_minute'], 0)
+        self.assertGreater(summary['tokens_per_second'], 0)
+        
+        # Reports are rendered on demand
+        response = self.client.get(f"/api/analyze/{results[0]['session_id']}")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('text_report', response.get_json())
+    
+    def test_invalid_batches(self):
+        """Malformed batches are rejected before any topic runs."""
+        for body, error in (({'topics': []}, 'Topics are required'),
+                            ({'topics': ['Edge Computing', '  ']}, 'Topic is required'),
+                            ({'topics': [{'topic': 'Edge Computing', 'report_type': 'bogus'}]},
+                             'Invalid report type'),
+                            ({'topics': ['Edge Computing'], 'priority': 'urgent'}, 'Invalid priority'),
+                            ({'topics': ['Edge Computing'], 'tenant': 'globex'}, 'Invalid tenant')):
+            response, _ = self.analyze_batch(body)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(error, response.get_json()['error'])
+        with patch.object(Config, 'BATCH_MAX_TOPICS', 2):
+            response, _ = self.analyze_batch({'topics': ['A', 'B', 'C']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(oversight_ai.list_processing_history(), [])
+    
+    def test_batch_larger_than_quota_burst(self):
+        """Topics are charged as they start; those beyond the quota fail on their own line."""
+        quotas = QuotaManager(analyses_per_minute=2, analyses_burst=2, tokens_per_minute=0)
+        headers = {'X-API-Key': 'secret-key'}
+        topics = ['Edge Computing', 'Cloud Computing', 'Quantum Computing']
+        with patch.object(oversight_ai, 'quotas', quotas):
+            response, lines = self.analyze_batch({'topics': topics}, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            usage = self.client.get('/api/usage', headers=headers).get_json()['usage']
+            
+            # With the quota used up, not even the first topic can start
+            response, _ = self.analyze_batch({'topics': topics}, headers=headers)
+            self.assertEqual(response.status_code, 429)
+        
+        results = [line for line in lines if line['type'] == 'result']
+        self.assertEqual(len(results), 3)
+        rejected = [result for result in results if not result['success']]
+        self.assertEqual(len(rejected), 1)
+        self.assertIn('Analysis quota exceeded', rejected[0]['error'])
+        self.assertGreater(rejected[0]['retry_after'], 0)
+        self.assertIsNone(rejected[0]['session_id'])
+        self.assertEqual((lines[-1]['succeeded'], lines[-1]['failed']), (2, 1))
+        self.assertEqual(usage['analyses'], 2)
+        self.assertEqual(len(oversight_ai.list_processing_history()), 2)
+
+
+class TestClientQuotas(APITestCase):
+    """Test per-client quotas and usage counters."""
+    
+    def test_each_client_has_its_own_quota(self):
+        """A client out of analyses gets a 429 while other clients are still served."""
+        quotas = QuotaManager(analyses_per_minute=1, analyses_burst=1, tokens_per_minute=0)
+        with patch.object(oversight_ai, 'quotas', quotas):
+            heavy = {'Origin': 'https://heavy.example'}
+            first = self.client.post('/api/analyze', json={'topic': 'Edge Computing'}, headers=heavy)
+            second = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'async': True},
+                                      headers=heavy)
+            other = self.client.post('/api/analyze', json={'topic': 'Edge Computing'},
+                                     headers={'X-API-Key': 'secret-key'})
+            usage = self.client.get('/api/usage', headers=heavy).get_json()
+            clients = self.client.get('/api/statistics').get_json()['statistics']['quotas']['clients']
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 429)
+        self.assertEqual(second.headers['Retry-After'], '60')
+        self.assertEqual(other.status_code, 200)
+        self.assertEqual(usage['client'], 'origin:https://heavy.example')
+        self.assertEqual(usage['usage']['analyses'], 1)
+        self.assertEqual(usage['usage']['rejected'], 1)
+        self.assertEqual(len(clients), 2)
+        self.assertNotIn('secret-key', json.dumps(clients))
+    
+    def test_llm_tokens_are_counted(self):
+        """The estimated LLM tokens of each researched angle are charged to the client."""
+        content = 'Edge computing moves processing close to the data source. ' * 10
+        with patch.object(oversight_ai.research_engine, '_research_angle_with_openai', return_value=content):
+            tokens = oversight_ai.research_engine.research_angle('What is Edge Computing?', 'Edge Computing')['tokens']
+            session_id = self.analyze()['session_id']
+            response = self.client.post(f'/api/refresh/{session_id}', json={
+                'angle': oversight_ai.get_session_results(session_id)['research_data']['content'][0]['angle']
+            })
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertGreater(tokens, len(content) // 4)
+        
+        usage = self.client.get('/api/usage').get_json()['usage']
+        self.assertEqual(usage['analyses'], 1)
+        self.assertGreater(usage['llm_tokens'], 0)
+    
+    def test_pipeline_calls_are_shared_by_client_weight(self):
+        """The pipeline slot and LLM calls of an analysis are queued for its client and weight."""
+        headers = {'X-API-Key': 'secret-key'}
+        client = self.client.get('/api/usage', headers=headers).get_json()['client']
+        clients = []
+        
+        def compile_information(topic, on_item=None):
+            clients.append(current_client.get())
+            return fake_compile_information(topic, on_item)
+        
+        with patch.object(oversight_ai, 'quotas', QuotaManager(weights={client: 2.0})), \
+                patch.object(oversight_ai.admission, 'slot', wraps=oversight_ai.admission.slot) as slot, \
+                patch.object(oversight_ai.research_engine, 'compile_information', side_effect=compile_information):
+            response = self.client.post('/api/analyze', json={'topic': 'Edge Computing'}, headers=headers)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertEqual(clients, [(client, 2.0)])
+        self.assertEqual((slot.call_args.kwargs['client'], slot.call_args.kwargs['weight']), (client, 2.0))
+        self.assertEqual(current_client.get(), (None, 1.0))
+    
+    def test_failed_llm_calls_use_no_tokens(self):
+        """A failed OpenAI call yields flagged fallback content that is charged no tokens."""
+        engine = oversight_ai.research_engine
+        angle = 'What is Edge Computing?'
+        with patch.object(engine.client.chat.completions, 'create', side_effect=ConnectionError("API down")):
+            failed = engine.research_angle(angle, 'Edge Computing')
+        self.assertTrue(failed['fallback'])
+        self.assertEqual(failed['tokens'], 0)
+        
+        # Content is only flagged by the failure, not by its text
+        with patch.object(engine, '_research_angle_with_openai', return_value=failed['content']):
+            answered = engine.research_angle(angle, 'Edge Computing')
+        self.assertNotIn('fallback', answered)
+        self.assertGreater(answered['tokens'], 0)
+
+
+def parse_events(body):
+    """Parse a Server-Sent Events body into (id, event, data) tuples, skipping comments."""
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if not line.startswith(':'))
+        if fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class TestProgressStream(APITestCase):
+    """Test the Server-Sent Events progress stream and fetching queued analyses."""
+    
+    def run_job(self, **extra):
+        response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'async': True, **extra})
+        oversight_ai.jobs.join()
+        return response.get_json()
+    
+    def test_stream_reports_pipeline_events(self):
+        """The stream carries step, angle, categorization and report events, then completion."""
+        job = self.run_job(report_types=['detailed', 'summary'])
+        response = self.client.get(job['progress_url'])
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        events = parse_events(response.get_data(as_text=True))
+        
+        self.assertEqual([event_id for event_id, _, _ in events], list(range(1, len(events) + 1)))
+        names = [name for _, name, _ in events]
+        self.assertEqual(names[:2], ['step_started', 'step_finished'])
+        self.assertEqual(names[-3:], ['report_ready', 'report_ready', 'completed'])
+        self.assertEqual([data['step'] for _, name, data in events if name == 'step_finished'],
+                         list(OversightAI.PIPELINE_STEPS))
+        
+        angles = [data for _, name, data in events if name == 'angle_completed']
+        self.assertEqual([angle['index'] for angle in angles], [1, 2, 3, 4])
+        self.assertTrue(all(angle['eta'] >= 0 and not angle['duplicate'] for angle in angles))
+        categorization = next(data for _, name, data in events if name == 'categorization')
+        self.assertEqual(categorization['medium_priority'], 2)
+        self.assertEqual([data['report_type'] for _, name, data in events if name == 'report_ready'],
+                         ['detailed', 'summary'])
+        
+        # Reconnecting clients resume after the last event they saw
+        resumed = self.client.get(job['progress_url'], headers={'Last-Event-ID': str(len(events) - 1)})
+        self.assertEqual([name for _, name, _ in parse_events(resumed.get_data(as_text=True))], ['completed'])
+    
+    def test_categorization_counts_with_bounded_lists(self):
+        """The categorization event counts every item even when buckets only keep their top items."""
+        with patch.object(oversight_ai.information_architect, 'keep_full_lists', False), \
+                patch.object(oversight_ai.information_architect, 'top_k', 1):
+            job = self.run_job()
+        events = parse_events(self.client.get(job['progress_url']).get_data(as_text=True))
+        categorization = next(data for _, name, data in events if name == 'categorization')
+        self.assertEqual(categorization['medium_priority'], 2)
+        self.assertEqual(sum(categorization.values()), 4)
+    
+    def test_failed_session_stream(self):
+        """A failed pipeline ends the stream with a failed event."""
+        with patch.object(oversight_ai.research_engine, 'compile_information',
+                          side_effect=RuntimeError('Research service unavailable')):
+            job = self.run_job()
+        events = parse_events(self.client.get(job['progress_url']).get_data(as_text=True))
+        self.assertEqual(events[-1][1:], ('failed', {'session_id': job['session_id'],
+                                                     'error': 'Research service unavailable'}))
+    
+    def test_sessions_without_events_are_polled(self):
+        """Sessions without events in this process stream their stored status."""
+        job = self.run_job()
+        with patch.object(oversight_ai, 'progress', ProgressBroker()):
+            events = parse_events(self.client.get(job['progress_url']).get_data(as_text=True))
+        self.assertEqual([name for _, name, _ in events], ['completed'])
+        self.assertEqual(self.client.get('/api/progress/session_0').status_code, 404)
+    
+    def test_analysis_response_of_queued_session(self):
+        """A finished job's analyze response is fetched by id, with the requested artifacts."""
+        job = self.run_job()
+        response = self.client.get(job['response_url'] + '?include=research_summary,html_report')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertTrue(data['success'])
+        self.assertIn('<h1>', data['html_report'])
+        self.assertIn('research_summary', data)
+        self.assertNotIn('markdown_report', data)
+        
+        self.assertEqual(self.client.get(job['response_url'] + '?include=poem').status_code, 400)
+        self.assertEqual(self.client.get('/api/analyze/session_0').status_code, 404)
+        with patch.object(oversight_ai, 'jobs', JobQueue(workers=0, max_depth=1)):
+            queued = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'async': True}).get_json()
+        pending = self.client.get(queued['response_url'])
+        self.assertEqual(pending.status_code, 202)
+        self.assertEqual(pending.get_json()['status']['status'], 'queued')
+
+
+class TestDownloadEndpoint(APITestCase):
+    """Test the streaming report download endpoint."""
+    
+    def test_streams_markdown_download(self):
+        """Markdown downloads are streamed and match the in-memory export."""
+        result = self.analyze(include=['text_report'])
+        session_id = result['session_id']
+        
+        response = self.client.get(f'/api/download/{session_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        # Not buffered to measure or hash the body
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertIn('ETag', response.headers)
+        self.assertEqual(response.mimetype, 'text/markdown')
+        self.assertIn('attachment', response.headers['Content-Disposition'])
+        self.assertIn('.md', response.headers['Content-Disposition'])
+        
+        body = response.get_data(as_text=True)
+        self.assertEqual(body, oversight_ai.export_session_data(session_id, format='markdown'))
+        self.assertIn('## 3. Document Content', body)
+    
+    def test_text_download_uses_cached_render(self):
+        """A text report rendered during analysis is served from the artifact cache."""
+        result = self.analyze(include=['text_report'])
+        
+        response = self.client.get(f"/api/download/{result['session_id']}/text")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(as_text=True), result['text_report'])
+    
+    def test_html_and_jsonl_downloads(self):
+        """HTML downloads are escaped fragments; JSON Lines has one record per section."""
+        result = self.analyze(report_type='summary', include=['html_report', 'final_report'])
+        session_id = result['session_id']
+        self.assertTrue(result['html_report'].startswith('<article class="oversight-report">'))
+        
+        response = self.client.get(f'/api/download/{session_id}/html')
+        self.assertEqual(response.mimetype, 'text/html')
+        self.assertEqual(response.get_data(as_text=True), result['html_report'])
+        
+        response = self.client.get(f'/api/download/{session_id}/jsonl')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(records[0], {'section': 'metadata', 'data': result['final_report']['metadata']})
+        content = {record['name']: record['data'] for record in records if record['section'] == 'content'}
+        self.assertEqual(content, result['final_report']['content'])
+    
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_msgpack_download_round_trip(self):
+        """MessagePack downloads decode back to the final report."""
+        result = self.analyze(include=['final_report'])
+        
+        response = self.client.get(f"/api/download/{result['session_id']}/msgpack")
+        self.assertEqual(response.mimetype, 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.get_data(), raw=False), result['final_report'])
+    
+    def test_format_from_accept_header(self):
+        """Without a format in the URL, the Accept header selects it."""
+        result = self.analyze(include=[])
+        session_id = result['session_id']
+        
+        response = self.client.get(f'/api/download/{session_id}',
+                                   headers={'Accept': 'application/x-ndjson, text/plain;q=0.5'})
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertIn('Accept', response.headers['Vary'])
+        self.assertTrue(response.get_data(as_text=True).startswith('{"section":"metadata"'))
+        
+        response = self.client.get(f'/api/download/{session_id}', headers={'Accept': '*/*'})
+        self.assertEqual(response.mimetype, 'text/markdown')
+        self.assertIn('## 1. Sources Used', response.get_data(as_text=True))
+    
+    def test_unknown_session(self):
+        """Downloads of unknown sessions return 404."""
+        response = self.client.get('/api/download/session_missing')
+        self.assertEqual(response.status_code, 404)
+
+
+
+class TestResultsEndpoint(APITestCase):
+    """Test serialized session results."""
+    
+    def test_results_served_from_precomputed_blob(self):
+        """Finished sessions are encoded once and reused by later fetches."""
+        result = self.analyze(include=[])
+        session_id = result['session_id']
+        
+        first = self.client.get(f'/api/results/{session_id}')
+        self.assertEqual(first.mimetype, 'application/json')
+        body = first.get_json()
+        self.assertTrue(body['success'])
+        self.assertEqual(body['results']['validated_topic'], 'Edge Computing')
+        
+        with patch.dict(oversight_ai.artifact_renderers, {'results_json': None}):
+            second = self.client.get(f'/api/results/{session_id}')
+        self.assertEqual(second.get_data(), first.get_data())
+    
+    def test_sparse_fields_and_pagination(self):
+        """Results can be narrowed to selected fields and paged."""
+        result = self.analyze(include=[])
+        session_id = result['session_id']
+        
+        response = self.client.get(f'/api/results/{session_id}?fields=final_report.metadata,research_data.content'
+                                   '&offset=1&limit=2')
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(set(body['results']), {'final_report', 'research_data'})
+        self.assertEqual(set(body['results']['final_report']), {'metadata'})
+        self.assertEqual(len(body['results']['research_data']['content']), 2)
+        self.assertEqual(body['pagination'], {
+            'research_data.content': {'offset': 1, 'limit': 2, 'total': len(ANGLES)}
+        })
+        
+        full = self.client.get(f'/api/results/{session_id}')
+        self.assertLess(len(response.get_data()) * 5, len(full.get_data()))
+    
+    def test_invalid_fields(self):
+        """Unknown result fields are rejected."""
+        result = self.analyze(include=[])
+        response = self.client.get(f"/api/results/{result['session_id']}?fields=secrets")
+        self.assertEqual(response.status_code, 400)
+    
+    def test_session_expiring_between_lookups(self):
+        """A session that expires while a request looks it up is a 404, not an error."""
+        session_id = self.analyze(include=[])['session_id']
+        for url in (f'/api/results/{session_id}', f'/api/results/{session_id}?limit=1'):
+            with patch.object(oversight_ai, 'get_session_results', return_value=None), \
+                    patch.object(oversight_ai, 'get_serialized_results', return_value=None), \
+                    patch.object(oversight_ai, 'get_session_results_view', return_value=None):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 404)
+        
+        with patch.object(oversight_ai, 'get_session_results', return_value=None):
+            response = self.client.get(f'/api/download/{session_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('oversight_ai_report_report_', response.headers['Content-Disposition'])
+    
+    def test_session_export_is_valid_json(self):
+        """JSON session exports decode back to the session data."""
+        result = self.analyze(include=[])
+        exported = json.loads(oversight_ai.export_session_data(result['session_id'], format='json'))
+        self.assertEqual(exported['session_id'], result['session_id'])
+        self.assertEqual(exported['status'], 'completed')
+
+
+class TestHTTPCaching(APITestCase):
+    """Test ETags, conditional GETs and compression for finished sessions."""
+    
+    def test_conditional_get_returns_304(self):
+        """A matching If-None-Match returns 304 without a body."""
+        session_id = self.analyze(include=[])['session_id']
+        
+        for url in (f'/api/results/{session_id}', f'/api/download/{session_id}/markdown'):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            # The session may still be refreshed, so copies are revalidated
+            self.assertIn('no-cache', first.headers['Cache-Control'])
+            self.assertNotIn('immutable', first.headers['Cache-Control'])
+            etag = first.headers['ETag']
+            self.assertFalse(etag.startswith('W/'))
+            
+            repeat = self.client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(repeat.status_code, 304)
+            self.assertEqual(repeat.get_data(), b'')
+    
+    def test_only_revision_pinned_urls_are_immutable(self):
+        """URLs naming the current revision are immutable; other revisions are not found."""
+        session_id = self.analyze(include=[])['session_id']
+        for url in (f'/api/results/{session_id}', f'/api/download/{session_id}/markdown'):
+            pinned = self.client.get(f'{url}?revision=0')
+            self.assertEqual(pinned.status_code, 200)
+            self.assertIn('immutable', pinned.headers['Cache-Control'])
+            self.assertEqual(self.client.get(f'{url}?revision=1').status_code, 404)
+        
+        with patch.object(oversight_ai.research_engine, '_research_angle_with_openai',
+                          return_value="Limited budgets slow down adoption. " * 20):
+            self.client.post(f'/api/refresh/{session_id}',
+                             json={'angle': "What are the challenges and limitations of Edge Computing?"})
+        self.assertEqual(self.client.get(f'/api/results/{session_id}?revision=0').status_code, 404)
+        self.assertIn('immutable', self.client.get(f'/api/results/{session_id}?revision=1').headers['Cache-Control'])
+    
+    def test_download_revalidation_skips_rendering(self):
+        """A download's ETag is known before rendering, so a 304 renders nothing."""
+        session_id = self.analyze(include=[])['session_id']
+        url = f'/api/download/{session_id}/text'
+        etag = self.client.get(url).headers['ETag']
+        self.assertNotEqual(self.client.get(f'/api/download/{session_id}/html').headers['ETag'], etag)
+        
+        with patch.object(oversight_ai, 'stream_artifact') as stream_artifact:
+            repeat = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(repeat.status_code, 304)
+        stream_artifact.assert_not_called()
+    
+    def test_results_revalidation_skips_loading(self):
+        """A results ETag is known from the session revision, so a 304 never loads the session."""
+        session_id = self.analyze(include=[])['session_id']
+        url = f'/api/results/{session_id}'
+        gzip_etag = self.client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        self.assertTrue(gzip_etag.endswith('-gzip"'))
+        
+        with patch.object(oversight_ai.sessions, 'get') as get:
+            repeat = self.client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.headers['ETag'], gzip_etag)
+        get.assert_not_called()
+        
+        # The compressed variant's ETag does not match the identity body
+        identity = self.client.get(url, headers={'Accept-Encoding': 'identity', 'If-None-Match': gzip_etag})
+        self.assertEqual(identity.status_code, 200)
+    
+    def test_gzip_variant_is_precompressed_once(self):
+        """Compressed variants decode to the identity body and are compressed only once."""
+        session_id = self.analyze(include=[])['session_id']
+        url = f'/api/results/{session_id}'
+        identity = self.client.get(url, headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', identity.headers)
+        
+        with patch('src.http_cache.gzip.compress', wraps=gzip.compress) as compress:
+            first = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+            second = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', first.headers['Vary'])
+        self.assertEqual(gzip.decompress(second.get_data()), identity.get_data())
+        self.assertLess(len(first.get_data()), len(identity.get_data()))
+        self.assertNotEqual(first.headers['ETag'], identity.headers['ETag'])
+
+
+class TestSparseAnalysis(APITestCase):
+    """Test sparse field selection on /api/analyze."""
+    
+    def test_fields_select_and_limit_rendering(self):
+        """Only the selected fields are returned and only their artifacts rendered."""
+        with patch.object(oversight_ai.report_generator, 'render_sections',
+                          wraps=oversight_ai.report_generator.render_sections) as render:
+            result = self.analyze(report_type='summary', fields=['final_report.content.key_points'])
+        
+        render.assert_not_called()
+        self.assertEqual(set(result), {'success', 'session_id', 'topic', 'report_type',
+                                       'processing_time', 'final_report'})
+        self.assertEqual(list(result['final_report']['content']), ['key_points'])
+    
+    def test_fields_in_multi_report_mode(self):
+        """Fields address individual reports of a multi-report response."""
+        result = self.analyze(report_types=['executive', 'summary'],
+                              fields=['reports.summary.markdown_report'])
+        
+        self.assertEqual(result['report_types'], ['executive', 'summary'])
+        self.assertEqual(list(result['reports']), ['summary'])
+        self.assertIn('# Edge Computing', result['reports']['summary']['markdown_report'])
+    
+    def test_invalid_response_fields(self):
+        """Unknown response fields are rejected."""
+        response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'fields': ['secrets']})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestMultiReportAnalysis(APITestCase):
+    """Test generating several report types from one research run."""
+    
+    def test_reports_share_one_research_run(self):
+        """All requested report types are built from a single compile_information call."""
+        result = self.analyze(report_types=['executive', 'summary', 'technical'],
+                              include=['final_report', 'text_report', 'categorization_summary'])
+        
+        self.assertEqual(oversight_ai.research_engine.compile_information.call_count, 1)
+        self.assertEqual(result['report_type'], 'executive')
+        self.assertEqual(result['report_types'], ['executive', 'summary', 'technical'])
+        self.assertIn('categorization_summary', result)
+        self.assertNotIn('final_report', result)
+        
+        for report_type, report in result['reports'].items():
+            self.assertEqual(report['final_report']['metadata']['report_type'], report_type)
+            self.assertIn(f"Report Type: {report_type.title()}", report['text_report'])
+        self.assertEqual(len({report['text_report'] for report in result['reports'].values()}), 3)
+    
+    def test_shared_subcomputations(self):
+        """Appendices and recommendations are computed once for all report types."""
+        with patch.object(oversight_ai.report_generator, '_generate_recommendations',
+                          wraps=oversight_ai.report_generator._generate_recommendations) as recommendations:
+            result = self.analyze(report_types=['executive', 'detailed'], include=['final_report'])
+        
+        self.assertEqual(recommendations.call_count, 1)
+        reports = result['reports']
+        self.assertEqual(reports['executive']['final_report']['appendices'],
+                         reports['detailed']['final_report']['appendices'])
+    
+    def test_download_selects_report_type(self):
+        """Downloads of multi-report sessions take a report_type query parameter."""
+        result = self.analyze(report_types=['summary', 'detailed'], include=['text_report'])
+        session_id = result['session_id']
+        
+        response = self.client.get(f'/api/download/{session_id}/text?report_type=detailed')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(as_text=True), result['reports']['detailed']['text_report'])
+        
+        response = self.client.get(f'/api/download/{session_id}/text?report_type=technical')
+        self.assertEqual(response.status_code, 404)
+    
+    def test_invalid_report_types(self):
+        """Unknown or empty report type lists are rejected."""
+        for report_types in (['executive', 'poetry'], [], 'executive'):
+            response = self.client.post('/api/analyze', json={'topic': 'Edge Computing',
+                                                              'report_types': report_types})
+            self.assertEqual(response.status_code, 400)
+    
+    def test_unknown_tenant(self):
+        """Tenants without a lexicon override are rejected before the pipeline runs."""
+        for tenant in ('globex', '../default', 7):
+            response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'tenant': tenant})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("Available tenants: ['example']", response.get_json()['error'])
+        self.assertEqual(oversight_ai.list_processing_history(), [])
+        
+        response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'tenant': 'example'})
+        self.assertEqual(response.status_code, 200)
+
+
+class TestIncrementalRefresh(APITestCase):
+    """Test refreshing one research angle of a finished session."""
+    
+    CHALLENGES = "What are the challenges and limitations of Edge Computing?"
+    
+    def refresh(self, session_id, angle, content):
+        with patch.object(oversight_ai.research_engine, '_research_angle_with_openai', return_value=content):
+            return self.client.post(f'/api/refresh/{session_id}', json={'angle': angle})
+    
+    def test_only_sections_reading_changed_data_are_regenerated(self):
+        """A refreshed item that stays in its bucket only regenerates that bucket's sections."""
+        result = self.analyze(report_types=['detailed', 'executive'], include=['markdown_report'])
+        session_id = result['session_id']
+        previous = oversight_ai.get_session_results(session_id)['final_reports']
+        
+        response = self.refresh(session_id, self.CHALLENGES, "Limited budgets slow down adoption. " * 20)
+        self.assertEqual(response.status_code, 200)
+        refresh = response.get_json()
+        
+        self.assertEqual(refresh['changed'], ['low_priority'])
+        self.assertEqual(refresh['regenerated_sections'], {
+            'detailed': ['content.supporting_information'],
+            'executive': []
+        })
+        reports = oversight_ai.get_session_results(session_id)['final_reports']
+        self.assertIs(reports['executive'], previous['executive'])
+        self.assertIs(reports['detailed']['content']['introduction'], previous['detailed']['content']['introduction'])
+        
+        # The cached markdown export has the regenerated section spliced in
+        markdown = oversight_ai.export_session_data(session_id, format='markdown', report_type='detailed')
+        self.assertEqual(markdown, oversight_ai.report_generator.export_report_as_markdown(reports['detailed']))
+        self.assertIn('Limited budgets slow down adoption.', markdown)
+    
+    def test_refreshed_report_matches_full_regeneration(self):
+        """Re-bucketing an item gives the same report as regenerating it from scratch."""
+        result = self.analyze(include=['text_report'])
+        session_id = result['session_id']
+        
+        content = "A critical, fundamental and essential framework with key benefits and major impact. " * 20
+        refresh = self.refresh(session_id, self.CHALLENGES, content).get_json()
+        self.assertEqual(refresh['changed'], ['low_priority', 'medium_priority', 'metadata'])
+        
+        results = oversight_ai.get_session_results(session_id)
+        report = results['final_report']
+        regenerated = oversight_ai.report_generator.generate_report(results['categorized_data'], 'detailed')
+        self.assertEqual(report['content'], regenerated['content'])
+        self.assertEqual(report['appendices'], regenerated['appendices'])
+        self.assertEqual(oversight_ai.export_session_data(session_id, format='text'),
+                         oversight_ai.report_generator.export_report_as_text(report))
+        
+        # Refreshed sessions are no longer served as immutable
+        response = self.client.get(f'/api/results/{session_id}')
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+        self.assertEqual(response.get_json()['results']['research_data']['content'][2]['content'], content)
+    
+    def test_refresh_into_a_duplicate_is_merged(self):
+        """A refreshed angle that now repeats another angle is merged into it, as during research."""
+        session_id = self.analyze()['session_id']
+        definition = "Edge Computing is a fundamental and essential discipline with a key impact on results. " * 20
+        
+        refresh = self.refresh(session_id, self.CHALLENGES, definition).get_json()
+        self.assertEqual(refresh['duplicate_of'],
+                         "What is Edge Computing? Provide a comprehensive definition and overview.")
+        
+        research_data = oversight_ai.get_session_results(session_id)['research_data']
+        angles = [item['angle'] for item in research_data['content']]
+        self.assertNotIn(self.CHALLENGES, angles)
+        self.assertEqual(research_data['content'][0]['merged_angles'], [self.CHALLENGES])
+        self.assertEqual(research_data['metadata']['deduplication']['items_removed'], 1)
+        source = next(source for source in research_data['sources'] if source['query'] == self.CHALLENGES)
+        self.assertEqual(source['action'], 'merged')
+        categorized = oversight_ai.get_session_results(session_id)['categorized_data']
+        self.assertEqual(categorized['categorization_metadata']['total_items_processed'], len(ANGLES) - 1)
+    
+    def test_concurrent_refreshes_by_two_workers(self):
+        """Workers refreshing the same session at once both keep their change."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'sessions.db')
+        store = SQLiteSessionStore(path, on_evict=oversight_ai.artifact_cache.invalidate_session)
+        trends = "What are the current trends and developments in Edge Computing?"
+        with patch.object(oversight_ai, 'sessions', store), \
+                patch.object(Config, 'SESSION_BACKEND', 'sqlite'), patch.object(Config, 'SESSION_DB_PATH', path):
+            other_worker = OversightAI()
+            session_id = self.analyze()['session_id']
+            apply_refresh = oversight_ai._apply_refresh
+            
+            def interleaved(stored, angle, content_item):
+                # The other worker refreshes another angle after this one read the session
+                if stored.get('revision', 0) == 0:
+                    with patch.object(other_worker.research_engine, '_research_angle_with_openai',
+                                      return_value="Automation of edge fleets keeps growing. " * 20):
+                        other_worker.refresh_angle(session_id, trends)
+                return apply_refresh(stored, angle, content_item)
+            
+            with patch.object(oversight_ai, '_apply_refresh', side_effect=interleaved):
+                refresh = self.refresh(session_id, self.CHALLENGES, "Limited budgets slow down adoption. " * 20)
+            self.assertEqual(refresh.get_json()['revision'], 2)
+            
+            research_data = store.get(session_id)['results']['research_data']
+            content = {item['angle']: item['content'] for item in research_data['content']}
+            self.assertIn('Limited budgets slow down adoption.', content[self.CHALLENGES])
+            self.assertIn('Automation of edge fleets keeps growing.', content[trends])
+    
+    def test_invalid_refresh_requests(self):
+        """Unknown sessions and angles are rejected."""
+        session_id = self.analyze()['session_id']
+        
+        self.assertEqual(self.refresh(session_id, 'What is poetry?', 'Text.').status_code, 400)
+        self.assertEqual(self.client.post(f'/api/refresh/{session_id}', json={}).status_code, 400)
+        self.assertEqual(self.refresh('session_0', self.CHALLENGES, 'Text.').status_code, 404)
+    
+    def test_refresh_is_seen_by_other_workers(self):
+        """Workers sharing a SQLite session store never serve artifacts cached before a refresh."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'sessions.db')
+        store = SQLiteSessionStore(path, on_evict=oversight_ai.artifact_cache.invalidate_session)
+        with patch.object(oversight_ai, 'sessions', store), \
+                patch.object(Config, 'SESSION_BACKEND', 'sqlite'), patch.object(Config, 'SESSION_DB_PATH', path):
+            other_worker = OversightAI()
+            session_id = self.analyze()['session_id']
+            before = other_worker.export_session_data(session_id, format='markdown')
+            self.assertIsNotNone(before)
+            
+            self.refresh(session_id, self.CHALLENGES, "Limited budgets slow down adoption. " * 20)
+            after = other_worker.export_session_data(session_id, format='markdown')
+            self.assertNotEqual(after, before)
+            self.assertIn('Limited budgets slow down adoption.', after)
+            self.assertEqual(other_worker.get_processing_status(session_id)['revision'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the rendered artifact cache
+Tests memoization and byte-size-bounded LRU eviction.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import unittest
+from src.artifact_cache import ArtifactCache
+
+
+class TestArtifactCache(unittest.TestCase):
+    """Test the byte-size-bounded LRU artifact cache."""
+    
+    def test_renders_once(self):
+        """Artifacts are rendered on first access only."""
+        cache = ArtifactCache(max_bytes=1024)
+        calls = []
+        
+        def render():
+            calls.append(1)
+            return "# Report"
+        
+        self.assertEqual(cache.get_or_render(('s1', 'markdown'), render), "# Report")
+        self.assertEqual(cache.get_or_render(('s1', 'markdown'), render), "# Report")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get_statistics()['hits'], 1)
+    
+    def test_evicts_least_recently_used_by_size(self):
+        """The least recently used artifacts are evicted once the byte budget is exceeded."""
+        cache = ArtifactCache(max_bytes=10)
+        cache.put(('s1', 'text'), 'aaaa')
+        cache.put(('s2', 'text'), b'bbbb')
+        cache.get(('s1', 'text'))
+        cache.put(('s3', 'text'), 'cccc')
+        
+        self.assertIsNotNone(cache.get(('s1', 'text')))
+        self.assertIsNone(cache.get(('s2', 'text')))
+        self.assertIsNotNone(cache.get(('s3', 'text')))
+        self.assertEqual(cache.current_bytes, 8)
+        self.assertEqual(cache.evictions, 1)
+    
+    def test_sizes_are_counted_in_bytes(self):
+        """Multi-byte characters count towards the budget by their encoded size."""
+        cache = ArtifactCache(max_bytes=100)
+        cache.put(('s1', 'text'), '•' * 10)
+        self.assertEqual(cache.current_bytes, 30)
+    
+    def test_oversized_and_invalidated_artifacts(self):
+        """Oversized artifacts are not stored and sessions can be invalidated."""
+        cache = ArtifactCache(max_bytes=5)
+        cache.put(('s1', 'text'), 'too large')
+        self.assertIsNone(cache.get(('s1', 'text')))
+        
+        cache.put(('s1', 'text'), 'ok')
+        cache.put(('s2', 'text'), 'ok')
+        cache.invalidate_session('s1')
+        self.assertIsNone(cache.get(('s1', 'text')))
+        self.assertEqual(cache.current_bytes, 2)
+    
+    def test_session_index_follows_evictions(self):
+        """Invalidating a session only drops its own artifacts, including after evictions."""
+        cache = ArtifactCache(max_bytes=6)
+        cache.put(('s1', 'text'), 'aa')
+        cache.put(('s1', 'markdown'), 'bb')
+        cache.put(('s2', 'text'), 'cc')
+        # Evicts ('s1', 'text')
+        cache.put(('s2', 'markdown'), 'dd')
+        self.assertEqual(cache._session_keys, {'s1': {('s1', 'markdown')},
+                                               's2': {('s2', 'text'), ('s2', 'markdown')}})
+        
+        cache.invalidate_session('s1')
+        cache.invalidate_session('s3')
+        self.assertEqual(list(cache._session_keys), ['s2'])
+        self.assertEqual(cache.get(('s2', 'text')), 'cc')
+        self.assertEqual(cache.current_bytes, 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
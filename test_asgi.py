@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test script for the ASGI entry point
+Exercises the async /api/analyze and progress stream routes and the Flask routes
+served through the WSGI adapter, with a stubbed research step, plus the
+concurrent research of the async pipeline.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+from config import Config
+
+try:
+    from starlette.testclient import TestClient
+except ImportError:
+    TestClient = None
+
+from test_api import fake_compile_information, parse_events
+
+if TestClient is not None:
+    with patch.object(Config, 'validate_openai_config', return_value=True):
+        from asgi import app, oversight_ai
+from src.quotas import QuotaManager
+from src.research_engine import ResearchEngine
+
+
+async def fake_compile_information_async(topic, on_item=None):
+    """Stand-in for ResearchEngine.compile_information_async that needs no API calls."""
+    await asyncio.sleep(0)
+    return fake_compile_information(topic, on_item)
+
+
+@unittest.skipIf(TestClient is None, "starlette (with httpx) is not installed")
+class TestASGIApp(unittest.TestCase):
+    """Test the API served by the ASGI app."""
+    
+    def setUp(self):
+        patcher = patch.object(oversight_ai.research_engine, 'compile_information_async',
+                               side_effect=fake_compile_information_async)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # The sync pipeline must not be used
+        patcher = patch.object(oversight_ai.research_engine, 'compile_information',
+                               side_effect=AssertionError('sync research step used'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(oversight_ai, 'quotas', QuotaManager())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(oversight_ai.clear_history)
+        
+        # One event loop for the whole test, so background analyses keep running between requests
+        self.client = TestClient(app)
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+    
+    def test_analyze_runs_on_event_loop(self):
+        """A synchronous analysis awaits the async pipeline and returns the full response."""
+        response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'include': ['research_summary']})
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual(response.headers['Access-Control-Allow-Origin'], '*')
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertIn('research_summary', data)
+        self.assertNotIn('html_report', data)
+        
+        status = oversight_ai.get_processing_status(data['session_id'])
+        self.assertEqual(status['status'], 'completed')
+    
+    def test_invalid_requests(self):
+        """Validation errors answer 400 like the Flask app."""
+        response = self.client.post('/api/analyze', json={})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'No data provided')
+        
+        response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'report_type': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid report type', response.json()['error'])
+    
+    def test_async_analysis_streams_progress(self):
+        """An "async": true analysis runs as a task; its progress streams until completion."""
+        response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'async': True})
+        self.assertEqual(response.status_code, 202, response.text)
+        data = response.json()
+        session_id = data['session_id']
+        self.assertEqual(data['progress_url'], f'/api/progress/{session_id}')
+        self.assertEqual(response.headers['Location'], f'/api/status/{session_id}')
+        
+        response = self.client.get(data['progress_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['content-type'].startswith('text/event-stream'))
+        events = parse_events(response.text)
+        names = [event[1] for event in events]
+        self.assertEqual(names[-1], 'completed')
+        self.assertEqual(names.count('angle_completed'), 4)
+        
+        # Served by the Flask app
+        response = self.client.get(data['response_url'])
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertTrue(response.json()['success'])
+    
+    def test_async_analysis_limit(self):
+        """Analyses beyond ASYNC_MAX_ANALYSES are rejected with a 503."""
+        with patch.object(Config, 'ASYNC_MAX_ANALYSES', 0):
+            response = self.client.post('/api/analyze', json={'topic': 'Edge Computing', 'async': True})
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()['success'])
+    
+    def test_batch_streams_results(self):
+        """A batch runs every topic on the event loop and streams NDJSON lines."""
+        response = self.client.post('/api/analyze/batch', json={'topics': ['Edge Computing', 'Cloud Computing']})
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertTrue(response.headers['content-type'].startswith('application/x-ndjson'))
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        self.assertEqual(sorted(line['index'] for line in lines[:-1]), [0, 1])
+        self.assertEqual(lines[-1]['succeeded'], 2)
+        
+        response = self.client.post('/api/analyze/batch', json={'topics': 'Edge Computing'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_unknown_session(self):
+        """Progress of an unknown session answers 404."""
+        response = self.client.get('/api/progress/session_unknown')
+        self.assertEqual(response.status_code, 404)
+    
+    def test_flask_routes_are_mounted(self):
+        """Routes without an async version are served by the Flask app."""
+        response = self.client.get('/api/report-types')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('detailed', response.json()['report_types'])
+        self.assertEqual(response.headers['Access-Control-Allow-Origin'], '*')
+
+
+class TestAsyncResearch(unittest.TestCase):
+    """Test the concurrent research of the async pipeline."""
+    
+    def test_angles_are_researched_concurrently_in_order(self):
+        """Angles run concurrently, but items are added in research angle order."""
+        with patch.object(Config, 'validate_openai_config', return_value=True), \
+                patch.object(Config, 'OPENAI_API_KEY', 'test_key'):
+            engine = ResearchEngine()
+        angles = engine.get_research_angles('Edge Computing')
+        running = []
+        peak = []
+        
+        async def research(angle, topic):
+            running.append(angle)
+            peak.append(len(running))
+            # Later angles finish first
+            await asyncio.sleep(0.001 * (len(angles) - angles.index(angle)))
+            running.remove(angle)
+            return f"Findings on {angle}"
+        
+        seen = []
+        with patch.object(engine, '_research_angle_with_openai_async', side_effect=research):
+            research_data = asyncio.run(
+                engine.compile_information_async('Edge Computing', on_item=lambda item: seen.append(item['angle']))
+            )
+        
+        self.assertEqual(max(peak), len(angles))
+        self.assertEqual([item['angle'] for item in research_data['content']], angles)
+        self.assertEqual(seen, angles)
+        self.assertEqual(research_data['metadata']['total_sources'], len(angles))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test script for the bulk processor
+Tests reading topic files, the checkpoint manifest, and resuming a killed bulk
+run without repeating completed topics or researched angles, with a stubbed
+OpenAI call.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from config import Config
+from bulk_process import ReportWriter, main, read_topics
+from src.checkpoint import CheckpointManifest
+from src.research_engine import ResearchEngine
+
+
+# The real OpenAI call, run against an unreachable API
+research_with_openai = ResearchEngine._research_angle_with_openai
+
+
+class Killed(BaseException):
+    """Stands in for the process being killed mid-run."""
+
+
+class TestReadTopics(unittest.TestCase):
+    """Test reading CSV and JSONL topic files."""
+    
+    def write(self, name, text):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, name)
+        with open(path, 'w', encoding='utf-8') as topic_file:
+            topic_file.write(text)
+        return path
+    
+    def test_csv_with_and_without_header(self):
+        """CSV files name their columns, or hold one topic per row."""
+        path = self.write('topics.csv', 'Topic,Report_Type\nEdge Computing,technical\n"Climate Change, 2030",\n , \n')
+        self.assertEqual(read_topics(path), [('Edge Computing', 'technical'), ('Climate Change, 2030', 'detailed')])
+        
+        path = self.write('topics.csv', 'Edge Computing\nCybersecurity\n')
+        self.assertEqual(read_topics(path, 'summary'), [('Edge Computing', 'summary'), ('Cybersecurity', 'summary')])
+    
+    def test_jsonl(self):
+        """JSONL lines are topic strings or objects."""
+        path = self.write('topics.jsonl',
+                          '"Edge Computing"\n\n{"topic": "Cybersecurity", "report_type": "executive"}\n')
+        self.assertEqual(read_topics(path), [('Edge Computing', 'detailed'), ('Cybersecurity', 'executive')])
+
+
+class TestCheckpointManifest(unittest.TestCase):
+    """Test recording and reloading bulk run progress."""
+    
+    def test_reload_skips_incomplete_last_line(self):
+        """A line cut short by a kill is skipped, and new entries start on a line of their own."""
+        path = os.path.join(tempfile.mkdtemp(), 'manifest.jsonl')
+        manifest = CheckpointManifest(path)
+        key = CheckpointManifest.topic_key('Edge  Computing', 'detailed')
+        manifest.record_angle('Edge Computing', {'angle': 'What is Edge Computing?', 'content': 'Findings'})
+        manifest.record_topic(key, 'completed', session_id='session_1')
+        manifest.record_topic('detailed:Cybersecurity', 'failed', error='boom')
+        manifest.close()
+        with open(path, 'ab') as manifest_file:
+            manifest_file.write(b'{"type": "topic", "key": "detailed:Cloud')
+        
+        manifest = CheckpointManifest(path)
+        manifest.record_topic('detailed:Cybersecurity', 'completed')
+        manifest.close()
+        manifest = CheckpointManifest(path)
+        self.addCleanup(manifest.close)
+        
+        self.assertTrue(manifest.is_completed('detailed:Edge Computing'))
+        self.assertTrue(manifest.is_completed('detailed:Cybersecurity'))
+        self.assertEqual(manifest.get_angle('Edge Computing', 'What is Edge Computing?')['content'], 'Findings')
+        self.assertEqual(manifest.get_statistics(), {'completed': 2, 'failed': 0, 'angles': 1})
+
+
+class TestBulkRun(unittest.TestCase):
+    """Test bulk runs against a stubbed OpenAI call."""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.topics = os.path.join(self.directory, 'topics.csv')
+        with open(self.topics, 'w', encoding='utf-8') as topic_file:
+            topic_file.write('topic\nEdge Computing\nCloud Computing\nQuantum Computing\nEdge Computing\n')
+        self.calls = []
+        self.kill_at = None
+        self.killed = False
+        self.fail_at = None
+        self.failed = []
+        for patcher in (patch.object(Config, 'validate_openai_config', return_value=True),
+                        patch.object(Config, 'OPENAI_API_KEY', 'test_key'),
+                        patch.object(ResearchEngine, '_research_angle_with_openai', autospec=True,
+                                     side_effect=self.research)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.angles = len(ResearchEngine().get_research_angles('Edge Computing'))
+    
+    def research(self, engine, angle, topic):
+        if self.killed or len(self.calls) == self.kill_at:
+            # Killed once the first topic's report is written; no call gets through afterwards
+            self.killed = True
+            deadline = time.time() + 5
+            while not os.path.exists(self.written) and time.time() < deadline:
+                time.sleep(0.001)
+            raise Killed()
+        if len(self.calls) == self.fail_at:
+            self.fail_at = None
+            self.failed.append((topic, angle))
+            with patch.object(engine.client.chat.completions, 'create', side_effect=ConnectionError("API down")):
+                return research_with_openai(engine, angle, topic)
+        self.calls.append((topic, angle))
+        return f"{topic} is a fundamental discipline with a key impact on {angle.lower()} results. " * 20
+    
+    def run_bulk(self, *args):
+        with patch('sys.stdout'):
+            return main([self.topics, '--concurrency', '1', '--progress-interval', '60', *args])
+    
+    def test_killed_run_resumes(self):
+        """A rerun skips completed topics and reuses the angles researched before the kill."""
+        output_dir = os.path.join(self.directory, 'reports')
+        # Killed while researching the second angle of the second topic
+        self.kill_at = self.angles + 1
+        self.written = os.path.join(output_dir, 'edge_computing_detailed.md')
+        with self.assertRaises(Killed):
+            self.run_bulk('--output-dir', output_dir)
+        # Let topics still running on the killed run's threads die out before the rerun
+        for thread in threading.enumerate():
+            if thread.name.startswith('oversight-batch'):
+                thread.join(5)
+        first_run = list(self.calls)
+        self.assertEqual(sorted(os.listdir(output_dir)), ['edge_computing_detailed.md', 'manifest.jsonl'])
+        
+        self.kill_at = None
+        self.killed = False
+        self.assertEqual(self.run_bulk('--output-dir', output_dir), 0)
+        second_run = self.calls[len(first_run):]
+        
+        # No angle was researched twice
+        self.assertEqual(len(set(self.calls)), len(self.calls))
+        self.assertEqual(len(self.calls), 3 * self.angles)
+        self.assertEqual([topic for topic, _ in second_run].count('Cloud Computing'), self.angles - 1)
+        self.assertEqual(sorted(os.listdir(output_dir)), [
+            'cloud_computing_detailed.md', 'edge_computing_detailed.md', 'manifest.jsonl',
+            'quantum_computing_detailed.md'
+        ])
+        with open(os.path.join(output_dir, 'cloud_computing_detailed.md'), encoding='utf-8') as report:
+            self.assertIn('Cloud Computing', report.read())
+        
+        # Everything is done
+        self.assertEqual(self.run_bulk('--output-dir', output_dir), 0)
+        self.assertEqual(len(self.calls), 3 * self.angles)
+    
+    def test_angles_researched_again_after_api_failure(self):
+        """Fallback content from a failed OpenAI call is not checkpointed, so a rerun researches the angle."""
+        output_dir = os.path.join(self.directory, 'reports')
+        # The API fails on the first angle of the second topic, and the run is killed two angles later
+        self.fail_at = self.angles
+        self.kill_at = self.angles + 1
+        self.written = os.path.join(output_dir, 'edge_computing_detailed.md')
+        with self.assertRaises(Killed):
+            self.run_bulk('--output-dir', output_dir)
+        for thread in threading.enumerate():
+            if thread.name.startswith('oversight-batch'):
+                thread.join(5)
+        first_run = list(self.calls)
+        self.assertEqual(len(self.failed), 1)
+        self.assertEqual(self.failed[0][0], 'Cloud Computing')
+        
+        self.kill_at = None
+        self.killed = False
+        self.assertEqual(self.run_bulk('--output-dir', output_dir), 0)
+        second_run = self.calls[len(first_run):]
+        self.assertIn(self.failed[0], second_run)
+        self.assertEqual([topic for topic, _ in second_run].count('Cloud Computing'), self.angles - 1)
+        with open(os.path.join(output_dir, 'cloud_computing_detailed.md'), encoding='utf-8') as report:
+            self.assertNotIn('Research findings related to', report.read())
+    
+    def test_interrupted_run_records_running_topics(self):
+        """On Ctrl-C the manifest is closed only once the running topics have recorded their angles."""
+        output_dir = os.path.join(self.directory, 'reports')
+        running_at_close = []
+        close = CheckpointManifest.close
+        
+        def record_close(manifest):
+            running_at_close.extend(thread for thread in threading.enumerate()
+                                    if thread.name.startswith('oversight-batch'))
+            close(manifest)
+        
+        with patch.object(ReportWriter, 'write', side_effect=KeyboardInterrupt), \
+                patch.object(CheckpointManifest, 'close', autospec=True, side_effect=record_close):
+            self.assertEqual(self.run_bulk('--output-dir', output_dir, '--concurrency', '2'), 130)
+        self.assertEqual(running_at_close, [])
+        
+        manifest = CheckpointManifest(os.path.join(output_dir, 'manifest.jsonl'))
+        self.addCleanup(manifest.close)
+        self.assertEqual(manifest.get_statistics()['angles'], len(self.calls))
+    
+    def test_jsonl_output(self):
+        """With --output, reports are appended to a JSONL file and the manifest sits next to it."""
+        output = os.path.join(self.directory, 'reports.jsonl')
+        self.assertEqual(self.run_bulk('--output', output, '--format', 'text'), 0)
+        with open(output, encoding='utf-8') as output_file:
+            lines = [json.loads(line) for line in output_file]
+        self.assertEqual([line['topic'] for line in lines], ['Edge Computing', 'Cloud Computing', 'Quantum Computing'])
+        self.assertTrue(all(line['format'] == 'text' and line['report'] for line in lines))
+        self.assertTrue(os.path.exists(f'{output}.manifest.jsonl'))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
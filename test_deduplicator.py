@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the Content Deduplicator
+Tests near-duplicate elimination without requiring an OpenAI API key.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import unittest
+from src.deduplicator import ContentDeduplicator
+
+
+BENEFITS = ("Renewable energy reduces greenhouse gas emissions, lowers long term energy costs, "
+            "creates local jobs and improves energy security for countries that import fuel. "
+            "Solar and wind installations can be deployed quickly at many scales.")
+
+APPLICATIONS = ("Renewable energy reduces greenhouse gas emissions, lowers long term energy costs, "
+                "creates local jobs and improves energy security for countries that import fuel. "
+                "Solar and wind installations can be deployed quickly at many different scales.")
+
+CHALLENGES = ("Intermittency remains the main obstacle: storage is expensive, grids need upgrades "
+              "and permitting for transmission lines can take a decade in some regions.")
+
+
+def make_research_data(*pairs):
+    """Build research data in the ResearchEngine format."""
+    content = []
+    sources = []
+    for angle, text in pairs:
+        content.append({
+            'angle': angle,
+            'content': text,
+            'word_count': len(text.split()),
+            'processing_time': 0.1,
+            'source': 'OpenAI test-model'
+        })
+        sources.append({
+            'type': 'AI Generated',
+            'source': 'OpenAI test-model',
+            'query': angle,
+            'timestamp': 0
+        })
+    return {'topic': 'Renewable Energy', 'content': content, 'sources': sources, 'metadata': {}}
+
+
+class TestContentDeduplicator(unittest.TestCase):
+    """Test MinHash near-duplicate detection and provenance tracking."""
+    
+    def setUp(self):
+        self.research_data = make_research_data(
+            ('benefits', BENEFITS),
+            ('applications', APPLICATIONS),
+            ('challenges', CHALLENGES)
+        )
+    
+    def test_merge_near_duplicates(self):
+        """Near-duplicates are removed and recorded on the kept item."""
+        result = ContentDeduplicator(threshold=0.6, mode='merge').deduplicate(self.research_data)
+        
+        self.assertEqual([item['angle'] for item in result['content']], ['benefits', 'challenges'])
+        self.assertEqual(result['content'][0]['merged_angles'], ['applications'])
+        self.assertEqual(result['metadata']['deduplication']['items_removed'], 1)
+        
+        duplicate_source = result['sources'][1]
+        self.assertEqual(duplicate_source['duplicate_of'], 'benefits')
+        self.assertEqual(duplicate_source['action'], 'merged')
+        self.assertEqual(len(result['sources']), 3)
+    
+    def test_items_are_not_modified(self):
+        """Merging copies the kept item, so items reused across runs never accumulate angles."""
+        deduplicator = ContentDeduplicator(threshold=0.6, mode='merge')
+        for _ in range(2):
+            result = deduplicator.deduplicate(self.research_data)
+        self.assertEqual(result['content'][0]['merged_angles'], ['applications'])
+        self.assertNotIn('merged_angles', self.research_data['content'][0])
+    
+    def test_metadata_counts_kept_items(self):
+        """Source and word totals describe the content left after deduplication."""
+        words = sum(item['word_count'] for item in self.research_data['content'])
+        self.research_data['metadata'] = {'total_sources': 3, 'content_length': words, 'words_per_second': words / 2}
+        result = ContentDeduplicator(threshold=0.6).deduplicate(self.research_data)
+        
+        kept_words = len(BENEFITS.split()) + len(CHALLENGES.split())
+        self.assertEqual(result['metadata']['total_sources'], 2)
+        self.assertEqual(result['metadata']['content_length'], kept_words)
+        self.assertAlmostEqual(result['metadata']['words_per_second'], kept_words / 2)
+    
+    def test_drop_mode_keeps_provenance_in_sources(self):
+        """Dropped duplicates are only referenced from their source entry."""
+        result = ContentDeduplicator(threshold=0.6, mode='drop').deduplicate(self.research_data)
+        
+        self.assertNotIn('merged_angles', result['content'][0])
+        self.assertEqual(result['sources'][1]['action'], 'dropped')
+    
+    def test_threshold_is_respected(self):
+        """Nothing is removed when the threshold is above the similarity."""
+        result = ContentDeduplicator(threshold=1.01).deduplicate(self.research_data)
+        self.assertEqual(len(result['content']), 3)
+    
+    def test_distinct_content_is_kept(self):
+        """Unrelated passages are never treated as duplicates."""
+        session = ContentDeduplicator(threshold=0.5).begin_session()
+        self.assertTrue(session.add_item(self.research_data['content'][0]))
+        self.assertTrue(session.add_item(self.research_data['content'][2]))
+    
+    def test_invalid_configuration(self):
+        """Invalid modes and band layouts are rejected."""
+        with self.assertRaises(ValueError):
+            ContentDeduplicator(mode='squash')
+        with self.assertRaises(ValueError):
+            ContentDeduplicator(num_perm=64, bands=10)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
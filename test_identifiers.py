@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for session identifiers
+Tests that ULIDs are unique across threads, sort by creation time, stay ordered
+within one millisecond and encode their timestamp.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import unittest
+from unittest.mock import patch
+from src.identifiers import ENCODING, ULIDGenerator, new_ulid, ulid_timestamp
+
+
+class TestULIDs(unittest.TestCase):
+    """Test ULID generation."""
+    
+    def test_format_and_timestamp(self):
+        """ULIDs are 26 Crockford base32 characters encoding their creation time."""
+        with patch('src.identifiers.time.time', return_value=1700000000.123):
+            ulid = ULIDGenerator().new()
+        self.assertEqual(len(ulid), 26)
+        self.assertTrue(set(ulid) <= set(ENCODING))
+        self.assertEqual(ulid_timestamp(ulid), 1700000000.123)
+    
+    def test_unique_across_threads(self):
+        """Ids generated concurrently by many threads never collide."""
+        ids = []
+        lock = threading.Lock()
+        
+        def generate():
+            generated = [new_ulid() for _ in range(2000)]
+            with lock:
+                ids.extend(generated)
+        
+        threads = [threading.Thread(target=generate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(set(ids)), 16000)
+    
+    def test_ordered_within_a_millisecond(self):
+        """Ids from the same millisecond, or after the clock steps back, keep increasing."""
+        generator = ULIDGenerator()
+        with patch('src.identifiers.time.time', return_value=1700000000.0):
+            ids = [generator.new() for _ in range(100)]
+        with patch('src.identifiers.time.time', return_value=1699999999.0):
+            ids.append(generator.new())
+        with patch('src.identifiers.time.time', return_value=1700000001.0):
+            ids.append(generator.new())
+        
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ulid_timestamp(ids[100]), 1700000000.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
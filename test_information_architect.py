@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Test script for the Information Architect
+Tests categorization behaviour without requiring an OpenAI API key.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from config import Config
+from src.information_architect import InformationArchitect, BUCKET_GROUPS
+from src.report_generator import ReportGenerator
+from src.lexicon import LexiconRegistry
+from src.tfidf_scorer import CorpusStatistics, TfidfImportanceScorer
+
+
+def make_item(angle, content):
+    """Build a research content item in the ResearchEngine format."""
+    return {
+        'angle': angle,
+        'content': content,
+        'word_count': len(content.split()),
+        'processing_time': 0.1,
+        'source': 'OpenAI test-model'
+    }
+
+
+SAMPLE_ITEMS = [
+    make_item("What is Testing? Provide a comprehensive definition and overview.",
+              "Testing is a fundamental and essential process with a key impact on results. " * 12),
+    make_item("What are the main applications and use cases of Testing?",
+              "Testing has practical and useful applications in a detailed and specific way. " * 6),
+    make_item("What are the challenges and limitations of Testing?",
+              "Some minor and limited challenges exist."),
+    make_item("What are the current trends and developments in Testing?",
+              "Trends change.")
+]
+
+
+class TestIncrementalCategorization(unittest.TestCase):
+    """Test the incremental add_item/snapshot categorization API."""
+    
+    def setUp(self):
+        self.architect = InformationArchitect()
+    
+    def test_incremental_matches_batch(self):
+        """Adding items one at a time produces the batch categorization."""
+        batch = self.architect.categorize_information({'topic': 'Testing', 'content': SAMPLE_ITEMS})
+        
+        categorization = self.architect.begin_categorization('Testing')
+        for item in SAMPLE_ITEMS:
+            categorization.add_item(item)
+        
+        self.assertEqual(categorization.snapshot(), batch)
+    
+    def test_confidence_scores_track_each_item(self):
+        """Bucket counts and confidence scores are current after every add_item."""
+        categorization = self.architect.begin_categorization('Testing')
+        
+        for processed, item in enumerate(SAMPLE_ITEMS, 1):
+            entry = categorization.add_item(item)
+            snapshot = categorization.snapshot()
+            metadata = snapshot['categorization_metadata']
+            counts = categorization.get_bucket_counts()
+            
+            self.assertEqual(metadata['total_items_processed'], processed)
+            self.assertEqual(sum(counts.values()), processed)
+            self.assertIn(entry['bucket'], counts)
+            self.assertAlmostEqual(
+                metadata['confidence_scores']['distribution']['high_priority'],
+                counts['high_priority'] / processed
+            )
+    
+    def test_snapshot_is_isolated(self):
+        """Snapshots are not affected by items added afterwards."""
+        categorization = self.architect.begin_categorization('Testing')
+        categorization.add_item(SAMPLE_ITEMS[0])
+        snapshot = categorization.snapshot()
+        
+        for item in SAMPLE_ITEMS[1:]:
+            categorization.add_item(item)
+        
+        self.assertEqual(snapshot['categorization_metadata']['total_items_processed'], 1)
+        total = sum(
+            len(items)
+            for group in ('important_information', 'minor_information')
+            for items in snapshot[group].values()
+        )
+        self.assertEqual(total, 1)
+    
+    def test_recategorize_item_matches_batch(self):
+        """Re-scoring one item gives the batch categorization of the updated items."""
+        batch = self.architect.categorize_information({'topic': 'Testing', 'content': SAMPLE_ITEMS})
+        refreshed = make_item(SAMPLE_ITEMS[-1]['angle'], "Trends keep changing.")
+        
+        recategorized = self.architect.recategorize_item(batch, refreshed)
+        
+        expected = self.architect.categorize_information(
+            {'topic': 'Testing', 'content': SAMPLE_ITEMS[:-1] + [refreshed]}
+        )
+        self.assertEqual(recategorized, expected)
+    
+    def test_empty_snapshot(self):
+        """A categorization with no items yet has zero confidence."""
+        snapshot = self.architect.begin_categorization('Testing').snapshot()
+        self.assertEqual(snapshot['categorization_metadata']['confidence_scores']['overall_confidence'], 0.0)
+
+
+
+class TestTopKSelection(unittest.TestCase):
+    """Test the bounded top-k heaps kept per priority bucket."""
+    
+    def setUp(self):
+        # Varying keyword richness and length gives a spread of scores and ties per bucket
+        keywords = ['essential', 'critical', 'core', 'vital', 'central', 'impact',
+                    'results', 'outcomes', 'framework', 'strategy', 'useful', 'practical']
+        angles = ["What are the benefits of Testing?", "What are the current trends in Testing?"]
+        self.items = [
+            make_item(angles[i % 2],
+                      (' '.join(keywords[:i % 13]) + " testing notes. ") * (i % 5 + 1) * 6)
+            for i in range(60)
+        ]
+    
+    def _expected_top(self, categorized, bucket, count):
+        items = categorized[BUCKET_GROUPS[bucket]][bucket]
+        return sorted(items, key=lambda item: item['importance_score'], reverse=True)[:count]
+    
+    def test_top_items_are_highest_scoring(self):
+        """Top items match a stable sort of the full bucket by score."""
+        architect = InformationArchitect(top_k=3)
+        categorized = architect.categorize_information({'topic': 'Testing', 'content': self.items})
+        
+        for bucket, group in BUCKET_GROUPS.items():
+            top_items = [categorized[group][bucket][index] for index in categorized['top_indices'][bucket]]
+            self.assertEqual(top_items, self._expected_top(categorized, bucket, 3))
+        self.assertNotIn('top_items', categorized)
+    
+    def test_without_full_lists(self):
+        """Buckets hold only the top items while counts stay exact."""
+        full = InformationArchitect(top_k=3).categorize_information(
+            {'topic': 'Testing', 'content': self.items}
+        )
+        bounded = InformationArchitect(top_k=3, keep_full_lists=False).categorize_information(
+            {'topic': 'Testing', 'content': self.items}
+        )
+        
+        for bucket, group in BUCKET_GROUPS.items():
+            self.assertLessEqual(len(bounded[group][bucket]), 3)
+            self.assertEqual(bounded[group][bucket],
+                             [full[group][bucket][index] for index in full['top_indices'][bucket]])
+            self.assertEqual(bounded['top_indices'][bucket], list(range(len(bounded[group][bucket]))))
+        self.assertEqual(bounded['categorization_metadata']['bucket_counts'],
+                         full['categorization_metadata']['bucket_counts'])
+        self.assertEqual(bounded['categorization_metadata']['confidence_scores'],
+                         full['categorization_metadata']['confidence_scores'])
+    
+    def test_report_generator_uses_highest_scores(self):
+        """Report templates pick the best items, with or without heaps."""
+        categorized = InformationArchitect(top_k=2).categorize_information(
+            {'topic': 'Testing', 'content': self.items}
+        )
+        generator = ReportGenerator()
+        
+        for bucket, group in BUCKET_GROUPS.items():
+            expected = self._expected_top(categorized, bucket, 5)
+            # Heaps only hold 2 items, so larger requests fall back to the full list
+            self.assertEqual(generator._top_items(categorized, group, bucket, 5), expected)
+            self.assertEqual(generator._top_items(categorized, group, bucket, 2), expected[:2])
+    
+    def test_bounded_lists_require_top_k(self):
+        """Dropping the full lists without any top-k heap is rejected."""
+        with self.assertRaises(ValueError):
+            InformationArchitect(top_k=0, keep_full_lists=False)
+
+
+class TestLexiconRegistry(unittest.TestCase):
+    """Test lexicon loading, compiled matching and hot reloading."""
+    
+    def setUp(self):
+        self.lexicon_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.lexicon_dir, 'tenants'))
+        shutil.copy(os.path.join(Config.LEXICON_DIR, 'default.json'), self.lexicon_dir)
+        self.registry = LexiconRegistry(self.lexicon_dir, reload_interval=0)
+    
+    def tearDown(self):
+        shutil.rmtree(self.lexicon_dir)
+    
+    def _write(self, relative_path, spec):
+        path = os.path.join(self.lexicon_dir, relative_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(spec, f)
+        # Make sure the change is visible even on coarse mtime filesystems
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    
+    def test_compiled_matcher_counts_substrings(self):
+        """The compiled index counts the same keywords as substring tests."""
+        lexicon = self.registry.get()
+        text = ("the keystone monkey takes a basic approach to mainstream systems, "
+                "with additional background on the main impact").lower()
+        
+        expected = {
+            tier: sum(1 for keyword in keywords if keyword in text)
+            for tier, keywords in lexicon.importance_keywords.items()
+        }
+        self.assertEqual(lexicon.match_keywords(text), expected)
+    
+    def test_compiled_once_per_version(self):
+        """Unchanged files are not recompiled on later lookups."""
+        self.assertIs(self.registry.get(), self.registry.get())
+    
+    def test_compiled_cache_is_bounded(self):
+        """Only the most recently used compiled versions are kept."""
+        registry = LexiconRegistry(self.lexicon_dir, reload_interval=0, max_compiled=2)
+        for tenant in ('acme', 'globex', 'initech'):
+            self._write(f'tenants/{tenant}.json', {'version': '1', 'angle_weights': {tenant: 0.9}})
+            registry.get(tenant)
+        self.assertEqual(len(registry._compiled), 2)
+        self.assertEqual(registry.tenants(), ['acme', 'globex', 'initech'])
+        
+        # Active lexicons evicted from the cache keep serving
+        self.assertEqual(registry.get('acme').version, '1+acme:1')
+    
+    def test_hot_reload_on_file_change(self):
+        """A changed lexicon file is swapped in without a new registry."""
+        before = self.registry.get()
+        
+        with open(os.path.join(self.lexicon_dir, 'default.json'), encoding='utf-8') as f:
+            spec = json.load(f)
+        spec['version'] = '2'
+        spec['importance_keywords']['high'].append('quantum')
+        self._write('default.json', spec)
+        
+        after = self.registry.get()
+        self.assertIsNot(before, after)
+        self.assertEqual(after.version, '2')
+        self.assertEqual(after.match_keywords('quantum')['high'], 1)
+        self.assertEqual(before.match_keywords('quantum')['high'], 0)
+    
+    def test_broken_file_keeps_active_lexicon(self):
+        """A malformed lexicon file is not swapped in; the previous version keeps serving."""
+        before = self.registry.get()
+        path = os.path.join(self.lexicon_dir, 'default.json')
+        with open(path, encoding='utf-8') as f:
+            spec = json.load(f)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"version": "2", "importance_keywords": {')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        with patch('builtins.print') as report:
+            self.assertIs(self.registry.get(), before)
+            self.assertIs(self.registry.get(), before)
+        # Reported once, not reloaded on every lookup
+        self.assertEqual(report.call_count, 1)
+        
+        spec['version'] = '3'
+        self._write('default.json', spec)
+        self.assertEqual(self.registry.get().version, '3')
+    
+    def test_tenant_override(self):
+        """Tenant files override single tiers and angle weights."""
+        self._write('tenants/acme.json', {
+            'version': '3',
+            'importance_keywords': {'high': ['compliance']},
+            'angle_weights': {'challenges': 0.9}
+        })
+        
+        tenant_lexicon = self.registry.get('acme')
+        self.assertEqual(tenant_lexicon.version, '1+acme:3')
+        self.assertEqual(tenant_lexicon.importance_keywords['high'], ('compliance',))
+        self.assertEqual(tenant_lexicon.importance_keywords['low'],
+                         self.registry.get().importance_keywords['low'])
+        self.assertEqual(tenant_lexicon.angle_weight('what are the challenges of x?'), 0.9)
+        
+        architect = InformationArchitect(self.registry)
+        categorized = architect.categorize_information(
+            {'topic': 'Testing', 'content': SAMPLE_ITEMS}, tenant='acme'
+        )
+        self.assertEqual(categorized['categorization_metadata']['lexicon_version'], '1+acme:3')
+    
+    def test_invalid_tenant_name(self):
+        """Tenant names cannot escape the lexicon directory."""
+        with self.assertRaises(ValueError):
+            self.registry.get('../default')
+
+
+
+class TestTfidfScoring(unittest.TestCase):
+    """Test the corpus TF-IDF scoring backend."""
+    
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.stats_path = os.path.join(self.data_dir, 'df.tsv.gz')
+    
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+    
+    def test_statistics_snapshot_round_trip(self):
+        """Document frequencies are snapshotted periodically and reloaded."""
+        statistics = CorpusStatistics(self.stats_path, snapshot_interval=2)
+        statistics.add_document(['solar', 'wind', 'solar'])
+        self.assertFalse(os.path.exists(self.stats_path))
+        statistics.add_document(['solar', 'storage'])
+        # Written by a background thread, off the request path
+        deadline = time.time() + 5
+        while not os.path.exists(self.stats_path) and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(os.path.exists(self.stats_path))
+        statistics.snapshot()
+        
+        reloaded = CorpusStatistics(self.stats_path)
+        self.assertEqual(reloaded.document_count, 2)
+        self.assertEqual(reloaded.document_frequency('solar'), 2)
+        self.assertEqual(reloaded.document_frequency('wind'), 1)
+        self.assertGreater(reloaded.idf('wind'), reloaded.idf('solar'))
+    
+    def test_processes_sharing_a_file_add_up(self):
+        """Snapshots append count increments, so concurrent writers do not lose each other's counts."""
+        first = CorpusStatistics(self.stats_path, snapshot_interval=1000)
+        second = CorpusStatistics(self.stats_path, snapshot_interval=1000)
+        first.add_document(['solar', 'wind'])
+        second.add_document(['solar'])
+        second.add_document(['storage'])
+        first.snapshot()
+        second.snapshot()
+        # Nothing new to write
+        second.snapshot()
+        
+        reloaded = CorpusStatistics(self.stats_path)
+        self.assertEqual(reloaded.document_count, 3)
+        self.assertEqual(reloaded.document_frequency('solar'), 2)
+        self.assertEqual(reloaded.document_frequency('storage'), 1)
+    
+    def test_recategorizing_does_not_recount(self):
+        """Refreshing an item re-scores it without adding it to the corpus statistics again."""
+        scorer = TfidfImportanceScorer(CorpusStatistics(path=''))
+        architect = InformationArchitect(scoring_backend='tfidf', tfidf_scorer=scorer)
+        categorized = architect.categorize_information({'topic': 'Testing', 'content': SAMPLE_ITEMS})
+        architect.recategorize_item(categorized, SAMPLE_ITEMS[0])
+        self.assertEqual(scorer.statistics.document_count, len(SAMPLE_ITEMS))
+    
+    def test_common_keywords_score_lower(self):
+        """A keyword that appears in every document contributes less over time."""
+        scorer = TfidfImportanceScorer(CorpusStatistics(path=''), score_scale=1.0)
+        lexicon = LexiconRegistry().get()
+        
+        text = "the system offers key benefits for grid operators"
+        first = scorer.score(text, 'Energy Storage', lexicon)
+        for _ in range(50):
+            scorer.score("system key benefits", 'Energy Storage', lexicon)
+        later = scorer.score(text, 'Energy Storage', lexicon)
+        
+        self.assertGreater(first, later)
+        self.assertGreater(later, 0.0)
+    
+    def test_architect_with_tfidf_backend(self):
+        """The architect can categorize with the TF-IDF backend."""
+        scorer = TfidfImportanceScorer(CorpusStatistics(path=''))
+        architect = InformationArchitect(scoring_backend='tfidf', tfidf_scorer=scorer)
+        categorized = architect.categorize_information({'topic': 'Testing', 'content': SAMPLE_ITEMS})
+        
+        metadata = categorized['categorization_metadata']
+        self.assertEqual(metadata['categorization_method'], 'hybrid_tfidf_scoring')
+        self.assertEqual(metadata['total_items_processed'], len(SAMPLE_ITEMS))
+        self.assertEqual(scorer.statistics.document_count, len(SAMPLE_ITEMS))
+    
+    def test_invalid_backend(self):
+        """Unknown scoring backends are rejected."""
+        with self.assertRaises(ValueError):
+            InformationArchitect(scoring_backend='bm25')
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -137,6 +137,42 @@ class TestOversightAIIntegration(unittest.TestCase):
         print(f"   Session ID: {result['session_id']}")
         print(f"   Processing time: {result['processing_time']:.2f} seconds")
 
+    
+    @patch('openai.OpenAI')
+    def test_lazy_rendered_artifacts(self, mock_openai_client):
+        """Test that only requested artifacts are rendered and later ones are memoized."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "Comprehensive information about the test topic."
+        
+        mock_client_instance = MagicMock()
+        mock_client_instance.chat.completions.create.return_value = mock_response
+        mock_openai_client.return_value = mock_client_instance
+        
+        with patch.object(Config, 'validate_openai_config', return_value=True):
+            with patch.object(Config, 'OPENAI_API_KEY', 'test_key'):
+                oversight_ai = OversightAI()
+                result = oversight_ai.process_topic("Test Topic", "summary", include=['text_report'])
+        
+        self.assertTrue(result['success'])
+        self.assertIn('text_report', result)
+        self.assertNotIn('markdown_report', result)
+        self.assertNotIn('final_report', result)
+        
+        # Markdown is rendered on first access and served from the cache afterwards
+        with patch.object(oversight_ai.report_generator, 'render_sections',
+                          wraps=oversight_ai.report_generator.render_sections) as export:
+            first = oversight_ai.render_artifact(result['session_id'], 'markdown')
+            second = oversight_ai.export_session_data(result['session_id'], format='markdown')
+            self.assertEqual(export.call_count, 1)
+        
+        self.assertEqual(first, second)
+        self.assertIn('## 3. Document Content', first)
+        
+        with self.assertRaises(ValueError):
+            oversight_ai.validate_include(['pdf_report'])
+        
+        print("✅ Lazy rendered artifacts test passed")
+
 
 def run_tests():
     """Run all integration tests."""
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job queue
+Tests that jobs run on the worker pool, that a full queue rejects jobs, that
+failures are counted, and that clients are served in weighted fair order.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import unittest
+from src.job_queue import JobQueue
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test the bounded job queue."""
+    
+    def test_jobs_run_on_worker_threads(self):
+        """Submitted jobs run concurrently on the worker threads."""
+        jobs = JobQueue(workers=3, max_depth=10)
+        self.addCleanup(jobs.shutdown)
+        started = threading.Barrier(3, timeout=5)
+        threads = set()
+        
+        def job():
+            started.wait()
+            threads.add(threading.current_thread().name)
+        
+        for _ in range(3):
+            self.assertTrue(jobs.submit(job))
+        jobs.join()
+        
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.current_thread().name, threads)
+        self.assertEqual(jobs.get_statistics()['completed'], 3)
+    
+    def test_full_queue_rejects_jobs(self):
+        """Jobs beyond max_depth are rejected instead of blocking the caller."""
+        release = threading.Event()
+        jobs = JobQueue(workers=1, max_depth=1)
+        self.addCleanup(jobs.shutdown)
+        self.addCleanup(release.set)
+        running = threading.Event()
+        
+        def block():
+            running.set()
+            release.wait(5)
+        
+        self.assertTrue(jobs.submit(block))
+        running.wait(5)
+        self.assertTrue(jobs.submit(lambda: None))
+        self.assertFalse(jobs.submit(lambda: None))
+        
+        statistics = jobs.get_statistics()
+        self.assertEqual(statistics['running'], 1)
+        self.assertEqual(statistics['queued'], 1)
+        self.assertEqual(statistics['rejected'], 1)
+    
+    def test_failed_jobs_are_counted(self):
+        """A failing job is counted and does not stop its worker."""
+        jobs = JobQueue(workers=1, max_depth=10)
+        self.addCleanup(jobs.shutdown)
+        results = []
+        
+        def fail():
+            raise RuntimeError('boom')
+        
+        jobs.submit(fail)
+        jobs.submit(lambda: results.append('ran'))
+        jobs.join()
+        
+        self.assertEqual(results, ['ran'])
+        statistics = jobs.get_statistics()
+        self.assertEqual(statistics['failed'], 1)
+        self.assertEqual(statistics['completed'], 1)
+    
+    
+    def run_in_order(self, submissions):
+        """Run jobs queued behind a blocking job on one worker; returns the order they ran in."""
+        jobs = JobQueue(workers=1, max_depth=20)
+        self.addCleanup(jobs.shutdown)
+        release = threading.Event()
+        running = threading.Event()
+        order = []
+        
+        def block():
+            running.set()
+            release.wait(5)
+        
+        jobs.submit(block, 'blocker')
+        running.wait(5)
+        for name, client, weight in submissions:
+            jobs.submit(lambda name=name: order.append(name), client, weight)
+        release.set()
+        jobs.join()
+        return order
+    
+    def test_clients_share_workers_fairly(self):
+        """A client with many queued jobs does not hold back another client's job."""
+        order = self.run_in_order([
+            ('a1', 'site-a', 1.0), ('a2', 'site-a', 1.0), ('a3', 'site-a', 1.0), ('b1', 'site-b', 1.0)
+        ])
+        self.assertEqual(order, ['a1', 'b1', 'a2', 'a3'])
+    
+    def test_weights_set_the_share(self):
+        """A client with twice the weight gets twice the share of the workers."""
+        order = self.run_in_order(
+            [(f'heavy{i}', 'heavy', 2.0) for i in range(1, 5)] + [(f'light{i}', 'light', 1.0) for i in range(1, 3)]
+        )
+        self.assertEqual(order, ['heavy1', 'heavy2', 'light1', 'heavy3', 'heavy4', 'light2'])
+    
+    def test_interactive_jobs_run_before_batch_jobs(self):
+        """Queued interactive jobs run before batch jobs queued earlier."""
+        jobs = JobQueue(workers=1, max_depth=20)
+        self.addCleanup(jobs.shutdown)
+        release = threading.Event()
+        running = threading.Event()
+        order = []
+        
+        def block():
+            running.set()
+            release.wait(5)
+        
+        jobs.submit(block)
+        running.wait(5)
+        for name, priority in (('batch1', 'batch'), ('batch2', 'batch'), ('interactive', 'interactive')):
+            jobs.submit(lambda name=name: order.append(name), priority=priority)
+        self.assertEqual(jobs.get_statistics()['classes']['batch']['queued'], 2)
+        release.set()
+        jobs.join()
+        
+        self.assertEqual(order, ['interactive', 'batch1', 'batch2'])
+        classes = jobs.get_statistics()['classes']
+        self.assertEqual(classes['batch']['queue_wait']['count'], 2)
+        self.assertEqual(classes['interactive']['queue_wait']['count'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
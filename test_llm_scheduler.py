@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM call scheduler
+Tests that interactive calls go ahead of batch calls, that batch calls leave
+the reserved request and token budget to interactive work, fair sharing between
+clients, token refunds and the queue wait statistics.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.llm_scheduler import LLMScheduler, current_client, current_priority
+
+
+class TestLLMScheduler(unittest.TestCase):
+    """Test scheduling LLM calls by priority class."""
+    
+    def wait_until_waiting(self, scheduler, priority, count):
+        while scheduler.get_statistics()['classes'][priority]['waiting'] < count:
+            time.sleep(0.001)
+    
+    def test_interactive_calls_go_first(self):
+        """A freed call slot goes to a waiting interactive call before batch calls queued earlier."""
+        scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=0, max_concurrent=1)
+        order = []
+        
+        def request(name, priority):
+            with scheduler.call(100, priority):
+                order.append(name)
+        
+        threads = []
+        with scheduler.call(100):
+            for name, priority in (('batch1', 'batch'), ('batch2', 'batch'), ('interactive', 'interactive')):
+                thread = threading.Thread(target=request, args=(name, priority))
+                thread.start()
+                threads.append(thread)
+                self.wait_until_waiting(scheduler, priority, 2 if name == 'batch2' else 1)
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(order, ['interactive', 'batch1', 'batch2'])
+        classes = scheduler.get_statistics()['classes']
+        self.assertEqual(classes['batch']['calls'], 2)
+        self.assertEqual(classes['interactive']['queue_wait']['count'], 2)
+        self.assertGreater(classes['batch']['queue_wait']['p95'], 0)
+    
+    def test_clients_share_calls_fairly(self):
+        """Waiting calls of the pipelines of different clients are served in turn."""
+        scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=0, max_concurrent=1)
+        order = []
+        
+        def request(name, client):
+            current_client.set((client, 1.0))
+            with scheduler.call(100):
+                order.append(name)
+        
+        threads = []
+        with scheduler.call(100):
+            for index, (name, client) in enumerate((('a1', 'a'), ('a2', 'a'), ('a3', 'a'), ('b1', 'b'))):
+                thread = threading.Thread(target=request, args=(name, client))
+                thread.start()
+                threads.append(thread)
+                self.wait_until_waiting(scheduler, 'interactive', index + 1)
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(order, ['a1', 'b1', 'a2', 'a3'])
+    
+    def test_batch_calls_leave_token_reserve(self):
+        """Batch calls wait rather than use the reserved share of the token budget."""
+        clock = [1000.0]
+        with patch('src.llm_scheduler.time.monotonic', side_effect=lambda: clock[0]):
+            scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=600, max_concurrent=10,
+                                     batch_reserve=0.25)
+            with scheduler.call(100):
+                pass
+            with scheduler.call(200, 'batch'):
+                pass
+            done = threading.Event()
+            
+            def batch():
+                with scheduler.call(200, 'batch'):
+                    done.set()
+            
+            thread = threading.Thread(target=batch)
+            thread.start()
+            self.wait_until_waiting(scheduler, 'batch', 1)
+            # 300 tokens left: the batch call would dip into the 150 token reserve
+            self.assertFalse(done.wait(0.05))
+            with scheduler.call(200):
+                pass
+            self.assertEqual(scheduler.get_statistics()['tokens_available'], 100)
+            
+            # A minute later the budget has refilled
+            clock[0] += 60
+            with scheduler.call(1):
+                pass
+            thread.join(5)
+        self.assertTrue(done.is_set())
+    
+    def test_unused_tokens_are_given_back(self):
+        """The difference between the estimated and the actual tokens goes back to the budget."""
+        with patch('src.llm_scheduler.time.monotonic', return_value=1000.0):
+            scheduler = LLMScheduler(requests_per_minute=60, tokens_per_minute=6000)
+            with scheduler.call(1000) as call:
+                call.tokens_used = 300
+            stats = scheduler.get_statistics()
+        self.assertEqual(stats['tokens_available'], 5700)
+        self.assertEqual(stats['requests_available'], 59)
+    
+    def test_async_calls_use_pipeline_priority(self):
+        """Calls made without a priority take the class of the current pipeline."""
+        scheduler = LLMScheduler(requests_per_minute=0, tokens_per_minute=0)
+        
+        async def pipeline():
+            current_priority.set('batch')
+            async with scheduler.call_async(100):
+                return scheduler.get_statistics()['classes']['batch']['running']
+        
+        self.assertEqual(asyncio.run(pipeline()), 1)
+        self.assertEqual(scheduler.get_statistics()['classes']['batch']['calls'], 1)
+        self.assertEqual(scheduler.get_statistics()['classes']['batch']['running'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
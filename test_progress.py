@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the progress broker
+Tests event replay for late subscribers, resuming after an event id, live delivery
+to waiting (thread and async) subscribers, keep-alives, closing sessions that never
+run and retention of finished sessions.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+from src.progress import ProgressBroker
+
+
+class TestProgressBroker(unittest.TestCase):
+    """Test publishing and subscribing to session progress events."""
+    
+    def test_late_subscribers_get_replay(self):
+        """Events published before subscribing are replayed, up to the terminal event."""
+        broker = ProgressBroker()
+        broker.open('s1')
+        broker.publish('s1', 'step_started', {'step': 'topic_input'})
+        broker.publish('s1', 'completed', {'session_id': 's1'})
+        broker.publish('s1', 'step_started', {'step': 'ignored'})
+        
+        self.assertEqual(list(broker.subscribe('s1')), [
+            (1, 'step_started', {'step': 'topic_input'}),
+            (2, 'completed', {'session_id': 's1'})
+        ])
+        self.assertEqual([event[0] for event in broker.subscribe('s1', last_event_id=1)], [2])
+        self.assertEqual(list(broker.subscribe('unknown')), [])
+    
+    def test_waiting_subscribers_receive_live_events(self):
+        """A subscriber waiting on an open session gets events as they are published."""
+        broker = ProgressBroker()
+        broker.open('s1')
+        received = []
+        subscriber = threading.Thread(
+            target=lambda: received.extend(event[1] for event in broker.subscribe('s1', timeout=5))
+        )
+        subscriber.start()
+        
+        broker.publish('s1', 'step_started', {'step': 'topic_input'})
+        broker.publish('s1', 'failed', {'error': 'boom'})
+        subscriber.join(5)
+        
+        self.assertFalse(subscriber.is_alive())
+        self.assertEqual(received, ['step_started', 'failed'])
+    
+    def test_closed_sessions_end_their_streams(self):
+        """Closing a session that will never run drops its channel and ends waiting subscribers."""
+        broker = ProgressBroker()
+        broker.open('s1')
+        received = []
+        subscriber = threading.Thread(target=lambda: received.extend(broker.subscribe('s1', timeout=5)))
+        subscriber.start()
+        
+        broker.close('s1')
+        subscriber.join(5)
+        self.assertFalse(subscriber.is_alive())
+        self.assertEqual(received, [])
+        self.assertNotIn('s1', broker)
+    
+    def test_keep_alive_while_idle(self):
+        """None is yielded when no event arrives within the timeout."""
+        broker = ProgressBroker()
+        broker.open('s1')
+        events = broker.subscribe('s1', timeout=0.01)
+        self.assertIsNone(next(events))
+    
+    def test_finished_sessions_expire(self):
+        """Events of finished sessions are dropped after the retention period."""
+        broker = ProgressBroker(retention=60)
+        with patch('src.progress.time.time', return_value=1000.0):
+            broker.open('s1')
+            broker.publish('s1', 'completed', {})
+            broker.open('s2')
+        with patch('src.progress.time.time', return_value=1100.0):
+            broker.open('s3')
+        
+        self.assertNotIn('s1', broker)
+        self.assertIn('s2', broker)
+    
+    def test_async_subscribers_receive_events_from_threads(self):
+        """An async subscriber is woken by events published on another thread."""
+        broker = ProgressBroker()
+        broker.open('s1')
+        broker.publish('s1', 'step_started', {'step': 'topic_input'})
+        
+        async def subscribe():
+            received = []
+            publisher = threading.Timer(0.05, lambda: (
+                broker.publish('s1', 'step_finished', {'step': 'topic_input'}),
+                broker.publish('s1', 'completed', {})
+            ))
+            publisher.start()
+            async for event in broker.subscribe_async('s1', timeout=5):
+                received.append(event)
+            publisher.join()
+            return received
+        
+        received = asyncio.run(subscribe())
+        self.assertEqual([event[1] for event in received], ['step_started', 'step_finished', 'completed'])
+        
+        async def idle():
+            broker.open('s2')
+            events = broker.subscribe_async('s2', timeout=0.01)
+            event = await events.__anext__()
+            await events.aclose()
+            return event
+        
+        self.assertIsNone(asyncio.run(idle()))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-client quotas
+Tests the analysis and LLM token buckets, their refill, refunds, usage counters
+and the bound on tracked clients.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import unittest
+from unittest.mock import patch
+from src.quotas import QuotaExceeded, QuotaManager
+
+
+class TestQuotaManager(unittest.TestCase):
+    """Test charging clients against their quotas."""
+    
+    def test_analysis_quota_refills(self):
+        """A client out of analyses is rejected until its bucket refills."""
+        quotas = QuotaManager(analyses_per_minute=6, analyses_burst=2, tokens_per_minute=0)
+        with patch('src.quotas.time.time', return_value=1000.0):
+            quotas.admit('site-a')
+            quotas.admit('site-a')
+            with self.assertRaises(QuotaExceeded) as rejection:
+                quotas.admit('site-a')
+            self.assertEqual(rejection.exception.retry_after, 10)
+            # Other clients have their own quota
+            quotas.admit('site-b')
+        with patch('src.quotas.time.time', return_value=1010.0):
+            quotas.admit('site-a')
+        
+        self.assertEqual(quotas.usage('site-a')['analyses'], 3)
+        self.assertEqual(quotas.usage('site-a')['rejected'], 1)
+    
+    def test_token_debt_blocks_analyses(self):
+        """LLM tokens are charged after the fact; a client in debt is rejected until it is paid off."""
+        quotas = QuotaManager(analyses_per_minute=0, tokens_per_minute=600, tokens_burst=1000)
+        with patch('src.quotas.time.time', return_value=1000.0):
+            quotas.admit('site-a')
+            quotas.charge_tokens('site-a', 1500)
+            with self.assertRaises(QuotaExceeded) as rejection:
+                quotas.admit('site-a', analyses=0)
+            self.assertEqual(rejection.exception.retry_after, 51)
+            usage = quotas.usage('site-a')
+        self.assertEqual(usage['llm_tokens'], 1500)
+        self.assertEqual(usage['llm_tokens_remaining'], -500)
+        self.assertIsNone(usage['analyses_remaining'])
+        
+        with patch('src.quotas.time.time', return_value=1051.0):
+            quotas.admit('site-a')
+    
+    def test_refund_and_anonymous_requests(self):
+        """Refunded analyses are given back; requests without a client are not limited."""
+        quotas = QuotaManager(analyses_per_minute=1, analyses_burst=1)
+        quotas.admit('site-a')
+        quotas.refund('site-a')
+        quotas.admit('site-a')
+        for _ in range(5):
+            quotas.admit(None)
+        self.assertEqual(quotas.usage('site-a')['analyses'], 1)
+        self.assertEqual(list(quotas.get_statistics()['clients']), ['site-a'])
+    
+    def test_least_recently_seen_clients_are_dropped(self):
+        """At most max_clients clients are tracked."""
+        quotas = QuotaManager(max_clients=2, weights={'site-b': 3.0})
+        for client in ('site-a', 'site-b', 'site-a', 'site-c'):
+            quotas.admit(client)
+        self.assertEqual(sorted(quotas.get_statistics()['clients']), ['site-a', 'site-c'])
+        self.assertEqual(quotas.weight('site-b'), 3.0)
+        self.assertEqual(quotas.weight('site-a'), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for report type templates
+Tests template compilation, report type loading and custom report types.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.report_templates import CompiledTemplate, load_report_types, section_label
+from src.report_generator import ReportGenerator
+from test_api import fake_compile_information
+from src.information_architect import InformationArchitect
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    """Test compiled text templates."""
+    
+    def test_renders_fields_and_format_specs(self):
+        """Fields are substituted and format specifications applied."""
+        template = CompiledTemplate('Topic: {topic}\nConfidence: {confidence:.1%} {{literal}} "quoted" \\ end')
+        self.assertEqual(template.fields, ('topic', 'confidence'))
+        self.assertEqual(
+            template.render({'topic': 'AI', 'confidence': 0.5}),
+            'Topic: AI\nConfidence: 50.0% {literal} "quoted" \\ end'
+        )
+    
+    def test_matches_str_format(self):
+        """Rendering is equivalent to str.format."""
+        source = "{a} and {b:>6} 'x' {a}\té"
+        context = {'a': '{b}', 'b': 'text'}
+        self.assertEqual(CompiledTemplate(source).render(context), source.format(**context))
+    
+    def test_template_text_is_not_code(self):
+        """Quotes, braces and backslashes in template text are rendered, never evaluated."""
+        source = '\\" + __import__("os").getcwd() + "\\n\'\'\' {topic}\\'
+        with patch('builtins.eval', side_effect=AssertionError("templates must not be evaluated")):
+            template = CompiledTemplate(source)
+        self.assertEqual(template.render({'topic': 'AI'}), source.format(topic='AI'))
+    
+    def test_rejects_invalid_fields(self):
+        """Attribute access, conversions, keywords and nested specs are rejected."""
+        for source in ['{a.b}', '{a[0]}', '{a!r}', '{class}', '{a:{b}}', '{}']:
+            with self.assertRaises(ValueError):
+                CompiledTemplate(source)
+    
+    def test_section_label(self):
+        """Section keys become readable labels."""
+        self.assertEqual(section_label('key_points'), 'Key Points')
+
+
+class TestReportTypes(unittest.TestCase):
+    """Test report types defined by template files."""
+    
+    def setUp(self):
+        self.categorized_data = InformationArchitect().categorize_information(
+            fake_compile_information('Edge Computing')
+        )
+    
+    def write_report_type(self, directory, name, spec):
+        with open(os.path.join(directory, f'{name}.json'), 'w', encoding='utf-8') as f:
+            json.dump(spec, f)
+    
+    def test_builtin_report_types(self):
+        """The built-in report types are loaded in their configured order."""
+        self.assertEqual(list(load_report_types()), ['executive', 'detailed', 'technical', 'summary'])
+    
+    def test_custom_report_type(self):
+        """A new report type is defined by a template file alone."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_report_type(directory, 'briefing', {
+                'sections': [
+                    {'name': 'overview', 'text': ['BRIEFING: {topic_upper}', '{key_findings}']},
+                    {'name': 'next_steps', 'builder': 'action_items'}
+                ]
+            })
+            generator = ReportGenerator(load_report_types(directory))
+        
+        report = generator.generate_report(self.categorized_data, 'briefing')
+        
+        self.assertEqual(report['metadata']['report_type'], 'briefing')
+        self.assertTrue(report['content']['overview'].startswith('BRIEFING: EDGE COMPUTING\n'))
+        self.assertIsInstance(report['content']['next_steps'], list)
+        self.assertIn('Next Steps', generator.export_report_as_markdown(report))
+    
+    def test_unknown_builder_rejected(self):
+        """Report types referencing unknown section builders are rejected at startup."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_report_type(directory, 'broken', {
+                'sections': [{'name': 'body', 'text': '{missing_builder}'}]
+            })
+            with self.assertRaises(ValueError):
+                ReportGenerator(load_report_types(directory))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
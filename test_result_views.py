@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for sparse field selection and pagination
+Tests the result view helpers without requiring an OpenAI API key.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import unittest
+from src.result_views import paginate, parse_fields, select_fields, validate_fields
+
+
+RESULTS = {
+    'validated_topic': 'Edge Computing',
+    'research_data': {
+        'content': [{'angle': f'angle {i}'} for i in range(8)],
+        'metadata': {'total_sources': 8}
+    },
+    'final_report': {
+        'metadata': {'topic': 'Edge Computing'},
+        'content': {'key_points': ['a', 'b'], 'overview': 'text'}
+    }
+}
+
+
+class TestFieldSelection(unittest.TestCase):
+    """Test sparse field selection."""
+    
+    def test_select_nested_paths(self):
+        """Only the requested dotted paths are returned."""
+        selected = select_fields(RESULTS, ['validated_topic', 'final_report.content.key_points', 'missing.path'])
+        self.assertEqual(selected, {
+            'validated_topic': 'Edge Computing',
+            'final_report': {'content': {'key_points': ['a', 'b']}}
+        })
+    
+    def test_enclosing_field_wins(self):
+        """Selecting a field and one of its children returns the whole field unmodified."""
+        for fields in (['final_report', 'final_report.content.key_points'],
+                       ['final_report.content.key_points', 'final_report']):
+            selected = select_fields(RESULTS, fields)
+            self.assertIs(selected['final_report'], RESULTS['final_report'])
+        self.assertEqual(RESULTS['final_report']['content']['overview'], 'text')
+    
+    def test_parse_and_validate(self):
+        """Comma-separated fields are split and unknown top-level fields rejected."""
+        self.assertEqual(parse_fields('a.b, c'), ['a.b', 'c'])
+        self.assertIsNone(parse_fields(None))
+        with self.assertRaises(ValueError):
+            parse_fields({'a': 1})
+        with self.assertRaises(ValueError):
+            validate_fields(['final_report.content', 'secrets'], ['final_report'])
+
+
+class TestPagination(unittest.TestCase):
+    """Test pagination of result lists."""
+    
+    def test_paginate_without_mutating(self):
+        """Lists are sliced in a copy and totals are reported."""
+        page, pagination = paginate(RESULTS, ['research_data.content', 'research_data.missing'], 2, 3)
+        
+        self.assertEqual([item['angle'] for item in page['research_data']['content']],
+                         ['angle 2', 'angle 3', 'angle 4'])
+        self.assertEqual(pagination, {'research_data.content': {'offset': 2, 'limit': 3, 'total': 8}})
+        self.assertEqual(len(RESULTS['research_data']['content']), 8)
+        self.assertIs(page['final_report'], RESULTS['final_report'])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSON serialization layer
+Tests the stdlib and orjson serializers and the JSON Lines export built on them,
+without requiring an OpenAI API key.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import unittest
+from datetime import datetime
+from src import serialization
+from src.report_generator import ReportGenerator
+from src.serialization import get_serializer, StdlibJSONSerializer
+
+
+REPORT = {
+    'metadata': {'topic': 'Edge Computing', 'generated': datetime(2024, 1, 1, 12, 0)},
+    'content': {'summary': 'Café latency — lower', 'points': ['a', 'b']},
+    'appendices': {'distribution': {1: 0.5, 'high': (1, 2)}}
+}
+
+
+class TestSerializers(unittest.TestCase):
+    """Test that every serializer produces equivalent, decodable JSON."""
+    
+    def test_stdlib_round_trip(self):
+        """The stdlib serializer encodes compact UTF-8 and stringifies unknown values."""
+        serializer = StdlibJSONSerializer()
+        data = serializer.dumps(REPORT)
+        
+        self.assertIsInstance(data, bytes)
+        self.assertNotIn(b', ', data)
+        decoded = serializer.loads(data)
+        self.assertEqual(decoded['metadata']['generated'], '2024-01-01 12:00:00')
+        self.assertEqual(decoded['content'], REPORT['content'])
+        self.assertEqual(decoded['appendices']['distribution'], {'1': 0.5, 'high': [1, 2]})
+    
+    def test_pretty_output(self):
+        """Pretty output is indented and decodes to the same data."""
+        serializer = get_serializer('json')
+        self.assertIn(b'\n  "metadata"', serializer.dumps(REPORT, pretty=True))
+        self.assertEqual(json.loads(serializer.dumps(REPORT, pretty=True)), json.loads(serializer.dumps(REPORT)))
+    
+    @unittest.skipIf(serialization.orjson is None, "orjson is not installed")
+    def test_orjson_matches_stdlib(self):
+        """orjson output decodes to the same content as the stdlib output."""
+        fast = get_serializer('orjson').loads(get_serializer('orjson').dumps(REPORT))
+        slow = get_serializer('json').loads(get_serializer('json').dumps(REPORT))
+        
+        self.assertEqual(fast['content'], slow['content'])
+        self.assertEqual(fast['appendices'], slow['appendices'])
+    
+    def test_jsonl_export_uses_shared_serializer(self):
+        """JSON Lines exports encode records with the configured serializer."""
+        lines = ReportGenerator().export_report_as_jsonl(REPORT).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0].encode('utf-8'),
+                         get_serializer().dumps({'section': 'metadata', 'data': REPORT['metadata']}))
+        self.assertEqual(json.loads(lines[3])['data'], {'1': 0.5, 'high': [1, 2]})
+    
+    def test_auto_and_invalid_names(self):
+        """'auto' picks orjson only when installed; unknown names are rejected."""
+        expected = 'orjson' if serialization.orjson is not None else 'json'
+        self.assertEqual(get_serializer('auto').name, expected)
+        self.assertIs(get_serializer('json'), get_serializer('json'))
+        with self.assertRaises(ValueError):
+            get_serializer('pickle')
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
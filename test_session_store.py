@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Test script for the session store
+Tests id lookup, count/byte bounds, LRU and idle-time eviction, and compression
+of cold sessions outside the store lock, and the SQLite store shared by worker processes.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tempfile
+import threading
+import unittest
+import zlib
+from unittest.mock import patch
+from src.session_store import SessionStore
+from src.sqlite_session_store import SQLiteSessionStore
+
+
+def make_session(session_id, start_time=0.0, text="Edge computing moves work closer to the data. "):
+    """Build a finished session in the OversightAI format."""
+    return {
+        'session_id': session_id,
+        'topic': 'Edge Computing',
+        'report_type': 'detailed',
+        'start_time': start_time,
+        'steps_completed': ['topic_input'],
+        'status': 'completed',
+        'processing_time': 1.5,
+        'results': {'research_data': {'content': [{'angle': 'What is it?', 'content': text * 50}]}}
+    }
+
+
+class TestSessionStore(unittest.TestCase):
+    """Test the bounded session store."""
+    
+    def test_lookup_by_id(self):
+        """Sessions are found by id; unknown ids miss."""
+        store = SessionStore(compress=False)
+        session = make_session('s1')
+        store.put(session)
+        
+        self.assertIs(store.get('s1'), session)
+        self.assertIsNone(store.get('s2'))
+        self.assertEqual(store.get_summary('s1')['status'], 'completed')
+        self.assertEqual(store.get_statistics()['hits'], 1)
+        self.assertEqual(store.get_statistics()['misses'], 1)
+    
+    def test_evicts_least_recently_used_by_count(self):
+        """The least recently used session is evicted beyond max_sessions."""
+        evicted = []
+        store = SessionStore(max_sessions=2, compress=False, on_evict=evicted.append)
+        store.put(make_session('s1'))
+        store.put(make_session('s2'))
+        store.get('s1')
+        store.put(make_session('s3'))
+        
+        self.assertIn('s1', store)
+        self.assertNotIn('s2', store)
+        self.assertEqual(evicted, ['s2'])
+    
+    def test_bounded_under_sustained_traffic(self):
+        """Memory levels off at the byte bound however many sessions are stored."""
+        store = SessionStore(max_bytes=50_000, hot_sessions=2)
+        for number in range(500):
+            store.put(make_session(f's{number}', number))
+        
+        statistics = store.get_statistics()
+        self.assertLessEqual(statistics['current_bytes'], 50_000)
+        self.assertGreater(statistics['evictions'], 0)
+        self.assertIn('s499', store)
+        self.assertLess(len(store), 500)
+    
+    def test_idle_sessions_expire(self):
+        """Sessions not accessed for longer than the TTL expire."""
+        store = SessionStore(ttl=60, compress=False)
+        with patch('src.session_store.time.time', return_value=1000.0):
+            store.put(make_session('s1'))
+        with patch('src.session_store.time.time', return_value=1030.0):
+            self.assertIsNotNone(store.get('s1'))
+        with patch('src.session_store.time.time', return_value=1080.0):
+            self.assertIsNotNone(store.get('s1'))
+        with patch('src.session_store.time.time', return_value=1200.0):
+            self.assertIsNone(store.get('s1'))
+        self.assertEqual(store.get_statistics()['expirations'], 1)
+    
+    def test_cold_sessions_are_compressed(self):
+        """Sessions outside the hot window are compressed and restored on access."""
+        store = SessionStore(hot_sessions=1)
+        store.put(make_session('s1'))
+        uncompressed_bytes = store.get_statistics()['current_bytes']
+        store.put(make_session('s2'))
+        
+        statistics = store.get_statistics()
+        self.assertEqual(statistics['compressed_sessions'], 1)
+        self.assertLess(statistics['current_bytes'], 2 * uncompressed_bytes)
+        
+        self.assertEqual(store.get('s1'), make_session('s1'))
+        statistics = store.get_statistics()
+        self.assertEqual(statistics['decompressions'], 1)
+        self.assertEqual(statistics['compressed_sessions'], 1)
+        self.assertIsInstance(store._entries['s2'][1], bytes)
+    
+    def test_compression_runs_outside_the_lock(self):
+        """Sessions are compressed and decompressed without holding the store lock."""
+        store = SessionStore(hot_sessions=1)
+        compress, decompress = zlib.compress, zlib.decompress
+        
+        def unlocked(function):
+            def call(*args):
+                self.assertFalse(store._lock.locked())
+                return function(*args)
+            return call
+        
+        with patch('src.session_store.zlib.compress', side_effect=unlocked(compress)) as compressed, \
+                patch('src.session_store.zlib.decompress', side_effect=unlocked(decompress)) as decompressed:
+            store.put(make_session('s1'))
+            store.put(make_session('s2'))
+            self.assertEqual(store.get('s1'), make_session('s1'))
+        self.assertEqual((compressed.call_count, decompressed.call_count), (2, 1))
+        self.assertEqual(store.get_statistics()['compressed_sessions'], 1)
+    
+    def test_summaries_are_oldest_first(self):
+        """Summaries list every session in start order without decompressing them."""
+        store = SessionStore(hot_sessions=0)
+        store.put(make_session('s2', start_time=2.0))
+        store.put(make_session('s1', start_time=1.0))
+        
+        self.assertEqual([summary['session_id'] for summary in store.summaries()], ['s1', 's2'])
+        self.assertEqual(store.get_statistics()['decompressions'], 0)
+        self.assertEqual(len(store.summaries(topic=' edge  COMPUTING')), 2)
+        self.assertEqual(store.summaries(topic='Quantum Computing'), [])
+
+
+class TestCompareAndSet(unittest.TestCase):
+    """Test conditional updates of both session stores."""
+    
+    def check_replace(self, store, other):
+        store.put(make_session('s1'))
+        updated = {**make_session('s1'), 'revision': 1}
+        self.assertTrue(store.replace(updated, 0))
+        # Computed from revision 0, which is no longer stored
+        self.assertFalse(other.replace({**make_session('s1'), 'revision': 1}, 0))
+        self.assertFalse(store.replace({**make_session('s2'), 'revision': 1}, 0))
+        self.assertEqual(other.get('s1'), updated)
+        self.assertNotIn('s2', store)
+    
+    def test_memory_store(self):
+        """An update computed from an outdated revision is not stored."""
+        store = SessionStore(compress=False)
+        self.check_replace(store, store)
+    
+    def test_sqlite_stores_sharing_a_database(self):
+        """Workers sharing a database do not overwrite each other's updates."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'sessions.db')
+        store, other = SQLiteSessionStore(path), SQLiteSessionStore(path)
+        self.addCleanup(store.close)
+        self.addCleanup(other.close)
+        self.check_replace(store, other)
+
+
+class TestSQLiteSessionStore(unittest.TestCase):
+    """Test the durable SQLite session store."""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'sessions', 'sessions.db')
+    
+    def open_store(self, **options):
+        store = SQLiteSessionStore(self.path, **options)
+        self.addCleanup(store.close)
+        return store
+    
+    def test_sessions_survive_restarts(self):
+        """Sessions stored by one store instance are found by a new one."""
+        store = self.open_store()
+        store.put(make_session('s1'))
+        store.close()
+        
+        reopened = self.open_store()
+        self.assertEqual(reopened.get('s1'), make_session('s1'))
+        self.assertEqual(reopened.get_summary('s1')['status'], 'completed')
+        self.assertIn('s1', reopened)
+        self.assertIsNone(reopened.get('s2'))
+        self.assertEqual(reopened.get_statistics()['misses'], 1)
+    
+    def test_updates_are_seen_by_other_stores(self):
+        """A store sharing the database reloads sessions updated by another one."""
+        writer = self.open_store()
+        reader = self.open_store()
+        writer.put(make_session('s1'))
+        self.assertEqual(reader.get('s1')['status'], 'completed')
+        
+        updated = make_session('s1')
+        updated['revision'] = 1
+        writer.put(updated)
+        self.assertEqual(reader.get('s1')['revision'], 1)
+        self.assertEqual(reader.get_summary('s1')['revision'], 1)
+        self.assertEqual(reader.get_statistics()['hits'], 2)
+    
+    def test_unchanged_sessions_are_not_reloaded(self):
+        """Reads of an unchanged session reuse the decoded copy."""
+        store = self.open_store()
+        store.put(make_session('s1'))
+        with patch.object(store.serializer, 'loads', wraps=store.serializer.loads) as loads:
+            first = store.get('s1')
+            self.assertIs(store.get('s1'), first)
+        loads.assert_not_called()
+    
+    def test_evicts_least_recently_used_by_count(self):
+        """The least recently accessed session is evicted beyond max_sessions."""
+        evicted = []
+        store = self.open_store(max_sessions=2, ttl=0, on_evict=evicted.append)
+        with patch('src.sqlite_session_store.time.time', return_value=1000.0):
+            store.put(make_session('s1'))
+        with patch('src.sqlite_session_store.time.time', return_value=1100.0):
+            store.put(make_session('s2'))
+        with patch('src.sqlite_session_store.time.time', return_value=1200.0):
+            store.get('s1')
+            store.put(make_session('s3'))
+        
+        self.assertIn('s1', store)
+        self.assertNotIn('s2', store)
+        self.assertEqual(evicted, ['s2'])
+        self.assertEqual(len(store), 2)
+    
+    def test_bounded_by_compressed_bytes(self):
+        """The database levels off at the byte bound of compressed payloads."""
+        store = self.open_store(max_bytes=5_000)
+        for number in range(100):
+            store.put(make_session(f's{number}', number, text=f"Record {number} of the edge log. "))
+        
+        statistics = store.get_statistics()
+        self.assertLessEqual(statistics['current_bytes'], 5_000)
+        self.assertGreater(statistics['evictions'], 0)
+        self.assertIn('s99', store)
+    
+    def test_running_totals_match_the_sessions(self):
+        """The stats table follows every write and is built from databases that predate it."""
+        store = self.open_store(max_sessions=3)
+        for number in range(5):
+            store.put(make_session(f's{number}', number))
+        store.put(make_session('s4', 4, text="A longer record of the edge log. "))
+        self.assertTrue(store.replace(make_session('s3', 3, text="Short. "), 0))
+        store.discard('s2')
+        
+        def totals():
+            return store._connection().execute('SELECT COUNT(*), SUM(size) FROM sessions').fetchone()
+        statistics = store.get_statistics()
+        self.assertEqual((statistics['sessions'], statistics['current_bytes']), totals())
+        self.assertEqual(len(store), 2)
+        
+        store._connection().execute('DROP TABLE session_stats')
+        reopened = self.open_store()
+        statistics = reopened.get_statistics()
+        self.assertEqual((statistics['sessions'], statistics['current_bytes']), totals())
+        reopened.clear()
+        self.assertEqual(reopened.get_statistics()['current_bytes'], 0)
+        self.assertEqual(len(store), 0)
+    
+    def test_idle_sessions_expire(self):
+        """Sessions not accessed for longer than the TTL expire."""
+        store = self.open_store(ttl=60)
+        with patch('src.sqlite_session_store.time.time', return_value=1000.0):
+            store.put(make_session('s1'))
+        with patch('src.sqlite_session_store.time.time', return_value=1030.0):
+            self.assertIsNotNone(store.get('s1'))
+        with patch('src.sqlite_session_store.time.time', return_value=1080.0):
+            self.assertIsNotNone(store.get('s1'))
+        with patch('src.sqlite_session_store.time.time', return_value=1200.0):
+            self.assertIsNone(store.get('s1'))
+        self.assertEqual(store.get_statistics()['expirations'], 1)
+    
+    def test_summaries_by_topic_oldest_first(self):
+        """Summaries are listed in start order, optionally for one topic."""
+        store = self.open_store()
+        store.put(make_session('s2', start_time=2.0))
+        store.put(make_session('s1', start_time=1.0))
+        other = make_session('s3', start_time=3.0)
+        other['topic'] = 'Quantum Computing'
+        store.put(other)
+        
+        self.assertEqual([summary['session_id'] for summary in store.summaries()], ['s1', 's2', 's3'])
+        self.assertEqual([summary['session_id'] for summary in store.summaries(topic='edge computing')],
+                         ['s1', 's2'])
+    
+    def test_concurrent_readers_and_writer(self):
+        """Readers in other threads proceed while sessions are being written."""
+        store = self.open_store()
+        store.put(make_session('s0'))
+        errors = []
+        
+        def read():
+            try:
+                for _ in range(50):
+                    self.assertEqual(store.get('s0')['session_id'], 's0')
+            except Exception as e:
+                errors.append(e)
+            finally:
+                store.close()
+        
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for number in range(1, 50):
+            store.put(make_session(f's{number}'))
+        for reader in readers:
+            reader.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(len(store), 50)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)